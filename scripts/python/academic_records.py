@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=============================================================================
+IntelliPath - Academic Records
+المرشد الأكاديمي الذكي - السجلات الأكاديمية
+=============================================================================
+Loads student_academic_records from a CSV/Excel export or from Supabase
+into a typed DataFrame, and derives what the advising tools need from it:
+passed courses, term order and each student's current major.
+يحمّل السجلات الأكاديمية من ملف أو من Supabase ويستخرج المقررات
+المنجزة وترتيب الفصول والتخصص الحالي لكل طالب.
+=============================================================================
+Version: 1.0.0 | الإصدار: 1.0.0
+Last Updated: 2026-10-19 | آخر تحديث: 2026-10-19
+=============================================================================
+"""
+
+import logging
+from typing import Any, List, Optional, Sequence
+from pathlib import Path
+
+from course_catalog import _paginate
+from settings import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas', 'pandas openpyxl')
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# CONSTANTS | الثوابت
+# =============================================================================
+
+PASS_MARK = 60  # Minimum passing final grade | الحد الأدنى للنجاح
+FAILING_LETTERS = ('F', 'راسب')  # Letter grades that do not pass | الدرجات الراسبة
+
+# Letter grades on the 4-point scale: (minimum mark, letter, points)
+# سلم الدرجات الحرفية: (أدنى علامة، الحرف، النقاط)
+GRADE_SCALE = (
+    (90, 'A', 4.0), (85, 'B+', 3.5), (80, 'B', 3.0), (75, 'C+', 2.5),
+    (70, 'C', 2.0), (65, 'D+', 1.5), (60, 'D', 1.0), (0, 'F', 0.0),
+)
+
+# Term position within an academic year | ترتيب الفصل ضمن العام
+SEMESTER_ORDER = {
+    'الفصل الأول': 0,
+    'الفصل الثاني': 1,
+    'الفصل الصيفي': 2,
+}
+
+# Columns most tools need | الأعمدة التي تحتاجها الأدوات غالباً
+CORE_COLUMNS = (
+    'student_id', 'academic_year', 'semester', 'course_code',
+    'course_credits', 'final_grade', 'letter_grade', 'grade_points', 'major',
+)
+NUMERIC_COLUMNS = ('course_credits', 'final_grade', 'grade_points', 'cumulative_gpa_points')
+
+
+# =============================================================================
+# LOADING | التحميل
+# =============================================================================
+
+def load_records(source: str, client: Any = None, columns: Optional[Sequence[str]] = None,
+                 page_size: int = 1000) -> 'pd.DataFrame':
+    """
+    Load academic records | تحميل السجلات الأكاديمية
+
+    Args:
+        source: CSV/Excel path, or 'supabase' | مسار الملف أو 'supabase'
+        client: Supabase client when source is 'supabase' | عميل Supabase
+        columns: Columns to keep (default: CORE_COLUMNS) | الأعمدة المطلوبة
+        page_size: Rows per Supabase request | الصفوف لكل طلب
+
+    Returns:
+        Records with text keys and numeric grade columns | السجلات
+    """
+    columns = list(columns or CORE_COLUMNS)
+    if source == 'supabase':
+        if client is None:
+            raise ValueError("A Supabase client is required for source 'supabase'")
+        rows = list(_paginate(client, 'student_academic_records', ', '.join(columns), page_size))
+        records = pd.DataFrame(rows, columns=columns)
+    elif Path(source).suffix.lower() in ('.xlsx', '.xls'):
+        records = pd.read_excel(source, usecols=lambda c: c in columns, dtype={'student_id': str})
+    else:
+        records = pd.read_csv(source, usecols=lambda c: c in columns, dtype={'student_id': str})
+
+    for column in columns:
+        if column not in records:
+            records[column] = None
+    for column in NUMERIC_COLUMNS:
+        if column in records:
+            records[column] = pd.to_numeric(records[column], errors='coerce')
+    for column in ('student_id', 'course_code'):
+        records[column] = records[column].astype(str).str.strip()
+
+    logger.info(f"Loaded {len(records)} academic records | تم تحميل {len(records)} سجل")
+    return records[columns]
+
+
+# =============================================================================
+# DERIVED COLUMNS | الأعمدة المشتقة
+# =============================================================================
+
+def passed_mask(records: 'pd.DataFrame', pass_mark: float = PASS_MARK) -> 'pd.Series':
+    """
+    Rows whose course was passed | الصفوف التي نجح فيها الطالب
+
+    The numeric grade decides when present; otherwise a non-failing letter.
+    """
+    grade = records['final_grade']
+    letter = records['letter_grade'].astype('string').str.strip()
+    by_letter = grade.isna() & letter.notna() & (letter != '') & ~letter.isin(FAILING_LETTERS)
+    return ((grade >= pass_mark) | by_letter.fillna(False)).astype(bool)
+
+
+def mark_points(marks: Any) -> Any:
+    """
+    Grade points for 0-100 marks on GRADE_SCALE, vectorized
+    نقاط الدرجة للعلامات وفق سلم الدرجات
+
+    Accepts a scalar, array or Series; missing marks stay NaN.
+    """
+    floors = [floor for floor, _, _ in reversed(GRADE_SCALE)]
+    points = np.array([p for _, _, p in reversed(GRADE_SCALE)])
+    values = np.asarray(marks, dtype=float)
+    band = np.clip(np.searchsorted(floors, values, side='right') - 1, 0, None)
+    result = np.where(np.isnan(values), np.nan, points[band])
+    return result.item() if result.ndim == 0 else result
+
+
+def term_index(records: 'pd.DataFrame') -> 'pd.Series':
+    """
+    Sortable term number from academic_year and semester | رقم الفصل القابل للترتيب
+
+    "2023/2024" + "الفصل الثاني" -> 2023 * 3 + 1.
+    """
+    start = pd.to_numeric(records['academic_year'].astype(str).str[:4], errors='coerce')
+    order = records['semester'].map(SEMESTER_ORDER).fillna(0)
+    return (start * len(SEMESTER_ORDER) + order).fillna(-1).astype(int)
+
+
+def student_majors(records: 'pd.DataFrame') -> 'pd.Series':
+    """
+    Latest recorded major per student | آخر تخصص مسجل لكل طالب
+    """
+    known = records[records['major'].notna()]
+    latest = known.assign(_term=term_index(known)).sort_values('_term', kind='stable')
+    return latest.groupby('student_id', sort=False)['major'].last()
+
+
+def completed_courses(records: 'pd.DataFrame', student_id: str,
+                      pass_mark: float = PASS_MARK) -> List[str]:
+    """
+    Courses one student has passed | المقررات التي أنجزها طالب
+    """
+    rows = records[(records['student_id'] == str(student_id)) & passed_mask(records, pass_mark)]
+    return rows['course_code'].unique().tolist()
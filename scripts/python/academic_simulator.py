@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=============================================================================
+IntelliPath - What-If Academic Simulator
+المرشد الأكاديمي الذكي - محاكي "ماذا لو" الأكاديمي
+=============================================================================
+Backs the simulator endpoints (drop, retake, grade projection) with
+vectorized GPA arithmetic over one student's records:
+
+- The transcript becomes numpy arrays of credits and grade points, plus
+  a mask of the attempts that count under the retake rule.
+- Every scenario is a set of changes to the credit and quality-point
+  totals (quality points = credits x grade points), so many drops,
+  retakes or grade outcomes are evaluated as one array expression.
+- Monte Carlo projections draw grade points for upcoming courses from
+  per-course grade distributions and score all samples at once.
+
+Retake rules: 'latest' (the last attempt replaces earlier ones), 'best'
+(the highest attempt counts) or 'all' (every attempt counts).
+يحسب أثر الانسحاب وإعادة المقررات وتوقعات الدرجات على المعدل بعمليات
+متجهة على سجل الطالب، مع محاكاة مونت كارلو لآلاف العينات دفعة واحدة.
+=============================================================================
+Version: 1.0.0 | الإصدار: 1.0.0
+Last Updated: 2026-10-19 | آخر تحديث: 2026-10-19
+=============================================================================
+"""
+
+import sys
+import json
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from academic_records import GRADE_SCALE, load_records, mark_points, term_index
+from settings import Clients, Settings, SettingsError, lazy_import, load_settings, setup_logging
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas', 'pandas openpyxl')
+
+logger = logging.getLogger(__name__)
+
+# Which attempts of a repeated course count | المحاولات المحتسبة عند الإعادة
+RETAKE_RULES = ('latest', 'best', 'all')
+
+# Grade points on the scale, low to high | نقاط السلم تصاعدياً
+SCALE_POINTS = tuple(sorted({points for _, _, points in GRADE_SCALE}))
+
+DEFAULT_CREDITS = 3  # Credits when a course has no record | الساعات الافتراضية
+
+
+# =============================================================================
+# SIMULATOR | المحاكي
+# =============================================================================
+
+class AcademicSimulator:
+    """
+    Vectorized what-if GPA engine for one student | محرك المعدل لطالب واحد
+    """
+
+    def __init__(self, codes: Sequence[str], credits: Sequence[float], points: Sequence[float],
+                 terms: Optional[Sequence[int]] = None, rule: str = 'latest',
+                 student_id: Optional[str] = None):
+        """
+        Build from parallel per-attempt arrays | البناء من مصفوفات المحاولات
+
+        Args:
+            codes: Course code per attempt | رمز المقرر لكل محاولة
+            credits: Credits per attempt | الساعات لكل محاولة
+            points: Grade points per attempt | نقاط الدرجة لكل محاولة
+            terms: Sortable term per attempt (default: given order) | الفصل لكل محاولة
+            rule: Retake rule, one of RETAKE_RULES | قاعدة الإعادة
+            student_id: Student number | الرقم الجامعي
+        """
+        if rule not in RETAKE_RULES:
+            raise ValueError(f"Unknown retake rule '{rule}'; use one of {', '.join(RETAKE_RULES)}")
+        self.student_id = student_id
+        self.rule = rule
+        self.codes = np.asarray(codes, dtype=object)
+        self.credits = np.asarray(credits, dtype=float)
+        self.points = np.asarray(points, dtype=float)
+        self.terms = np.arange(len(self.codes)) if terms is None else np.asarray(terms)
+
+        # Course position per attempt | رقم المقرر لكل محاولة
+        self.courses, self.course_of = np.unique(self.codes.astype(str), return_inverse=True)
+        self.counted = self._counted()
+        weights = self.credits * self.counted
+        # Per-course credit and quality-point totals of counted attempts
+        # مجاميع الساعات والنقاط المحتسبة لكل مقرر
+        self.course_credits = np.bincount(self.course_of, weights, minlength=len(self.courses))
+        self.course_quality = np.bincount(self.course_of, weights * self.points, minlength=len(self.courses))
+        self.total_credits = float(self.course_credits.sum())
+        self.total_quality = float(self.course_quality.sum())
+
+    @classmethod
+    def from_records(cls, records: 'pd.DataFrame', student_id: str,
+                     rule: str = 'latest') -> 'AcademicSimulator':
+        """
+        Load one student's graded attempts | تحميل محاولات طالب واحد
+
+        Grade points come from grade_points, or from final_grade on the
+        scale when missing; ungraded (in-progress) rows are skipped.
+        """
+        mine = records[records['student_id'] == str(student_id)]
+        points = mine['grade_points'].to_numpy(dtype=float)
+        points = np.where(np.isnan(points), mark_points(mine['final_grade'].to_numpy(dtype=float)), points)
+        credits = mine['course_credits'].fillna(DEFAULT_CREDITS).to_numpy(dtype=float)
+        graded = ~np.isnan(points)
+        return cls(
+            mine['course_code'].to_numpy()[graded],
+            credits[graded],
+            points[graded],
+            terms=term_index(mine).to_numpy()[graded],
+            rule=rule,
+            student_id=str(student_id),
+        )
+
+    def _counted(self) -> 'np.ndarray':
+        """Attempts that count under the retake rule | المحاولات المحتسبة"""
+        if self.rule == 'all' or not len(self.codes):
+            return np.ones(len(self.codes), dtype=bool)
+        # Sort by course, then by the rule's key; the last attempt per course wins
+        # الترتيب حسب المقرر ثم مفتاح القاعدة؛ تُحتسب المحاولة الأخيرة
+        key = self.terms if self.rule == 'latest' else self.points
+        order = np.lexsort((np.arange(len(self.codes)), key, self.course_of))
+        last = np.ones(len(order), dtype=bool)
+        last[:-1] = self.course_of[order[1:]] != self.course_of[order[:-1]]
+        counted = np.zeros(len(self.codes), dtype=bool)
+        counted[order[last]] = True
+        return counted
+
+    @staticmethod
+    def _gpa(quality: Any, credits: Any) -> Any:
+        credits = np.asarray(credits, dtype=float)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(credits > 0, np.asarray(quality) / np.where(credits > 0, credits, 1), 0.0)
+
+    def _positions(self, codes: Sequence[str]) -> 'np.ndarray':
+        """Course position per code, -1 when not on the transcript | موقع المقرر"""
+        codes = np.asarray(codes, dtype=str)
+        if not len(self.courses):
+            return np.full(len(codes), -1)
+        found = np.clip(np.searchsorted(self.courses, codes), 0, len(self.courses) - 1)
+        return np.where(self.courses[found] == codes, found, -1)
+
+    # -------------------------------------------------------------------------
+    # Scenarios | السيناريوهات
+    # -------------------------------------------------------------------------
+
+    def gpa(self) -> float:
+        """Current cumulative GPA | المعدل التراكمي الحالي"""
+        return float(self._gpa(self.total_quality, self.total_credits))
+
+    def drop(self, scenarios: Any) -> 'np.ndarray':
+        """
+        GPA after removing courses from the transcript | المعدل بعد حذف مقررات
+
+        Args:
+            scenarios: Boolean matrix (scenarios x courses on the transcript,
+                       in self.courses order) or a list of code lists
+                       مصفوفة منطقية أو قائمة مجموعات رموز
+
+        Returns:
+            GPA per scenario | المعدل لكل سيناريو
+        """
+        matrix = self._scenario_matrix(scenarios)
+        return self._gpa(
+            self.total_quality - matrix @ self.course_quality,
+            self.total_credits - matrix @ self.course_credits,
+        )
+
+    def drop_each(self) -> 'np.ndarray':
+        """GPA after dropping each transcript course alone | المعدل بعد حذف كل مقرر"""
+        return self._gpa(self.total_quality - self.course_quality, self.total_credits - self.course_credits)
+
+    def _scenario_matrix(self, scenarios: Any) -> 'np.ndarray':
+        if isinstance(scenarios, np.ndarray) and scenarios.dtype == bool:
+            return scenarios.astype(float)
+        matrix = np.zeros((len(scenarios), len(self.courses)))
+        for row, codes in enumerate(scenarios):
+            positions = self._positions(list(codes))
+            matrix[row, positions[positions >= 0]] = 1.0
+        return matrix
+
+    def _columns(self, codes: Sequence[str], credits: Optional[Sequence[float]] = None
+                 ) -> Tuple[float, float, 'np.ndarray', 'np.ndarray']:
+        """
+        Baseline totals and per-column terms for new attempts
+        المجاميع الأساسية وحدود كل عمود للمحاولات الجديدة
+
+        A code already on the transcript is a retake: under 'latest' its
+        counted attempt leaves the baseline; under 'best' it also sets a
+        floor on the new points; under 'all' the new attempt adds on.
+
+        Returns:
+            (baseline quality, baseline credits, column credits, points floor)
+        """
+        positions = self._positions(codes)
+        if credits is None:
+            # Credits of the latest attempt, else the default | ساعات آخر محاولة أو الافتراضي
+            credits = np.full(len(codes), float(DEFAULT_CREDITS))
+            for column, position in enumerate(positions):
+                if position >= 0:
+                    credits[column] = self.credits[self.course_of == position][-1]
+        credits = np.asarray(credits, dtype=float)
+        floor = np.full(len(codes), -np.inf)
+
+        quality, total = self.total_quality, self.total_credits
+        retaken = positions[positions >= 0]
+        if self.rule != 'all' and len(retaken):
+            quality -= float(self.course_quality[retaken].sum())
+            total -= float(self.course_credits[retaken].sum())
+            if self.rule == 'best':
+                existing = self._gpa(self.course_quality[retaken], self.course_credits[retaken])
+                floor[positions >= 0] = existing
+        return quality, total, credits, floor
+
+    def project(self, codes: Sequence[str], points: Any,
+                credits: Optional[Sequence[float]] = None) -> 'np.ndarray':
+        """
+        GPA for grade outcomes of upcoming or retaken courses
+        المعدل لنتائج متوقعة لمقررات قادمة أو معادة
+
+        Args:
+            codes: Courses taken next (retakes if already on the transcript)
+                   المقررات القادمة
+            points: Grade points, shape (scenarios, len(codes)) or (len(codes),)
+                    نقاط الدرجة لكل سيناريو
+            credits: Credits per course (default: transcript or 3) | الساعات
+
+        Returns:
+            GPA per scenario | المعدل لكل سيناريو
+        """
+        quality, total, credits, floor = self._columns(codes, credits)
+        points = np.maximum(np.atleast_2d(np.asarray(points, dtype=float)), floor)
+        return self._gpa(quality + points @ credits, total + credits.sum())
+
+    def retake(self, codes: Sequence[str], target_points: Sequence[float] = SCALE_POINTS) -> 'np.ndarray':
+        """
+        GPA for retaking each course at each target grade
+        المعدل عند إعادة كل مقرر بكل درجة مستهدفة
+
+        Returns:
+            Matrix (courses x targets) | مصفوفة (المقررات × الدرجات)
+        """
+        targets = np.asarray(target_points, dtype=float)
+        result = np.empty((len(codes), len(targets)))
+        for row, code in enumerate(codes):
+            result[row] = self.project([code], targets[:, None])
+        return result
+
+    def monte_carlo(self, codes: Sequence[str], distributions: 'np.ndarray',
+                    samples: int = 10000, credits: Optional[Sequence[float]] = None,
+                    seed: Optional[int] = None) -> 'np.ndarray':
+        """
+        Sample projected GPAs | عينات المعدل المتوقع
+
+        Args:
+            codes: Upcoming or retaken courses | المقررات القادمة
+            distributions: Probabilities over SCALE_POINTS per course,
+                           shape (len(codes), len(SCALE_POINTS)) | توزيع الدرجات
+            samples: Number of draws | عدد العينات
+            credits: Credits per course | الساعات
+            seed: Random seed | بذرة العشوائية
+
+        Returns:
+            GPA per sample | المعدل لكل عينة
+        """
+        rng = np.random.default_rng(seed)
+        cdf = np.cumsum(np.asarray(distributions, dtype=float), axis=1)
+        cdf /= cdf[:, -1:]
+        # Inverse-CDF draw for every (sample, course) at once | السحب بمعكوس التوزيع التراكمي
+        draws = rng.random((samples, len(codes), 1))
+        band = np.minimum((draws > cdf[None]).sum(axis=2), len(SCALE_POINTS) - 1)
+        return self.project(codes, np.asarray(SCALE_POINTS)[band], credits=credits)
+
+
+# =============================================================================
+# GRADE DISTRIBUTIONS | توزيعات الدرجات
+# =============================================================================
+
+def grade_distributions(records: 'pd.DataFrame', codes: Sequence[str],
+                        student_id: Optional[str] = None, prior_weight: float = 5.0) -> 'np.ndarray':
+    """
+    Per-course probabilities over SCALE_POINTS from all records
+    احتمالات الدرجات لكل مقرر من جميع السجلات
+
+    Each course's histogram is smoothed with `prior_weight` pseudo-counts
+    shaped like the student's own grades (or everyone's, without a
+    student), so rare or new courses still get a sensible distribution.
+
+    Returns:
+        Matrix (len(codes), len(SCALE_POINTS)) | مصفوفة الاحتمالات
+    """
+    points = records['grade_points'].to_numpy(dtype=float)
+    points = np.where(np.isnan(points), mark_points(records['final_grade'].to_numpy(dtype=float)), points)
+    graded = ~np.isnan(points)
+    # Points above the top of the scale (grade_points has no CHECK) land in the top band
+    # النقاط فوق أعلى السلم تحسب في أعلى فئة
+    band = np.minimum(np.searchsorted(SCALE_POINTS, points[graded]), len(SCALE_POINTS) - 1)
+    frame = pd.DataFrame({
+        'student_id': records['student_id'].to_numpy()[graded],
+        'course_code': records['course_code'].to_numpy()[graded],
+        'band': band,
+    })
+
+    bands = len(SCALE_POINTS)
+    own = frame[frame['student_id'] == str(student_id)] if student_id is not None else frame
+    prior = np.bincount((own if len(own) else frame)['band'], minlength=bands).astype(float) + 1.0
+    prior = prior_weight * prior / prior.sum()
+
+    mine = frame[frame['course_code'].isin(codes)]
+    counts = pd.crosstab(mine['course_code'], mine['band']).reindex(
+        index=list(codes), columns=range(bands), fill_value=0
+    ).to_numpy(dtype=float)
+    smoothed = counts + prior
+    return smoothed / smoothed.sum(axis=1, keepdims=True)
+
+
+# =============================================================================
+# MAIN ENTRY POINT | نقطة الدخول الرئيسية
+# =============================================================================
+
+def add_arguments(parser: Any) -> None:
+    """
+    Add simulator arguments to a parser | إضافة وسائط المحاكي
+    """
+    parser.add_argument(
+        '--records', required=True,
+        help="student_academic_records CSV/Excel or 'supabase' | مصدر السجلات الأكاديمية"
+    )
+    parser.add_argument('--student', required=True, help='Student number | الرقم الجامعي')
+    parser.add_argument(
+        '--rule', choices=RETAKE_RULES, default='latest',
+        help='Which attempts of a repeated course count (default: latest) | قاعدة الإعادة'
+    )
+    parser.add_argument('--drop', nargs='+', help='Courses to drop, each alone and together | مقررات للحذف')
+    parser.add_argument('--retake', nargs='+', help='Courses to retake | مقررات للإعادة')
+    parser.add_argument(
+        '--courses', nargs='+',
+        help='Upcoming courses as CODE or CODE:CREDITS for projection | المقررات القادمة'
+    )
+    parser.add_argument('--samples', type=int, default=10000, help='Monte Carlo samples (default: 10000) | عدد العينات')
+    parser.add_argument('--target-gpa', type=float, default=2.0, help='GPA threshold to report (default: 2.0) | المعدل المستهدف')
+    parser.add_argument('--seed', type=int, help='Random seed | بذرة العشوائية')
+
+
+def _parse_courses(items: Sequence[str]) -> Tuple[List[str], Optional[List[float]]]:
+    codes, credits = [], []
+    for item in items:
+        code, _, value = item.partition(':')
+        codes.append(code)
+        credits.append(float(value) if value else None)
+    if all(c is None for c in credits):
+        return codes, None
+    return codes, [c if c is not None else DEFAULT_CREDITS for c in credits]
+
+
+def run_command(args: Any, settings: Settings, clients: Optional[Clients] = None) -> int:
+    """
+    Run what-if scenarios from parsed arguments | تشغيل السيناريوهات من الوسائط
+
+    Returns:
+        Process exit code | رمز الخروج
+    """
+    client = None
+    if args.records == 'supabase':
+        settings.require('supabase_url', 'supabase_key')
+        client = (clients or Clients(settings)).supabase
+    records = load_records(args.records, client=client)
+    simulator = AcademicSimulator.from_records(records, args.student, rule=args.rule)
+    if not len(simulator.codes):
+        logger.error(f"No graded records for student {args.student} | لا توجد سجلات للطالب")
+        return 1
+
+    current = simulator.gpa()
+    result: Dict[str, Any] = {
+        'student_id': args.student,
+        'rule': args.rule,
+        'gpa': round(current, 2),
+        'credits': simulator.total_credits,
+    }
+
+    if args.drop:
+        each = simulator.drop([[code] for code in args.drop] + [args.drop])
+        result['drop'] = {
+            **{code: round(float(gpa - current), 3) for code, gpa in zip(args.drop, each)},
+            'all': round(float(each[-1] - current), 3),
+        }
+
+    if args.retake:
+        table = simulator.retake(args.retake)
+        result['retake'] = {
+            code: {str(points): round(float(gpa), 2) for points, gpa in zip(SCALE_POINTS, row)}
+            for code, row in zip(args.retake, table)
+        }
+
+    if args.courses:
+        codes, credits = _parse_courses(args.courses)
+        distributions = grade_distributions(records, codes, student_id=args.student)
+        gpas = simulator.monte_carlo(codes, distributions, samples=args.samples, credits=credits, seed=args.seed)
+        p5, p50, p95 = np.percentile(gpas, [5, 50, 95])
+        result['projection'] = {
+            'courses': codes,
+            'samples': args.samples,
+            'mean': round(float(gpas.mean()), 3),
+            'p5': round(float(p5), 3),
+            'median': round(float(p50), 3),
+            'p95': round(float(p95), 3),
+            f'p_gpa_at_least_{args.target_gpa}': round(float((gpas >= args.target_gpa).mean()), 3),
+        }
+
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    return 0
+
+
+def main():
+    """
+    Main entry point | نقطة الدخول الرئيسية
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='IntelliPath what-if academic simulator | محاكي ماذا لو الأكاديمي'
+    )
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    setup_logging(level=logging.WARNING)
+    try:
+        sys.exit(run_command(args, load_settings()))
+    except (SettingsError, ImportError, ValueError) as e:
+        logger.error(str(e))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=============================================================================
+IntelliPath - Array Helpers
+المرشد الأكاديمي الذكي - أدوات المصفوفات
+=============================================================================
+Small vectorized numpy helpers shared by the sparse scoring jobs
+(peer matching, course similarity).
+أدوات numpy مشتركة بين مهام الحساب المتناثر.
+=============================================================================
+Version: 1.0.0 | الإصدار: 1.0.0
+Last Updated: 2026-10-19 | آخر تحديث: 2026-10-19
+=============================================================================
+"""
+
+from settings import lazy_import
+
+np = lazy_import('numpy')
+
+
+def concat_ranges(starts: 'np.ndarray', stops: 'np.ndarray') -> 'np.ndarray':
+    """
+    Concatenated arange(start, stop) for each pair without a Python loop
+    دمج النطاقات arange(start, stop) لكل زوج دون حلقة
+
+    Used to gather the CSR/CSC slices of many rows or columns at once.
+
+    Args:
+        starts: Range starts | بدايات النطاقات
+        stops: Range ends (exclusive) | نهايات النطاقات
+
+    Returns:
+        All positions of all ranges, in order | جميع المواقع بالترتيب
+    """
+    lengths = stops - starts
+    offsets = np.repeat(starts - np.concatenate(([0], np.cumsum(lengths)[:-1])), lengths)
+    return offsets + np.arange(lengths.sum())
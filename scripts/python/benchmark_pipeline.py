@@ -0,0 +1,727 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=============================================================================
+IntelliPath - End-to-End Pipeline Benchmark
+المرشد الأكاديمي الذكي - قياس أداء خط المعالجة الكامل
+=============================================================================
+Times CourseSeeder, GraphSync and VectorEmbeddingGenerator against in-process
+stand-ins: a PostgREST-like fake for the Supabase client (capped at 1000
+rows per request, like PostgREST's max-rows), a recording Neo4j driver that
+counts round-trips and transactions, an in-memory Qdrant and a
+deterministic embedding stub with configurable latency. Synthetic catalogs
+from 100 to 100k courses are generated per run; throughput, round-trips and
+peak memory are reported per stage as JSON.
+
+The 'resync' stage runs GraphSync against a graph seeded with existing
+nodes and edges (stale hashes plus a few removed keys), so the diff and
+delete path is exercised; a sync that deletes more than the removed keys
+(e.g. a truncated Supabase read) is reported as an error.
+
+This is a standalone command rather than a pytest-benchmark or asv suite:
+it needs no extra dev dependencies, and the numbers that matter here are
+request, round-trip and row counts from the fakes, which those tools do
+not report; timings alone would hide a batching regression.
+يقيس أداء أدوات التعبئة والمزامنة والتضمين مقابل بدائل داخل العملية
+ويبلغ عن الإنتاجية وعدد الرحلات وذروة الذاكرة لكل مرحلة.
+=============================================================================
+Version: 1.0.0 | الإصدار: 1.0.0
+Last Updated: 2026-10-19 | آخر تحديث: 2026-10-19
+=============================================================================
+"""
+
+import re
+import sys
+import json
+import random
+import hashlib
+import logging
+import tempfile
+import tracemalloc
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+import seed_courses
+import graph_sync
+from course_catalog import CatalogCourse, CourseCatalog
+from retrieval_eval import StubEmbeddings
+from settings import setup_logging
+from text_chunker import ChunkerConfig, TextChunker
+from vector_embedding_generator import EmbeddingConfig, VectorEmbeddingGenerator
+
+logger = logging.getLogger(__name__)
+
+STAGES = ('seed', 'graph', 'resync', 'chunk', 'embed')
+
+# Separators VectorEmbeddingGenerator gave LangChain's splitter before text_chunker
+# الفواصل التي كان يستخدمها المقسم السابق
+_LANGCHAIN_SEPARATORS = ["\n\n", "\n", ".", "!", "?", "،", "؟", "!", " ", ""]
+
+
+# =============================================================================
+# SUPABASE FAKE | بديل Supabase
+# =============================================================================
+
+# Embedded resource in a select: alias:table!fkey(columns) | مورد مضمن في الاستعلام
+_EMBED_RE = re.compile(r"(\w+):(\w+)(?:!(\w+))?\(([^)]*)\)")
+
+
+class FakeQuery:
+    """
+    Chainable PostgREST-style request against FakeSupabase tables
+    طلب متسلسل بأسلوب PostgREST على جداول البديل
+    """
+
+    def __init__(self, client: 'FakeSupabase', table: str):
+        self.client = client
+        self.table = table
+        self._columns = '*'
+        self._filters: List[Tuple[str, Any]] = []
+        self._after: Optional[Tuple[str, Any]] = None
+        self._order: Optional[str] = None
+        self._range: Optional[Tuple[int, int]] = None
+        self._write: Optional[Tuple[str, Any, Optional[str]]] = None
+
+    def select(self, columns: str = '*', **kwargs) -> 'FakeQuery':
+        self._columns = columns
+        return self
+
+    def eq(self, column: str, value: Any) -> 'FakeQuery':
+        self._filters.append((column, value))
+        return self
+
+    def gt(self, column: str, value: Any) -> 'FakeQuery':
+        self._after = (column, value)
+        return self
+
+    def order(self, column: str, **kwargs) -> 'FakeQuery':
+        self._order = column
+        return self
+
+    def limit(self, count: int) -> 'FakeQuery':
+        self._range = (0, count - 1)
+        return self
+
+    def range(self, start: int, end: int) -> 'FakeQuery':
+        self._range = (start, end)
+        return self
+
+    def upsert(self, data: Any, on_conflict: Optional[str] = None, **kwargs) -> 'FakeQuery':
+        self._write = ('upsert', data, on_conflict)
+        return self
+
+    def insert(self, data: Any, **kwargs) -> 'FakeQuery':
+        self._write = ('insert', data, None)
+        return self
+
+    def execute(self) -> SimpleNamespace:
+        self.client.requests += 1
+        if self._write:
+            data = self.client._write(self.table, *self._write)
+        else:
+            data = self.client._read(self.table, self._columns, self._filters, self._range,
+                                     self._after, self._order)
+        self.client.rows_transferred += len(data)
+        return SimpleNamespace(data=data, count=None)
+
+
+class FakeSupabase:
+    """
+    In-memory stand-in for supabase.Client; counts HTTP requests
+    بديل في الذاكرة لعميل Supabase يعد طلبات HTTP
+    """
+
+    def __init__(self, tables: Optional[Dict[str, List[Dict[str, Any]]]] = None, max_rows: int = 1000):
+        self.tables: Dict[str, List[Dict[str, Any]]] = {}
+        self.max_rows = max_rows  # PostgREST max-rows: rows per response | الحد الأقصى للصفوف
+        self._keys: Dict[Tuple[str, str], Dict[Tuple, int]] = {}
+        self._next_id = 0
+        self.requests = 0
+        self.rows_transferred = 0
+        for name, rows in (tables or {}).items():
+            self._write(name, 'insert', rows, None)
+        self.requests = self.rows_transferred = 0
+
+    def table(self, name: str) -> FakeQuery:
+        return FakeQuery(self, name)
+
+    def _write(self, table: str, mode: str, data: Any, on_conflict: Optional[str]) -> List[Dict[str, Any]]:
+        rows = self.tables.setdefault(table, [])
+        records = data if isinstance(data, list) else [data]
+        key_cols = tuple(c.strip() for c in on_conflict.split(',')) if on_conflict else None
+        index = self._keys.setdefault((table, on_conflict or ''), {})
+        if key_cols and not index and rows:
+            index.update({tuple(r.get(c) for c in key_cols): i for i, r in enumerate(rows)})
+        written = []
+        for record in records:
+            key = tuple(record.get(c) for c in key_cols) if key_cols else None
+            if key is not None and key in index:
+                rows[index[key]].update(record)
+                written.append(rows[index[key]])
+                continue
+            row = dict(record)
+            if 'id' not in row:
+                self._next_id += 1
+                row['id'] = f"{self._next_id:032x}"
+            if key is not None:
+                index[key] = len(rows)
+            rows.append(row)
+            written.append(row)
+        return [dict(r) for r in written]
+
+    def _read(self, table: str, columns: str, filters: List[Tuple[str, Any]],
+              window: Optional[Tuple[int, int]], after: Optional[Tuple[str, Any]] = None,
+              order: Optional[str] = None) -> List[Dict[str, Any]]:
+        rows = [r for r in self.tables.get(table, []) if all(r.get(c) == v for c, v in filters)]
+        if after:
+            rows = [r for r in rows if r[after[0]] > after[1]]
+        if order:
+            rows = sorted(rows, key=lambda r: r[order])
+        if window:
+            rows = rows[window[0]:window[1] + 1]
+        # Like PostgREST, never more than max-rows per response | لا أكثر من الحد لكل استجابة
+        rows = rows[:self.max_rows]
+
+        embeds = _EMBED_RE.findall(columns)
+        plain = [c.strip() for c in _EMBED_RE.sub('', columns).split(',') if c.strip()]
+        lookups = {}
+        for alias, target, fkey, target_cols in embeds:
+            by_id = {r['id']: r for r in self.tables.get(target, [])}
+            if fkey:
+                fk_col = fkey[len(table) + 1:-len('_fkey')] if fkey.startswith(table) else f"{alias}_id"
+            else:
+                fk_col = f"{alias}_id" if rows and f"{alias}_id" in rows[0] else f"{target[:-1]}_id"
+            lookups[alias] = (fk_col, by_id, [c.strip() for c in target_cols.split(',')])
+
+        result = []
+        for row in rows:
+            out = dict(row) if '*' in plain else {c: row.get(c) for c in plain}
+            for alias, (fk_col, by_id, target_cols) in lookups.items():
+                target_row = by_id.get(row.get(fk_col))
+                out[alias] = {c: target_row.get(c) for c in target_cols} if target_row else None
+            result.append(out)
+        return result
+
+
+# =============================================================================
+# NEO4J FAKE | بديل Neo4j
+# =============================================================================
+
+class FakeResult:
+    """Result of a recorded query | نتيجة استعلام مسجل"""
+
+    _RECORD = {'test': 1, 'node_id': '4:fake:0', 'rel_type': 'FAKE', 'code': None, 'depth': 0, 'generation': 0}
+
+    def __init__(self, rows: Optional[List[Dict[str, Any]]] = None, raw: bool = False):
+        self._rows = rows
+        self._raw = raw  # Rows are the records themselves | الصفوف هي السجلات
+
+    def _records(self) -> List[Dict[str, Any]]:
+        if self._raw:
+            return list(self._rows)
+        # One record per UNWIND row, each counting itself | سجل لكل صف
+        if self._rows is None:
+            return [self._RECORD]
+        return [dict(self._RECORD, code=row.get('code') if isinstance(row, dict) else row, written=1)
+                for row in self._rows]
+
+    def single(self) -> Dict[str, Any]:
+        return self._records()[0]
+
+    def consume(self) -> None:
+        return None
+
+    def data(self) -> List[Dict[str, Any]]:
+        return self._records()
+
+    def __iter__(self):
+        return iter(self._records())
+
+
+class RecordingTransaction:
+    """Managed transaction handed to units of work | معاملة مدارة"""
+
+    def __init__(self, driver: 'RecordingDriver'):
+        self.driver = driver
+
+    def run(self, query: str, parameters: Optional[Dict[str, Any]] = None, **kwargs) -> FakeResult:
+        return self.driver._record(query, parameters or kwargs)
+
+
+class RecordingSession:
+    """Session that records every round-trip | جلسة تسجل كل رحلة"""
+
+    def __init__(self, driver: 'RecordingDriver'):
+        self.driver = driver
+
+    def __enter__(self) -> 'RecordingSession':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def run(self, query: str, parameters: Optional[Dict[str, Any]] = None, **kwargs) -> FakeResult:
+        # Auto-commit: one round-trip, one transaction | رحلة واحدة ومعاملة واحدة
+        self.driver.transactions += 1
+        return self.driver._record(query, parameters or kwargs)
+
+    def execute_write(self, work: Callable, *args, **kwargs) -> Any:
+        self.driver.transactions += 1
+        return work(RecordingTransaction(self.driver), *args, **kwargs)
+
+    execute_read = execute_write
+
+    def close(self) -> None:
+        return None
+
+
+# Relationship type, else first node label of a hash lookup | نوع العلاقة أو التسمية
+_REL_TYPE_RE = re.compile(r"\[r:(\w+)")
+_NODE_LABEL_RE = re.compile(r"MATCH \(\w+:(\w+)")
+
+
+class RecordingDriver:
+    """
+    Stand-in for neo4j.Driver counting round-trips, transactions and rows
+    بديل برنامج تشغيل Neo4j يعد الرحلات والمعاملات والصفوف
+    """
+
+    def __init__(self, existing: Optional[Dict[str, List[Dict[str, Any]]]] = None):
+        """
+        Args:
+            existing: Hash-lookup records per label or relationship type,
+                      e.g. {'Course': [{'key': code, 'hash': ...}]}; empty
+                      means a first load | السجلات الموجودة لكل نوع
+        """
+        self.round_trips = 0
+        self.transactions = 0
+        self.rows_sent = 0
+        self.rows_deleted = 0
+        self.queries: Dict[str, int] = {}
+        self.existing = existing or {}
+
+    def _record(self, query: str, parameters: Dict[str, Any]) -> FakeResult:
+        self.round_trips += 1
+        key = ' '.join(query.split())[:60]
+        self.queries[key] = self.queries.get(key, 0) + 1
+        batch = next((v for v in parameters.values() if isinstance(v, list)), None)
+        self.rows_sent += len(batch) if batch is not None else 1
+        if 'sync_hash AS hash' in query:
+            # Hash lookups return the seeded graph state | البحث يعيد حالة الرسم المزروعة
+            match = _REL_TYPE_RE.search(query) or _NODE_LABEL_RE.search(query)
+            kind = match.group(1) if match else None
+            return FakeResult(self.existing.get(kind, []), raw=True)
+        if 'DELETE' in query and batch is not None:
+            self.rows_deleted += len(batch)
+        return FakeResult(batch)
+
+    def session(self, **kwargs) -> RecordingSession:
+        return RecordingSession(self)
+
+    def verify_connectivity(self) -> None:
+        return None
+
+    def close(self) -> None:
+        return None
+
+
+class HashEmbeddings(StubEmbeddings):
+    """
+    Stub embedder whose cost is only its simulated latency: each vector is
+    drawn from a generator seeded by the text hash
+    مضمن بديل تكلفته زمن الاستجابة المحاكى فقط
+    """
+
+    def embed(self, text: str, dim: int) -> List[float]:
+        digest = hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest()
+        seed = int.from_bytes(digest, 'little')
+        vector = np.random.default_rng(seed).standard_normal(dim, dtype=np.float32)
+        return (vector / np.linalg.norm(vector)).tolist()
+
+
+class CountingProxy:
+    """Wrap a client and count calls per method | تغليف عميل وعد استدعاءاته"""
+
+    def __init__(self, target: Any):
+        self._target = target
+        self.calls: Dict[str, int] = {}
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._target, name)
+        if not callable(attr):
+            return attr
+
+        def counted(*args, **kwargs):
+            self.calls[name] = self.calls.get(name, 0) + 1
+            return attr(*args, **kwargs)
+        return counted
+
+
+# =============================================================================
+# SYNTHETIC CATALOG | الكتالوج الاصطناعي
+# =============================================================================
+
+_TOPICS_EN = ['Programming', 'Networks', 'Databases', 'Algorithms', 'Security', 'Learning',
+              'Systems', 'Graphics', 'Robotics', 'Signals', 'Control', 'Mathematics']
+_TOPICS_AR = ['البرمجة', 'الشبكات', 'قواعد البيانات', 'الخوارزميات', 'الأمن', 'التعلم',
+              'النظم', 'الرسوميات', 'الروبوت', 'الإشارات', 'التحكم', 'الرياضيات']
+_LEVELS_EN = ['Introduction to', 'Advanced', 'Applied', 'Principles of', 'Topics in']
+_LEVELS_AR = ['مقدمة في', 'متقدم في', 'تطبيقات', 'مبادئ', 'مواضيع في']
+_DEPARTMENTS = ['هندسة البرمجيات ونظم المعلومات', 'هندسة الذكاء الاصطناعي وعلوم البيانات',
+                'هندسة الاتصالات', 'هندسة التحكم والروبوت', 'أمن النظم والشبكات']
+
+
+@dataclass
+class SyntheticCatalog:
+    """
+    Generated courses plus related tables | مقررات مولدة مع الجداول المرتبطة
+    """
+    courses: List[Dict[str, Any]] = field(default_factory=list)
+    prerequisites: List[Tuple[str, str]] = field(default_factory=list)  # (course, prereq)
+
+
+def make_catalog(n: int, seed: int = 42) -> SyntheticCatalog:
+    """
+    Generate n courses with a prerequisite DAG | توليد مقررات مع رسم متطلبات لا دوري
+
+    Args:
+        n: Number of courses | عدد المقررات
+        seed: Random seed | البذرة
+    """
+    rng = random.Random(seed)
+    catalog = SyntheticCatalog()
+    by_year: Dict[int, List[str]] = {y: [] for y in range(1, 6)}
+    earlier: List[str] = []
+    for i in range(n):
+        year = 1 + i * 5 // n
+        if not by_year[year]:
+            # Prerequisites come from recent courses of earlier years | المتطلبات من سنوات سابقة
+            earlier = [c for y in range(1, year) for c in by_year[y][-200:]]
+        prefix = ''.join(chr(65 + (i // 26 ** k) % 26) for k in range(3, 0, -1))
+        code = f"{prefix}{year}{i % 1000:03d}"
+        t, lvl = rng.randrange(len(_TOPICS_EN)), rng.randrange(len(_LEVELS_EN))
+        catalog.courses.append({
+            'code': code,
+            'name': f"{_LEVELS_EN[lvl]} {_TOPICS_EN[t]} {i}",
+            'name_ar': f"{_LEVELS_AR[lvl]} {_TOPICS_AR[t]} {i}",
+            'description': f"This course covers {_TOPICS_EN[t].lower()} for year {year} students.",
+            'description_ar': f"يغطي هذا المقرر {_TOPICS_AR[t]} لطلاب السنة {year}.",
+            'credits': rng.choice([2, 3, 3, 4]),
+            'department': rng.choice(_DEPARTMENTS),
+            'year_level': year,
+            'is_active': True,
+        })
+        for prereq in rng.sample(earlier, min(len(earlier), rng.randint(0, 3))):
+            catalog.prerequisites.append((code, prereq))
+        by_year[year].append(code)
+    return catalog
+
+
+def _supabase_tables(catalog: SyntheticCatalog) -> Dict[str, List[Dict[str, Any]]]:
+    """Tables GraphSync reads | الجداول التي تقرؤها المزامنة"""
+    courses = [dict(c, id=f"c{i}") for i, c in enumerate(catalog.courses)]
+    ids = {c['code']: c['id'] for c in courses}
+    skills = [{'id': f"s{i}", 'name': f"Skill {i}", 'name_ar': f"مهارة {i}"}
+              for i in range(max(len(courses) // 10, 1))]
+    careers = [{'id': f"p{i}", 'name': f"Career {i}", 'name_ar': f"مسار {i}"} for i in range(20)]
+    return {
+        'courses': courses,
+        'course_prerequisites': [
+            {'course_id': ids[c], 'prerequisite_id': ids[p]} for c, p in catalog.prerequisites
+        ],
+        'majors': [{'id': f"m{i}", 'name': d} for i, d in enumerate(_DEPARTMENTS)],
+        'skills': skills,
+        'course_skills': [
+            {'course_id': c['id'], 'skill_id': skills[i % len(skills)]['id'], 'level': 'beginner'}
+            for i, c in enumerate(courses)
+        ],
+        'career_paths': careers,
+        'course_career_paths': [
+            {'course_id': c['id'], 'career_path_id': careers[i % 20]['id'], 'importance': 'core'}
+            for i, c in enumerate(courses)
+        ],
+    }
+
+
+# =============================================================================
+# MEASUREMENT | القياس
+# =============================================================================
+
+@contextmanager
+def measure(report: Dict[str, Any], items: int):
+    """
+    Record wall time, throughput and traced peak memory for a stage
+    تسجيل الزمن والإنتاجية وذروة الذاكرة لمرحلة
+    """
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    started = perf_counter()
+    yield report
+    elapsed = perf_counter() - started
+    report.update({
+        'items': items,
+        'seconds': round(elapsed, 4),
+        'items_per_sec': round(items / elapsed, 1) if elapsed else None,
+        'peak_mb': round((tracemalloc.get_traced_memory()[1] - base) / 1e6, 2),
+    })
+
+
+def bench_seed(catalog: SyntheticCatalog, batch_size: int) -> Dict[str, Any]:
+    """CourseSeeder.parse_courses + seed_courses | قياس أداة التعبئة"""
+    prereqs: Dict[str, List[str]] = {}
+    for course, prereq in catalog.prerequisites:
+        prereqs.setdefault(course, []).append(prereq)
+    df = pd.DataFrame([dict(c, prerequisites=', '.join(prereqs.get(c['code'], [])) or None)
+                       for c in catalog.courses])
+
+    fake = FakeSupabase()
+    seeder = seed_courses.CourseSeeder(seed_courses.SeederConfig(
+        supabase_url='http://fake', supabase_key='fake', input_file='synthetic.csv',
+        batch_size=batch_size
+    ), supabase=fake)
+
+    parse, write = {}, {}
+    with measure(parse, len(df)):
+        courses = seeder.parse_courses(df)
+    with measure(write, len(courses)):
+        seeder.seed_courses(courses)
+    write.update({'http_requests': fake.requests, 'rows_transferred': fake.rows_transferred,
+                  'errors': seeder.stats['errors']})
+    return {'parse': parse, 'write': write}
+
+
+def _existing_graph(catalog: SyntheticCatalog, removed: int) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Graph state of an earlier sync: every course and prerequisite with a
+    stale hash, plus `removed` of each that are gone from Supabase
+    حالة رسم سابقة: كل العناصر ببصمة قديمة مع عناصر محذوفة من المصدر
+    """
+    courses = [{'key': c['code'], 'hash': 'stale', 'node_id': f"4:fake:{i}"}
+               for i, c in enumerate(catalog.courses)]
+    courses += [{'key': f"GONE{i:05d}", 'hash': 'stale', 'node_id': f"4:gone:{i}"} for i in range(removed)]
+    requires = [{'key': [c, p], 'hash': 'stale'} for c, p in catalog.prerequisites]
+    requires += [{'key': [f"GONE{i:05d}", catalog.courses[0]['code']], 'hash': 'stale'} for i in range(removed)]
+    return {'Course': courses, 'REQUIRES': requires}
+
+
+def bench_graph(catalog: SyntheticCatalog, removed: Optional[int] = None) -> Dict[str, Any]:
+    """
+    GraphSync.run against the fakes | قياس المزامنة
+
+    Args:
+        catalog: Synthetic catalog | الكتالوج
+        removed: Seed an existing graph with this many deleted courses and
+                 prerequisites (None: empty graph) | عدد العناصر المحذوفة
+    """
+    fake = FakeSupabase(_supabase_tables(catalog))
+    driver = RecordingDriver(_existing_graph(catalog, removed) if removed is not None else None)
+    syncer = graph_sync.GraphSync(graph_sync.SyncConfig(
+        supabase_url='http://fake', supabase_key='fake',
+        neo4j_uri='bolt://fake', neo4j_user='neo4j', neo4j_password='fake'
+    ), supabase=fake, driver=driver)
+    report: Dict[str, Any] = {}
+    with measure(report, len(catalog.courses)):
+        syncer.run()
+    report.update({
+        'http_requests': fake.requests,
+        'rows_transferred': fake.rows_transferred,
+        'neo4j_round_trips': driver.round_trips,
+        'neo4j_transactions': driver.transactions,
+        'neo4j_rows_sent': driver.rows_sent,
+        'neo4j_rows_deleted': driver.rows_deleted,
+        'errors': syncer.stats['errors'],
+    })
+    if removed is not None:
+        # Deleted courses take their edges with them; only the seeded ones may go
+        # لا يحذف إلا ما زرع كمحذوف
+        expected = 2 * removed
+        report['expected_deletes'] = expected
+        if driver.rows_deleted != expected:
+            logger.error(f"Resync deleted {driver.rows_deleted} rows, expected {expected} | حذف غير متوقع")
+            report['errors'] += 1
+    return report
+
+
+def _catalog_text(courses: List[Dict[str, Any]]) -> str:
+    """Course entries as the plain-text documents the embed stage loads | نص الكتالوج"""
+    return '\n'.join(
+        f"{c['code']} {c['name']} | {c['name_ar']}\n{c['description']}\n{c['description_ar']}\n"
+        for c in courses
+    )
+
+
+def bench_chunk(catalog: SyntheticCatalog, chunk_size: int = 1000,
+                chunk_overlap: int = 200) -> Dict[str, Any]:
+    """
+    TextChunker.split_text, against LangChain's RecursiveCharacterTextSplitter
+    with the previous settings when langchain-text-splitters is installed
+    قياس المقسم مقارنة بمقسم LangChain السابق إن كان مثبتاً
+    """
+    text = _catalog_text(catalog.courses)
+    chunker = TextChunker(ChunkerConfig(chunk_size=chunk_size, chunk_overlap=chunk_overlap))
+    report: Dict[str, Any] = {}
+    with measure(report, len(catalog.courses)):
+        chunks = chunker.split_text(text)
+    report.update({
+        'chars': len(text),
+        'chunks': len(chunks),
+        'max_chunk_chars': max(map(len, chunks), default=0),
+        'errors': sum(1 for c in chunks if len(c) > chunk_size),
+    })
+
+    try:
+        from langchain_text_splitters import RecursiveCharacterTextSplitter
+    except ImportError:
+        report['baseline'] = None
+        return report
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size, chunk_overlap=chunk_overlap,
+        length_function=len, separators=_LANGCHAIN_SEPARATORS
+    )
+    baseline: Dict[str, Any] = {}
+    with measure(baseline, len(catalog.courses)):
+        baseline['chunks'] = len(splitter.split_text(text))
+    report['baseline'] = baseline
+    if report['seconds']:
+        report['speedup'] = round(baseline['seconds'] / report['seconds'], 1)
+    return report
+
+
+def bench_embed(catalog: SyntheticCatalog, dimensions: int, latency: float,
+                batch_size: int, workdir: Path) -> Dict[str, Any]:
+    """VectorEmbeddingGenerator.process_directory | قياس مولد التضمينات"""
+    from qdrant_client import QdrantClient
+
+    docs = workdir / 'docs'
+    docs.mkdir()
+    per_file = 200
+    for start in range(0, len(catalog.courses), per_file):
+        text = _catalog_text(catalog.courses[start:start + per_file])
+        (docs / f"catalog_{start // per_file:05d}.txt").write_text(text, encoding='utf-8')
+
+    stub = SimpleNamespace(embeddings=HashEmbeddings(dimensions, latency))
+    generator = VectorEmbeddingGenerator(EmbeddingConfig(
+        openai_api_key='benchmark', vector_size=dimensions, batch_size=batch_size,
+        page_cache_path=None, journal_path=str(workdir / 'journal.sqlite'), catalog_source=None
+    ), openai_client=stub)
+    generator.qdrant = CountingProxy(QdrantClient(":memory:"))
+    generator.catalog = CourseCatalog(courses={
+        c['code']: CatalogCourse(code=c['code'], name=c['name'], name_ar=c['name_ar'],
+                                 year_level=c['year_level'], department=c['department'])
+        for c in catalog.courses
+    })
+
+    report: Dict[str, Any] = {}
+    with measure(report, len(catalog.courses)):
+        stats = generator.process_directory(str(docs))
+    report.update({
+        'chunks': stats['chunks_created'],
+        'embedding_requests': stub.embeddings.calls,
+        'qdrant_calls': dict(generator.qdrant.calls),
+        'vectors_uploaded': stats['vectors_uploaded'],
+        'errors': stats['errors'],
+    })
+    return report
+
+
+def run_benchmarks(sizes: List[int], stages: List[str], dimensions: int = 256,
+                   latency: float = 0.0, batch_size: int = 100, seed: int = 42) -> Dict[str, Any]:
+    """
+    Run the selected stages for each catalog size | تشغيل المراحل لكل حجم
+
+    Returns:
+        {size: {stage: metrics}} | المقاييس لكل حجم ومرحلة
+    """
+    results: Dict[str, Any] = {}
+    tracemalloc.start()
+    try:
+        for size in sizes:
+            catalog = make_catalog(size, seed)
+            logger.warning(f"Benchmarking {size} courses ({len(catalog.prerequisites)} prerequisites)")
+            row: Dict[str, Any] = {'prerequisites': len(catalog.prerequisites)}
+            if 'seed' in stages:
+                row['seed'] = bench_seed(catalog, batch_size)
+            if 'graph' in stages:
+                row['graph'] = bench_graph(catalog)
+            if 'resync' in stages:
+                row['resync'] = bench_graph(catalog, removed=max(size // 100, 1))
+            if 'chunk' in stages:
+                row['chunk'] = bench_chunk(catalog)
+            if 'embed' in stages:
+                with tempfile.TemporaryDirectory(prefix='intellipath-bench-') as tmp:
+                    row['embed'] = bench_embed(catalog, dimensions, latency, batch_size, Path(tmp))
+            results[str(size)] = row
+    finally:
+        tracemalloc.stop()
+    return {
+        'settings': {'dimensions': dimensions, 'embedding_latency_s': latency,
+                     'batch_size': batch_size, 'seed': seed},
+        'results': results,
+    }
+
+
+# =============================================================================
+# MAIN ENTRY POINT | نقطة الدخول الرئيسية
+# =============================================================================
+
+def main():
+    """
+    Main entry point | نقطة الدخول الرئيسية
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='IntelliPath pipeline benchmark | قياس أداء خط المعالجة'
+    )
+    parser.add_argument(
+        '--sizes',
+        type=int,
+        nargs='+',
+        default=[100, 1000, 10000],
+        help='Catalog sizes in courses (up to 100000) | أحجام الكتالوج'
+    )
+    parser.add_argument(
+        '--stages',
+        nargs='+',
+        choices=STAGES,
+        default=list(STAGES),
+        help='Stages to run | المراحل'
+    )
+    parser.add_argument('--dimensions', type=int, default=256, help='Stub embedding size | بعد التضمين')
+    parser.add_argument(
+        '--embed-latency',
+        type=float,
+        default=0.0,
+        help='Simulated seconds per embedding request | زمن طلب التضمين المحاكى'
+    )
+    parser.add_argument('--batch-size', type=int, default=100, help='Batch size | حجم الدفعة')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed | البذرة')
+    parser.add_argument('--output', help='Write the JSON report here | ملف التقرير')
+    parser.add_argument('--verbose', action='store_true', help='Keep pipeline INFO logs | إظهار السجلات')
+
+    args = parser.parse_args()
+
+    # Per-batch INFO logs would dominate the timings | سجلات الدفعات تشوه القياس
+    setup_logging(level=logging.INFO if args.verbose else logging.WARNING)
+
+    report = run_benchmarks(args.sizes, args.stages, dimensions=args.dimensions,
+                            latency=args.embed_latency, batch_size=args.batch_size, seed=args.seed)
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+        logger.warning(f"Report written to {args.output} | تمت كتابة التقرير")
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=============================================================================
+IntelliPath - Course/Career Relevance
+المرشد الأكاديمي الذكي - صلة المقررات بالمسارات المهنية
+=============================================================================
+Precomputes a course x career relevance matrix from the knowledge graph,
+so career recommendations read one array instead of running multi-hop
+Cypher at query time.
+
+- The graph is courses, skills, topics and careers joined by
+  LEADS_TO_CAREER / PREPARES_FOR, TEACHES_SKILL / TEACHES, COVERS_TOPIC
+  and IS_PREREQUISITE_FOR edges, each with a weight, walked both ways.
+- Relevance is personalized PageRank restarted at each career: a course
+  scores high when it leads to the career directly, shares skills and
+  topics with courses that do, or is a prerequisite on their chains.
+  All careers are propagated together as one (nodes x careers) matrix.
+- Scores are scaled to 0-1 per career and saved as a float16 .npz
+  artifact; optionally written to Neo4j as parallel array properties
+  on Course and CareerPath nodes.
+يحسب مصفوفة صلة المقررات بالمسارات المهنية مسبقاً بانتشار PageRank
+الشخصي عبر المهارات والموضوعات وسلاسل المتطلبات.
+=============================================================================
+Version: 1.0.0 | الإصدار: 1.0.0
+Last Updated: 2026-10-19 | آخر تحديث: 2026-10-19
+=============================================================================
+"""
+
+import sys
+import json
+import hashlib
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from course_catalog import DEFAULT_KNOWLEDGE_GRAPH, CourseCatalog, load_catalog
+from graph_export import _live
+from graph_sync import ACTIVE_GENERATION_QUERY
+from instrumentation import Instrumentation, add_instrumentation_arguments, instrumented_run
+from settings import Clients, Settings, SettingsError, lazy_import, load_settings, setup_logging
+
+np = lazy_import('numpy')
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OUTPUT = DEFAULT_KNOWLEDGE_GRAPH.with_name('career_relevance.npz')
+
+# Relationship -> kind of its target node (sources are courses)
+# نوع العقدة الهدف لكل علاقة (المصدر مقرر دائماً)
+RELATION_TARGETS = {
+    'LEADS_TO_CAREER': 'career',  # Export / edge-function schema | مخطط التصدير
+    'PREPARES_FOR': 'career',  # graph_sync schema | مخطط المزامنة
+    'TEACHES_SKILL': 'skill',
+    'TEACHES': 'skill',
+    'COVERS_TOPIC': 'topic',
+    'IS_PREREQUISITE_FOR': 'course',
+}
+
+
+# =============================================================================
+# CONFIGURATION | الإعدادات
+# =============================================================================
+
+@dataclass
+class RelevanceConfig:
+    """
+    Relevance propagation configuration | إعدادات انتشار الصلة
+    """
+    # Edge weights by relationship | أوزان العلاقات
+    weights: Dict[str, float] = field(default_factory=lambda: {
+        'LEADS_TO_CAREER': 1.0, 'PREPARES_FOR': 1.0,
+        'TEACHES_SKILL': 0.6, 'TEACHES': 0.6,
+        'COVERS_TOPIC': 0.4,
+        'IS_PREREQUISITE_FOR': 0.5,
+    })
+    restart: float = 0.25  # Walk restart probability | احتمال العودة إلى المسار
+    tolerance: float = 1e-6  # L1 change that stops iteration | حد التقارب
+    max_iterations: int = 100  # Iteration cap | الحد الأقصى للتكرارات
+    min_relevance: float = 0.01  # Scores below this are stored as 0 | أدنى صلة محفوظة
+    top: int = 20  # Entries per node written to Neo4j | العناصر لكل عقدة في Neo4j
+    batch_size: int = 500  # Nodes per Neo4j write | العقد لكل كتابة
+
+
+# =============================================================================
+# RELEVANCE MATRIX | مصفوفة الصلة
+# =============================================================================
+
+@dataclass
+class CareerRelevance:
+    """
+    Course x career relevance, 0-1 per career | صلة المقررات بالمسارات
+
+    A career-fit lookup is a row read (`careers_for`), a column read
+    (`courses_for`) or the mean of a student's rows (`fit`).
+    """
+    courses: 'np.ndarray'
+    careers: 'np.ndarray'
+    matrix: 'np.ndarray'
+    version: str = ''
+
+    def __post_init__(self):
+        self._course_row = {code: i for i, code in enumerate(self.courses.tolist())}
+        self._career_col = {name: j for j, name in enumerate(self.careers.tolist())}
+
+    def save(self, path: str) -> None:
+        """Write as compressed .npz (float16 scores) | حفظ المصفوفة"""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(
+            path, courses=self.courses, careers=self.careers,
+            matrix=self.matrix.astype(np.float16), version=np.array(self.version),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> 'CareerRelevance':
+        """Read a saved matrix | تحميل المصفوفة"""
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data['courses'], data['careers'], data['matrix'].astype(np.float32), str(data['version']))
+
+    @staticmethod
+    def _ranked(names: 'np.ndarray', scores: 'np.ndarray', limit: int) -> List[Tuple[str, float]]:
+        order = np.argsort(-scores, kind='stable')[:limit]
+        return [(str(names[i]), round(float(scores[i]), 4)) for i in order if scores[i] > 0]
+
+    def careers_for(self, course_code: str, limit: int = 10) -> List[Tuple[str, float]]:
+        """Most relevant careers for a course | أكثر المسارات صلة بالمقرر"""
+        row = self._course_row.get(course_code)
+        return [] if row is None else self._ranked(self.careers, self.matrix[row], limit)
+
+    def courses_for(self, career: str, limit: int = 10) -> List[Tuple[str, float]]:
+        """Most relevant courses for a career | أكثر المقررات صلة بالمسار"""
+        col = self._career_col.get(career)
+        return [] if col is None else self._ranked(self.courses, self.matrix[:, col], limit)
+
+    def fit(self, course_codes: Iterable[str]) -> Dict[str, float]:
+        """
+        Career fit of a set of completed courses | ملاءمة المسارات لمقررات منجزة
+
+        Mean relevance over the courses known to the matrix.
+        """
+        rows = [self._course_row[code] for code in course_codes if code in self._course_row]
+        if not rows:
+            return {}
+        scores = self.matrix[rows].mean(axis=0)
+        return dict(self._ranked(self.careers, scores, len(self.careers)))
+
+
+def _graph(catalog: CourseCatalog, config: RelevanceConfig) -> Tuple[List[str], 'np.ndarray', 'np.ndarray', 'np.ndarray']:
+    """
+    Nodes and weighted directed edge arrays, both directions of each edge
+    العقد وأطراف العلاقات الموزونة في الاتجاهين
+
+    Node keys are '<kind>:<name>' so a topic and a career sharing a name
+    stay distinct.
+    """
+    keys: Dict[str, int] = {}
+
+    def node(kind: str, name: str) -> int:
+        return keys.setdefault(f'{kind}:{name}', len(keys))
+
+    for code in catalog.courses:
+        node('course', code)
+    src, dst, weight = [], [], []
+    for edge_type, kind in RELATION_TARGETS.items():
+        w = config.weights.get(edge_type, 0.0)
+        if w <= 0:
+            continue
+        for source, target in sorted(set(catalog.edges.get(edge_type, []))):
+            src.append(node('course', source))
+            dst.append(node(kind, target))
+            weight.append(w)
+    src, dst = np.array(src, dtype=np.int64), np.array(dst, dtype=np.int64)
+    weight = np.array(weight, dtype=np.float64)
+    return (list(keys), np.concatenate((src, dst)), np.concatenate((dst, src)),
+            np.concatenate((weight, weight)))
+
+
+def compute_relevance(catalog: CourseCatalog, config: Optional[RelevanceConfig] = None,
+                      metrics: Optional[Instrumentation] = None) -> CareerRelevance:
+    """
+    Personalized PageRank from every career at once | PageRank شخصي لكل المسارات
+
+    Args:
+        catalog: Catalog with typed edges | الكتالوج مع العلاقات
+        config: Propagation configuration | الإعدادات
+        metrics: Instrumentation for stage timings | أداة القياس
+
+    Returns:
+        Course x career relevance | مصفوفة الصلة
+    """
+    config = config or RelevanceConfig()
+    metrics = metrics or Instrumentation('career_relevance')
+    keys, src, dst, weight = _graph(catalog, config)
+    kinds = np.array([key.split(':', 1)[0] for key in keys])
+    names = np.array([key.split(':', 1)[1] for key in keys])
+    course_nodes = np.flatnonzero(kinds == 'course')
+    career_nodes = np.flatnonzero(kinds == 'career')
+
+    version = hashlib.sha1(json.dumps([
+        sorted(config.weights.items()), config.restart, config.min_relevance,
+        keys, src.tolist(), dst.tolist(),
+    ]).encode()).hexdigest()[:12]
+    matrix = np.zeros((len(course_nodes), len(career_nodes)), dtype=np.float32)
+    if not len(career_nodes):
+        logger.warning("No course-career edges in the graph | لا توجد علاقات مقرر-مسار")
+        return CareerRelevance(names[course_nodes], names[career_nodes], matrix, version)
+
+    with metrics.span('propagate', items=len(career_nodes)):
+        # Row-stochastic walk: edge probability = weight / node's total weight,
+        # edges grouped by target so each step is one reduceat
+        # انتقال عشوائي موزون مجمّع حسب العقدة الهدف
+        out_weight = np.bincount(src, weights=weight, minlength=len(keys))
+        order = np.argsort(dst, kind='stable')
+        src, dst, step = src[order], dst[order], (weight / out_weight[src])[order]
+        targets, starts = np.unique(dst, return_index=True)
+
+        restart = np.zeros((len(keys), len(career_nodes)))
+        restart[career_nodes, np.arange(len(career_nodes))] = 1.0
+        scores = restart.copy()
+        iterations = 0
+        for iterations in range(1, config.max_iterations + 1):
+            spread = np.zeros_like(scores)
+            spread[targets] = np.add.reduceat(step[:, None] * scores[src], starts, axis=0)
+            updated = config.restart * restart + (1 - config.restart) * spread
+            change = np.abs(updated - scores).sum(axis=0).max()
+            scores = updated
+            if change < config.tolerance:
+                break
+        logger.info(f"Converged after {iterations} iterations | تقارب بعد {iterations} تكرار")
+
+    matrix = scores[course_nodes].astype(np.float32)
+    peak = matrix.max(axis=0)
+    matrix /= np.where(peak > 0, peak, 1)
+    matrix[matrix < config.min_relevance] = 0
+    return CareerRelevance(names[course_nodes], names[career_nodes], matrix, version)
+
+
+# =============================================================================
+# NEO4J | Neo4j
+# =============================================================================
+
+def write_neo4j(driver: Any, relevance: CareerRelevance, config: Optional[RelevanceConfig] = None,
+                database: Optional[str] = None,
+                metrics: Optional[Instrumentation] = None) -> Dict[str, int]:
+    """
+    Store the top entries as array properties on the live generation
+    تخزين أعلى القيم كخصائص مصفوفية في الجيل الحي
+
+    Course: career_relevance_careers / career_relevance_scores
+    CareerPath: career_relevance_courses / career_relevance_scores
+
+    Returns:
+        Nodes updated per label | العقد المحدثة لكل تصنيف
+    """
+    config = config or RelevanceConfig()
+    metrics = metrics or Instrumentation('career_relevance')
+    course_rows = [{
+        'key': code, 'names': [n for n, _ in ranked], 'scores': [s for _, s in ranked],
+    } for code in relevance.courses.tolist() for ranked in [relevance.careers_for(code, config.top)]]
+    career_rows = [{
+        'key': name, 'names': [n for n, _ in ranked], 'scores': [s for _, s in ranked],
+    } for name in relevance.careers.tolist() for ranked in [relevance.courses_for(name, config.top)]]
+
+    queries = {
+        'Course': f"""
+        UNWIND $rows AS row
+        MATCH (c:Course {{code: row.key}}) WHERE {_live('c')}
+        SET c.career_relevance_careers = row.names,
+            c.career_relevance_scores = row.scores,
+            c.career_relevance_version = $version
+        RETURN count(c) AS written
+        """,
+        'CareerPath': f"""
+        UNWIND $rows AS row
+        MATCH (cp:CareerPath {{name: row.key}}) WHERE {_live('cp')}
+        SET cp.career_relevance_courses = row.names,
+            cp.career_relevance_scores = row.scores,
+            cp.career_relevance_version = $version
+        RETURN count(cp) AS written
+        """,
+    }
+    written = {}
+    with driver.session(database=database) as session:
+        generation = session.run(ACTIVE_GENERATION_QUERY).single()['generation']
+        for label, rows in (('Course', course_rows), ('CareerPath', career_rows)):
+            written[label] = 0
+            for start in range(0, len(rows), config.batch_size):
+                batch = rows[start:start + config.batch_size]
+                with metrics.span('relevance.neo4j', items=len(batch)):
+                    record = session.execute_write(lambda tx: tx.run(
+                        queries[label], rows=batch, generation=generation, version=relevance.version
+                    ).single())
+                written[label] += record['written'] if record else 0
+    logger.info(f"Neo4j relevance written: {written} | تمت كتابة الصلة")
+    return written
+
+
+# =============================================================================
+# MAIN ENTRY POINT | نقطة الدخول الرئيسية
+# =============================================================================
+
+def add_arguments(parser: Any) -> None:
+    """
+    Add relevance arguments to a parser | إضافة وسائط حساب الصلة
+    """
+    parser.add_argument(
+        '--catalog',
+        help="Knowledge graph export (from `export`) or 'supabase' (default: bundled export) | مصدر الرسم"
+    )
+    parser.add_argument(
+        '--output', default=str(DEFAULT_OUTPUT),
+        help='Relevance artifact (default: public/data/career_relevance.npz) | ملف المصفوفة'
+    )
+    parser.add_argument('--course', help='Print the top careers for a course | المسارات الأقرب لمقرر')
+    parser.add_argument('--career', help='Print the top courses for a career | المقررات الأقرب لمسار')
+    parser.add_argument('--restart', type=float, default=0.25, help='Walk restart probability (default: 0.25) | احتمال العودة')
+    parser.add_argument('--top', type=int, default=20, help='Entries per node in Neo4j (default: 20) | العناصر لكل عقدة')
+    parser.add_argument('--neo4j', action='store_true', help='Write array properties to Neo4j | الكتابة إلى Neo4j')
+    parser.add_argument('--database', help='Neo4j database name | اسم قاعدة البيانات')
+    add_instrumentation_arguments(parser)
+
+
+def run_command(args: Any, settings: Settings, clients: Optional[Clients] = None) -> int:
+    """
+    Compute the relevance matrix from parsed arguments | حساب الصلة من الوسائط
+
+    Returns:
+        Process exit code | رمز الخروج
+    """
+    if args.neo4j:
+        settings.require('neo4j_uri', 'neo4j_password')
+    if args.catalog == 'supabase':
+        settings.require('supabase_url', 'supabase_key')
+    own_clients = clients is None
+    clients = clients or Clients(settings)
+    config = RelevanceConfig(restart=args.restart, top=args.top)
+
+    try:
+        with instrumented_run('career_relevance', args) as metrics:
+            with metrics.span('load'):
+                catalog = load_catalog(args.catalog, client=clients.supabase if args.catalog == 'supabase' else None)
+            relevance = compute_relevance(catalog, config, metrics)
+            if len(relevance.careers) == 0:
+                # Keep the previous artifact rather than replace it with an empty one
+                # الإبقاء على الملف السابق بدل استبداله بملف فارغ
+                logger.error("Catalog has no course-career edges; nothing saved | لا توجد علاقات بالمسارات المهنية")
+                return 1
+            relevance.save(args.output)
+
+            if args.course or args.career:
+                ranked = (relevance.careers_for(args.course, config.top) if args.course
+                          else relevance.courses_for(args.career, config.top))
+                print(json.dumps(dict(ranked), ensure_ascii=False, indent=2))
+                return 0
+
+            summary: Dict[str, Any] = {
+                'courses': len(relevance.courses),
+                'careers': len(relevance.careers),
+                'nonzero': int(np.count_nonzero(relevance.matrix)),
+                'version': relevance.version,
+                'output': args.output,
+            }
+            if args.neo4j:
+                summary['neo4j'] = write_neo4j(clients.neo4j, relevance, config,
+                                               args.database or settings.neo4j_database, metrics)
+            metrics.result.update(summary)
+    finally:
+        if own_clients:
+            clients.close()
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+    return 0
+
+
+def main():
+    """
+    Main entry point | نقطة الدخول الرئيسية
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='IntelliPath course/career relevance | صلة المقررات بالمسارات المهنية'
+    )
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    setup_logging('career_relevance.log')
+    try:
+        sys.exit(run_command(args, load_settings()))
+    except (SettingsError, ImportError, ValueError) as e:
+        logger.error(str(e))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
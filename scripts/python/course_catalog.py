@@ -0,0 +1,469 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=============================================================================
+IntelliPath - Course Catalog
+المرشد الأكاديمي الذكي - كتالوج المقررات
+=============================================================================
+In-memory course catalog shared by the Python tooling. Loads courses and
+graph edges from the Neo4j export (public/data/knowledge_graph.json) or from
+the Supabase `courses`/`course_prerequisites` tables, and enriches document
+chunks with the majors, course codes and year levels they mention.
+كتالوج مقررات في الذاكرة يُحمّل من تصدير Neo4j أو من جداول Supabase،
+ويثري قطع المستندات بالتخصصات ورموز المقررات والسنوات المذكورة فيها.
+=============================================================================
+Version: 1.0.0 | الإصدار: 1.0.0
+Last Updated: 2026-10-19 | آخر تحديث: 2026-10-19
+=============================================================================
+"""
+
+import re
+import json
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from dataclasses import dataclass, field
+from collections import Counter, defaultdict
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Default export location relative to the repository root
+# موقع التصدير الافتراضي بالنسبة لجذر المستودع
+DEFAULT_KNOWLEDGE_GRAPH = Path(__file__).resolve().parents[2] / 'public' / 'data' / 'knowledge_graph.json'
+
+# Study-plan file prefixes (public/data/plans) -> major
+# بادئات ملفات الخطط الدراسية -> التخصص
+PLAN_PREFIX_MAJORS = {
+    'AI': 'هندسة الذكاء الصنعي وعلوم البيانات',
+    'IS': 'هندسة البرمجيات ونظم المعلومات',
+    'SS': 'هندسة أمن النظم والشبكات الحاسوبية',
+    'COM': 'هندسة الاتصالات',
+    'CR': 'هندسة التحكم والروبوت',
+}
+
+# Course code shapes: CIFC.1.01 (SPU plans) or CS301 / IT-210
+# أشكال رموز المقررات
+COURSE_CODE_RE = re.compile(r"\b([A-Z]{2,5}(?:\.\d{1,2}){2}|[A-Z]{2,4}[ -]?\d{3,4})\b")
+
+# Words compared when matching course names | الكلمات المقارنة عند مطابقة الأسماء
+_NAME_WORD_RE = re.compile(r"\w+")
+
+
+# =============================================================================
+# DATA CLASSES | فئات البيانات
+# =============================================================================
+
+@dataclass
+class CatalogCourse:
+    """
+    Catalog entry for one course | مدخل كتالوج لمقرر واحد
+    """
+    code: str  # Course code | رمز المقرر
+    name: str  # English name | الاسم بالإنجليزية
+    name_ar: Optional[str] = None  # Arabic name | الاسم بالعربية
+    credits: int = 3  # Credit hours | الساعات المعتمدة
+    year_level: int = 1  # Year level | السنة الدراسية
+    semester: Optional[int] = None  # Plan semester (1-10) | الفصل في الخطة
+    major: Optional[str] = None  # Owning major | التخصص
+    department: Optional[str] = None  # Department | القسم
+    category: Optional[str] = None  # Requirement category | فئة المتطلب
+    critical_path_depth: int = 0  # Prerequisite chain depth | عمق سلسلة المتطلبات
+    is_bottleneck: bool = False  # Bottleneck indicator | مؤشر عنق الزجاجة
+    description: Optional[str] = None  # English description | الوصف بالإنجليزية
+    description_ar: Optional[str] = None  # Arabic description | الوصف بالعربية
+    objectives_en: Optional[str] = None  # Objectives EN | الأهداف بالإنجليزية
+    objectives_ar: Optional[str] = None  # Objectives AR | الأهداف بالعربية
+    updated_at: Optional[str] = None  # Last update | آخر تحديث
+
+
+def _to_int(value: Any, default: int) -> int:
+    """Coerce exported strings like "3" to int | تحويل النصوص إلى أعداد"""
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return default
+
+
+# courses.semester term names -> term within the year (1 first, 2 second)
+# أسماء الفصول في جدول المقررات -> ترتيب الفصل في السنة
+TERM_NAMES = {'الفصل الأول': 1, 'الفصل الثاني': 2}
+
+
+def _plan_semester(value: Any, year_level: int) -> Optional[int]:
+    """
+    Plan semester (1-10) from a number or a term name like 'الفصل الثاني'
+    الفصل في الخطة من رقم أو من اسم الفصل
+    """
+    if isinstance(value, str) and value.strip() in TERM_NAMES:
+        return (year_level - 1) * len(TERM_NAMES) + TERM_NAMES[value.strip()]
+    return _to_int(value, 0) or None
+
+
+def _to_bool(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ('true', '1', 'yes')
+    return bool(value)
+
+
+# =============================================================================
+# CATALOG | الكتالوج
+# =============================================================================
+
+@dataclass
+class CourseCatalog:
+    """
+    Courses plus typed edges | المقررات مع العلاقات المصنفة
+    Edges are (source_key, target_key) pairs grouped by relationship type,
+    e.g. 'IS_PREREQUISITE_FOR' -> [(prereq_code, course_code), ...].
+    """
+    courses: Dict[str, CatalogCourse] = field(default_factory=dict)
+    edges: Dict[str, List[Tuple[str, str]]] = field(default_factory=lambda: defaultdict(list))
+    majors: List[str] = field(default_factory=list)
+
+    def __post_init__(self):
+        self._name_to_codes: Optional[Dict[Tuple[str, ...], List[str]]] = None
+        self._name_lengths: List[int] = []
+
+    # -------------------------------------------------------------------------
+    # Loading | التحميل
+    # -------------------------------------------------------------------------
+
+    @classmethod
+    def from_knowledge_graph(cls, path: Optional[str] = None) -> 'CourseCatalog':
+        """
+        Load from a Neo4j JSON export | التحميل من تصدير Neo4j
+
+        Args:
+            path: Export file (defaults to public/data/knowledge_graph.json)
+                  ملف التصدير
+
+        Returns:
+            Loaded catalog | الكتالوج المحمل
+        """
+        with open(path or DEFAULT_KNOWLEDGE_GRAPH, encoding='utf-8') as f:
+            data = json.load(f)
+
+        catalog = cls()
+        nodes = data.get('nodes', {})
+        # Node id -> natural key (course code or entity name)
+        # معرف العقدة -> المفتاح الطبيعي
+        id_to_key: Dict[str, str] = {}
+
+        for node in nodes.get('Course', []):
+            props = node.get('properties', {})
+            code = (props.get('code') or '').strip()
+            if not code or code == '-':
+                continue
+            catalog.courses[code] = CatalogCourse(
+                code=code,
+                name=props.get('name_en') or props.get('name') or code,
+                name_ar=props.get('name_ar'),
+                credits=_to_int(props.get('credits'), 3),
+                year_level=_to_int(props.get('year'), 1),
+                semester=_to_int(props.get('level'), 0) or None,
+                major=props.get('major'),
+                department=props.get('department'),
+                category=props.get('category'),
+                critical_path_depth=_to_int(props.get('critical_path_depth'), 0),
+                is_bottleneck=_to_bool(props.get('is_bottleneck')),
+                description=props.get('description_en') or props.get('description') or None,
+                description_ar=props.get('description_ar'),
+                objectives_en=props.get('objectives_en'),
+                objectives_ar=props.get('objectives_ar'),
+                updated_at=props.get('updated_at'),
+            )
+            id_to_key[str(node.get('id'))] = code
+
+        for label, label_nodes in nodes.items():
+            if label == 'Course':
+                continue
+            for node in label_nodes:
+                name = node.get('properties', {}).get('name')
+                if name:
+                    id_to_key[str(node.get('id'))] = name
+                    if label == 'Major':
+                        catalog.majors.append(name)
+
+        def endpoint(node: Dict[str, Any]) -> Optional[str]:
+            props = node.get('properties', {})
+            if props.get('code') or props.get('name'):
+                return props.get('code') or props.get('name')
+            node_id = node.get('id', node.get('element_id'))
+            return id_to_key.get(str(node_id)) if node_id is not None else None
+
+        skipped = 0
+        for rel in data.get('relationships', []):
+            start = endpoint(rel.get('start_node', {}))
+            end = endpoint(rel.get('end_node', {}))
+            if start and end:
+                catalog.edges[rel['type']].append((start, end))
+            else:
+                skipped += 1
+
+        if skipped:
+            logger.warning(f"Skipped {skipped} relationships without endpoints | علاقات بلا أطراف")
+        logger.info(f"Catalog loaded: {len(catalog.courses)} courses | تم تحميل الكتالوج")
+        return catalog
+
+    @classmethod
+    def from_supabase(cls, client: Any, page_size: int = 1000) -> 'CourseCatalog':
+        """
+        Load from Supabase tables | التحميل من جداول Supabase
+
+        Args:
+            client: supabase Client | عميل Supabase
+            page_size: Rows per request | الصفوف لكل طلب
+
+        Returns:
+            Loaded catalog | الكتالوج المحمل
+        """
+        catalog = cls()
+        id_to_code: Dict[str, str] = {}
+
+        for row in _paginate(client, 'courses', '*', page_size, active_only=True):
+            year_level = _to_int(row.get('year_level'), 1)
+            catalog.courses[row['code']] = CatalogCourse(
+                code=row['code'],
+                name=row['name'],
+                name_ar=row.get('name_ar'),
+                credits=_to_int(row.get('credits'), 3),
+                year_level=year_level,
+                semester=_plan_semester(row.get('semester'), year_level),
+                department=row.get('department'),
+                critical_path_depth=_to_int(row.get('critical_path_depth'), 0),
+                is_bottleneck=bool(row.get('is_bottleneck')),
+                description=row.get('description'),
+                description_ar=row.get('description_ar'),
+                objectives_en=row.get('objectives_en'),
+                objectives_ar=row.get('objectives_ar'),
+                updated_at=row.get('updated_at'),
+            )
+            id_to_code[row['id']] = row['code']
+
+        for row in _paginate(client, 'course_prerequisites', 'course_id, prerequisite_id', page_size):
+            course = id_to_code.get(row['course_id'])
+            prereq = id_to_code.get(row['prerequisite_id'])
+            if course and prereq:
+                catalog.edges['IS_PREREQUISITE_FOR'].append((prereq, course))
+
+        majors = {row['id']: row['name'] for row in _paginate(client, 'majors', 'id, name', page_size)}
+        catalog.majors = list(majors.values())
+
+        # Link tables become the same typed edges as the graph export
+        # جداول الربط تصبح نفس علاقات تصدير الرسم المعرفي
+        for link, column, table, edge_type in _LINK_TABLES:
+            try:
+                names = majors if table == 'majors' else {
+                    row['id']: row['name'] for row in _paginate(client, table, 'id, name', page_size)
+                }
+                for row in _paginate(client, link, f'course_id, {column}', page_size):
+                    course = id_to_code.get(row['course_id'])
+                    target = names.get(row[column])
+                    if course and target:
+                        catalog.edges[edge_type].append((course, target))
+            except Exception as e:
+                logger.warning(f"Skipping {link}: {e} | تخطي {link}")
+
+        # A course owned by exactly one major gets it; shared courses stay open to all
+        # المقرر التابع لتخصص واحد يأخذه، والمقررات المشتركة تبقى متاحة للجميع
+        owners: Dict[str, Set[str]] = defaultdict(set)
+        for code, major in catalog.edges['BELONGS_TO']:
+            owners[code].add(major)
+        for code, names in owners.items():
+            if len(names) == 1:
+                catalog.courses[code].major = next(iter(names))
+
+        try:
+            for row in _paginate(client, 'course_relations', 'course_id, related_course_id', page_size):
+                course = id_to_code.get(row['course_id'])
+                related = id_to_code.get(row['related_course_id'])
+                if course and related:
+                    catalog.edges['RELATED_TO'].append((course, related))
+        except Exception as e:
+            logger.warning(f"Skipping course_relations: {e} | تخطي course_relations")
+        logger.info(f"Catalog loaded: {len(catalog.courses)} courses | تم تحميل الكتالوج")
+        return catalog
+
+    # -------------------------------------------------------------------------
+    # Lookups | الاستعلامات
+    # -------------------------------------------------------------------------
+
+    def prerequisite_pairs(self) -> List[Tuple[str, str]]:
+        """(prerequisite, course) pairs within the catalog | أزواج المتطلبات"""
+        return [
+            (p, c) for p, c in self.edges.get('IS_PREREQUISITE_FOR', [])
+            if p in self.courses and c in self.courses
+        ]
+
+    def _build_name_index(self) -> None:
+        """
+        Index course names by word sequence | فهرسة أسماء المقررات بتسلسل الكلمات
+        A dict lookup per word window stays fast with 100k names, where one
+        regex alternation over all names grows linearly.
+        """
+        name_to_codes: Dict[Tuple[str, ...], List[str]] = defaultdict(list)
+        for course in self.courses.values():
+            for name in (course.name, course.name_ar):
+                words = tuple(_NAME_WORD_RE.findall(name.lower())) if name else ()
+                # Single words ("Applications") are too ambiguous | الكلمات المفردة ملتبسة
+                if len(words) >= 2:
+                    name_to_codes[words].append(course.code)
+        self._name_to_codes = dict(name_to_codes)
+        # Longest names first so "Calculus II" wins over "Calculus I"
+        # الأسماء الأطول أولاً
+        self._name_lengths = sorted({len(words) for words in name_to_codes}, reverse=True)
+
+    def match_courses(self, text: str) -> List[str]:
+        """
+        Find catalog courses mentioned by code or name | إيجاد المقررات المذكورة
+
+        Args:
+            text: Chunk text | نص القطعة
+
+        Returns:
+            Sorted course codes | رموز المقررات مرتبة
+        """
+        codes: Set[str] = {
+            m.replace(' ', '').replace('-', '')
+            for m in COURSE_CODE_RE.findall(text)
+        } & self.courses.keys()
+
+        if self._name_to_codes is None:
+            self._build_name_index()
+        if self._name_to_codes:
+            words = _NAME_WORD_RE.findall(text.lower())
+            i = 0
+            while i < len(words):
+                for n in self._name_lengths:
+                    found = self._name_to_codes.get(tuple(words[i:i + n]))
+                    if found:
+                        codes.update(found)
+                        i += n
+                        break
+                else:
+                    i += 1
+        return sorted(codes)
+
+    def enrich(self, metadata: Dict[str, Any], text: str) -> Dict[str, Any]:
+        """
+        Add filterable catalog fields to chunk metadata
+        إضافة حقول الكتالوج القابلة للفلترة إلى بيانات القطعة
+
+        Sets course_codes, majors, year_levels, year_level_min/max and, when
+        unambiguous, course_code, major and department.
+
+        Args:
+            metadata: Chunk metadata (updated in place) | بيانات القطعة
+            text: Chunk text | نص القطعة
+
+        Returns:
+            The updated metadata | البيانات المحدثة
+        """
+        codes = set(self.match_courses(text))
+        codes.update(c for c in metadata.get('course_codes', []) if c in self.courses)
+        file_code = metadata.get('course_code')
+        if file_code in self.courses:
+            codes.add(file_code)
+
+        majors: Set[str] = set()
+        plan_major = self.major_for_file(metadata.get('source_file', ''))
+        if plan_major:
+            majors.add(plan_major)
+
+        courses = [self.courses[c] for c in sorted(codes)]
+        majors.update(c.major for c in courses if c.major)
+        years = sorted({c.year_level for c in courses})
+
+        metadata['course_codes'] = sorted(codes)
+        metadata['majors'] = sorted(majors)
+        metadata['year_levels'] = years
+        if years:
+            metadata['year_level_min'] = years[0]
+            metadata['year_level_max'] = years[-1]
+
+        # Single-valued fields only when unambiguous | الحقول المفردة عند عدم الالتباس
+        if len(codes) == 1:
+            metadata['course_code'] = next(iter(codes))
+        elif file_code not in self.courses:
+            metadata.pop('course_code', None)
+        if plan_major or len(majors) == 1:
+            metadata['major'] = plan_major or next(iter(majors))
+        departments = Counter(c.department for c in courses if c.department)
+        if len(departments) == 1:
+            metadata['department'] = next(iter(departments))
+        return metadata
+
+    @staticmethod
+    def major_for_file(filename: str) -> Optional[str]:
+        """
+        Major of a study-plan file such as AI-BW-3.pdf | تخصص ملف الخطة الدراسية
+        """
+        prefix = Path(filename).stem.split('-')[0].upper()
+        return PLAN_PREFIX_MAJORS.get(prefix)
+
+
+# Supabase link table, target column, target table, export edge type
+# جدول الربط وعمود الهدف وجدول الهدف ونوع العلاقة
+_LINK_TABLES = (
+    ('course_skills', 'skill_id', 'skills', 'TEACHES_SKILL'),
+    ('course_topics', 'topic_id', 'topics', 'COVERS_TOPIC'),
+    ('course_tools', 'tool_id', 'tools', 'TEACHES_TOOL'),
+    ('course_career_paths', 'career_path_id', 'career_paths', 'LEADS_TO_CAREER'),
+    ('course_majors', 'major_id', 'majors', 'BELONGS_TO'),
+)
+
+
+def _paginate(client: Any, table: str, columns: str, page_size: int,
+              active_only: bool = False, key: str = 'id') -> Iterable[Dict[str, Any]]:
+    """
+    Page through a Supabase table by primary key | التصفح عبر جدول Supabase بالمفتاح
+    Keyset pagination (key > last key, ordered by key) so every row is read
+    exactly once; offset pages have no guaranteed order in PostgREST and can
+    skip or repeat rows. The key is selected when missing and not yielded.
+    تصفح بالمفتاح لقراءة كل صف مرة واحدة بالضبط.
+    """
+    selected = [c.strip() for c in columns.split(',')]
+    extra_key = '*' not in selected and key not in selected
+    if extra_key:
+        columns = f"{columns}, {key}"
+    last = None
+    while True:
+        query = client.table(table).select(columns)
+        if active_only:
+            query = query.eq('is_active', True)
+        if last is not None:
+            query = query.gt(key, last)
+        rows = query.order(key).limit(page_size).execute().data
+        if rows:
+            last = rows[-1][key]
+        for row in rows:
+            if extra_key:
+                row.pop(key, None)
+            yield row
+        if len(rows) < page_size:
+            break
+
+
+def load_catalog(source: Optional[str] = None, client: Any = None) -> CourseCatalog:
+    """
+    Load a catalog from a JSON export path or 'supabase'
+    تحميل الكتالوج من ملف تصدير أو من Supabase
+
+    Args:
+        source: Export path, 'supabase', or None for the bundled export
+                مسار التصدير أو 'supabase'
+        client: Existing Supabase client to reuse | عميل Supabase موجود
+    """
+    if source != 'supabase':
+        return CourseCatalog.from_knowledge_graph(source)
+    if client is not None:
+        return CourseCatalog.from_supabase(client)
+
+    import os
+    from supabase import create_client
+
+    url = os.getenv('SUPABASE_URL') or os.getenv('VITE_SUPABASE_URL')
+    key = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
+    if not url or not key:
+        raise ValueError("Missing SUPABASE_URL or SUPABASE_SERVICE_ROLE_KEY")
+    return CourseCatalog.from_supabase(create_client(url, key))
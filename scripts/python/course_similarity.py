@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=============================================================================
+IntelliPath - Course Similarity
+المرشد الأكاديمي الذكي - تشابه المقررات
+=============================================================================
+Regenerates RELATED_TO edges from what courses teach instead of a
+hand-curated list.
+
+- Each course is a sparse row over the topics, skills and tools it links
+  to (COVERS_TOPIC, TEACHES_SKILL / TEACHES, TEACHES_TOOL), scored by
+  TF-IDF cosine or Jaccard overlap.
+- The sparse product is a vectorized self-join on shared features, run
+  in blocks of courses, so work grows with the pairs that actually share
+  something rather than with n². Features on more than max_df courses
+  are skipped when generating pairs.
+- Description embeddings (an .npz of codes and vectors) can be blended
+  in; they rescore pairs that share at least one feature.
+- The top-k per course are bulk-written through GraphSync as weighted
+  RELATED_TO edges tagged source 'similarity'; curated edges are kept.
+يحسب تشابه المقررات من الموضوعات والمهارات والأدوات المشتركة ويكتب أفضل
+k علاقة RELATED_TO لكل مقرر عبر GraphSync.
+=============================================================================
+Version: 1.0.0 | الإصدار: 1.0.0
+Last Updated: 2026-10-19 | آخر تحديث: 2026-10-19
+=============================================================================
+"""
+
+import sys
+import json
+import logging
+from typing import Any, Dict, Optional, Tuple
+from dataclasses import dataclass, field
+
+from array_ops import concat_ranges
+from course_catalog import CourseCatalog, load_catalog
+from graph_sync import GraphSync, SyncConfig
+from instrumentation import Instrumentation, add_instrumentation_arguments, instrumented_run
+from settings import Clients, Settings, SettingsError, lazy_import, load_settings, setup_logging
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas', 'pandas openpyxl')
+
+logger = logging.getLogger(__name__)
+
+METRICS = ('tfidf', 'jaccard')
+
+
+# =============================================================================
+# CONFIGURATION | الإعدادات
+# =============================================================================
+
+@dataclass
+class SimilarityConfig:
+    """
+    Course similarity configuration | إعدادات تشابه المقررات
+    """
+    top_k: int = 5  # Related courses kept per course | عدد المقررات ذات الصلة
+    metric: str = 'tfidf'  # 'tfidf' cosine or 'jaccard' | مقياس التشابه
+    # Feature weight by relationship | وزن السمات حسب العلاقة
+    relation_weights: Dict[str, float] = field(default_factory=lambda: {
+        'COVERS_TOPIC': 1.0, 'TEACHES_SKILL': 1.0, 'TEACHES': 1.0, 'TEACHES_TOOL': 0.7,
+    })
+    min_score: float = 0.1  # Weakest edge kept | أدنى تشابه محفوظ
+    embedding_weight: float = 0.3  # Share of the embedding similarity | وزن التضمينات
+    max_df: int = 1000  # Features on more courses are not joined on | حد شيوع السمة
+    block_size: int = 1024  # Courses per join block | المقررات لكل كتلة
+
+
+# =============================================================================
+# SIMILARITY | التشابه
+# =============================================================================
+
+def load_embeddings(path: str) -> Tuple['np.ndarray', 'np.ndarray']:
+    """
+    Course embeddings from an .npz with 'codes' and 'vectors', L2-normalized
+    تحميل تضمينات المقررات
+    """
+    with np.load(path, allow_pickle=False) as data:
+        codes, vectors = data['codes'].astype(str), data['vectors'].astype(np.float32)
+    vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+    return codes, vectors
+
+
+def _incidence(catalog: CourseCatalog, config: SimilarityConfig) -> 'pd.DataFrame':
+    """(course, feature, weight) cells, one per linked feature | خلايا الوقوع"""
+    cells = pd.DataFrame(
+        [(source, f'{edge_type}:{target}', weight)
+         for edge_type, weight in config.relation_weights.items() if weight > 0
+         for source, target in catalog.edges.get(edge_type, [])],
+        columns=['course', 'feature', 'weight'],
+    )
+    cells = cells[cells['course'].isin(catalog.courses)]
+    return cells.groupby(['course', 'feature'], sort=True)['weight'].max().reset_index()
+
+
+def compute_similarity(catalog: CourseCatalog, config: Optional[SimilarityConfig] = None,
+                       embeddings: Optional[Tuple['np.ndarray', 'np.ndarray']] = None,
+                       metrics: Optional[Instrumentation] = None) -> 'pd.DataFrame':
+    """
+    Top-k related courses per course | أفضل k مقرر ذي صلة لكل مقرر
+
+    Args:
+        catalog: Catalog with topic/skill/tool edges | الكتالوج
+        config: Similarity configuration | الإعدادات
+        embeddings: (codes, normalized vectors) to blend in | التضمينات
+        metrics: Instrumentation for stage timings | أداة القياس
+
+    Returns:
+        course_code, related_code, score, metric rows | صفوف العلاقات
+    """
+    config = config or SimilarityConfig()
+    metrics = metrics or Instrumentation('course_similarity')
+    if config.metric not in METRICS:
+        raise ValueError(f"Unknown metric {config.metric!r}; use one of {METRICS}")
+    columns = ['course_code', 'related_code', 'score', 'metric']
+    cells = _incidence(catalog, config)
+    if cells.empty:
+        logger.warning("No topic/skill/tool edges in the catalog | لا توجد سمات للمقررات")
+        return pd.DataFrame(columns=columns)
+
+    rows, codes = pd.factorize(cells['course'], sort=True)
+    cols, _ = pd.factorize(cells['feature'])
+    n = len(codes)
+    df = np.bincount(cols)
+    if config.metric == 'tfidf':
+        values = cells['weight'].to_numpy() * (np.log((1 + n) / (1 + df)) + 1)[cols]
+        values /= np.sqrt(np.bincount(rows, weights=values ** 2))[rows]
+    else:
+        values = np.ones(len(cells))
+    sizes = np.bincount(rows, minlength=n)
+    row_ptr = np.concatenate(([0], np.cumsum(sizes)))
+
+    # Postings per feature, skipping features too common to discriminate
+    # قوائم المقررات لكل سمة دون السمات الشائعة جداً
+    order = np.argsort(cols, kind='stable')
+    col_ptr = np.concatenate(([0], np.cumsum(df)))
+    post_rows, post_values = rows[order], values[order]
+    joinable = df[cols] <= config.max_df
+
+    if embeddings is not None:
+        emb_codes, vectors = embeddings
+        emb_row = pd.Index(emb_codes).get_indexer(codes)
+
+    parts = []
+    with metrics.span('similarity', items=n):
+        for start in range(0, n, config.block_size):
+            stop = min(start + config.block_size, n)
+            left = np.arange(row_ptr[start], row_ptr[stop])
+            left = left[joinable[left]]
+            counts = df[cols[left]]
+            positions = concat_ranges(col_ptr[cols[left]], col_ptr[cols[left] + 1])
+            a = np.repeat(rows[left], counts)
+            b = post_rows[positions]
+            product = np.repeat(values[left], counts) * post_values[positions]
+            keep = a != b
+            pair, inverse = np.unique((a[keep] - start).astype(np.int64) * n + b[keep], return_inverse=True)
+            score = np.bincount(inverse, weights=product[keep])
+            a, b = pair // n + start, pair % n
+            if config.metric == 'jaccard':
+                score = score / (sizes[a] + sizes[b] - score)
+
+            if embeddings is not None:
+                ea, eb = emb_row[a], emb_row[b]
+                both = (ea >= 0) & (eb >= 0)
+                cosine = np.zeros(len(a))
+                pairs = np.flatnonzero(both)
+                for chunk in range(0, len(pairs), 8192):
+                    idx = pairs[chunk:chunk + 8192]
+                    cosine[idx] = np.einsum('ij,ij->i', vectors[ea[idx]], vectors[eb[idx]])
+                score = np.where(both, (1 - config.embedding_weight) * score
+                                 + config.embedding_weight * np.clip(cosine, 0, 1), score)
+
+            ranked = np.lexsort((b, -score, a))
+            a, b, score = a[ranked], b[ranked], score[ranked]
+            rank = np.arange(len(a)) - np.searchsorted(a, a)
+            keep = (rank < config.top_k) & (score >= config.min_score)
+            parts.append(pd.DataFrame({
+                'course_code': codes[a[keep]], 'related_code': codes[b[keep]],
+                'score': np.round(score[keep], 4), 'metric': config.metric,
+            }))
+    related = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=columns)
+    logger.info(f"{len(related)} related-course edges for {n} courses | علاقات التشابه")
+    return related
+
+
+# =============================================================================
+# MAIN ENTRY POINT | نقطة الدخول الرئيسية
+# =============================================================================
+
+def add_arguments(parser: Any) -> None:
+    """
+    Add similarity arguments to a parser | إضافة وسائط تشابه المقررات
+    """
+    parser.add_argument(
+        '--catalog',
+        help="Knowledge graph export (from `export`) or 'supabase' (default: bundled export) | مصدر الرسم"
+    )
+    parser.add_argument('--course', help='Print the related courses of one course | المقررات ذات الصلة بمقرر')
+    parser.add_argument('--top-k', type=int, default=5, help='Related courses per course (default: 5) | العدد لكل مقرر')
+    parser.add_argument('--metric', choices=METRICS, default='tfidf', help='Similarity measure (default: tfidf) | المقياس')
+    parser.add_argument('--min-score', type=float, default=0.1, help='Weakest edge kept (default: 0.1) | أدنى تشابه')
+    parser.add_argument('--embeddings', help='.npz of course codes and description vectors to blend in | ملف التضمينات')
+    parser.add_argument('--embedding-weight', type=float, default=0.3, help='Embedding share (default: 0.3) | وزن التضمينات')
+    parser.add_argument('--output', help='Related pairs CSV | ملف العلاقات')
+    parser.add_argument('--neo4j', action='store_true', help='Write RELATED_TO edges through GraphSync | الكتابة إلى Neo4j')
+    parser.add_argument('--dry-run', action='store_true', help='Show the edge diff without writing | عرض الفروقات فقط')
+    parser.add_argument('--batch-size', type=int, default=SyncConfig.batch_size, help='Edges per write transaction | العلاقات لكل معاملة')
+    add_instrumentation_arguments(parser)
+
+
+def run_command(args: Any, settings: Settings, clients: Optional[Clients] = None) -> int:
+    """
+    Compute related courses from parsed arguments | حساب المقررات ذات الصلة من الوسائط
+
+    Returns:
+        Process exit code | رمز الخروج
+    """
+    if args.neo4j:
+        settings.require('supabase_url', 'supabase_key', 'neo4j_uri', 'neo4j_password')
+    elif args.catalog == 'supabase':
+        settings.require('supabase_url', 'supabase_key')
+    clients = clients or Clients(settings)
+    config = SimilarityConfig(top_k=args.top_k, metric=args.metric, min_score=args.min_score,
+                              embedding_weight=args.embedding_weight)
+
+    with instrumented_run('course_similarity', args) as metrics:
+        with metrics.span('load'):
+            catalog = load_catalog(args.catalog, client=clients.supabase if args.catalog == 'supabase' else None)
+            embeddings = load_embeddings(args.embeddings) if args.embeddings else None
+        related = compute_similarity(catalog, config, embeddings, metrics)
+        if related.empty:
+            # Nothing to compare is a broken input, not "no related courses";
+            # writing it would delete every computed edge
+            # عدم وجود أزواج يعني مدخلات ناقصة؛ الكتابة ستحذف كل العلاقات المحسوبة
+            logger.error(
+                "Catalog yielded no similar course pairs; nothing written. "
+                "Use a knowledge graph export with topic/skill/tool edges | "
+                "لم ينتج الكتالوج أي أزواج متشابهة؛ لم يكتب شيء"
+            )
+            return 1
+
+        if args.course:
+            rows = related[related['course_code'] == args.course]
+            print(json.dumps(dict(zip(rows['related_code'], rows['score'])), ensure_ascii=False, indent=2))
+            return 0
+        if args.output:
+            related.to_csv(args.output, index=False, encoding='utf-8')
+
+        summary: Dict[str, Any] = {
+            'courses': int(related['course_code'].nunique()),
+            'edges': len(related),
+            'mean_score': round(float(related['score'].mean()), 4) if len(related) else 0.0,
+        }
+        errors = 0
+        if args.neo4j:
+            syncer = GraphSync(
+                SyncConfig(
+                    supabase_url=settings.supabase_url,
+                    supabase_key=settings.supabase_key,
+                    neo4j_uri=settings.neo4j_uri,
+                    neo4j_user=settings.neo4j_user,
+                    neo4j_password=settings.neo4j_password,
+                    neo4j_database=settings.neo4j_database,
+                    dry_run=args.dry_run,
+                    batch_size=args.batch_size,
+                ),
+                metrics=metrics, supabase=clients.supabase, driver=clients.neo4j,
+            )
+            try:
+                # Edges go into the live generation | الكتابة في الجيل الحي
+                syncer.generation = syncer.active_generation() or 0
+                syncer.sync_related_courses(related.to_dict('records'))
+                if args.dry_run:
+                    syncer.log_diff()
+            finally:
+                syncer.close()
+            errors = syncer.stats['errors']
+            summary.update({
+                'written': syncer.stats['relationships_created'],
+                'deleted': syncer.stats['deleted'],
+                'unchanged': syncer.stats['unchanged'],
+            })
+        metrics.result.update(summary)
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+    return 1 if errors else 0
+
+
+def main():
+    """
+    Main entry point | نقطة الدخول الرئيسية
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='IntelliPath course similarity | تشابه المقررات'
+    )
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    setup_logging('course_similarity.log')
+    try:
+        sys.exit(run_command(args, load_settings()))
+    except (SettingsError, ImportError, ValueError) as e:
+        logger.error(str(e))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=============================================================================
+IntelliPath - Embedding Dimension Quality Check
+المرشد الأكاديمي الذكي - فحص جودة أبعاد التضمين
+=============================================================================
+Check of what reduced embedding dimensions cost in retrieval quality.
+Full-size vectors stored in the ingestion journal are truncated and
+re-normalized (equivalent to the `dimensions` parameter of the
+text-embedding-3 models). For each reduced index, the check measures how
+much of the full-size top-k neighbour list it keeps (neighbour recall@k).
+
+Two query sources:
+  --queries   a retrieval_eval query set, embedded at full size with the
+              journal's model; measures real query-to-chunk retrieval
+  (default)   a random sample of journal chunks held out as queries;
+              measures chunk-to-chunk neighbour recall only, with no API
+              calls
+The figure is agreement with full-size search, not labelled relevance;
+run retrieval_eval with --dimensions for that.
+
+    intellipath.py dimension-check --queries eval/queries.jsonl --dims 256 512
+فحص تكلفة تقليل أبعاد التضمين: نسبة ما يحتفظ به كل فهرس مخفض من أقرب k
+جيران في الفهرس الكامل، لاستعلامات حقيقية (--queries) أو لقطع محجوزة.
+=============================================================================
+Version: 1.0.0 | الإصدار: 1.0.0
+Last Updated: 2026-10-19 | آخر تحديث: 2026-10-19
+=============================================================================
+"""
+
+import sys
+import json
+import time
+import logging
+from typing import Any, Dict, List, Optional
+
+from ingest_journal import IngestJournal
+from instrumentation import add_instrumentation_arguments, instrumented_run
+from settings import Clients, Settings, SettingsError, lazy_import, load_settings, setup_logging
+
+np = lazy_import('numpy')
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# VECTOR HELPERS | أدوات المتجهات
+# =============================================================================
+
+def truncate_embeddings(vectors: 'np.ndarray', dim: int) -> 'np.ndarray':
+    """
+    Shorten embeddings to `dim` and re-normalize | تقصير التضمينات وإعادة تطبيعها
+
+    Args:
+        vectors: (n, d) full-size embeddings | التضمينات الكاملة
+        dim: Target dimension | البعد المطلوب
+
+    Returns:
+        (n, dim) unit vectors | متجهات الوحدة
+    """
+    reduced = np.ascontiguousarray(vectors[:, :dim], dtype=np.float32)
+    norms = np.linalg.norm(reduced, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return reduced / norms
+
+
+def top_k(index: 'np.ndarray', queries: 'np.ndarray', k: int, block: int = 256) -> 'np.ndarray':
+    """
+    Exact cosine top-k for unit vectors | أعلى k بالتشابه الدقيق
+
+    Args:
+        index: (n, d) unit vectors | متجهات الفهرس
+        queries: (q, d) unit vectors | متجهات الاستعلام
+        k: Neighbours per query | عدد الجيران
+        block: Queries scored per matrix product | استعلامات لكل عملية ضرب
+
+    Returns:
+        (q, k) row indices ordered by score | فهارس الصفوف مرتبة
+    """
+    k = min(k, len(index))
+    result = np.empty((len(queries), k), dtype=np.int64)
+    for start in range(0, len(queries), block):
+        scores = queries[start:start + block] @ index.T
+        part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        order = np.take_along_axis(scores, part, axis=1).argsort(axis=1)[:, ::-1]
+        result[start:start + block] = np.take_along_axis(part, order, axis=1)
+    return result
+
+
+def recall_at_k(predicted: 'np.ndarray', truth: 'np.ndarray') -> float:
+    """Mean overlap between predicted and reference top-k | متوسط التطابق مع المرجع"""
+    k = truth.shape[1]
+    hits = sum(len(set(p) & set(t)) for p, t in zip(predicted.tolist(), truth.tolist()))
+    return hits / (len(truth) * k)
+
+
+# =============================================================================
+# CHECK | الفحص
+# =============================================================================
+
+def run_check(vectors: 'np.ndarray', dims: List[int], k: int = 10,
+              queries: Optional['np.ndarray'] = None, holdout: int = 200,
+              seed: int = 42) -> Dict[str, Any]:
+    """
+    Compare reduced-dimension indexes with the full-size index
+    مقارنة الفهارس المخفضة مع الفهرس الكامل
+
+    Args:
+        vectors: (n, d) full-size embeddings | التضمينات الكاملة
+        dims: Reduced dimensions to evaluate | الأبعاد المراد تقييمها
+        k: Recall cut-off | حد الاسترجاع
+        queries: (q, d) full-size query embeddings; None holds out chunks
+                 تضمينات الاستعلامات؛ None لحجز قطع كاستعلامات
+        holdout: Chunks held out as queries when `queries` is None | القطع المحجوزة
+        seed: Sampling seed | بذرة الاختيار
+
+    Returns:
+        Report with one row per dimension | تقرير بصف لكل بعد
+    """
+    n, full_dim = vectors.shape
+    if queries is not None:
+        if queries.shape[1] != full_dim:
+            raise ValueError(
+                f"Query embeddings have {queries.shape[1]} dimensions, journal has {full_dim};"
+                f" embed both with the same model"
+            )
+        index_vectors, query_vectors = vectors, queries
+        source = 'query_set'
+    else:
+        holdout = min(holdout, n // 5)
+        if holdout < 1:
+            raise ValueError(f"Need at least 5 embeddings for a held-out check, got {n}")
+        rng = np.random.default_rng(seed)
+        is_query = np.zeros(n, dtype=bool)
+        is_query[rng.choice(n, size=holdout, replace=False)] = True
+        index_vectors, query_vectors = vectors[~is_query], vectors[is_query]
+        source = 'held_out_chunks'
+
+    full_index = truncate_embeddings(index_vectors, full_dim)
+    truth = top_k(full_index, truncate_embeddings(query_vectors, full_dim), k)
+
+    rows = []
+    for dim in sorted(set(dims) | {full_dim}):
+        if dim > full_dim:
+            logger.warning(f"Skipping {dim}: larger than stored vectors ({full_dim})")
+            continue
+        index = truncate_embeddings(index_vectors, dim)
+        reduced_queries = truncate_embeddings(query_vectors, dim)
+        started = time.perf_counter()
+        predicted = top_k(index, reduced_queries, k)
+        elapsed = time.perf_counter() - started
+        rows.append({
+            'dimensions': dim,
+            f'neighbour_recall@{k}': round(recall_at_k(predicted, truth), 4),
+            'bytes_per_vector': dim * 4,
+            'index_mb': round(index.nbytes / 1e6, 2),
+            'search_ms_per_query': round(elapsed * 1000 / len(reduced_queries), 4),
+        })
+
+    return {
+        'query_source': source,
+        'vectors': int(len(index_vectors)),
+        'queries': int(len(query_vectors)),
+        'full_dimensions': int(full_dim),
+        'k': k,
+        'results': rows,
+    }
+
+
+def load_journal_embeddings(path: str) -> 'np.ndarray':
+    """
+    Load full-size embeddings from the ingestion journal | تحميل التضمينات من السجل
+
+    Args:
+        path: Journal SQLite path | مسار السجل
+    """
+    journal = IngestJournal(path)
+    try:
+        rows = [np.frombuffer(blob, dtype=np.float32) for _, blob in journal.iter_embeddings()]
+    finally:
+        journal.close()
+    if not rows:
+        raise ValueError(f"No embeddings stored in {path}")
+    return np.vstack(rows)
+
+
+def embed_queries(client: Any, texts: List[str], model: str, batch_size: int = 100) -> 'np.ndarray':
+    """
+    Embed query texts at full size | تضمين الاستعلامات بالأبعاد الكاملة
+
+    Args:
+        client: OpenAI client | عميل OpenAI
+        texts: Query texts | نصوص الاستعلامات
+        model: Model the journal was embedded with | نموذج تضمين السجل
+        batch_size: Texts per API call | النصوص لكل استدعاء
+    """
+    rows: List[List[float]] = []
+    for start in range(0, len(texts), batch_size):
+        response = client.embeddings.create(model=model, input=texts[start:start + batch_size])
+        rows.extend(item.embedding for item in response.data)
+    return np.asarray(rows, dtype=np.float32)
+
+
+# =============================================================================
+# COMMAND | الأمر
+# =============================================================================
+
+def add_arguments(parser: Any) -> None:
+    """
+    Add dimension check arguments to a parser | إضافة وسائط فحص الأبعاد
+    """
+    parser.add_argument(
+        '--journal',
+        default='.cache/ingest_journal.sqlite',
+        help='Journal from a full-size embedding run | سجل تشغيل بالأبعاد الكاملة'
+    )
+    parser.add_argument(
+        '--queries',
+        help='retrieval_eval query set (JSON/JSONL); default holds out journal chunks | مجموعة الاستعلامات'
+    )
+    parser.add_argument(
+        '--model',
+        default='text-embedding-3-small',
+        help='Model the journal was embedded with (default: text-embedding-3-small) | نموذج التضمين'
+    )
+    parser.add_argument(
+        '--dims',
+        type=int,
+        nargs='+',
+        default=[256, 512, 768],
+        help='Reduced dimensions to evaluate | الأبعاد المراد تقييمها'
+    )
+    parser.add_argument('--k', type=int, default=10, help='Recall cut-off | حد الاسترجاع')
+    parser.add_argument(
+        '--holdout',
+        type=int,
+        default=200,
+        help='Chunks held out as queries without --queries | القطع المحجوزة كاستعلامات'
+    )
+    parser.add_argument('--seed', type=int, default=42, help='Sampling seed | بذرة الاختيار')
+    parser.add_argument('--output', help='Write the JSON report here | ملف التقرير')
+    add_instrumentation_arguments(parser)
+
+
+def run_command(args: Any, settings: Settings, clients: Optional[Clients] = None) -> int:
+    """
+    Run the dimension check from parsed arguments | تشغيل فحص الأبعاد من الوسائط
+
+    Returns:
+        Process exit code | رمز الخروج
+    """
+    if args.queries:
+        settings.require('openai_api_key')
+    own_clients = clients is None
+    clients = clients or Clients(settings)
+
+    try:
+        with instrumented_run('dimension_check', args) as metrics:
+            with metrics.span('load'):
+                vectors = load_journal_embeddings(args.journal)
+            queries = None
+            if args.queries:
+                # Imported here: retrieval_eval pulls in the embedding pipeline
+                # يستورد هنا لأن retrieval_eval يحمل خط التضمين
+                from retrieval_eval import load_queries
+                texts = [q.query for q in load_queries(args.queries)]
+                with metrics.span('embed', items=len(texts)):
+                    queries = embed_queries(clients.openai, texts, args.model)
+            with metrics.span('check', items=len(vectors)):
+                report = run_check(vectors, args.dims, k=args.k, queries=queries,
+                                   holdout=args.holdout, seed=args.seed)
+            metrics.result.update({'query_source': report['query_source'], 'queries': report['queries']})
+    except ValueError as e:
+        logger.error(str(e))
+        return 1
+    finally:
+        if own_clients:
+            clients.close()
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+        logger.info(f"Report written to {args.output} | تمت كتابة التقرير")
+    else:
+        print(text)
+    return 0
+
+
+# =============================================================================
+# MAIN ENTRY POINT | نقطة الدخول الرئيسية
+# =============================================================================
+
+def main():
+    """
+    Main entry point | نقطة الدخول الرئيسية
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Embedding dimension recall check | فحص استرجاع أبعاد التضمين'
+    )
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    setup_logging()
+    try:
+        sys.exit(run_command(args, load_settings()))
+    except (SettingsError, ImportError) as e:
+        logger.error(str(e))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,447 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=============================================================================
+IntelliPath - Document Loaders
+المرشد الأكاديمي الذكي - محملات المستندات
+=============================================================================
+File-type registry used by the embedding generator. PDFs are read with a
+layout-preserving pypdf extractor whose per-page text is cached by page hash;
+images (study-plan PNGs) go through an optional local OCR stage in a worker
+pool. Course-code/credit table rows are extracted into structured metadata.
+سجل أنواع الملفات لمولد التضمينات: استخراج نصوص PDF مع تخزين مؤقت لكل صفحة،
+وتعرف ضوئي اختياري للصور، واستخراج جداول رموز المقررات والساعات.
+=============================================================================
+Version: 1.0.0 | الإصدار: 1.0.0
+Last Updated: 2026-10-19 | آخر تحديث: 2026-10-19
+=============================================================================
+"""
+
+import re
+import hashlib
+import inspect
+import logging
+import sqlite3
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from course_catalog import COURSE_CODE_RE
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# DATA CLASSES | فئات البيانات
+# =============================================================================
+
+@dataclass
+class PageDocument:
+    """
+    One loaded page or image | صفحة أو صورة محملة
+    Mirrors the page_content/metadata shape of LangChain documents.
+    """
+    page_content: str  # Extracted text | النص المستخرج
+    metadata: Dict[str, Any] = field(default_factory=dict)  # Metadata | البيانات الوصفية
+
+
+@dataclass
+class LoaderConfig:
+    """
+    Configuration for document loading | إعدادات تحميل المستندات
+    """
+    page_cache_path: Optional[str] = ".cache/page_text.sqlite"  # Page text cache | ذاكرة نصوص الصفحات
+    layout_mode: bool = True  # Keep table columns aligned | الحفاظ على أعمدة الجداول
+    enable_ocr: bool = False  # OCR images (needs pytesseract) | التعرف الضوئي للصور
+    ocr_languages: str = "ara+eng"  # Tesseract languages | لغات Tesseract
+    ocr_workers: int = 2  # OCR worker processes | عمليات التعرف الضوئي
+
+
+# =============================================================================
+# COURSE TABLE EXTRACTION | استخراج جداول المقررات
+# =============================================================================
+
+_CREDITS_RE = re.compile(r"(?<![\d.])(10|[1-9])(?![\d.])")
+
+
+def extract_course_rows(text: str) -> List[Dict[str, Any]]:
+    """
+    Extract course-code/credit rows from plan text | استخراج صفوف المقررات
+    A row is any line holding a course code; the last standalone 1-10
+    integer after the code is taken as its credit hours.
+
+    Args:
+        text: Page text | نص الصفحة
+
+    Returns:
+        List of {code, name, credits} dicts | قائمة صفوف المقررات
+    """
+    rows = []
+    for line in text.splitlines():
+        match = COURSE_CODE_RE.search(line)
+        if not match:
+            continue
+        code = match.group(1).replace(' ', '').replace('-', '')
+        rest = line[match.end():]
+        numbers = _CREDITS_RE.findall(rest)
+        name = re.sub(r"[\d|\t]+", " ", rest)
+        name = re.sub(r"\s{2,}", " ", name).strip(" -:|")
+        rows.append({
+            'code': code,
+            'name': name or None,
+            'credits': int(numbers[-1]) if numbers else None,
+        })
+    return rows
+
+
+# =============================================================================
+# PAGE CACHE | ذاكرة الصفحات المؤقتة
+# =============================================================================
+
+class PageTextCache:
+    """
+    SQLite cache of extracted text keyed by page hash
+    ذاكرة SQLite للنصوص المستخرجة بمفتاح hash الصفحة
+    """
+
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS page_text ("
+            " page_hash TEXT NOT NULL, extractor TEXT NOT NULL, text TEXT NOT NULL,"
+            " PRIMARY KEY (page_hash, extractor))"
+        )
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, page_hash: str, extractor: str) -> Optional[str]:
+        """Return cached text or None | إرجاع النص المخزن أو None"""
+        row = self.conn.execute(
+            "SELECT text FROM page_text WHERE page_hash = ? AND extractor = ?",
+            (page_hash, extractor)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row[0]
+
+    def put(self, page_hash: str, extractor: str, text: str) -> None:
+        """Store extracted text | تخزين النص المستخرج"""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO page_text (page_hash, extractor, text) VALUES (?, ?, ?)",
+            (page_hash, extractor, text)
+        )
+
+    def commit(self) -> None:
+        self.conn.commit()
+
+    def close(self) -> None:
+        self.conn.commit()
+        self.conn.close()
+
+
+def _ocr_image(path: str, languages: str) -> str:
+    """
+    OCR one image (runs in a worker process) | التعرف الضوئي لصورة واحدة
+    """
+    import pytesseract
+    from PIL import Image
+
+    with Image.open(path) as image:
+        return pytesseract.image_to_string(image, lang=languages)
+
+
+def _object_digest(obj: Any, digests: Dict[int, bytes], active: Optional[set] = None) -> bytes:
+    """
+    Digest of a PDF object with indirect references resolved
+    بصمة كائن PDF مع حل المراجع غير المباشرة
+
+    Streams contribute their decoded data, so two pages that draw the same
+    XObject name get different digests when the XObjects differ. Digests of
+    indirect objects are memoized per document (shared fonts are hashed
+    once); a reference cycle hashes as its object number.
+    """
+    from pypdf.generic import IndirectObject
+
+    active = set() if active is None else active
+    if isinstance(obj, IndirectObject):
+        if obj.idnum in digests:
+            return digests[obj.idnum]
+        if obj.idnum in active:
+            return f"ref:{obj.idnum}".encode()
+        active.add(obj.idnum)
+        digest = _object_digest(obj.get_object(), digests, active)
+        active.discard(obj.idnum)
+        digests[obj.idnum] = digest
+        return digest
+
+    h = hashlib.sha256(type(obj).__name__.encode())
+    if isinstance(obj, dict):
+        for key in sorted(obj):
+            if key in ('/Parent', '/Length'):
+                continue
+            h.update(str(key).encode())
+            h.update(_object_digest(obj[key], digests, active))
+        if hasattr(obj, 'get_data'):
+            h.update(obj.get_data())
+    elif isinstance(obj, list):
+        for item in obj:
+            h.update(_object_digest(item, digests, active))
+    else:
+        h.update(repr(obj).encode())
+    return h.digest()
+
+
+def _page_digest(page: Any, digests: Dict[int, bytes]) -> str:
+    """
+    Page cache key: content stream plus the resources it draws
+    مفتاح ذاكرة الصفحة: تيار المحتوى مع الموارد التي يرسمها
+
+    The content stream alone is not enough: XObject-only pages ("/Im0 Do")
+    share it while showing different images and forms.
+    """
+    h = hashlib.sha256()
+    contents = page.get_contents()
+    h.update(contents.get_data() if contents is not None else b'')
+    resources = page.get('/Resources')
+    if resources is not None:
+        h.update(_object_digest(resources, digests))
+    return h.hexdigest()
+
+
+# =============================================================================
+# LOADER REGISTRY | سجل المحملات
+# =============================================================================
+
+class DocumentLoader:
+    """
+    Loads curriculum assets through a per-file-type registry
+    يحمل ملفات المنهاج عبر سجل حسب نوع الملف
+    """
+
+    def __init__(self, config: LoaderConfig):
+        """
+        Initialize the loader | تهيئة المحمل
+
+        Args:
+            config: Loader configuration | إعدادات المحمل
+        """
+        self.config = config
+        self.cache = PageTextCache(config.page_cache_path) if config.page_cache_path else None
+
+        # Suffix -> loader function | اللاحقة -> دالة التحميل
+        self.registry: Dict[str, Callable[[Path], List[PageDocument]]] = {}
+        self.register('.pdf', self.load_pdf)
+        self.register('.txt', self.load_text)
+        self.register('.md', self.load_text)
+        for suffix in ('.png', '.jpg', '.jpeg', '.tif', '.tiff'):
+            self.register(suffix, self.load_image)
+
+        # Images queued for OCR, processed together in the pool
+        # الصور المنتظرة للتعرف الضوئي
+        self._pending_images: List[Path] = []
+
+        # PDF extractor cache key, resolved on the first PDF | مفتاح مستخرج PDF
+        self._pdf_extractor: Optional[str] = None
+
+    def register(self, suffix: str, loader: Callable[[Path], List[PageDocument]]) -> None:
+        """
+        Register a loader for a file suffix | تسجيل محمل للاحقة ملف
+
+        Args:
+            suffix: File suffix including the dot | لاحقة الملف
+            loader: Callable returning page documents | دالة تعيد الصفحات
+        """
+        self.registry[suffix.lower()] = loader
+
+    def supports(self, path: Path) -> bool:
+        """Check if a file type is registered | التحقق من دعم نوع الملف"""
+        return path.suffix.lower() in self.registry
+
+    def iter_files(self, directory: Path, file_pattern: Optional[str] = None) -> Iterator[Path]:
+        """
+        Yield supported files under a directory | إرجاع الملفات المدعومة في المجلد
+        """
+        candidates = directory.glob(file_pattern) if file_pattern else directory.rglob('*')
+        for path in sorted(candidates):
+            if path.is_file() and self.supports(path):
+                yield path
+
+    def load(self, path: Path) -> List[PageDocument]:
+        """
+        Load one file through its registered loader | تحميل ملف عبر محمله
+
+        Args:
+            path: File path | مسار الملف
+
+        Returns:
+            Page documents (empty for images queued for OCR)
+            صفحات المستند (فارغة للصور المنتظرة)
+        """
+        docs = self.registry[path.suffix.lower()](path)
+        return self._annotate(docs, path)
+
+    def _annotate(self, docs: List[PageDocument], path: Path) -> List[PageDocument]:
+        """
+        Add source metadata and structured course-table documents
+        إضافة بيانات المصدر ومستندات جداول المقررات المنظمة
+        """
+        tables = []
+        for doc in docs:
+            doc.metadata.setdefault('source_file', path.name)
+            doc.metadata.setdefault('source_path', str(path))
+            rows = extract_course_rows(doc.page_content)
+            if not rows:
+                continue
+            doc.metadata['course_codes'] = sorted({r['code'] for r in rows})
+            # One line per row so the table survives chunking intact
+            # سطر لكل صف حتى يبقى الجدول سليماً بعد التقطيع
+            lines = [
+                ' | '.join([r['code'], r['name'] or '', f"{r['credits']} cr" if r['credits'] else ''])
+                for r in rows
+            ]
+            tables.append(PageDocument(
+                page_content='\n'.join(lines),
+                metadata={
+                    **doc.metadata,
+                    'source_type': 'course_table',
+                    'course_table': rows,
+                }
+            ))
+        return docs + tables
+
+    def load_pdf(self, path: Path) -> List[PageDocument]:
+        """
+        Extract PDF pages, reusing cached text for unchanged pages
+        استخراج صفحات PDF مع إعادة استخدام النص المخزن للصفحات غير المتغيرة
+        """
+        from pypdf import PdfReader
+
+        extractor = self._pdf_extractor or self._resolve_pdf_extractor()
+        reader = PdfReader(str(path))
+        docs = []
+        digests: Dict[int, bytes] = {}
+
+        for page_number, page in enumerate(reader.pages):
+            page_hash = _page_digest(page, digests)
+
+            text = self.cache.get(page_hash, extractor) if self.cache else None
+            if text is None:
+                text = self._extract_page_text(page)
+                if self.cache:
+                    self.cache.put(page_hash, extractor, text)
+
+            docs.append(PageDocument(
+                page_content=text,
+                metadata={'page': page_number, 'page_hash': page_hash, 'source_type': 'pdf'}
+            ))
+
+        if self.cache:
+            self.cache.commit()
+        return docs
+
+    def _resolve_pdf_extractor(self) -> str:
+        """
+        Check pypdf and name the extractor for the page cache
+        التحقق من pypdf وتسمية المستخرج في ذاكرة الصفحات
+
+        The key carries the pypdf version, so text cached by another
+        extractor or release is never served as layout text.
+
+        Raises:
+            ImportError: Layout mode requested but pypdf lacks it | pypdf لا يدعم وضع التخطيط
+        """
+        import pypdf
+
+        if not self.config.layout_mode:
+            self._pdf_extractor = f"pypdf-{pypdf.__version__}"
+        elif 'extraction_mode' in inspect.signature(pypdf.PageObject.extract_text).parameters:
+            self._pdf_extractor = f"pypdf-{pypdf.__version__}-layout"
+        else:
+            raise ImportError(
+                f"PDF layout mode needs pypdf>=4.0 (installed {pypdf.__version__}); "
+                f"run pip install -r requirements.txt | وضع التخطيط يتطلب pypdf 4.0 أو أحدث"
+            )
+        return self._pdf_extractor
+
+    def _extract_page_text(self, page: Any) -> str:
+        """Extract text, in layout mode when configured | استخراج النص بوضع التخطيط"""
+        if self.config.layout_mode:
+            return page.extract_text(extraction_mode="layout")
+        return page.extract_text()
+
+    def load_text(self, path: Path) -> List[PageDocument]:
+        """Load a plain text/markdown file | تحميل ملف نصي"""
+        return [PageDocument(
+            page_content=path.read_text(encoding='utf-8', errors='replace'),
+            metadata={'page': 0, 'source_type': 'text'}
+        )]
+
+    def load_image(self, path: Path) -> List[PageDocument]:
+        """
+        Serve cached OCR text or queue the image for the OCR pool
+        إرجاع نص التعرف الضوئي المخزن أو إضافة الصورة للانتظار
+        """
+        page_hash = hashlib.sha256(path.read_bytes()).hexdigest()
+        extractor = f"ocr-{self.config.ocr_languages}"
+        text = self.cache.get(page_hash, extractor) if self.cache else None
+        if text is not None:
+            return [self._image_document(text, page_hash)]
+
+        if not self.config.enable_ocr:
+            logger.warning(f"Skipping image without OCR enabled: {path.name} | تخطي صورة")
+            return []
+
+        self._pending_images.append(path)
+        return []
+
+    def _image_document(self, text: str, page_hash: str) -> PageDocument:
+        return PageDocument(
+            page_content=text,
+            metadata={'page': 0, 'page_hash': page_hash, 'source_type': 'image'}
+        )
+
+    def flush_ocr(self) -> List[PageDocument]:
+        """
+        OCR all queued images in a process pool | التعرف الضوئي للصور المنتظرة
+
+        Returns:
+            Page documents for the OCR'd images | صفحات الصور المعالجة
+        """
+        if not self._pending_images:
+            return []
+
+        try:
+            import pytesseract  # noqa: F401
+            from PIL import Image  # noqa: F401
+        except ImportError as e:
+            logger.error(f"OCR unavailable ({e}); install pytesseract and Pillow")
+            self._pending_images = []
+            return []
+
+        paths = self._pending_images
+        self._pending_images = []
+        extractor = f"ocr-{self.config.ocr_languages}"
+        logger.info(f"Running OCR on {len(paths)} images | التعرف الضوئي على {len(paths)} صورة")
+
+        docs = []
+        with ProcessPoolExecutor(max_workers=self.config.ocr_workers) as pool:
+            texts = pool.map(_ocr_image, [str(p) for p in paths],
+                             [self.config.ocr_languages] * len(paths))
+            for path, text in zip(paths, texts):
+                page_hash = hashlib.sha256(path.read_bytes()).hexdigest()
+                if self.cache:
+                    self.cache.put(page_hash, extractor, text)
+                docs.extend(self._annotate([self._image_document(text, page_hash)], path))
+
+        if self.cache:
+            self.cache.commit()
+        return docs
+
+    def close(self) -> None:
+        """Close the page cache | إغلاق ذاكرة الصفحات"""
+        if self.cache:
+            self.cache.close()
@@ -0,0 +1,476 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=============================================================================
+IntelliPath - Course Eligibility Engine
+المرشد الأكاديمي الذكي - محرك أهلية المقررات
+=============================================================================
+Answers "which courses can this student take next?" from an index built
+once over the prerequisite DAG:
+
+- Per course, direct and transitive prerequisites as integer bitsets, so
+  a single student check is a few AND operations per course.
+- A CSR edge list (prerequisite indices per course), so the whole student
+  body is scored in vectorized chunks: completed prerequisites per
+  (student, course) are gathered over the edges and summed per course.
+
+Completed courses come from student_academic_records (passed rows only).
+يجيب عن "ما المقررات المتاحة للطالب؟" عبر فهرس يُبنى مرة واحدة على شبكة
+المتطلبات: مجموعات بتات للفحص الفردي، وقائمة حواف مضغوطة لتقييم جميع
+الطلاب دفعة واحدة.
+=============================================================================
+Version: 1.0.0 | الإصدار: 1.0.0
+Last Updated: 2026-10-19 | آخر تحديث: 2026-10-19
+=============================================================================
+"""
+
+import sys
+import json
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from dataclasses import dataclass, field, asdict
+from collections import deque
+
+from academic_records import PASS_MARK, load_records, passed_mask, student_majors
+from course_catalog import CourseCatalog, load_catalog
+from settings import Clients, Settings, SettingsError, lazy_import, load_settings, setup_logging
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas', 'pandas openpyxl')
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# DATA CLASSES | فئات البيانات
+# =============================================================================
+
+@dataclass
+class Eligibility:
+    """
+    Eligibility report for one student | تقرير الأهلية لطالب واحد
+    """
+    student_id: Optional[str]  # Student number | الرقم الجامعي
+    major: Optional[str]  # Major used to pick candidate courses | التخصص
+    completed: List[str] = field(default_factory=list)  # Passed courses | المقررات المنجزة
+    eligible: List[str] = field(default_factory=list)  # Open for registration | المقررات المتاحة
+    blocked: Dict[str, List[str]] = field(default_factory=dict)  # Course -> missing prerequisites | المقررات المحجوبة
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+# =============================================================================
+# PREREQUISITE INDEX | فهرس المتطلبات
+# =============================================================================
+
+class PrerequisiteIndex:
+    """
+    Reachability index over the prerequisite DAG | فهرس الوصول لشبكة المتطلبات
+    """
+
+    def __init__(self, codes: Sequence[str], pairs: Iterable[Tuple[str, str]],
+                 majors: Optional[Dict[str, Optional[str]]] = None):
+        """
+        Build the index | بناء الفهرس
+
+        Args:
+            codes: Course codes | رموز المقررات
+            pairs: (prerequisite, course) pairs | أزواج (المتطلب، المقرر)
+            majors: Course code -> owning major | التخصص المالك لكل مقرر
+        """
+        self.codes: List[str] = list(codes)
+        self.position: Dict[str, int] = {code: i for i, code in enumerate(self.codes)}
+        self.majors: List[Optional[str]] = [(majors or {}).get(code) for code in self.codes]
+
+        n = len(self.codes)
+        prerequisites: List[set] = [set() for _ in range(n)]
+        for prereq, course in pairs:
+            p, c = self.position.get(prereq), self.position.get(course)
+            if p is not None and c is not None and p != c:
+                prerequisites[c].add(p)
+        self.prerequisites: List[List[int]] = [sorted(p) for p in prerequisites]
+
+        # Direct prerequisites as bitsets | المتطلبات المباشرة كمجموعات بتات
+        self.direct: List[int] = [sum(1 << p for p in prereqs) for prereqs in self.prerequisites]
+
+        # CSR layout for the vectorized pass | تخطيط مضغوط للتقييم المتجه
+        self.indegree = np.array([len(p) for p in self.prerequisites], dtype=np.int16)
+        self.indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(self.indegree, out=self.indptr[1:])
+        self.indices = np.array([p for prereqs in self.prerequisites for p in prereqs], dtype=np.int64)
+
+        self.order = self._topological_order()
+        self.rank: List[int] = [0] * n
+        for r, i in enumerate(self.order):
+            self.rank[i] = r
+        # Transitive prerequisites (ancestors) as bitsets | المتطلبات المتعدية
+        self.ancestors: List[int] = [0] * n
+        for c in self.order:
+            mask = 0
+            for p in self.prerequisites[c]:
+                mask |= (1 << p) | self.ancestors[p]
+            self.ancestors[c] = mask
+
+        logger.info(
+            f"Prerequisite index: {n} courses, {len(self.indices)} edges | "
+            f"فهرس المتطلبات: {n} مقرر"
+        )
+
+    @classmethod
+    def from_catalog(cls, catalog: CourseCatalog) -> 'PrerequisiteIndex':
+        """
+        Build from a CourseCatalog | البناء من كتالوج المقررات
+        """
+        pairs = catalog.prerequisite_pairs()
+        if not pairs:
+            logger.warning(
+                "Catalog has no prerequisite edges; every course counts as open | "
+                "لا توجد متطلبات في الكتالوج"
+            )
+        majors = {code: course.major or course.department for code, course in catalog.courses.items()}
+        return cls(list(catalog.courses), pairs, majors)
+
+    def _topological_order(self) -> List[int]:
+        """
+        Kahn order, prerequisites first; cycle members are appended last
+        ترتيب طوبولوجي؛ المقررات ضمن الحلقات تُلحق في النهاية
+        """
+        n = len(self.codes)
+        dependents: List[List[int]] = [[] for _ in range(n)]
+        remaining = [len(p) for p in self.prerequisites]
+        for c, prereqs in enumerate(self.prerequisites):
+            for p in prereqs:
+                dependents[p].append(c)
+
+        queue = deque(i for i in range(n) if remaining[i] == 0)
+        order: List[int] = []
+        while queue:
+            i = queue.popleft()
+            order.append(i)
+            for d in dependents[i]:
+                remaining[d] -= 1
+                if remaining[d] == 0:
+                    queue.append(d)
+
+        if len(order) < n:
+            cyclic = [i for i in range(n) if remaining[i] > 0]
+            logger.warning(
+                f"Prerequisite cycle among {len(cyclic)} courses, e.g. "
+                f"{', '.join(self.codes[i] for i in cyclic[:5])} | حلقة في المتطلبات"
+            )
+            order.extend(cyclic)
+        return order
+
+    # -------------------------------------------------------------------------
+    # Bitset helpers | أدوات مجموعات البتات
+    # -------------------------------------------------------------------------
+
+    def mask(self, codes: Iterable[str]) -> int:
+        """Bitset of the known codes | مجموعة بتات للرموز المعروفة"""
+        bits = 0
+        for code in codes:
+            i = self.position.get(code)
+            if i is not None:
+                bits |= 1 << i
+        return bits
+
+    def codes_of(self, bits: int) -> List[str]:
+        """Codes in a bitset, in topological order | الرموز ضمن مجموعة بتات"""
+        members = []
+        while bits:
+            low = bits & -bits
+            members.append(low.bit_length() - 1)
+            bits ^= low
+        return [self.codes[i] for i in sorted(members, key=self.rank.__getitem__)]
+
+    def candidates(self, major: Optional[str] = None) -> List[int]:
+        """
+        Courses offered to a major: its own plus unassigned ones
+        المقررات المتاحة لتخصص: مقرراته والمقررات العامة
+        """
+        if major is None or major not in self.majors:
+            return list(range(len(self.codes)))
+        return [i for i, m in enumerate(self.majors) if m is None or m == major]
+
+    # -------------------------------------------------------------------------
+    # Queries | الاستعلامات
+    # -------------------------------------------------------------------------
+
+    def check(self, completed: Iterable[str], major: Optional[str] = None,
+              student_id: Optional[str] = None) -> Eligibility:
+        """
+        Eligible and blocked courses for one student | الأهلية لطالب واحد
+
+        Args:
+            completed: Passed course codes | المقررات المنجزة
+            major: Student major (None: whole catalog) | التخصص
+            student_id: Student number for the report | الرقم الجامعي
+
+        Returns:
+            Eligibility report; blocked courses list their missing direct
+            prerequisites | تقرير الأهلية
+        """
+        done = self.mask(completed)
+        report = Eligibility(student_id=student_id, major=major, completed=self.codes_of(done))
+        for i in self.candidates(major):
+            if done >> i & 1:
+                continue
+            missing = self.direct[i] & ~done
+            if missing:
+                report.blocked[self.codes[i]] = self.codes_of(missing)
+            else:
+                report.eligible.append(self.codes[i])
+        return report
+
+    def outstanding(self, code: str, completed: Iterable[str]) -> List[str]:
+        """
+        Every course still needed before `code`, prerequisites first
+        كل المقررات المتبقية قبل مقرر ما، المتطلبات أولاً
+        """
+        i = self.position.get(code)
+        if i is None:
+            return []
+        return self.codes_of(self.ancestors[i] & ~self.mask(completed))
+
+    def candidate_rows(self, majors: Sequence[Optional[str]]) -> Tuple['np.ndarray', 'np.ndarray']:
+        """
+        Candidate-course mask per major, and each student's row in it
+        مصفوفة المقررات المرشحة لكل تخصص وصف كل طالب فيها
+
+        Args:
+            majors: Major per student (None when unknown) | تخصص كل طالب
+
+        Returns:
+            (masks, rows); row -1 (unknown major) is the whole catalog
+        """
+        major_names = sorted({m for m in self.majors if m is not None})
+        offered = np.ones((len(major_names) + 1, len(self.codes)), dtype=bool)
+        course_majors = np.array([m if m is not None else '' for m in self.majors], dtype=object)
+        for k, name in enumerate(major_names):
+            offered[k] = (course_majors == name) | (course_majors == '')
+        return offered, pd.Index(major_names).get_indexer(pd.Index(majors, dtype=object))
+
+    def descendant_counts(self) -> 'np.ndarray':
+        """
+        Courses that transitively require each course | عدد المقررات التابعة لكل مقرر
+
+        The ancestor bitsets are unpacked into a boolean matrix, one row
+        per course, and summed by column.
+        """
+        n = len(self.codes)
+        width = (n + 7) // 8
+        packed = np.frombuffer(
+            b''.join(mask.to_bytes(width, 'little') for mask in self.ancestors), dtype=np.uint8
+        ).reshape(n, width)
+        return np.unpackbits(packed, axis=1, count=n, bitorder='little').sum(axis=0, dtype=np.int64)
+
+    def passed_cells(self, student_ids: Sequence[str], records: 'pd.DataFrame',
+                     pass_mark: float = PASS_MARK) -> Tuple['np.ndarray', 'np.ndarray']:
+        """
+        (student row, course column) of every passed record, sorted by row
+        خلايا المقررات المنجزة مرتبة حسب الطالب
+
+        Args:
+            student_ids: Row order | ترتيب الصفوف
+            records: student_academic_records rows | السجلات الأكاديمية
+            pass_mark: Passing grade | درجة النجاح
+        """
+        rows = pd.Index(student_ids).get_indexer(records['student_id'])
+        cols = records['course_code'].map(self.position)
+        keep = (rows >= 0) & cols.notna().to_numpy() & passed_mask(records, pass_mark).to_numpy()
+        rows, cols = rows[keep], cols[keep].to_numpy(dtype=np.int64)
+        order = np.argsort(rows, kind='stable')
+        return rows[order], cols[order]
+
+    def satisfied(self, done: 'np.ndarray') -> 'np.ndarray':
+        """
+        Completed direct prerequisites per (student, course), vectorized
+        عدد المتطلبات المنجزة لكل (طالب، مقرر)
+
+        Gathers the completion flags along the CSR edge list and sums each
+        course's segment with np.add.reduceat. Courses without
+        prerequisites are skipped so the segments stay contiguous.
+        """
+        counts = np.zeros(done.shape, dtype=np.int16)
+        if not len(self.indices):
+            return counts
+        has_prereqs = np.flatnonzero(self.indegree)
+        gathered = done[:, self.indices].astype(np.int16)
+        counts[:, has_prereqs] = np.add.reduceat(gathered, self.indptr[has_prereqs], axis=1)
+        return counts
+
+    def bulk(self, records: 'pd.DataFrame', pass_mark: float = PASS_MARK,
+             chunk_size: int = 1024) -> Tuple['pd.DataFrame', 'pd.DataFrame']:
+        """
+        Score every student in the records in one vectorized pass
+        تقييم جميع الطلاب دفعة واحدة
+
+        Args:
+            records: student_academic_records rows | السجلات الأكاديمية
+            pass_mark: Passing grade | درجة النجاح
+            chunk_size: Students per block, bounds memory to
+                        chunk_size x edges | الطلاب لكل كتلة
+
+        Returns:
+            Per-student summary (completed / eligible / blocked counts and
+            eligible codes) and per-course demand (eligible students)
+            ملخص لكل طالب وطلب متوقع لكل مقرر
+        """
+        majors = student_majors(records)
+        student_ids = pd.unique(records['student_id'])
+        offered, major_row = self.candidate_rows(majors.reindex(student_ids))
+
+        rows, cols = self.passed_cells(student_ids, records, pass_mark)
+        bounds = np.searchsorted(rows, np.arange(0, len(student_ids) + chunk_size, chunk_size))
+
+        summaries: List['pd.DataFrame'] = []
+        demand = np.zeros(len(self.codes), dtype=np.int64)
+        blocked_demand = np.zeros(len(self.codes), dtype=np.int64)
+        codes = np.array(self.codes, dtype=object)
+
+        for block, start in enumerate(range(0, len(student_ids), chunk_size)):
+            ids = student_ids[start:start + chunk_size]
+            lo, hi = bounds[block], bounds[block + 1]
+            done = np.zeros((len(ids), len(self.codes)), dtype=bool)
+            done[rows[lo:hi] - start, cols[lo:hi]] = True
+            open_ = offered[major_row[start:start + chunk_size]] & ~done
+            eligible = open_ & (self.satisfied(done) == self.indegree)
+            blocked = open_ & ~eligible
+
+            demand += eligible.sum(axis=0)
+            blocked_demand += blocked.sum(axis=0)
+            summaries.append(pd.DataFrame({
+                'student_id': ids,
+                'major': majors.reindex(ids).to_numpy(),
+                'completed': done.sum(axis=1),
+                'eligible': eligible.sum(axis=1),
+                'blocked': blocked.sum(axis=1),
+                'eligible_courses': [' '.join(codes[row]) for row in eligible],
+            }))
+
+        students = pd.concat(summaries, ignore_index=True) if summaries else pd.DataFrame(
+            columns=['student_id', 'major', 'completed', 'eligible', 'blocked', 'eligible_courses']
+        )
+        courses = pd.DataFrame({
+            'course_code': self.codes,
+            'major': self.majors,
+            'eligible_students': demand,
+            'blocked_students': blocked_demand,
+        }).sort_values('eligible_students', ascending=False, kind='stable')
+        logger.info(
+            f"Scored {len(students)} students against {len(self.codes)} courses | "
+            f"تم تقييم {len(students)} طالب"
+        )
+        return students, courses
+
+
+# =============================================================================
+# MAIN ENTRY POINT | نقطة الدخول الرئيسية
+# =============================================================================
+
+def add_arguments(parser: Any) -> None:
+    """
+    Add eligibility arguments to a parser | إضافة وسائط الأهلية
+    """
+    parser.add_argument(
+        '--catalog',
+        help="Knowledge graph export or 'supabase' (default: bundled export) | مصدر الكتالوج"
+    )
+    parser.add_argument(
+        '--records',
+        help="student_academic_records CSV/Excel or 'supabase' | مصدر السجلات الأكاديمية"
+    )
+    parser.add_argument('--student', help='Report one student | تقرير طالب واحد')
+    parser.add_argument('--completed', nargs='+', help='Check an ad-hoc set of passed courses | مقررات منجزة')
+    parser.add_argument('--major', help='Limit candidates to a major | حصر المقررات بتخصص')
+    parser.add_argument('--pass-mark', type=float, default=PASS_MARK, help='Passing grade (default: 60) | درجة النجاح')
+    parser.add_argument('--output', help='Bulk mode: per-student CSV | ملف نتائج الطلاب')
+    parser.add_argument('--demand-output', help='Bulk mode: per-course demand CSV | ملف الطلب على المقررات')
+    parser.add_argument('--json', action='store_true', help='Print JSON | طباعة JSON')
+
+
+def _print_report(report: Eligibility, index: PrerequisiteIndex, as_json: bool) -> None:
+    if as_json:
+        print(json.dumps(report.to_dict(), ensure_ascii=False, indent=2))
+        return
+    print(f"Student: {report.student_id or '-'} | Major: {report.major or '-'}")
+    print(f"Completed: {len(report.completed)}")
+    print(f"Eligible ({len(report.eligible)}): {' '.join(report.eligible)}")
+    print(f"Blocked ({len(report.blocked)}):")
+    for code, missing in report.blocked.items():
+        chain = index.outstanding(code, report.completed)
+        extra = f" (chain: {' -> '.join(chain)})" if len(chain) > len(missing) else ''
+        print(f"  {code}: missing {', '.join(missing)}{extra}")
+
+
+def run_command(args: Any, settings: Settings, clients: Optional[Clients] = None) -> int:
+    """
+    Run eligibility checks from parsed arguments | تشغيل فحص الأهلية من الوسائط
+
+    Returns:
+        Process exit code | رمز الخروج
+    """
+    if args.catalog == 'supabase' or args.records == 'supabase':
+        settings.require('supabase_url', 'supabase_key')
+    clients = clients or Clients(settings)
+    client = clients.supabase if 'supabase' in (args.catalog, args.records) else None
+
+    index = PrerequisiteIndex.from_catalog(load_catalog(args.catalog, client=client))
+
+    if args.completed is not None:
+        _print_report(index.check(args.completed, major=args.major), index, args.json)
+        return 0
+
+    if not args.records:
+        logger.error("Pass --records or --completed | حدد السجلات أو المقررات المنجزة")
+        return 2
+    records = load_records(args.records, client=client)
+
+    if args.student:
+        mine = records[records['student_id'] == args.student]
+        if mine.empty:
+            logger.error(f"No records for student {args.student} | لا توجد سجلات للطالب")
+            return 1
+        major = args.major or student_majors(mine).get(args.student)
+        completed = mine.loc[passed_mask(mine, args.pass_mark), 'course_code']
+        _print_report(index.check(completed, major=major, student_id=args.student), index, args.json)
+        return 0
+
+    students, courses = index.bulk(records, pass_mark=args.pass_mark)
+    if args.output:
+        students.to_csv(args.output, index=False, encoding='utf-8')
+    if args.demand_output:
+        courses.to_csv(args.demand_output, index=False, encoding='utf-8')
+    summary = {
+        'students': len(students),
+        'mean_eligible': round(float(students['eligible'].mean()), 2) if len(students) else 0.0,
+        'no_eligible_courses': int((students['eligible'] == 0).sum()),
+        'top_demand': courses.head(10)[['course_code', 'eligible_students']].to_dict('records'),
+    }
+    print(json.dumps(summary, ensure_ascii=False, indent=2, default=int))
+    return 0
+
+
+def main():
+    """
+    Main entry point | نقطة الدخول الرئيسية
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='IntelliPath course eligibility | أهلية المقررات'
+    )
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    setup_logging()
+    try:
+        sys.exit(run_command(args, load_settings()))
+    except (SettingsError, ImportError, ValueError) as e:
+        logger.error(str(e))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
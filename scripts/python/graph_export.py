@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=============================================================================
+IntelliPath - Knowledge Graph Export
+المرشد الأكاديمي الذكي - تصدير الرسم المعرفي
+=============================================================================
+Exports the Neo4j graph to the JSON layout of public/data/knowledge_graph.json
+(nodes grouped by label, relationships with typed endpoints). Relationship
+endpoints carry the node id and natural key so CourseCatalog can resolve them.
+يصدر رسم Neo4j إلى صيغة knowledge_graph.json مع أطراف علاقات قابلة للحل.
+=============================================================================
+Version: 1.0.0 | الإصدار: 1.0.0
+Last Updated: 2026-10-19 | آخر تحديث: 2026-10-19
+=============================================================================
+"""
+
+import os
+import sys
+import json
+import logging
+from typing import Any, Dict, List, Optional
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+from course_catalog import DEFAULT_KNOWLEDGE_GRAPH
+from graph_sync import ACTIVE_GENERATION_QUERY
+from settings import Clients, Settings, SettingsError, load_settings, setup_logging
+
+logger = logging.getLogger(__name__)
+
+# Properties that identify a node across exports | خصائص تعريف العقدة
+NATURAL_KEYS = ('code', 'name')
+
+
+def _plain(value: Any) -> Any:
+    """JSON-safe property value; temporal types become ISO strings | قيمة قابلة للتسلسل"""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    if hasattr(value, 'iso_format'):
+        return value.iso_format()
+    return str(value)
+
+
+def _endpoint(node_id: str, labels: List[str], props: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'id': node_id,
+        'labels': labels,
+        'properties': {k: _plain(props[k]) for k in NATURAL_KEYS if props.get(k) is not None},
+    }
+
+
+def _live(var: str) -> str:
+    """Cypher predicate: node is in the live generation (or unversioned) | شرط الجيل الحي"""
+    return f"({var}.generation IS NULL OR $generation IS NULL OR {var}.generation = $generation)"
+
+
+def export_graph(driver: Any, output: str, database: Optional[str] = None,
+                 fetch_size: int = 2000) -> Dict[str, int]:
+    """
+    Export all nodes and relationships to a JSON file | تصدير العقد والعلاقات
+
+    Args:
+        driver: Neo4j driver | برنامج تشغيل Neo4j
+        output: Output JSON path | ملف الإخراج
+        database: Database name (default database if None) | اسم قاعدة البيانات
+        fetch_size: Records per network fetch | السجلات لكل جلب
+
+    Returns:
+        Node and relationship counts | أعداد العقد والعلاقات
+    """
+    nodes: Dict[str, List[Dict[str, Any]]] = {}
+    relationships: List[Dict[str, Any]] = []
+    label_counts: Counter = Counter()
+    type_counts: Counter = Counter()
+
+    with driver.session(database=database, fetch_size=fetch_size) as session:
+        # Only the live generation; shadow rebuilds stay out | الجيل الحي فقط
+        generation = session.run(ACTIVE_GENERATION_QUERY).single()['generation']
+        
+        logger.info("Exporting nodes | تصدير العقد")
+        for record in session.run(
+            f"MATCH (n) WHERE {_live('n')} AND NOT n:GraphVersion "
+            "RETURN elementId(n) AS id, labels(n) AS labels, properties(n) AS props",
+            generation=generation
+        ):
+            labels = list(record['labels'])
+            primary = labels[0] if labels else 'Node'
+            nodes.setdefault(primary, []).append({
+                'id': record['id'],
+                'labels': labels,
+                'properties': {k: _plain(v) for k, v in record['props'].items() if k != 'generation'},
+            })
+            label_counts.update(labels)
+
+        logger.info("Exporting relationships | تصدير العلاقات")
+        for record in session.run(
+            f"MATCH (a)-[r]->(b) WHERE {_live('a')} AND {_live('b')} "
+            "RETURN type(r) AS type, properties(r) AS props, "
+            "elementId(a) AS start_id, labels(a) AS start_labels, a{.code, .name} AS start_keys, "
+            "elementId(b) AS end_id, labels(b) AS end_labels, b{.code, .name} AS end_keys",
+            generation=generation
+        ):
+            relationships.append({
+                'type': record['type'],
+                'start_node': _endpoint(record['start_id'], list(record['start_labels']), record['start_keys']),
+                'end_node': _endpoint(record['end_id'], list(record['end_labels']), record['end_keys']),
+                'properties': {k: _plain(v) for k, v in record['props'].items()},
+            })
+            type_counts[record['type']] += 1
+
+    # Counts are strings, as in the original export | الأعداد نصوص كما في التصدير الأصلي
+    node_labels = {label: str(count) for label, count in sorted(label_counts.items())}
+    relationship_types = {t: str(count) for t, count in type_counts.most_common()}
+    total_nodes = sum(len(v) for v in nodes.values())
+    statistics = {
+        'total_nodes': str(total_nodes),
+        'total_relationships': str(len(relationships)),
+        'node_labels_count': str(len(node_labels)),
+        'relationship_types_count': str(len(relationship_types)),
+    }
+    data = {
+        'export_timestamp': datetime.now().isoformat(),
+        'database_info': {
+            'node_labels': node_labels,
+            'relationship_types': relationship_types,
+            'total_nodes': statistics['total_nodes'],
+            'total_relationships': statistics['total_relationships'],
+        },
+        'statistics': statistics,
+        'node_labels': node_labels,
+        'relationship_types': relationship_types,
+        'nodes': {label: nodes[label] for label in sorted(nodes)},
+        'relationships': relationships,
+        'metadata': {},
+    }
+
+    # Write via a temporary file so readers never see half an export | كتابة ذرية
+    target = Path(output)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(target.name + '.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, target)
+
+    logger.info(f"Exported {total_nodes} nodes and {len(relationships)} relationships to {output}")
+    return {'nodes': total_nodes, 'relationships': len(relationships)}
+
+
+# =============================================================================
+# MAIN ENTRY POINT | نقطة الدخول الرئيسية
+# =============================================================================
+
+def add_arguments(parser: Any) -> None:
+    """
+    Add export arguments to a parser | إضافة وسائط التصدير
+    """
+    parser.add_argument(
+        '--output',
+        default=str(DEFAULT_KNOWLEDGE_GRAPH),
+        help='Output JSON file (default: public/data/knowledge_graph.json) | ملف الإخراج'
+    )
+    parser.add_argument('--database', help='Neo4j database name | اسم قاعدة البيانات')
+
+
+def run_command(args: Any, settings: Settings, clients: Optional[Clients] = None) -> int:
+    """
+    Run the export from parsed arguments | تشغيل التصدير من الوسائط
+
+    Returns:
+        Process exit code | رمز الخروج
+    """
+    settings.require('neo4j_uri', 'neo4j_password')
+    own_clients = clients is None
+    clients = clients or Clients(settings)
+    try:
+        export_graph(clients.neo4j, args.output, database=args.database or settings.neo4j_database)
+    finally:
+        if own_clients:
+            clients.close()
+    return 0
+
+
+def main():
+    """
+    Main entry point | نقطة الدخول الرئيسية
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='IntelliPath knowledge graph export | تصدير الرسم المعرفي'
+    )
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    setup_logging()
+    try:
+        sys.exit(run_command(args, load_settings()))
+    except (SettingsError, ImportError) as e:
+        logger.error(str(e))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
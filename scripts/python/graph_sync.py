@@ -14,39 +14,20 @@ Last Updated: 2026-01-02 | آخر تحديث: 2026-01-02
 =============================================================================
 """
 
-import os
 import sys
 import json
+import hashlib
 import logging
-from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass
+from typing import Callable, Dict, List, Any, Optional, Tuple
+from dataclasses import dataclass, field
 from datetime import datetime
+from operator import itemgetter
 
-# Third-party imports | المكتبات الخارجية
-try:
-    from neo4j import GraphDatabase, Driver
-    from supabase import create_client, Client
-    from dotenv import load_dotenv
-except ImportError as e:
-    print(f"Missing required package: {e}")
-    print("Install with: pip install neo4j supabase python-dotenv")
-    sys.exit(1)
+from course_catalog import _paginate
+from instrumentation import Instrumentation, Span, add_instrumentation_arguments, instrumented_run, json_size
+from settings import NEO4J_DRIVER_OPTIONS, Clients, Settings, SettingsError, load_settings, setup_logging
 
-# Load environment variables | تحميل متغيرات البيئة
-load_dotenv()
-
-# =============================================================================
-# LOGGING CONFIGURATION | إعداد التسجيل
-# =============================================================================
-
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler('graph_sync.log', encoding='utf-8')
-    ]
-)
+# Logging is configured by the entry point | يُعد التسجيل من نقطة الدخول
 logger = logging.getLogger(__name__)
 
 
@@ -67,10 +48,91 @@ class SyncConfig:
     neo4j_uri: str
     neo4j_user: str
     neo4j_password: str
+    neo4j_database: Optional[str] = None  # Target database, skips home-db lookup | قاعدة البيانات الهدف
+    
+    # Driver tuning, defaults shared with Clients.neo4j | ضبط برنامج التشغيل
+    max_connection_pool_size: int = NEO4J_DRIVER_OPTIONS['max_connection_pool_size']
+    connection_acquisition_timeout: float = NEO4J_DRIVER_OPTIONS['connection_acquisition_timeout']
+    fetch_size: int = NEO4J_DRIVER_OPTIONS['fetch_size']
+    keep_alive: bool = NEO4J_DRIVER_OPTIONS['keep_alive']
+    max_transaction_retry_time: float = NEO4J_DRIVER_OPTIONS['max_transaction_retry_time']
     
     # Sync options | خيارات المزامنة
-    clear_existing: bool = False  # Clear existing data before sync | مسح البيانات قبل المزامنة
-    batch_size: int = 100  # Batch size for operations | حجم الدفعة للعمليات
+    rebuild: bool = False  # Blue/green rebuild into a new generation | إعادة بناء في جيل جديد
+    batch_size: int = 100  # Rows per write transaction | الصفوف لكل معاملة كتابة
+    delete_batch_size: int = 10000  # Rows per transaction when dropping a generation | الصفوف لكل معاملة حذف
+    dry_run: bool = False  # Report the diff without writing | عرض الفروقات دون كتابة
+    page_size: int = 1000  # Supabase rows per request, at most PostgREST max-rows | الصفوف لكل طلب
+    
+    def driver_options(self) -> Dict[str, Any]:
+        """Keyword arguments for GraphDatabase.driver | وسائط إنشاء برنامج التشغيل"""
+        return {
+            'max_connection_pool_size': self.max_connection_pool_size,
+            'connection_acquisition_timeout': self.connection_acquisition_timeout,
+            'fetch_size': self.fetch_size,
+            'keep_alive': self.keep_alive,
+            'max_transaction_retry_time': self.max_transaction_retry_time,
+        }
+
+
+# =============================================================================
+# GRAPH GENERATIONS | أجيال الرسم البياني
+# =============================================================================
+# Synced nodes carry a `generation` property. The pointer node
+# (:GraphVersion {name: 'active'}) names the live generation; a rebuild
+# loads generation N+1 beside it, flips the pointer in one transaction
+# and then drops generation N in batches. Every reader (graph_export,
+# career_relevance and the neo4j-query / sync-neo4j edge functions) resolves
+# the pointer first and keeps only live or unversioned nodes:
+#     OPTIONAL MATCH (v:GraphVersion {name: 'active'})
+#     MATCH (c:Course) WHERE c.generation IS NULL OR c.generation = v.generation ...
+# Relationships no sync step writes (COVERS_TOPIC, TEACHES_TOOL, BELONGS_TO,
+# RELATED_TO, ...) are copied onto the rebuilt nodes before the flip.
+# العقد المتزامنة تحمل خاصية generation، وعقدة المؤشر تحدد الجيل الحي؛
+# إعادة البناء تحمّل جيلاً جديداً ثم تبدّل المؤشر ذرياً وتحذف القديم على دفعات،
+# وتنسخ العلاقات غير المتزامنة إلى الجيل الجديد قبل التبديل.
+
+# Labels written by GraphSync and their identity property | التسميات وخاصية الهوية
+SYNCED_KEYS = {'Course': 'code', 'Major': 'name', 'Skill': 'name', 'CareerPath': 'name'}
+SYNCED_LABELS = tuple(SYNCED_KEYS)
+
+# Relationship types every sync run recreates | أنواع العلاقات التي تعيد المزامنة إنشاءها
+SYNCED_RELATIONSHIPS = ('REQUIRES', 'TEACHES', 'PREPARES_FOR')
+
+ACTIVE_GENERATION_QUERY = (
+    "OPTIONAL MATCH (v:GraphVersion {name: 'active'}) RETURN v.generation AS generation"
+)
+
+
+# =============================================================================
+# CHANGE DETECTION | اكتشاف التغييرات
+# =============================================================================
+
+def property_hash(properties: Dict[str, Any]) -> str:
+    """
+    Stable hash of an entity's synced properties | بصمة ثابتة لخصائص الكيان
+    
+    Stored as `sync_hash` so unchanged entities are skipped on the next run.
+    """
+    payload = json.dumps(properties, sort_keys=True, ensure_ascii=False, default=str, separators=(',', ':'))
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _key(value: Any) -> Any:
+    """Hashable identity key; relationship keys arrive as lists | مفتاح قابل للتجزئة"""
+    return tuple(value) if isinstance(value, list) else value
+
+
+@dataclass
+class SyncDiff:
+    """
+    Planned changes for one entity type | التغييرات المخططة لنوع كيان
+    """
+    entity: str  # Entity name | اسم الكيان
+    created: List[Any] = field(default_factory=list)  # Keys missing from the graph | مفاتيح جديدة
+    changed: List[Any] = field(default_factory=list)  # Keys whose hash differs | مفاتيح متغيرة
+    deleted: List[Any] = field(default_factory=list)  # Keys missing from the source | مفاتيح محذوفة
+    unchanged: int = 0  # Entities skipped | الكيانات دون تغيير
 
 
 # =============================================================================
@@ -81,25 +143,45 @@ class GraphSync:
     """
     Main class for syncing data to Neo4j graph database
     الفئة الرئيسية لمزامنة البيانات إلى قاعدة Neo4j البيانية
+    
+    All Neo4j access goes through managed transactions (execute_write /
+    execute_read), so the driver retries transient failures such as
+    leader switches and deadlocks. Units of work are idempotent MERGE
+    batches and safe to re-run.
+    كل الوصول إلى Neo4j عبر معاملات مدارة يعيد برنامج التشغيل محاولتها عند
+    الأخطاء العابرة، ووحدات العمل دفعات MERGE آمنة للإعادة.
     """
     
-    def __init__(self, config: SyncConfig):
+    def __init__(self, config: SyncConfig, metrics: Optional[Instrumentation] = None,
+                 supabase: Any = None, driver: Any = None):
         """
         Initialize the sync | تهيئة المزامنة
         
         Args:
             config: Sync configuration | إعدادات المزامنة
+            metrics: Run instrumentation | أداة قياس التشغيل
+            supabase: Shared Supabase client (created if omitted) | عميل Supabase مشترك
+            driver: Shared Neo4j driver, left open by close() | برنامج تشغيل Neo4j مشترك
         """
         self.config = config
+        self.metrics = metrics or Instrumentation('graph_sync')
         
         # Initialize Supabase client | تهيئة عميل Supabase
-        self.supabase: Client = create_client(config.supabase_url, config.supabase_key)
+        if supabase is None:
+            from supabase import create_client
+            supabase = create_client(config.supabase_url, config.supabase_key)
+        self.supabase = supabase
         
         # Initialize Neo4j driver | تهيئة برنامج تشغيل Neo4j
-        self.neo4j_driver: Driver = GraphDatabase.driver(
-            config.neo4j_uri,
-            auth=(config.neo4j_user, config.neo4j_password)
-        )
+        self._owns_driver = driver is None
+        if driver is None:
+            from neo4j import GraphDatabase
+            driver = GraphDatabase.driver(
+                config.neo4j_uri,
+                auth=(config.neo4j_user, config.neo4j_password),
+                **config.driver_options()
+            )
+        self.neo4j_driver = driver
         
         # Statistics | الإحصائيات
         self.stats = {
@@ -109,17 +191,123 @@ class GraphSync:
             'prerequisites_synced': 0,
             'career_paths_synced': 0,
             'relationships_created': 0,
+            'unchanged': 0,
+            'deleted': 0,
+            'retries': 0,
             'errors': 0
         }
         
+        # Planned changes per entity | التغييرات المخططة لكل كيان
+        self.diffs: Dict[str, SyncDiff] = {}
+        
+        # Generation being written; set by prepare_generation() | الجيل المستهدف
+        self.generation = 0
+        self.unadopted = False  # Dry run against a graph without generations | تجربة دون أجيال
+        self.partial_reads: List[str] = []  # Tables read incompletely; no deletes | جداول مقروءة جزئياً
+        
         logger.info("Graph sync initialized | تم تهيئة مزامنة الرسم البياني")
     
     def close(self):
         """Close connections | إغلاق الاتصالات"""
-        if self.neo4j_driver:
+        if self.neo4j_driver and self._owns_driver:
             self.neo4j_driver.close()
             logger.info("Neo4j connection closed | تم إغلاق اتصال Neo4j")
     
+    def _fetch(self, stage: str, table: str, columns: str = '*',
+               active_only: bool = False) -> List[Dict[str, Any]]:
+        """
+        Read a whole Supabase table, page by page, inside a '<stage>.fetch' span
+        قراءة جدول Supabase كاملاً على صفحات ضمن مقطع قياس
+        
+        A single request is capped at PostgREST's max-rows, and a short read
+        would turn every row past the cap into a delete. A page that fails
+        marks the run's reads partial, which disables deletes (see _apply).
+        الطلب الواحد محدود بعدد صفوف؛ القراءة الجزئية توقف الحذف.
+        """
+        rows: List[Dict[str, Any]] = []
+        with self.metrics.span(f'{stage}.fetch') as span:
+            try:
+                for row in _paginate(self.supabase, table, columns, self.config.page_size, active_only):
+                    rows.append(row)
+            except Exception as e:
+                logger.error(f"Reading {table} stopped after {len(rows)} rows: {e} | قراءة جزئية")
+                self.stats['errors'] += 1
+                self.partial_reads.append(table)
+                span.error()
+            span.add(items=len(rows), bytes=json_size(rows))
+        return rows
+    
+    def _session(self) -> Any:
+        """Open a session on the configured database | فتح جلسة على قاعدة البيانات"""
+        return self.neo4j_driver.session(
+            database=self.config.neo4j_database,
+            fetch_size=self.config.fetch_size
+        )
+    
+    def _execute(self, session: Any, span: Span, query: str,
+                 parameters: Optional[Dict[str, Any]] = None, read: bool = False) -> List[Any]:
+        """
+        Run one query as a managed, retryable transaction
+        تنفيذ استعلام كمعاملة مدارة قابلة لإعادة المحاولة
+        
+        Args:
+            session: Neo4j session | جلسة Neo4j
+            span: Span that records driver retries | مقطع القياس
+            query: Cypher query | استعلام Cypher
+            parameters: Query parameters | معاملات الاستعلام
+            read: Route to a reader (execute_read) | التوجيه إلى قارئ
+        
+        Returns:
+            Records, consumed inside the transaction | السجلات
+        """
+        attempts = 0
+        
+        def work(tx: Any) -> List[Any]:
+            nonlocal attempts
+            attempts += 1
+            # Consume inside the transaction so a re-run starts clean | الاستهلاك داخل المعاملة
+            return list(tx.run(query, parameters or {}))
+        
+        try:
+            execute = session.execute_read if read else session.execute_write
+            return execute(work)
+        finally:
+            if attempts > 1:
+                span.retry(attempts - 1)
+                self.stats['retries'] += attempts - 1
+    
+    def _write_batches(self, stage: str, query: str, rows: List[Dict[str, Any]]) -> List[Any]:
+        """
+        Write rows in batches of config.batch_size, one transaction each
+        كتابة الصفوف على دفعات، معاملة لكل دفعة
+        
+        Args:
+            stage: Span stage prefix | بادئة مقطع القياس
+            query: Cypher query that UNWINDs $rows | استعلام يفك $rows
+            rows: Row parameters | الصفوف
+        
+        Returns:
+            Records from all committed batches | سجلات الدفعات المنفذة
+        """
+        records: List[Any] = []
+        with self.metrics.span(f'{stage}.write', items=len(rows)) as span, self._session() as session:
+            for start in range(0, len(rows), self.config.batch_size):
+                batch = rows[start:start + self.config.batch_size]
+                try:
+                    records.extend(self._execute(
+                        session, span, query, {'rows': batch, 'generation': self.generation}
+                    ))
+                except Exception as e:
+                    logger.error(f"Error writing {stage} batch at row {start}: {e}")
+                    self.stats['errors'] += len(batch)
+                    span.error()
+        return records
+    
+    @staticmethod
+    def _written(records: List[Any]) -> int:
+        """Sum the 'written' counts of batch results | مجموع الصفوف المكتوبة"""
+        return sum(record['written'] for record in records)
+    
     def verify_connection(self) -> bool:
         """
         Verify Neo4j connection | التحقق من اتصال Neo4j
@@ -128,10 +316,9 @@ class GraphSync:
             True if connected | True إذا متصل
         """
         try:
-            with self.neo4j_driver.session() as session:
-                result = session.run("RETURN 1 AS test")
-                record = result.single()
-                if record and record['test'] == 1:
+            with self.metrics.span('connect') as span, self._session() as session:
+                records = self._execute(session, span, "RETURN 1 AS test", read=True)
+                if records and records[0]['test'] == 1:
                     logger.info("Neo4j connection verified | تم التحقق من اتصال Neo4j")
                     return True
         except Exception as e:
@@ -144,56 +331,328 @@ class GraphSync:
         """
         logger.info("Setting up Neo4j constraints | إعداد قيود Neo4j")
         
+        # Keys are unique per generation so a rebuild can load beside the
+        # live graph; the single-key constraints of older versions block that
+        # المفاتيح فريدة لكل جيل؛ القيود القديمة أحادية المفتاح تمنع ذلك
+        legacy = [
+            "DROP CONSTRAINT course_code IF EXISTS",
+            "DROP CONSTRAINT major_name IF EXISTS",
+            "DROP CONSTRAINT skill_name IF EXISTS",
+            "DROP CONSTRAINT career_name IF EXISTS",
+        ]
+        
         constraints = [
             # Course constraints | قيود المقررات
-            "CREATE CONSTRAINT course_code IF NOT EXISTS FOR (c:Course) REQUIRE c.code IS UNIQUE",
+            "CREATE CONSTRAINT course_code_generation IF NOT EXISTS FOR (c:Course) REQUIRE (c.code, c.generation) IS UNIQUE",
             # Major constraints | قيود التخصصات
-            "CREATE CONSTRAINT major_name IF NOT EXISTS FOR (m:Major) REQUIRE m.name IS UNIQUE",
+            "CREATE CONSTRAINT major_name_generation IF NOT EXISTS FOR (m:Major) REQUIRE (m.name, m.generation) IS UNIQUE",
             # Skill constraints | قيود المهارات
-            "CREATE CONSTRAINT skill_name IF NOT EXISTS FOR (s:Skill) REQUIRE s.name IS UNIQUE",
+            "CREATE CONSTRAINT skill_name_generation IF NOT EXISTS FOR (s:Skill) REQUIRE (s.name, s.generation) IS UNIQUE",
             # CareerPath constraints | قيود المسارات المهنية
-            "CREATE CONSTRAINT career_name IF NOT EXISTS FOR (cp:CareerPath) REQUIRE cp.name IS UNIQUE",
+            "CREATE CONSTRAINT career_name_generation IF NOT EXISTS FOR (cp:CareerPath) REQUIRE (cp.name, cp.generation) IS UNIQUE",
+            # Generation pointer | مؤشر الجيل
+            "CREATE CONSTRAINT graph_version_name IF NOT EXISTS FOR (v:GraphVersion) REQUIRE v.name IS UNIQUE",
         ]
         
         indexes = [
             # Course indexes | فهارس المقررات
+            "CREATE INDEX course_code_lookup IF NOT EXISTS FOR (c:Course) ON (c.code)",
             "CREATE INDEX course_department IF NOT EXISTS FOR (c:Course) ON (c.department)",
             "CREATE INDEX course_year IF NOT EXISTS FOR (c:Course) ON (c.year_level)",
             # Full-text search index | فهرس البحث النصي
             "CREATE FULLTEXT INDEX course_search IF NOT EXISTS FOR (c:Course) ON EACH [c.name, c.name_ar, c.description_ar]"
         ]
         
-        with self.neo4j_driver.session() as session:
+        # Schema changes cannot share a transaction | تغييرات المخطط لا تشترك في معاملة
+        with self.metrics.span('constraints') as span, self._session() as session:
+            for statement in legacy:
+                self._execute(session, span, statement)
+            
             for constraint in constraints:
                 try:
-                    session.run(constraint)
+                    self._execute(session, span, constraint)
                 except Exception as e:
                     if "already exists" not in str(e).lower():
                         logger.warning(f"Constraint warning: {e}")
             
             for index in indexes:
                 try:
-                    session.run(index)
+                    self._execute(session, span, index)
                 except Exception as e:
                     if "already exists" not in str(e).lower():
                         logger.warning(f"Index warning: {e}")
         
         logger.info("Constraints and indexes set up | تم إعداد القيود والفهارس")
     
-    def clear_graph(self):
+    def active_generation(self) -> Optional[int]:
         """
-        Clear all nodes and relationships | مسح جميع العقد والعلاقات
+        Read the live generation from the pointer node | قراءة الجيل الحي
+        
+        Returns:
+            Live generation, or None before the first sync | الجيل الحي
         """
-        if not self.config.clear_existing:
-            return
-            
-        logger.warning("Clearing existing graph data | مسح بيانات الرسم البياني")
+        with self.metrics.span('generation') as span, self._session() as session:
+            records = self._execute(session, span, ACTIVE_GENERATION_QUERY, read=True)
+        return records[0]['generation'] if records else None
+    
+    def prepare_generation(self) -> Optional[int]:
+        """
+        Choose the generation to write and clear leftovers
+        اختيار الجيل المستهدف وتنظيف بقايا إعادة بناء سابقة
+        
+        Incremental syncs write into the live generation. A rebuild first
+        drops any half-built generation from an interrupted run, then
+        targets live + 1.
+        
+        Returns:
+            Live generation before this run | الجيل الحي قبل التشغيل
+        """
+        active = self.active_generation()
+        if self.config.dry_run:
+            # Diff against the live graph; nothing is adopted or dropped | المقارنة مع الجيل الحي
+            self.unadopted = active is None
+            self.generation = active or 0
+            return self.generation
+        if active is None:
+            # First sync with generations: adopt existing nodes as generation 0
+            # أول مزامنة بالأجيال: اعتماد العقد الحالية كجيل 0
+            active = 0
+            self._in_batches(
+                'adopt',
+                "MATCH (n) WHERE n.generation IS NULL AND ({labels}) "
+                "CALL {{ WITH n SET n.generation = 0 }} IN TRANSACTIONS OF {rows} ROWS"
+            )
+            self.switch_generation(None, 0)
+        
+        if self.config.rebuild:
+            self.drop_inactive_generations(active)
+            self.generation = active + 1
+            logger.info(f"Rebuilding into generation {self.generation} | إعادة البناء في الجيل {self.generation}")
+        else:
+            self.generation = active
+        return active
+    
+    def switch_generation(self, expected: Optional[int], generation: int) -> None:
+        """
+        Atomically point readers at a generation | تبديل الجيل الحي ذرياً
+        
+        Args:
+            expected: Generation the pointer must still hold | الجيل المتوقع حالياً
+            generation: New live generation | الجيل الحي الجديد
+        
+        Raises:
+            RuntimeError: Another sync moved the pointer | تغير المؤشر من مزامنة أخرى
+        """
+        query = """
+        MERGE (v:GraphVersion {name: 'active'})
+        WITH v WHERE v.generation IS NULL OR v.generation = $expected
+        SET v.previous = v.generation,
+            v.generation = $generation,
+            v.switched_at = datetime()
+        RETURN v.generation AS generation
+        """
+        with self.metrics.span('switch') as span, self._session() as session:
+            records = self._execute(session, span, query, {'expected': expected, 'generation': generation})
+        if not records:
+            raise RuntimeError(f"Generation pointer moved from {expected} during sync")
+        logger.info(f"Live graph generation is now {generation} | الجيل الحي الآن {generation}")
+    
+    def drop_inactive_generations(self, active: int) -> None:
+        """
+        Delete every synced node outside the live generation in batches
+        حذف العقد خارج الجيل الحي على دفعات
+        
+        Args:
+            active: Live generation to keep | الجيل الحي
+        """
+        self._in_batches(
+            'drop',
+            "MATCH (n) WHERE n.generation <> $active AND ({labels}) "
+            "CALL {{ WITH n DETACH DELETE n }} IN TRANSACTIONS OF {rows} ROWS",
+            {'active': active}
+        )
+    
+    def carry_relationships(self, active: int) -> int:
+        """
+        Copy relationships no sync step writes onto the rebuilt generation
+        نسخ العلاقات التي لا تكتبها المزامنة إلى الجيل الجديد
+        
+        Curated edges hang off live-generation nodes and would be dropped
+        with them. Each is recreated between the nodes with the same keys in
+        the new generation; endpoints outside the synced labels (Topic, Tool)
+        are kept as they are. Edges to entities removed from the source go.
         
-        with self.neo4j_driver.session() as session:
-            # Delete in batches to avoid memory issues | الحذف على دفعات
-            session.run("MATCH (n) DETACH DELETE n")
+        Args:
+            active: Live generation being replaced | الجيل الحي المستبدل
+        
+        Returns:
+            Relationships copied | عدد العلاقات المنسوخة
+        """
+        def quote(name: str) -> str:
+            return '`' + name.replace('`', '``') + '`'
         
-        logger.info("Graph cleared | تم مسح الرسم البياني")
+        labels = ' OR '.join(f'n:{label}' for label in SYNCED_LABELS)
+        discover = f"""
+        MATCH (n)-[r]-() WHERE n.generation = $active AND ({labels}) AND NOT type(r) IN $synced
+        WITH DISTINCT r
+        WITH type(r) AS type, labels(startNode(r)) AS start, labels(endNode(r)) AS end
+        RETURN type,
+               coalesce([l IN start WHERE l IN $keyed][0], start[0]) AS start,
+               coalesce([l IN end WHERE l IN $keyed][0], end[0]) AS end,
+               count(*) AS count
+        """
+        with self.metrics.span('carry') as span, self._session() as session:
+            kinds = self._execute(session, span, discover, {
+                'active': active, 'synced': list(SYNCED_RELATIONSHIPS), 'keyed': list(SYNCED_KEYS)
+            }, read=True)
+        
+        carried = 0
+        for kind in kinds:
+            if kind['start'] is None or kind['end'] is None:
+                continue
+            conditions, remap = [], []
+            ends = {}
+            for var, label in (('a', kind['start']), ('b', kind['end'])):
+                if label in SYNCED_KEYS:
+                    key = SYNCED_KEYS[label]
+                    conditions.append(f"{var}.generation = $active")
+                    remap.append(f"MATCH ({var}2:{quote(label)} {{{key}: {var}.{key}, generation: $generation}})")
+                    ends[var] = f"{var}2"
+                else:
+                    ends[var] = var
+            query = (
+                f"MATCH (a:{quote(kind['start'])})-[r:{quote(kind['type'])}]->(b:{quote(kind['end'])}) "
+                f"WHERE {' AND '.join(conditions)} "
+                f"CALL {{ WITH a, r, b {' '.join(remap)} "
+                f"CREATE ({ends['a']})-[c:{quote(kind['type'])}]->({ends['b']}) SET c = properties(r) "
+                f"}} IN TRANSACTIONS OF {int(self.config.delete_batch_size)} ROWS"
+            )
+            with self.metrics.span('carry') as span, self._session() as session:
+                summary = session.run(query, {'active': active, 'generation': self.generation}).consume()
+                created = summary.counters.relationships_created
+                span.add(items=created)
+            carried += created
+            logger.info(
+                f"Carried {created}/{kind['count']} {kind['type']} "
+                f"({kind['start']}->{kind['end']}) into generation {self.generation}"
+            )
+        self.stats['relationships_created'] += carried
+        return carried
+    
+    def _in_batches(self, stage: str, template: str, parameters: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Run a CALL { ... } IN TRANSACTIONS statement over the synced labels
+        تنفيذ استعلام على دفعات من المعاملات
+        
+        Batched statements commit their own inner transactions, so they run
+        as auto-commit queries rather than managed units of work; they are
+        idempotent and simply resume on the next run if interrupted.
+        """
+        labels = ' OR '.join(f'n:{label}' for label in SYNCED_LABELS)
+        query = template.format(labels=labels, rows=int(self.config.delete_batch_size))
+        with self.metrics.span(stage), self._session() as session:
+            summary = session.run(query, parameters or {}).consume()
+        counters = getattr(summary, 'counters', None)
+        if counters is not None and (counters.nodes_deleted or counters.properties_set):
+            logger.info(
+                f"{stage}: {counters.nodes_deleted} nodes deleted, "
+                f"{counters.properties_set} properties set"
+            )
+    
+    def _plan(self, entity: str, rows: List[Dict[str, Any]], key: Callable[[Dict[str, Any]], Any],
+              existing_query: str) -> Tuple[List[Dict[str, Any]], List[Any], Dict[Any, Dict[str, Any]]]:
+        """
+        Diff source rows against the graph by property hash
+        مقارنة صفوف المصدر بالرسم البياني عبر بصمة الخصائص
+        
+        Args:
+            entity: Entity name for stats and spans | اسم الكيان
+            rows: Source rows (property names as written) | صفوف المصدر
+            key: Row -> identity key | مفتاح الهوية
+            existing_query: Returns key, hash (and node_id) per graph entity | استعلام الموجود
+        
+        Returns:
+            Rows to write, keys to delete, existing records by key | الصفوف للكتابة والمفاتيح للحذف
+        """
+        source: Dict[Any, Dict[str, Any]] = {}
+        for row in rows:
+            row['sync_hash'] = property_hash(row)
+            source[key(row)] = row
+        
+        with self.metrics.span(f'{entity}.diff') as span, self._session() as session:
+            records = self._execute(session, span, existing_query, {'generation': self.generation}, read=True)
+            span.add(items=len(records))
+        existing = {_key(record['key']): record for record in records}
+        
+        diff = SyncDiff(entity)
+        writes = []
+        for k, row in source.items():
+            record = existing.get(k)
+            if record is None:
+                diff.created.append(k)
+            elif record['hash'] != row['sync_hash']:
+                diff.changed.append(k)
+            else:
+                diff.unchanged += 1
+                continue
+            writes.append(row)
+        diff.deleted = [k for k in existing if k not in source]
+        
+        self.diffs[entity] = diff
+        self.stats['unchanged'] += diff.unchanged
+        logger.info(
+            f"{entity}: {len(diff.created)} new, {len(diff.changed)} changed, "
+            f"{len(diff.deleted)} removed, {diff.unchanged} unchanged"
+        )
+        return writes, diff.deleted, existing
+    
+    def _apply(self, entity: str, upsert_query: str, delete_query: str,
+               writes: List[Dict[str, Any]], deleted: List[Any]) -> List[Any]:
+        """
+        Write changed rows and delete removed ones (skipped in dry runs)
+        كتابة الصفوف المتغيرة وحذف المحذوفة (عدا وضع التجربة)
+        
+        Returns:
+            Records of the upsert batches | سجلات دفعات الكتابة
+        """
+        if self.config.dry_run:
+            return []
+        records = self._write_batches(entity, upsert_query, writes) if writes else []
+        if deleted and self.partial_reads:
+            # A missing source row is not proof of deletion | غياب الصف ليس دليلاً على حذفه
+            logger.warning(
+                f"{entity}: skipping {len(deleted)} deletes, incomplete reads of "
+                f"{', '.join(self.partial_reads)} | تخطي الحذف بسبب قراءة جزئية"
+            )
+        elif deleted:
+            keys = [list(k) if isinstance(k, tuple) else k for k in deleted]
+            self.stats['deleted'] += self._written(self._write_batches(f'{entity}.delete', delete_query, keys))
+        return records
+    
+    def log_diff(self, limit: int = 20) -> None:
+        """
+        Log the planned changes of a dry run | عرض التغييرات المخططة
+        
+        Args:
+            limit: Keys listed per change kind | عدد المفاتيح المعروضة لكل نوع
+        """
+        logger.info("DRY RUN MODE - No data will be written | وضع التجربة - لن تتم كتابة بيانات")
+        if self.unadopted:
+            logger.warning(
+                "Graph has no active generation yet: existing nodes are adopted on the first real "
+                "sync, so this diff lists every entity as created | "
+                "لا يوجد جيل حي بعد: تعتمد العقد الحالية عند أول مزامنة فعلية، لذا تظهر كل الكيانات كجديدة"
+            )
+        for diff in self.diffs.values():
+            logger.info(
+                f"{diff.entity}: +{len(diff.created)} ~{len(diff.changed)} "
+                f"-{len(diff.deleted)} ={diff.unchanged}"
+            )
+            for verb, keys in (('create', diff.created), ('update', diff.changed), ('delete', diff.deleted)):
+                for k in keys[:limit]:
+                    logger.info(f"  Would {verb}: {k}")
+                if len(keys) > limit:
+                    logger.info(f"  ... and {len(keys) - limit} more")
     
     def sync_courses(self) -> Dict[str, str]:
         """
@@ -205,59 +664,70 @@ class GraphSync:
         logger.info("Syncing courses | مزامنة المقررات")
         
         # Fetch courses from Supabase | جلب المقررات من Supabase
-        result = self.supabase.table('courses').select('*').eq('is_active', True).execute()
-        courses = result.data
+        courses = self._fetch('courses', 'courses', active_only=True)
         
         logger.info(f"Found {len(courses)} courses to sync | تم إيجاد {len(courses)} مقرر للمزامنة")
         
-        code_to_id = {}
+        rows = []
+        for course in courses:
+            try:
+                rows.append({
+                    'code': course['code'],
+                    'name': course['name'],
+                    'name_ar': course.get('name_ar'),
+                    'description': course.get('description'),
+                    'description_ar': course.get('description_ar'),
+                    'credits': course['credits'],
+                    'department': course['department'],
+                    'year_level': course['year_level'],
+                    'hours_theory': course.get('hours_theory', 2),
+                    'hours_lab': course.get('hours_lab', 2),
+                    'difficulty_rating': float(course.get('difficulty_rating', 3.0)),
+                    'is_bottleneck': course.get('is_bottleneck', False),
+                    'supabase_id': course['id']
+                })
+            except Exception as e:
+                logger.error(f"Error syncing course {course.get('code')}: {e}")
+                self.stats['errors'] += 1
         
-        with self.neo4j_driver.session() as session:
-            for course in courses:
-                try:
-                    # Create or update course node | إنشاء أو تحديث عقدة المقرر
-                    query = """
-                    MERGE (c:Course {code: $code})
-                    SET c.name = $name,
-                        c.name_ar = $name_ar,
-                        c.description = $description,
-                        c.description_ar = $description_ar,
-                        c.credits = $credits,
-                        c.department = $department,
-                        c.year_level = $year_level,
-                        c.hours_theory = $hours_theory,
-                        c.hours_lab = $hours_lab,
-                        c.difficulty_rating = $difficulty_rating,
-                        c.is_bottleneck = $is_bottleneck,
-                        c.supabase_id = $supabase_id,
-                        c.updated_at = datetime()
-                    RETURN elementId(c) as node_id
-                    """
-                    
-                    result = session.run(query, {
-                        'code': course['code'],
-                        'name': course['name'],
-                        'name_ar': course.get('name_ar'),
-                        'description': course.get('description'),
-                        'description_ar': course.get('description_ar'),
-                        'credits': course['credits'],
-                        'department': course['department'],
-                        'year_level': course['year_level'],
-                        'hours_theory': course.get('hours_theory', 2),
-                        'hours_lab': course.get('hours_lab', 2),
-                        'difficulty_rating': float(course.get('difficulty_rating', 3.0)),
-                        'is_bottleneck': course.get('is_bottleneck', False),
-                        'supabase_id': course['id']
-                    })
-                    
-                    record = result.single()
-                    if record:
-                        code_to_id[course['code']] = record['node_id']
-                        self.stats['courses_synced'] += 1
-                        
-                except Exception as e:
-                    logger.error(f"Error syncing course {course['code']}: {e}")
-                    self.stats['errors'] += 1
+        writes, deleted, existing = self._plan(
+            'courses', rows, itemgetter('code'),
+            "MATCH (c:Course {generation: $generation}) "
+            "RETURN c.code AS key, c.sync_hash AS hash, elementId(c) AS node_id"
+        )
+        
+        # Create or update changed course nodes | إنشاء أو تحديث المقررات المتغيرة
+        query = """
+        UNWIND $rows AS row
+        MERGE (c:Course {code: row.code, generation: $generation})
+        SET c.name = row.name,
+            c.name_ar = row.name_ar,
+            c.description = row.description,
+            c.description_ar = row.description_ar,
+            c.credits = row.credits,
+            c.department = row.department,
+            c.year_level = row.year_level,
+            c.hours_theory = row.hours_theory,
+            c.hours_lab = row.hours_lab,
+            c.difficulty_rating = row.difficulty_rating,
+            c.is_bottleneck = row.is_bottleneck,
+            c.supabase_id = row.supabase_id,
+            c.sync_hash = row.sync_hash,
+            c.updated_at = datetime()
+        RETURN c.code AS code, elementId(c) AS node_id
+        """
+        delete_query = """
+        UNWIND $rows AS key
+        MATCH (c:Course {code: key, generation: $generation})
+        DETACH DELETE c
+        RETURN count(*) AS written
+        """
+        
+        written = self._apply('courses', query, delete_query, writes, deleted)
+        self.stats['courses_synced'] += len(written)
+        
+        code_to_id = {code: record['node_id'] for code, record in existing.items() if code not in deleted}
+        code_to_id.update({record['code']: record['node_id'] for record in written})
         
         logger.info(f"Synced {self.stats['courses_synced']} courses")
         return code_to_id
@@ -272,43 +742,45 @@ class GraphSync:
         logger.info("Syncing prerequisites | مزامنة المتطلبات السابقة")
         
         # Fetch prerequisites with course codes | جلب المتطلبات مع رموز المقررات
-        result = self.supabase.table('course_prerequisites').select(
+        prerequisites = self._fetch(
+            'prerequisites', 'course_prerequisites',
             '*, course:courses!course_prerequisites_course_id_fkey(code), prerequisite:courses!course_prerequisites_prerequisite_id_fkey(code)'
-        ).execute()
-        
-        prerequisites = result.data
+        )
         logger.info(f"Found {len(prerequisites)} prerequisites | تم إيجاد {len(prerequisites)} متطلب سابق")
         
-        with self.neo4j_driver.session() as session:
-            for prereq in prerequisites:
-                try:
-                    course_code = prereq.get('course', {}).get('code')
-                    prereq_code = prereq.get('prerequisite', {}).get('code')
-                    
-                    if not course_code or not prereq_code:
-                        continue
-                    
-                    # Create REQUIRES relationship | إنشاء علاقة REQUIRES
-                    query = """
-                    MATCH (c:Course {code: $course_code})
-                    MATCH (p:Course {code: $prereq_code})
-                    MERGE (c)-[r:REQUIRES]->(p)
-                    SET r.created_at = datetime()
-                    RETURN type(r) as rel_type
-                    """
-                    
-                    result = session.run(query, {
-                        'course_code': course_code,
-                        'prereq_code': prereq_code
-                    })
-                    
-                    if result.single():
-                        self.stats['prerequisites_synced'] += 1
-                        self.stats['relationships_created'] += 1
-                        
-                except Exception as e:
-                    logger.error(f"Error syncing prerequisite: {e}")
-                    self.stats['errors'] += 1
+        rows = []
+        for prereq in prerequisites:
+            course_code = (prereq.get('course') or {}).get('code')
+            prereq_code = (prereq.get('prerequisite') or {}).get('code')
+            if course_code and prereq_code:
+                rows.append({'course_code': course_code, 'prereq_code': prereq_code})
+        
+        writes, deleted, _ = self._plan(
+            'prerequisites', rows, itemgetter('course_code', 'prereq_code'),
+            "MATCH (c:Course {generation: $generation})-[r:REQUIRES]->(p:Course) "
+            "RETURN [c.code, p.code] AS key, r.sync_hash AS hash"
+        )
+        
+        # Create REQUIRES relationships | إنشاء علاقات REQUIRES
+        query = """
+        UNWIND $rows AS row
+        MATCH (c:Course {code: row.course_code, generation: $generation})
+        MATCH (p:Course {code: row.prereq_code, generation: $generation})
+        MERGE (c)-[r:REQUIRES]->(p)
+        ON CREATE SET r.created_at = datetime()
+        SET r.sync_hash = row.sync_hash
+        RETURN count(r) AS written
+        """
+        delete_query = """
+        UNWIND $rows AS key
+        MATCH (:Course {code: key[0], generation: $generation})-[r:REQUIRES]->(:Course {code: key[1], generation: $generation})
+        DELETE r
+        RETURN count(*) AS written
+        """
+        
+        written = self._written(self._apply('prerequisites', query, delete_query, writes, deleted))
+        self.stats['prerequisites_synced'] += written
+        self.stats['relationships_created'] += written
         
         logger.info(f"Synced {self.stats['prerequisites_synced']} prerequisites")
     
@@ -318,38 +790,48 @@ class GraphSync:
         """
         logger.info("Syncing majors | مزامنة التخصصات")
         
-        result = self.supabase.table('majors').select('*').execute()
-        majors = result.data
+        majors = self._fetch('majors', 'majors')
         
-        with self.neo4j_driver.session() as session:
-            for major in majors:
-                try:
-                    query = """
-                    MERGE (m:Major {name: $name})
-                    SET m.name_en = $name_en,
-                        m.description = $description,
-                        m.total_credits = $total_credits,
-                        m.duration_years = $duration_years,
-                        m.supabase_id = $supabase_id,
-                        m.updated_at = datetime()
-                    RETURN elementId(m) as node_id
-                    """
-                    
-                    result = session.run(query, {
-                        'name': major['name'],
-                        'name_en': major.get('name_en'),
-                        'description': major.get('description'),
-                        'total_credits': major.get('total_credits', 171),
-                        'duration_years': major.get('duration_years', 5),
-                        'supabase_id': major['id']
-                    })
-                    
-                    if result.single():
-                        self.stats['majors_synced'] += 1
-                        
-                except Exception as e:
-                    logger.error(f"Error syncing major {major['name']}: {e}")
-                    self.stats['errors'] += 1
+        rows = []
+        for major in majors:
+            try:
+                rows.append({
+                    'name': major['name'],
+                    'name_en': major.get('name_en'),
+                    'description': major.get('description'),
+                    'total_credits': major.get('total_credits', 171),
+                    'duration_years': major.get('duration_years', 5),
+                    'supabase_id': major['id']
+                })
+            except Exception as e:
+                logger.error(f"Error syncing major {major.get('name')}: {e}")
+                self.stats['errors'] += 1
+        
+        writes, deleted, _ = self._plan(
+            'majors', rows, itemgetter('name'),
+            "MATCH (m:Major {generation: $generation}) RETURN m.name AS key, m.sync_hash AS hash"
+        )
+        
+        query = """
+        UNWIND $rows AS row
+        MERGE (m:Major {name: row.name, generation: $generation})
+        SET m.name_en = row.name_en,
+            m.description = row.description,
+            m.total_credits = row.total_credits,
+            m.duration_years = row.duration_years,
+            m.supabase_id = row.supabase_id,
+            m.sync_hash = row.sync_hash,
+            m.updated_at = datetime()
+        RETURN count(m) AS written
+        """
+        delete_query = """
+        UNWIND $rows AS key
+        MATCH (m:Major {name: key, generation: $generation})
+        DETACH DELETE m
+        RETURN count(*) AS written
+        """
+        
+        self.stats['majors_synced'] += self._written(self._apply('majors', query, delete_query, writes, deleted))
         
         logger.info(f"Synced {self.stats['majors_synced']} majors")
     
@@ -359,36 +841,46 @@ class GraphSync:
         """
         logger.info("Syncing skills | مزامنة المهارات")
         
-        result = self.supabase.table('skills').select('*').execute()
-        skills = result.data
+        skills = self._fetch('skills', 'skills')
         
-        with self.neo4j_driver.session() as session:
-            for skill in skills:
-                try:
-                    query = """
-                    MERGE (s:Skill {name: $name})
-                    SET s.name_ar = $name_ar,
-                        s.category = $category,
-                        s.description = $description,
-                        s.supabase_id = $supabase_id,
-                        s.updated_at = datetime()
-                    RETURN elementId(s) as node_id
-                    """
-                    
-                    result = session.run(query, {
-                        'name': skill['name'],
-                        'name_ar': skill.get('name_ar'),
-                        'category': skill.get('category'),
-                        'description': skill.get('description'),
-                        'supabase_id': skill['id']
-                    })
-                    
-                    if result.single():
-                        self.stats['skills_synced'] += 1
-                        
-                except Exception as e:
-                    logger.error(f"Error syncing skill {skill['name']}: {e}")
-                    self.stats['errors'] += 1
+        rows = []
+        for skill in skills:
+            try:
+                rows.append({
+                    'name': skill['name'],
+                    'name_ar': skill.get('name_ar'),
+                    'category': skill.get('category'),
+                    'description': skill.get('description'),
+                    'supabase_id': skill['id']
+                })
+            except Exception as e:
+                logger.error(f"Error syncing skill {skill.get('name')}: {e}")
+                self.stats['errors'] += 1
+        
+        writes, deleted, _ = self._plan(
+            'skills', rows, itemgetter('name'),
+            "MATCH (s:Skill {generation: $generation}) RETURN s.name AS key, s.sync_hash AS hash"
+        )
+        
+        query = """
+        UNWIND $rows AS row
+        MERGE (s:Skill {name: row.name, generation: $generation})
+        SET s.name_ar = row.name_ar,
+            s.category = row.category,
+            s.description = row.description,
+            s.supabase_id = row.supabase_id,
+            s.sync_hash = row.sync_hash,
+            s.updated_at = datetime()
+        RETURN count(s) AS written
+        """
+        delete_query = """
+        UNWIND $rows AS key
+        MATCH (s:Skill {name: key, generation: $generation})
+        DETACH DELETE s
+        RETURN count(*) AS written
+        """
+        
+        self.stats['skills_synced'] += self._written(self._apply('skills', query, delete_query, writes, deleted))
         
         logger.info(f"Synced {self.stats['skills_synced']} skills")
     
@@ -398,43 +890,45 @@ class GraphSync:
         """
         logger.info("Syncing course-skill relationships | مزامنة علاقات المقرر-المهارة")
         
-        result = self.supabase.table('course_skills').select(
-            '*, course:courses(code), skill:skills(name)'
-        ).execute()
+        relations = self._fetch('course_skills', 'course_skills', '*, course:courses(code), skill:skills(name)')
         
-        relations = result.data
+        rows = []
+        for rel in relations:
+            course_code = (rel.get('course') or {}).get('code')
+            skill_name = (rel.get('skill') or {}).get('name')
+            if course_code and skill_name:
+                rows.append({
+                    'course_code': course_code,
+                    'skill_name': skill_name,
+                    'level': rel.get('level', 'beginner')
+                })
         
-        with self.neo4j_driver.session() as session:
-            for rel in relations:
-                try:
-                    course_code = rel.get('course', {}).get('code')
-                    skill_name = rel.get('skill', {}).get('name')
-                    level = rel.get('level', 'beginner')
-                    
-                    if not course_code or not skill_name:
-                        continue
-                    
-                    query = """
-                    MATCH (c:Course {code: $course_code})
-                    MATCH (s:Skill {name: $skill_name})
-                    MERGE (c)-[r:TEACHES]->(s)
-                    SET r.level = $level,
-                        r.created_at = datetime()
-                    RETURN type(r) as rel_type
-                    """
-                    
-                    result = session.run(query, {
-                        'course_code': course_code,
-                        'skill_name': skill_name,
-                        'level': level
-                    })
-                    
-                    if result.single():
-                        self.stats['relationships_created'] += 1
-                        
-                except Exception as e:
-                    logger.error(f"Error syncing course-skill: {e}")
-                    self.stats['errors'] += 1
+        writes, deleted, _ = self._plan(
+            'course_skills', rows, itemgetter('course_code', 'skill_name'),
+            "MATCH (c:Course {generation: $generation})-[r:TEACHES]->(s:Skill) "
+            "RETURN [c.code, s.name] AS key, r.sync_hash AS hash"
+        )
+        
+        query = """
+        UNWIND $rows AS row
+        MATCH (c:Course {code: row.course_code, generation: $generation})
+        MATCH (s:Skill {name: row.skill_name, generation: $generation})
+        MERGE (c)-[r:TEACHES]->(s)
+        ON CREATE SET r.created_at = datetime()
+        SET r.level = row.level,
+            r.sync_hash = row.sync_hash
+        RETURN count(r) AS written
+        """
+        delete_query = """
+        UNWIND $rows AS key
+        MATCH (:Course {code: key[0], generation: $generation})-[r:TEACHES]->(:Skill {name: key[1], generation: $generation})
+        DELETE r
+        RETURN count(*) AS written
+        """
+        
+        self.stats['relationships_created'] += self._written(
+            self._apply('course_skills', query, delete_query, writes, deleted)
+        )
     
     def sync_career_paths(self):
         """
@@ -442,42 +936,54 @@ class GraphSync:
         """
         logger.info("Syncing career paths | مزامنة المسارات المهنية")
         
-        result = self.supabase.table('career_paths').select('*').execute()
-        careers = result.data
+        careers = self._fetch('career_paths', 'career_paths')
         
-        with self.neo4j_driver.session() as session:
-            for career in careers:
-                try:
-                    query = """
-                    MERGE (cp:CareerPath {name: $name})
-                    SET cp.name_ar = $name_ar,
-                        cp.description = $description,
-                        cp.description_ar = $description_ar,
-                        cp.demand = $demand,
-                        cp.salary_min = $salary_min,
-                        cp.salary_max = $salary_max,
-                        cp.supabase_id = $supabase_id,
-                        cp.updated_at = datetime()
-                    RETURN elementId(cp) as node_id
-                    """
-                    
-                    result = session.run(query, {
-                        'name': career['name'],
-                        'name_ar': career.get('name_ar'),
-                        'description': career.get('description'),
-                        'description_ar': career.get('description_ar'),
-                        'demand': career.get('demand', 'متوسط'),
-                        'salary_min': career.get('salary_range_min'),
-                        'salary_max': career.get('salary_range_max'),
-                        'supabase_id': career['id']
-                    })
-                    
-                    if result.single():
-                        self.stats['career_paths_synced'] += 1
-                        
-                except Exception as e:
-                    logger.error(f"Error syncing career {career['name']}: {e}")
-                    self.stats['errors'] += 1
+        rows = []
+        for career in careers:
+            try:
+                rows.append({
+                    'name': career['name'],
+                    'name_ar': career.get('name_ar'),
+                    'description': career.get('description'),
+                    'description_ar': career.get('description_ar'),
+                    'demand': career.get('demand', 'متوسط'),
+                    'salary_min': career.get('salary_range_min'),
+                    'salary_max': career.get('salary_range_max'),
+                    'supabase_id': career['id']
+                })
+            except Exception as e:
+                logger.error(f"Error syncing career {career.get('name')}: {e}")
+                self.stats['errors'] += 1
+        
+        writes, deleted, _ = self._plan(
+            'career_paths', rows, itemgetter('name'),
+            "MATCH (cp:CareerPath {generation: $generation}) RETURN cp.name AS key, cp.sync_hash AS hash"
+        )
+        
+        query = """
+        UNWIND $rows AS row
+        MERGE (cp:CareerPath {name: row.name, generation: $generation})
+        SET cp.name_ar = row.name_ar,
+            cp.description = row.description,
+            cp.description_ar = row.description_ar,
+            cp.demand = row.demand,
+            cp.salary_min = row.salary_min,
+            cp.salary_max = row.salary_max,
+            cp.supabase_id = row.supabase_id,
+            cp.sync_hash = row.sync_hash,
+            cp.updated_at = datetime()
+        RETURN count(cp) AS written
+        """
+        delete_query = """
+        UNWIND $rows AS key
+        MATCH (cp:CareerPath {name: key, generation: $generation})
+        DETACH DELETE cp
+        RETURN count(*) AS written
+        """
+        
+        self.stats['career_paths_synced'] += self._written(
+            self._apply('career_paths', query, delete_query, writes, deleted)
+        )
         
         logger.info(f"Synced {self.stats['career_paths_synced']} career paths")
     
@@ -487,43 +993,92 @@ class GraphSync:
         """
         logger.info("Syncing course-career relationships | مزامنة علاقات المقرر-المسار")
         
-        result = self.supabase.table('course_career_paths').select(
-            '*, course:courses(code), career:career_paths(name)'
-        ).execute()
+        relations = self._fetch('course_careers', 'course_career_paths', '*, course:courses(code), career:career_paths(name)')
         
-        relations = result.data
+        rows = []
+        for rel in relations:
+            course_code = (rel.get('course') or {}).get('code')
+            career_name = (rel.get('career') or {}).get('name')
+            if course_code and career_name:
+                rows.append({
+                    'course_code': course_code,
+                    'career_name': career_name,
+                    'importance': rel.get('importance', 'core')
+                })
         
-        with self.neo4j_driver.session() as session:
-            for rel in relations:
-                try:
-                    course_code = rel.get('course', {}).get('code')
-                    career_name = rel.get('career', {}).get('name')
-                    importance = rel.get('importance', 'core')
-                    
-                    if not course_code or not career_name:
-                        continue
-                    
-                    query = """
-                    MATCH (c:Course {code: $course_code})
-                    MATCH (cp:CareerPath {name: $career_name})
-                    MERGE (c)-[r:PREPARES_FOR]->(cp)
-                    SET r.importance = $importance,
-                        r.created_at = datetime()
-                    RETURN type(r) as rel_type
-                    """
-                    
-                    result = session.run(query, {
-                        'course_code': course_code,
-                        'career_name': career_name,
-                        'importance': importance
-                    })
-                    
-                    if result.single():
-                        self.stats['relationships_created'] += 1
-                        
-                except Exception as e:
-                    logger.error(f"Error syncing course-career: {e}")
-                    self.stats['errors'] += 1
+        writes, deleted, _ = self._plan(
+            'course_careers', rows, itemgetter('course_code', 'career_name'),
+            "MATCH (c:Course {generation: $generation})-[r:PREPARES_FOR]->(cp:CareerPath) "
+            "RETURN [c.code, cp.name] AS key, r.sync_hash AS hash"
+        )
+        
+        query = """
+        UNWIND $rows AS row
+        MATCH (c:Course {code: row.course_code, generation: $generation})
+        MATCH (cp:CareerPath {name: row.career_name, generation: $generation})
+        MERGE (c)-[r:PREPARES_FOR]->(cp)
+        ON CREATE SET r.created_at = datetime()
+        SET r.importance = row.importance,
+            r.sync_hash = row.sync_hash
+        RETURN count(r) AS written
+        """
+        delete_query = """
+        UNWIND $rows AS key
+        MATCH (:Course {code: key[0], generation: $generation})-[r:PREPARES_FOR]->(:CareerPath {name: key[1], generation: $generation})
+        DELETE r
+        RETURN count(*) AS written
+        """
+        
+        self.stats['relationships_created'] += self._written(
+            self._apply('course_careers', query, delete_query, writes, deleted)
+        )
+    
+    def sync_related_courses(self, rows: List[Dict[str, Any]]):
+        """
+        Bulk-write computed RELATED_TO edges | كتابة علاقات RELATED_TO المحسوبة
+        
+        Only edges tagged source 'similarity' are diffed and deleted, so
+        hand-curated RELATED_TO edges are left alone. An empty row list is
+        refused rather than treated as "delete everything".
+        
+        Args:
+            rows: course_code, related_code, score and metric per edge | صفوف العلاقات
+        """
+        logger.info("Syncing related courses | مزامنة المقررات ذات الصلة")
+        if not rows:
+            # An empty result would plan every computed edge for deletion
+            # نتيجة فارغة ستحذف كل العلاقات المحسوبة
+            logger.error("No related course rows; keeping existing edges | لا توجد صفوف")
+            self.stats['errors'] += 1
+            return
+        
+        writes, deleted, _ = self._plan(
+            'related_courses', rows, itemgetter('course_code', 'related_code'),
+            "MATCH (c:Course {generation: $generation})-[r:RELATED_TO {source: 'similarity'}]->(o:Course) "
+            "RETURN [c.code, o.code] AS key, r.sync_hash AS hash"
+        )
+        
+        query = """
+        UNWIND $rows AS row
+        MATCH (c:Course {code: row.course_code, generation: $generation})
+        MATCH (o:Course {code: row.related_code, generation: $generation})
+        MERGE (c)-[r:RELATED_TO {source: 'similarity'}]->(o)
+        ON CREATE SET r.created_at = datetime()
+        SET r.weight = row.score,
+            r.metric = row.metric,
+            r.sync_hash = row.sync_hash
+        RETURN count(r) AS written
+        """
+        delete_query = """
+        UNWIND $rows AS key
+        MATCH (:Course {code: key[0], generation: $generation})-[r:RELATED_TO {source: 'similarity'}]->(:Course {code: key[1], generation: $generation})
+        DELETE r
+        RETURN count(*) AS written
+        """
+        
+        self.stats['relationships_created'] += self._written(
+            self._apply('related_courses', query, delete_query, writes, deleted)
+        )
     
     def calculate_critical_paths(self):
         """
@@ -531,40 +1086,42 @@ class GraphSync:
         """
         logger.info("Calculating critical paths | حساب المسارات الحرجة")
         
-        with self.neo4j_driver.session() as session:
+        with self.metrics.span('critical_paths') as span, self._session() as session:
             # Find courses that are prerequisites for many other courses
             # إيجاد المقررات التي هي متطلبات لكثير من المقررات الأخرى
+            # Only courses whose values differ are written | تكتب القيم المتغيرة فقط
             query = """
-            MATCH (c:Course)<-[:REQUIRES]-(dependent:Course)
+            MATCH (c:Course {generation: $generation})<-[:REQUIRES]-(dependent:Course)
             WITH c, count(dependent) as dependent_count
             WHERE dependent_count >= 2
+              AND (c.is_bottleneck IS NULL OR NOT c.is_bottleneck
+                   OR coalesce(c.dependent_count, -1) <> dependent_count)
             SET c.is_bottleneck = true,
                 c.dependent_count = dependent_count
             RETURN c.code as code, dependent_count
             """
             
-            result = session.run(query)
-            bottlenecks = list(result)
+            bottlenecks = self._execute(session, span, query, {'generation': self.generation})
             
-            logger.info(f"Marked {len(bottlenecks)} bottleneck courses")
+            logger.info(f"Marked {len(bottlenecks)} new bottleneck courses")
             
             # Calculate depth for each course (longest path to a leaf)
             # حساب العمق لكل مقرر (أطول مسار إلى ورقة)
             depth_query = """
-            MATCH (c:Course)
+            MATCH (c:Course {generation: $generation})
             OPTIONAL MATCH path = (c)-[:REQUIRES*]->(leaf:Course)
             WHERE NOT (leaf)-[:REQUIRES]->()
-            WITH c, max(length(path)) as max_depth
-            SET c.critical_path_depth = coalesce(max_depth, 0)
-            RETURN c.code as code, c.critical_path_depth as depth
+            WITH c, coalesce(max(length(path)), 0) as depth
+            WHERE c.critical_path_depth IS NULL OR c.critical_path_depth <> depth
+            SET c.critical_path_depth = depth
+            RETURN c.code as code, depth
             ORDER BY depth DESC
             LIMIT 10
             """
             
-            result = session.run(depth_query)
-            depths = list(result)
+            depths = self._execute(session, span, depth_query, {'generation': self.generation})
             
-            logger.info(f"Calculated depths for courses. Top 10 deepest:")
+            logger.info(f"Updated course depths. Top 10 deepest changed:")
             for d in depths:
                 logger.info(f"  {d['code']}: depth {d['depth']}")
     
@@ -586,10 +1143,11 @@ class GraphSync:
                 raise Exception("Cannot connect to Neo4j")
             
             # Setup constraints | إعداد القيود
-            self.setup_constraints()
+            if not self.config.dry_run:
+                self.setup_constraints()
             
-            # Clear if requested | المسح إذا طُلب
-            self.clear_graph()
+            # Choose the generation to write | اختيار الجيل المستهدف
+            active = self.prepare_generation()
             
             # Sync all entities | مزامنة جميع الكيانات
             code_to_id = self.sync_courses()
@@ -600,9 +1158,26 @@ class GraphSync:
             self.sync_career_paths()
             self.sync_course_careers()
             
+            if self.config.dry_run:
+                self.log_diff()
+                return self.stats
+            
             # Calculate derived data | حساب البيانات المشتقة
             self.calculate_critical_paths()
             
+            # Flip readers to the rebuilt generation, then drop the old one
+            # تبديل القراء إلى الجيل الجديد ثم حذف القديم
+            if self.config.rebuild:
+                if self.stats['errors']:
+                    logger.error(
+                        f"Rebuild had {self.stats['errors']} errors; generation {active} stays live | "
+                        f"إعادة البناء بها أخطاء؛ يبقى الجيل {active} حياً"
+                    )
+                else:
+                    self.carry_relationships(active)
+                    self.switch_generation(active, self.generation)
+                    self.drop_inactive_generations(self.generation)
+            
         except Exception as e:
             logger.error(f"Sync failed: {e} | فشلت المزامنة: {e}")
             raise
@@ -620,9 +1195,14 @@ class GraphSync:
         logger.info(f"Skills synced: {self.stats['skills_synced']}")
         logger.info(f"Career paths synced: {self.stats['career_paths_synced']}")
         logger.info(f"Relationships created: {self.stats['relationships_created']}")
+        logger.info(f"Unchanged (skipped): {self.stats['unchanged']}")
+        logger.info(f"Deleted: {self.stats['deleted']}")
+        logger.info(f"Transaction retries: {self.stats['retries']}")
+        logger.info(f"Generation written: {self.generation}")
         logger.info(f"Errors: {self.stats['errors']}")
         logger.info("=" * 60)
         
+        self.metrics.result.update(self.stats)
         return self.stats
 
 
@@ -630,61 +1210,91 @@ class GraphSync:
 # MAIN ENTRY POINT | نقطة الدخول الرئيسية
 # =============================================================================
 
-def main():
+def add_arguments(parser: Any) -> None:
     """
-    Main entry point | نقطة الدخول الرئيسية
+    Add graph sync arguments to a parser | إضافة وسائط المزامنة
     """
-    import argparse
-    
-    parser = argparse.ArgumentParser(
-        description='IntelliPath Graph Sync | مزامنة رسم IntelliPath البياني'
+    parser.add_argument(
+        '--rebuild', '--clear',
+        dest='rebuild',
+        action='store_true',
+        help='Rebuild into a new generation and switch readers atomically | إعادة بناء كاملة دون توقف'
     )
     parser.add_argument(
-        '--clear',
+        '--dry-run',
         action='store_true',
-        help='Clear existing graph data before sync | مسح البيانات الموجودة قبل المزامنة'
+        help='Show what would be created, updated or deleted | عرض التغييرات دون كتابة'
     )
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=SyncConfig.batch_size,
+        help=f'Rows per write transaction (default: {SyncConfig.batch_size}) | الصفوف لكل معاملة'
+    )
+    parser.add_argument(
+        '--pool-size',
+        type=int,
+        default=SyncConfig.max_connection_pool_size,
+        help=f'Neo4j connection pool size (default: {SyncConfig.max_connection_pool_size}) | حجم مجمع الاتصالات'
+    )
+    add_instrumentation_arguments(parser)
+
+
+def run_command(args: Any, settings: Settings, clients: Optional[Clients] = None) -> int:
+    """
+    Run the graph sync from parsed arguments | تشغيل المزامنة من الوسائط
     
-    args = parser.parse_args()
-    
-    # Get credentials | الحصول على بيانات الاعتماد
-    supabase_url = os.getenv('SUPABASE_URL') or os.getenv('VITE_SUPABASE_URL')
-    supabase_key = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
-    neo4j_uri = os.getenv('NEO4J_URI')
-    neo4j_user = os.getenv('NEO4J_USERNAME', 'neo4j')
-    neo4j_password = os.getenv('NEO4J_PASSWORD')
-    
+    Returns:
+        Process exit code | رمز الخروج
+    """
     # Validate credentials | التحقق من بيانات الاعتماد
-    missing = []
-    if not supabase_url:
-        missing.append('SUPABASE_URL')
-    if not supabase_key:
-        missing.append('SUPABASE_SERVICE_ROLE_KEY')
-    if not neo4j_uri:
-        missing.append('NEO4J_URI')
-    if not neo4j_password:
-        missing.append('NEO4J_PASSWORD')
-    
-    if missing:
-        logger.error(f"Missing environment variables: {', '.join(missing)}")
-        logger.error(f"متغيرات البيئة المفقودة: {', '.join(missing)}")
-        sys.exit(1)
+    settings.require('supabase_url', 'supabase_key', 'neo4j_uri', 'neo4j_password')
     
     # Create configuration | إنشاء الإعدادات
     config = SyncConfig(
-        supabase_url=supabase_url,
-        supabase_key=supabase_key,
-        neo4j_uri=neo4j_uri,
-        neo4j_user=neo4j_user,
-        neo4j_password=neo4j_password,
-        clear_existing=args.clear
+        supabase_url=settings.supabase_url,
+        supabase_key=settings.supabase_key,
+        neo4j_uri=settings.neo4j_uri,
+        neo4j_user=settings.neo4j_user,
+        neo4j_password=settings.neo4j_password,
+        neo4j_database=settings.neo4j_database,
+        max_connection_pool_size=args.pool_size,
+        rebuild=args.rebuild,
+        dry_run=args.dry_run,
+        batch_size=args.batch_size
     )
     
-    # Run sync | تشغيل المزامنة
-    syncer = GraphSync(config)
-    stats = syncer.run()
+    # Run sync; GraphSync opens its own driver so the pool settings apply
+    # تشغيل المزامنة؛ تنشئ GraphSync برنامج تشغيلها لتطبيق إعدادات المجمع
+    with instrumented_run('graph_sync', args) as metrics:
+        syncer = GraphSync(
+            config,
+            metrics=metrics,
+            supabase=clients.supabase if clients else None
+        )
+        stats = syncer.run()
     
-    sys.exit(1 if stats['errors'] > 0 else 0)
+    return 1 if stats['errors'] > 0 else 0
+
+
+def main():
+    """
+    Main entry point | نقطة الدخول الرئيسية
+    """
+    import argparse
+    
+    parser = argparse.ArgumentParser(
+        description='IntelliPath Graph Sync | مزامنة رسم IntelliPath البياني'
+    )
+    add_arguments(parser)
+    args = parser.parse_args()
+    
+    setup_logging('graph_sync.log')
+    try:
+        sys.exit(run_command(args, load_settings()))
+    except (SettingsError, ImportError) as e:
+        logger.error(str(e))
+        sys.exit(1)
 
 
 if __name__ == '__main__':
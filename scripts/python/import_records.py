@@ -0,0 +1,707 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=============================================================================
+IntelliPath - Student Academic Records Importer
+المرشد الأكاديمي الذكي - مستورد السجلات الأكاديمية للطلاب
+=============================================================================
+Streams registrar exports (CSV or Excel) into student_academic_records:
+
+- Headers (Arabic or English, with spelling variants) are mapped to
+  table columns once per file.
+- Rows are read in chunks and cleaned with column-wide pandas operations:
+  Arabic digits, numbers, booleans, the "2024/2025" year embedded in the
+  semester text, semester summary rows and range checks.
+- Duplicates of (student_id, academic_year, semester, course_code) keep
+  the most complete row, as the import-student-records function does.
+- Rows are loaded with batched Supabase upserts on that key, or with
+  Postgres COPY into a staging table followed by one INSERT ... ON
+  CONFLICT per chunk (--copy, needs DATABASE_URL).
+يستورد ملفات السجل الأكاديمي على دفعات: تعيين الأعمدة مرة واحدة، وتنظيف
+متجه للقيم، وإدراج مجمع عبر Supabase أو عبر COPY مباشرة إلى Postgres.
+=============================================================================
+Version: 1.0.0 | الإصدار: 1.0.0
+Last Updated: 2026-10-19 | آخر تحديث: 2026-10-19
+=============================================================================
+"""
+
+import io
+import os
+import re
+import sys
+import json
+import logging
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+
+from instrumentation import Instrumentation, add_instrumentation_arguments, instrumented_run
+from settings import Clients, Settings, SettingsError, lazy_import, load_settings, setup_logging
+
+# Third-party imports load on first use | المكتبات الخارجية تحمل عند أول استخدام
+np = lazy_import('numpy')
+pd = lazy_import('pandas', 'pandas openpyxl')
+openpyxl = lazy_import('openpyxl')
+psycopg = lazy_import('psycopg', 'psycopg[binary]')
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# CONSTANTS | الثوابت
+# =============================================================================
+
+TABLE = 'student_academic_records'
+# Upsert key, backed by idx_student_academic_records_unique_entry
+# مفتاح الإدراج أو التحديث
+RECORD_KEY = ('student_id', 'academic_year', 'semester', 'course_code')
+SUMMARY_CODE = '__SUMMARY__'  # Course code of semester summary rows | رمز صفوف ملخص الفصل
+UNKNOWN = 'Unknown'
+
+# Header aliases per column, as in the import-student-records function
+# أسماء الأعمدة البديلة لكل حقل
+COLUMN_MAPPINGS: Dict[str, Tuple[str, ...]] = {
+    'student_id': ('student_id', 'رقم الطالب', 'الرقم الجامعي', 'رقم_الطالب', 'id', 'studentid'),
+    'college': ('college', 'الكلية', 'كلية'),
+    'major': ('major', 'الاختصاص', 'التخصص', 'الفرع', 'القسم'),
+    'academic_year': ('academic_year', 'العام الدراسي', 'السنة الدراسية', 'year', 'العام'),
+    'semester': ('semester', 'الفصل الدراسي', 'الفصل', 'term'),
+    'last_registration_semester': ('last_registration_semester', 'آخر فصل تسجيل', 'آخر فصل'),
+    'study_mode': ('study_mode', 'نمط الدراسة', 'نوع الدراسة'),
+    'permanent_status': ('permanent_status', 'الحالة الدائمة', 'حالة الطالب'),
+    'semester_status': ('semester_status', 'حالة الفصل'),
+    'registered_hours_semester': ('registered_hours_semester', 'الساعات المسجلة-فصل', 'الساعات المسجلة'),
+    'completed_hours_semester': ('completed_hours_semester', 'الساعات المنجزة-الفصل', 'الساعات المنجزة'),
+    'academic_warning': ('academic_warning', 'الإنذار الأكاديمي', 'انذار', 'الإنذار'),
+    'cumulative_gpa_percent': (
+        'cumulative_gpa_percent', 'المعدل التراكمي المئوي-نهاية', 'المعدل المئوي', 'gpa_percent',
+    ),
+    'cumulative_gpa_points': (
+        'cumulative_gpa_points', 'المعدل التراكمي النقطي-نهاية', 'المعدل النقطي', 'gpa', 'cumulative_gpa',
+    ),
+    'total_completed_hours': (
+        'total_completed_hours', 'الساعات المنجزة-نهاية', 'اجمالي الساعات', 'total_hours', 'completed_hours',
+    ),
+    'baccalaureate_type': ('baccalaureate_type', 'نوع البكالوريا', 'نوع الشهادة', 'نوع البكلوريا'),
+    'baccalaureate_country': ('baccalaureate_country', 'بلد البكالوريا', 'بلد الشهادة', 'بلد البكلوريا'),
+    'certificate_score': ('certificate_score', 'علامة الشهادة', 'درجة الشهادة'),
+    'certificate_average': ('certificate_average', 'معدل الشهادة'),
+    'previous_academic_warning': ('previous_academic_warning', 'الإنذار الاكاديمي السابق', 'الإنذار السابق'),
+    'course_name': ('course_name', 'اسم المقرر', 'اسم المادة', 'المقرر', 'course', 'coursename'),
+    'course_code': ('course_code', 'رمز المقرر', 'كود المقرر', 'رقم المقرر', 'code', 'رمز'),
+    'course_credits': ('course_credits', 'عدد الساعات', 'الساعات', 'credits', 'hours', 'عدد ساعات'),
+    'final_grade': ('final_grade', 'العلامة النهائية', 'الدرجة النهائية', 'العلامة', 'grade', 'mark'),
+    'letter_grade': ('letter_grade', 'الدرجة', 'الدرجة الحرفية', 'التقدير', 'grade_letter'),
+    'grade_points': ('grade_points', 'النقاط', 'نقاط المقرر', 'points', 'النقط'),
+    'has_ministry_scholarship': ('has_ministry_scholarship', 'لديه منحة وزارة', 'منحة', 'منحة وزارة'),
+}
+
+# Column types | أنواع الأعمدة
+NUMERIC_COLUMNS = (
+    'course_credits', 'final_grade', 'grade_points', 'cumulative_gpa_points',
+    'cumulative_gpa_percent', 'certificate_score', 'certificate_average',
+)
+INTEGER_COLUMNS = ('registered_hours_semester', 'completed_hours_semester', 'total_completed_hours')
+BOOLEAN_COLUMNS = ('has_ministry_scholarship',)
+SUMMARY_COLUMNS = (
+    'total_completed_hours', 'cumulative_gpa_points', 'cumulative_gpa_percent',
+    'registered_hours_semester', 'completed_hours_semester',
+)
+# Valid ranges; values outside become NULL | النطاقات المقبولة
+RANGES = {
+    'final_grade': (0, 100),
+    'grade_points': (0, 4),
+    'cumulative_gpa_points': (0, 4),
+    'cumulative_gpa_percent': (0, 100),
+    'course_credits': (0, 30),
+}
+TRUE_VALUES = ('true', '1', 'yes', 'نعم', 'صحيح')
+
+# Table columns written by the importer | الأعمدة التي يكتبها المستورد
+RECORD_COLUMNS = tuple(COLUMN_MAPPINGS) + ('raw_data',)
+
+# Arabic-Indic and Persian digits -> ASCII | تحويل الأرقام العربية
+_DIGITS = str.maketrans('٠١٢٣٤٥٦٧٨٩۰۱۲۳۴۵۶۷۸۹٫', '01234567890123456789.')
+# Spelling variants folded before header matching | توحيد الإملاء قبل المطابقة
+_ARABIC_FOLD = str.maketrans({'أ': 'ا', 'إ': 'ا', 'آ': 'ا', 'ة': 'ه', 'ى': 'ي', 'ـ': None})
+_HEADER_NOISE = re.compile(r"[\s_\-#]+|[\u064b-\u0652]")
+_YEAR_RE = r'(\d{4}\s*/\s*\d{4})'
+_STUDENT_FILE_RE = re.compile(r'^(\d{5,10})')
+
+CSV_ENCODINGS = ('utf-8-sig', 'cp1256', 'iso-8859-6')
+
+
+# =============================================================================
+# CONFIGURATION | الإعدادات
+# =============================================================================
+
+@dataclass
+class ImporterConfig:
+    """
+    Configuration for the records importer | إعدادات مستورد السجلات
+    """
+    input_file: str  # Input file path | مسار ملف الإدخال
+    chunk_size: int = 50000  # Rows read and cleaned at a time | الصفوف لكل قراءة
+    batch_size: int = 1000  # Rows per upsert request | الصفوف لكل طلب إدراج
+    workers: int = 4  # Parallel upsert requests | طلبات الإدراج المتوازية
+    use_copy: bool = False  # Load through Postgres COPY | التحميل عبر COPY
+    database_url: Optional[str] = None  # Postgres URL for COPY | رابط Postgres
+    student_id_from_filename: bool = False  # "4220212.csv" -> student 4220212 | الرقم من اسم الملف
+    keep_raw: bool = True  # Store the source row in raw_data | حفظ الصف الأصلي
+    dry_run: bool = False  # Parse and validate only | وضع التجربة
+
+
+# =============================================================================
+# HEADER MAPPING | تعيين الأعمدة
+# =============================================================================
+
+def normalize_header(header: Any) -> str:
+    """
+    Comparable header text: lower case, no spaces/underscores/dashes,
+    Arabic spelling variants folded
+    نص عمود قابل للمقارنة
+    """
+    text = str(header).replace('\ufeff', '').strip().lower()
+    return _HEADER_NOISE.sub('', text.translate(_ARABIC_FOLD))
+
+
+def map_headers(headers: Sequence[Any]) -> Dict[str, Any]:
+    """
+    Match file headers to table columns | مطابقة أعمدة الملف مع الجدول
+
+    Exact (normalized) matches win; then a header containing a
+    non-trivial alias, such as "المعدل التراكمي النقطي-نهاية 2024".
+    Each header serves at most one column.
+
+    Returns:
+        Column -> original header | العمود -> اسم العمود في الملف
+    """
+    normalized = {h: normalize_header(h) for h in headers}
+    aliases = {field: [normalize_header(a) for a in names] for field, names in COLUMN_MAPPINGS.items()}
+    mapping: Dict[str, Any] = {}
+    used = set()
+
+    for field, names in aliases.items():
+        for header, norm in normalized.items():
+            if header not in used and norm in names:
+                mapping[field] = header
+                used.add(header)
+                break
+
+    for field, names in aliases.items():
+        if field in mapping:
+            continue
+        # Longest alias first so specific names beat generic ones | الأطول أولاً
+        for name in sorted((n for n in names if len(n) >= 4), key=len, reverse=True):
+            header = next((h for h, norm in normalized.items() if h not in used and name in norm), None)
+            if header is not None:
+                mapping[field] = header
+                used.add(header)
+                break
+    return mapping
+
+
+# =============================================================================
+# VECTORIZED CLEANING | التنظيف المتجه
+# =============================================================================
+
+def _per_value(values: 'pd.Series', transform: Any) -> 'pd.Series':
+    """
+    Apply a Series transform once per distinct value | تطبيق التحويل مرة لكل قيمة مميزة
+
+    Registrar columns repeat heavily (years, terms, grades, codes), so the
+    string work runs over the uniques and is mapped back by position.
+    """
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    result = transform(pd.Series(uniques, dtype=object).astype(str))
+    return pd.Series(result.to_numpy()[codes], index=values.index)
+
+
+def _numbers(values: 'pd.Series') -> 'pd.Series':
+    """Text column to float; Arabic digits and thousands separators handled | تحويل إلى أرقام"""
+    text = values.str.translate(_DIGITS).str.replace(r'[,\s]', '', regex=True)
+    return pd.to_numeric(text.where(~text.isin(('', '-'))), errors='coerce')
+
+
+# Per-column text normalization | توحيد النص لكل عمود
+_TEXT_TRANSFORMS = {
+    'student_id': lambda v: v.str.translate(_DIGITS),
+    'course_code': lambda v: v.str.upper(),
+}
+
+
+def _split_term(year_text: 'pd.Series', semester_text: 'pd.Series') -> Tuple['pd.Series', 'pd.Series']:
+    """
+    Academic year and semester from their cells | العام والفصل من الخلايا
+
+    The year may sit in the semester text: "الفصل الأول 2024/2025".
+    قد يكون العام ضمن نص الفصل.
+    """
+    year_text = year_text.str.translate(_DIGITS)
+    semester_text = semester_text.str.translate(_DIGITS).str.replace(r'\s+', ' ', regex=True)
+    year = year_text.str.extract(_YEAR_RE)[0]
+    year = year.fillna(semester_text.str.extract(_YEAR_RE)[0]).str.replace(r'\s+', '', regex=True)
+    semester = semester_text.str.replace(_YEAR_RE, '', regex=True).str.replace(r'\s+', ' ', regex=True).str.strip()
+    return year.fillna(UNKNOWN), semester.replace('', UNKNOWN)
+
+
+def completeness(rows: 'pd.DataFrame') -> 'pd.Series':
+    """Filled key fields per row, used to pick among duplicates | درجة اكتمال الصف"""
+    score = rows[['college', 'major', 'final_grade', 'letter_grade', 'grade_points']].notna().sum(axis=1)
+    for field in ('academic_year', 'semester', 'course_code', 'course_name'):
+        score += (rows[field] != UNKNOWN).astype(int)
+    return score
+
+
+def clean_chunk(raw: 'pd.DataFrame', mapping: Dict[str, Any], stats: Dict[str, int],
+                student_id: Optional[str] = None, keep_raw: bool = True,
+                source: Optional[str] = None) -> 'pd.DataFrame':
+    """
+    Turn raw text rows into table rows | تحويل الصفوف النصية إلى صفوف الجدول
+
+    Args:
+        raw: Chunk with every cell as text ('' when empty) | دفعة نصية
+        mapping: Column -> header from map_headers | تعيين الأعمدة
+        stats: Counters updated in place | العدادات
+        student_id: Student number for every row (from the file name) | الرقم الجامعي
+        keep_raw: Build raw_data from the source row | بناء raw_data
+        source: File name stored in raw_data | اسم الملف
+
+    Returns:
+        Validated, de-duplicated rows with RECORD_COLUMNS | الصفوف المنظفة
+    """
+    blank = pd.Series('', index=raw.index, dtype=object)
+
+    def text(field: str, transform: Any = lambda v: v) -> 'pd.Series':
+        values = raw[mapping[field]] if field in mapping else blank
+        return _per_value(values, lambda v: transform(v.str.strip()))
+
+    out = pd.DataFrame(index=raw.index)
+    for field in COLUMN_MAPPINGS:
+        if field in NUMERIC_COLUMNS or field in INTEGER_COLUMNS:
+            out[field] = text(field, _numbers).astype(float)
+        elif field in BOOLEAN_COLUMNS:
+            out[field] = text(field, lambda v: v.str.lower().isin(TRUE_VALUES)).astype(bool)
+        else:
+            values = text(field, _TEXT_TRANSFORMS.get(field, lambda v: v))
+            out[field] = values.where(values != '')
+
+    if student_id:
+        out['student_id'] = student_id.translate(_DIGITS)
+
+    # Split once per distinct (year, semester) pair; both are numbered in
+    # order of first appearance | مرة لكل زوج مميز
+    terms = pd.DataFrame({'year': text('academic_year'), 'semester': text('semester')})
+    pair = terms.groupby(['year', 'semester'], sort=False).ngroup().to_numpy()
+    distinct = terms.drop_duplicates()
+    years, semesters = _split_term(distinct['year'], distinct['semester'])
+    out['academic_year'] = years.to_numpy()[pair]
+    out['semester'] = semesters.to_numpy()[pair]
+
+    # Semester summary rows carry the only reliable cumulative values
+    # صفوف ملخص الفصل تحمل القيم التراكمية
+    no_course = out['course_code'].isna() & out['course_name'].isna()
+    summary = no_course & out[list(SUMMARY_COLUMNS)].notna().any(axis=1)
+    keep = out['student_id'].notna() & (~no_course | summary)
+    stats['skipped'] += int((~keep).sum())
+    out, summary, raw = out[keep], summary[keep], raw[keep]
+
+    out.loc[summary, ['course_code', 'course_name']] = SUMMARY_CODE
+    out[['course_code', 'course_name']] = out[['course_code', 'course_name']].fillna(UNKNOWN)
+    out.loc[summary, ['final_grade', 'letter_grade', 'grade_points']] = None
+    out['course_credits'] = out['course_credits'].where(~summary, 0).fillna(3)
+    stats['summary_rows'] += int(summary.sum())
+
+    for field, (low, high) in RANGES.items():
+        bad = out[field].notna() & ~out[field].between(low, high)
+        stats['invalid'] += int(bad.sum())
+        out.loc[bad, field] = None
+    for field in INTEGER_COLUMNS:
+        out[field] = out[field].round().astype('Int64')
+
+    # Most complete row per key, first on ties | الصف الأكمل لكل مفتاح
+    order = completeness(out).sort_values(ascending=False, kind='stable').index
+    deduped = out.loc[order].drop_duplicates(list(RECORD_KEY), keep='first').sort_index()
+    stats['duplicates'] += len(out) - len(deduped)
+
+    if keep_raw:
+        source_rows = raw.loc[deduped.index]
+        imported_at = datetime.now(timezone.utc).isoformat()
+        columns = [str(c) for c in source_rows.columns] + ['_import_file_name', '_imported_at']
+        tail = (source, imported_at)
+        # zip over plain tuples; DataFrame.to_dict boxes every cell | أسرع من to_dict
+        deduped['raw_data'] = [
+            dict(zip(columns, values + tail))
+            for values in source_rows.itertuples(index=False, name=None)
+        ]
+    else:
+        deduped['raw_data'] = None
+    return deduped[list(RECORD_COLUMNS)]
+
+
+# =============================================================================
+# READING | القراءة
+# =============================================================================
+
+def _cell_text(value: Any) -> str:
+    """Excel cell as text; 4210380.0 stays "4210380" | قيمة الخلية كنص"""
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def read_chunks(path: str, chunk_size: int) -> Iterator['pd.DataFrame']:
+    """
+    Stream a CSV or Excel file as text chunks | قراءة الملف على دفعات نصية
+
+    CSV encoding and delimiter are detected from the first bytes; Excel
+    is read row by row in openpyxl's read-only mode.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ('.xlsx', '.xlsm'):
+        workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            headers = None
+            batch: List[List[str]] = []
+            for row in rows:
+                cells = [_cell_text(v) for v in row]
+                if headers is None:
+                    if any(cells):
+                        headers = [h or f'column_{i}' for i, h in enumerate(cells)]
+                    continue
+                if any(cells):
+                    batch.append(cells[:len(headers)] + [''] * (len(headers) - len(cells)))
+                if len(batch) >= chunk_size:
+                    yield pd.DataFrame(batch, columns=headers, dtype=object)
+                    batch = []
+            if batch:
+                yield pd.DataFrame(batch, columns=headers, dtype=object)
+        finally:
+            workbook.close()
+        return
+    if extension != '.csv':
+        raise ValueError(f"Unsupported file format: {extension}")
+
+    with open(path, 'rb') as f:
+        head = f.read(1 << 20)
+    # Whole lines only, so a multi-byte character is never cut | أسطر كاملة فقط
+    head = head[:head.rfind(b'\n') + 1] or head
+    for encoding in CSV_ENCODINGS:
+        try:
+            sample = head.decode(encoding)
+            break
+        except UnicodeDecodeError:
+            continue
+    else:
+        raise ValueError("Could not read CSV with any supported encoding")
+    first_line = sample.split('\n', 1)[0]
+    delimiter = max((',', ';', '\t'), key=first_line.count)
+    logger.info(f"CSV encoding {encoding}, delimiter {delimiter!r} | ترميز الملف والفاصل")
+
+    yield from pd.read_csv(
+        path, sep=delimiter, encoding=encoding, dtype=str, keep_default_na=False,
+        chunksize=chunk_size, skip_blank_lines=True,
+    )
+
+
+# =============================================================================
+# IMPORTER | المستورد
+# =============================================================================
+
+class RecordsImporter:
+    """
+    Streams registrar exports into student_academic_records
+    يستورد ملفات السجل الأكاديمي إلى جدول السجلات
+    """
+
+    def __init__(self, config: ImporterConfig, metrics: Optional[Instrumentation] = None,
+                 supabase: Any = None, connection: Any = None):
+        """
+        Initialize the importer | تهيئة المستورد
+
+        Args:
+            config: Importer configuration | إعدادات المستورد
+            metrics: Run instrumentation | أداة قياس التشغيل
+            supabase: Supabase client for upserts | عميل Supabase
+            connection: Postgres connection for COPY (opened from
+                        database_url if omitted) | اتصال Postgres
+        """
+        self.config = config
+        self.metrics = metrics or Instrumentation('import_records')
+        self.supabase = supabase
+        self.connection = connection
+        if config.use_copy and connection is None and not config.dry_run:
+            if not config.database_url:
+                raise ValueError("COPY needs DATABASE_URL | يتطلب COPY رابط قاعدة البيانات")
+            self.connection = psycopg.connect(config.database_url)
+        self.stats = {
+            'total_read': 0,
+            'imported': 0,
+            'summary_rows': 0,
+            'duplicates': 0,
+            'invalid': 0,
+            'skipped': 0,
+            'errors': 0,
+        }
+        # Sorted key hashes and their best completeness across chunks
+        # بصمات المفاتيح مرتبة مع أفضل درجة اكتمال عبر الدفعات
+        self._seen_keys = np.empty(0, dtype='uint64')
+        self._seen_scores = np.empty(0, dtype='int64')
+
+    def _drop_seen(self, rows: 'pd.DataFrame') -> 'pd.DataFrame':
+        """
+        Skip rows whose key already came with an equal or more complete row
+        in an earlier chunk | تخطي المكررات عبر الدفعات
+
+        Keys are tracked as 64-bit hashes, so memory stays near 16 bytes
+        per distinct key.
+        """
+        keys = pd.util.hash_pandas_object(rows[list(RECORD_KEY)], index=False).to_numpy()
+        score = completeness(rows).to_numpy()
+        position = np.searchsorted(self._seen_keys, keys)
+        found = position < len(self._seen_keys)
+        found[found] = self._seen_keys[position[found]] == keys[found]
+        prior = np.full(len(keys), -1, dtype='int64')
+        prior[found] = self._seen_scores[position[found]]
+        keep = score > prior
+        self.stats['duplicates'] += int((~keep).sum())
+
+        self._seen_scores[position[found & keep]] = score[found & keep]
+        new = np.flatnonzero(~found)
+        new = new[np.argsort(keys[new], kind='stable')]
+        self._seen_keys = np.insert(self._seen_keys, position[new], keys[new])
+        self._seen_scores = np.insert(self._seen_scores, position[new], score[new])
+        return rows[keep]
+
+    # -------------------------------------------------------------------------
+    # Loading | التحميل
+    # -------------------------------------------------------------------------
+
+    def _upsert(self, rows: 'pd.DataFrame') -> None:
+        """
+        Batched upserts on RECORD_KEY, several requests in flight
+        إدراج أو تحديث على دفعات متوازية
+        """
+        payload = rows.astype(object).where(rows.notna(), None).to_dict('records')
+        batches = [payload[i:i + self.config.batch_size] for i in range(0, len(payload), self.config.batch_size)]
+
+        def send(batch: List[Dict[str, Any]]) -> int:
+            try:
+                with self.metrics.span('records.upsert', items=len(batch)):
+                    self.supabase.table(TABLE).upsert(
+                        batch, on_conflict=','.join(RECORD_KEY), returning='minimal'
+                    ).execute()
+                return 0
+            except Exception as e:
+                logger.error(f"Upsert batch failed: {e} | فشل إدراج الدفعة")
+                return len(batch)
+
+        with ThreadPoolExecutor(max_workers=max(self.config.workers, 1)) as pool:
+            failed = sum(pool.map(send, batches))
+        self.stats['errors'] += failed
+        self.stats['imported'] += len(payload) - failed
+
+    def _copy(self, rows: 'pd.DataFrame') -> None:
+        """
+        COPY into a staging table, then one INSERT ... ON CONFLICT
+        النسخ إلى جدول مؤقت ثم إدراج واحد مع التحديث عند التعارض
+        """
+        columns = ', '.join(RECORD_COLUMNS)
+        updates = ', '.join(f"{c} = EXCLUDED.{c}" for c in RECORD_COLUMNS if c not in RECORD_KEY)
+        frame = rows.copy()
+        frame['raw_data'] = [json.dumps(v, ensure_ascii=False) if v is not None else None for v in frame['raw_data']]
+        buffer = io.StringIO()
+        frame.to_csv(buffer, header=False, index=False)
+
+        try:
+            with self.metrics.span('records.copy', items=len(frame), bytes=buffer.tell()):
+                with self.connection.transaction(), self.connection.cursor() as cur:
+                    cur.execute(
+                        f"CREATE TEMP TABLE IF NOT EXISTS records_stage "
+                        f"(LIKE public.{TABLE} INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
+                    )
+                    with cur.copy(f"COPY records_stage ({columns}) FROM STDIN (FORMAT csv)") as copy:
+                        copy.write(buffer.getvalue())
+                    cur.execute(
+                        f"INSERT INTO public.{TABLE} ({columns}) "
+                        f"SELECT {columns} FROM records_stage "
+                        f"ON CONFLICT ({', '.join(RECORD_KEY)}) DO UPDATE SET {updates}, updated_at = NOW()"
+                    )
+            self.stats['imported'] += len(frame)
+        except Exception as e:
+            logger.error(f"COPY chunk failed: {e} | فشل نسخ الدفعة")
+            self.stats['errors'] += len(frame)
+
+    # -------------------------------------------------------------------------
+    # Run | التشغيل
+    # -------------------------------------------------------------------------
+
+    def run(self) -> Dict[str, int]:
+        """
+        Run the import | تشغيل الاستيراد
+
+        Returns:
+            Statistics dictionary | قاموس الإحصائيات
+        """
+        start_time = datetime.now()
+        path = self.config.input_file
+        source = os.path.basename(path)
+        student_id = None
+        if self.config.student_id_from_filename:
+            match = _STUDENT_FILE_RE.match(source)
+            student_id = match.group(1) if match else None
+
+        logger.info("=" * 60)
+        logger.info(f"Importing academic records from {source} | استيراد السجلات الأكاديمية")
+        logger.info("=" * 60)
+
+        mapping = None
+        chunks = read_chunks(path, self.config.chunk_size)
+        while True:
+            with self.metrics.span('read') as span:
+                raw = next(chunks, None)
+                if raw is not None:
+                    span.add(items=len(raw))
+            if raw is None:
+                break
+            self.stats['total_read'] += len(raw)
+
+            if mapping is None:
+                mapping = map_headers(list(raw.columns))
+                logger.info(f"Mapped columns: {json.dumps(mapping, ensure_ascii=False)}")
+                missing = [c for c in ('student_id', 'course_code') if c not in mapping]
+                if 'student_id' in missing and student_id:
+                    missing.remove('student_id')
+                if missing:
+                    raise ValueError(f"Missing required columns: {', '.join(missing)} | أعمدة مطلوبة مفقودة")
+
+            with self.metrics.span('clean', items=len(raw)):
+                rows = clean_chunk(raw, mapping, self.stats, student_id=student_id,
+                                   keep_raw=self.config.keep_raw, source=source)
+                rows = self._drop_seen(rows)
+
+            if self.config.dry_run:
+                if self.stats['imported'] == 0 and len(rows):
+                    sample = rows.head(3).drop(columns='raw_data')
+                    logger.info("DRY RUN MODE - sample rows | وضع التجربة - عينة:\n" + sample.to_string())
+                self.stats['imported'] += len(rows)
+            elif self.config.use_copy:
+                self._copy(rows)
+            else:
+                self._upsert(rows)
+            logger.info(f"Processed {self.stats['total_read']} rows | تمت معالجة {self.stats['total_read']} صف")
+
+        if self.connection is not None and not self.connection.closed:
+            self.connection.close()
+
+        elapsed = (datetime.now() - start_time).total_seconds()
+        logger.info("=" * 60)
+        logger.info("IMPORT COMPLETE | اكتمل الاستيراد")
+        logger.info(f"Time elapsed: {elapsed:.2f}s | الوقت المنقضي: {elapsed:.2f} ثانية")
+        for key, value in self.stats.items():
+            logger.info(f"{key}: {value}")
+        logger.info("=" * 60)
+
+        self.metrics.result.update(self.stats)
+        return self.stats
+
+
+# =============================================================================
+# MAIN ENTRY POINT | نقطة الدخول الرئيسية
+# =============================================================================
+
+def add_arguments(parser: Any) -> None:
+    """
+    Add importer arguments to a parser | إضافة وسائط المستورد
+    """
+    parser.add_argument('input_file', help='Registrar export (CSV or Excel) | ملف السجل الأكاديمي')
+    parser.add_argument(
+        '--chunk-size', type=int, default=50000,
+        help='Rows read and cleaned at a time (default: 50000) | الصفوف لكل قراءة'
+    )
+    parser.add_argument(
+        '--batch-size', type=int, default=1000,
+        help='Rows per upsert request (default: 1000) | الصفوف لكل طلب'
+    )
+    parser.add_argument(
+        '--workers', type=int, default=4,
+        help='Parallel upsert requests (default: 4) | الطلبات المتوازية'
+    )
+    parser.add_argument(
+        '--copy', action='store_true',
+        help='Load with Postgres COPY via DATABASE_URL | التحميل عبر COPY'
+    )
+    parser.add_argument(
+        '--student-id-from-filename', action='store_true',
+        help='Take the student number from names like 4220212.csv | الرقم الجامعي من اسم الملف'
+    )
+    parser.add_argument('--no-raw', action='store_true', help='Do not store raw_data | عدم حفظ البيانات الأصلية')
+    parser.add_argument('--dry-run', action='store_true', help='Parse and validate only | تحقق دون إدراج')
+    add_instrumentation_arguments(parser)
+
+
+def run_command(args: Any, settings: Settings, clients: Optional[Clients] = None) -> int:
+    """
+    Run the importer from parsed arguments | تشغيل المستورد من الوسائط
+
+    Returns:
+        Process exit code | رمز الخروج
+    """
+    if args.copy and not args.dry_run:
+        settings.require('database_url')
+    elif not args.dry_run:
+        settings.require('supabase_url', 'supabase_key')
+
+    config = ImporterConfig(
+        input_file=args.input_file,
+        chunk_size=args.chunk_size,
+        batch_size=args.batch_size,
+        workers=args.workers,
+        use_copy=args.copy,
+        database_url=settings.database_url,
+        student_id_from_filename=args.student_id_from_filename,
+        keep_raw=not args.no_raw,
+        dry_run=args.dry_run,
+    )
+    own_clients = clients is None
+    clients = clients or Clients(settings)
+    try:
+        with instrumented_run('import_records', args) as metrics:
+            importer = RecordsImporter(
+                config,
+                metrics=metrics,
+                supabase=clients.supabase if not (args.dry_run or args.copy) else None,
+            )
+            stats = importer.run()
+    finally:
+        if own_clients:
+            clients.close()
+    return 1 if stats['errors'] > 0 else 0
+
+
+def main():
+    """
+    Main entry point | نقطة الدخول الرئيسية
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='IntelliPath academic records importer | مستورد السجلات الأكاديمية'
+    )
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    setup_logging('records_importer.log')
+    try:
+        sys.exit(run_command(args, load_settings()))
+    except (SettingsError, ImportError, ValueError) as e:
+        logger.error(str(e))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=============================================================================
+IntelliPath - Ingestion Checkpoint Journal
+المرشد الأكاديمي الذكي - سجل نقاط الاستئناف للإدخال
+=============================================================================
+SQLite (WAL) journal recording per-file and per-chunk ingestion state
+(chunked -> embedded -> uploaded) so an interrupted embedding run
+can resume from its last durable step without re-paying for embeddings.
+Table sources (the courses table) also keep each uploaded row's embedding
+and version, so unchanged rows are skipped on later runs.
+سجل SQLite يحفظ حالة كل ملف وقطعة حتى يمكن استئناف التشغيل المنقطع
+دون إعادة دفع تكلفة التضمينات.
+=============================================================================
+Version: 1.0.0 | الإصدار: 1.0.0
+Last Updated: 2026-10-19 | آخر تحديث: 2026-10-19
+=============================================================================
+"""
+
+import json
+import logging
+import sqlite3
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from datetime import datetime
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS run (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    run_key TEXT NOT NULL,
+    started_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    file_hash TEXT NOT NULL,
+    state TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS chunks (
+    chunk_id TEXT PRIMARY KEY,
+    file_path TEXT NOT NULL REFERENCES files(path),
+    content TEXT NOT NULL,
+    metadata TEXT NOT NULL,
+    embedding BLOB,
+    state TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_chunks_state ON chunks(state);
+CREATE TABLE IF NOT EXISTS batches (
+    batch_no INTEGER NOT NULL,
+    stage TEXT NOT NULL,
+    chunk_count INTEGER NOT NULL,
+    finished_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS source_items (
+    source TEXT NOT NULL,
+    item_key TEXT NOT NULL,
+    version TEXT NOT NULL,
+    embedding BLOB NOT NULL,
+    uploaded_at TEXT NOT NULL,
+    PRIMARY KEY (source, item_key)
+);
+"""
+
+
+class IngestJournal:
+    """
+    Durable checkpoint store for embedding runs
+    مخزن دائم لنقاط استئناف تشغيل التضمينات
+    """
+
+    def __init__(self, path: str):
+        """
+        Open (or create) the journal | فتح السجل أو إنشاؤه
+
+        Args:
+            path: SQLite file path | مسار ملف SQLite
+        """
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        # WAL keeps committed steps durable if the process is killed
+        # وضع WAL يحفظ الخطوات المنفذة عند إيقاف العملية
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        self.batch_no = 0
+
+    def begin(self, run_key: str, resume: bool) -> bool:
+        """
+        Start or resume a run | بدء التشغيل أو استئنافه
+
+        Args:
+            run_key: Identity of directory + settings | هوية المجلد والإعدادات
+            resume: Keep prior progress when keys match | الاحتفاظ بالتقدم السابق
+
+        Returns:
+            True if prior progress is being resumed | True عند الاستئناف
+        """
+        row = self.conn.execute("SELECT run_key FROM run WHERE id = 1").fetchone()
+        if resume and row and row[0] == run_key:
+            self.batch_no = self.conn.execute(
+                "SELECT COALESCE(MAX(batch_no), 0) FROM batches"
+            ).fetchone()[0]
+            done = self.count_chunks('uploaded')
+            pending = self.count_chunks() - done
+            logger.info(f"Resuming run: {done} chunks uploaded, {pending} pending | استئناف التشغيل")
+            return True
+
+        if resume and row:
+            logger.warning("Journal belongs to a different run; starting fresh | بدء تشغيل جديد")
+        with self.conn:
+            self.conn.execute("DELETE FROM chunks")
+            self.conn.execute("DELETE FROM files")
+            self.conn.execute("DELETE FROM batches")
+            self.conn.execute(
+                "INSERT OR REPLACE INTO run (id, run_key, started_at) VALUES (1, ?, ?)",
+                (run_key, datetime.now().isoformat())
+            )
+        self.batch_no = 0
+        return False
+
+    # -------------------------------------------------------------------------
+    # Files | الملفات
+    # -------------------------------------------------------------------------
+
+    def file_state(self, path: str, file_hash: str) -> Optional[str]:
+        """
+        State of a file if its content is unchanged | حالة الملف إذا لم يتغير
+        """
+        row = self.conn.execute(
+            "SELECT state, file_hash FROM files WHERE path = ?", (path,)
+        ).fetchone()
+        if row is None or row[1] != file_hash:
+            return None
+        return row[0]
+
+    def record_chunks(self, path: str, file_hash: str, chunks: List[Any]) -> None:
+        """
+        Persist a file's chunks and mark it chunked | حفظ قطع الملف وتعليمه كمقطع
+        Chunks from an older version of the file are replaced.
+        """
+        with self.conn:
+            self.conn.execute("DELETE FROM chunks WHERE file_path = ?", (path,))
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO chunks (chunk_id, file_path, content, metadata, state)"
+                " VALUES (?, ?, ?, ?, 'chunked')",
+                [
+                    (c.id, path, c.content, json.dumps(c.metadata, ensure_ascii=False, default=str))
+                    for c in chunks
+                ]
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO files (path, file_hash, state, updated_at) VALUES (?, ?, 'chunked', ?)",
+                (path, file_hash, datetime.now().isoformat())
+            )
+
+    # -------------------------------------------------------------------------
+    # Chunks and batches | القطع والدفعات
+    # -------------------------------------------------------------------------
+
+    def count_chunks(self, state: Optional[str] = None) -> int:
+        """Count chunks, optionally by state | عد القطع"""
+        if state is None:
+            return self.conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM chunks WHERE state = ?", (state,)
+        ).fetchone()[0]
+
+    def iter_pending(self, batch_size: int) -> Iterator[List[Tuple[str, str, Dict[str, Any], Optional[List[float]]]]]:
+        """
+        Yield batches of not-yet-uploaded chunks | إرجاع دفعات القطع غير المرفوعة
+
+        Yields:
+            Lists of (chunk_id, content, metadata, embedding or None)
+        """
+        ids = [r[0] for r in self.conn.execute(
+            "SELECT chunk_id FROM chunks WHERE state != 'uploaded' ORDER BY rowid"
+        )]
+        for i in range(0, len(ids), batch_size):
+            batch_ids = ids[i:i + batch_size]
+            placeholders = ','.join('?' * len(batch_ids))
+            rows = self.conn.execute(
+                f"SELECT chunk_id, content, metadata, embedding FROM chunks"
+                f" WHERE chunk_id IN ({placeholders}) ORDER BY rowid",
+                batch_ids
+            ).fetchall()
+            yield [
+                (chunk_id, content, json.loads(metadata),
+                 array('f', embedding).tolist() if embedding is not None else None)
+                for chunk_id, content, metadata, embedding in rows
+            ]
+
+    def mark_embedded(self, embeddings: Dict[str, List[float]]) -> None:
+        """
+        Persist embeddings for a batch | حفظ تضمينات دفعة
+
+        Args:
+            embeddings: chunk_id -> vector | معرف القطعة -> المتجه
+        """
+        if not embeddings:
+            return
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE chunks SET embedding = ?, state = 'embedded' WHERE chunk_id = ?",
+                [(array('f', vec).tobytes(), chunk_id) for chunk_id, vec in embeddings.items()]
+            )
+            self._log_batch('embedded', len(embeddings))
+
+    def mark_uploaded(self, chunk_ids: List[str]) -> None:
+        """Mark chunks as uploaded | تعليم القطع كمرفوعة"""
+        if not chunk_ids:
+            return
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE chunks SET state = 'uploaded' WHERE chunk_id = ?",
+                [(chunk_id,) for chunk_id in chunk_ids]
+            )
+            self._log_batch('uploaded', len(chunk_ids))
+
+    def iter_embeddings(self) -> Iterator[Tuple[str, bytes]]:
+        """
+        Yield stored embeddings as raw float32 bytes | إرجاع التضمينات المخزنة كبايتات float32
+        """
+        yield from self.conn.execute(
+            "SELECT chunk_id, embedding FROM chunks WHERE embedding IS NOT NULL ORDER BY rowid"
+        )
+
+    def finish_files(self) -> None:
+        """Mark files whose chunks are all uploaded | تعليم الملفات المكتملة"""
+        with self.conn:
+            self.conn.execute(
+                "UPDATE files SET state = 'uploaded', updated_at = ? WHERE state != 'uploaded'"
+                " AND NOT EXISTS (SELECT 1 FROM chunks WHERE chunks.file_path = files.path"
+                " AND chunks.state != 'uploaded')",
+                (datetime.now().isoformat(),)
+            )
+
+    # -------------------------------------------------------------------------
+    # Table sources | مصادر الجداول
+    # -------------------------------------------------------------------------
+    # Uploaded rows of a table source (e.g. the courses table) keyed by row and
+    # version; unlike chunks they survive begin() so unchanged rows are never
+    # embedded twice.
+    # الصفوف المرفوعة من مصدر جدول تبقى بعد begin() فلا يعاد تضمين الصفوف غير المتغيرة.
+
+    def source_versions(self, source: str) -> Dict[str, str]:
+        """Uploaded version of each row of a source | إصدار كل صف مرفوع"""
+        return dict(self.conn.execute(
+            "SELECT item_key, version FROM source_items WHERE source = ?", (source,)
+        ))
+
+    def source_embeddings(self, source: str, keys: List[str]) -> Dict[str, List[float]]:
+        """
+        Cached embeddings of source rows | التضمينات المخزنة لصفوف المصدر
+
+        Returns:
+            item_key -> vector for the keys that are cached | المفتاح -> المتجه
+        """
+        found: Dict[str, List[float]] = {}
+        for i in range(0, len(keys), 500):
+            batch = keys[i:i + 500]
+            placeholders = ','.join('?' * len(batch))
+            for key, embedding in self.conn.execute(
+                f"SELECT item_key, embedding FROM source_items"
+                f" WHERE source = ? AND item_key IN ({placeholders})",
+                [source, *batch]
+            ):
+                found[key] = array('f', embedding).tolist()
+        return found
+
+    def record_source_items(self, source: str, items: Dict[str, Tuple[str, List[float]]]) -> None:
+        """
+        Record uploaded source rows | تسجيل صفوف المصدر المرفوعة
+
+        Args:
+            source: Source name | اسم المصدر
+            items: item_key -> (version, vector) | المفتاح -> (الإصدار، المتجه)
+        """
+        if not items:
+            return
+        now = datetime.now().isoformat()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO source_items (source, item_key, version, embedding, uploaded_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                [(source, key, version, array('f', vec).tobytes(), now)
+                 for key, (version, vec) in items.items()]
+            )
+
+    def drop_source_items(self, source: str, keys: List[str]) -> None:
+        """Forget rows removed from a source | حذف الصفوف المحذوفة من المصدر"""
+        with self.conn:
+            self.conn.executemany(
+                "DELETE FROM source_items WHERE source = ? AND item_key = ?",
+                [(source, key) for key in keys]
+            )
+
+    def _log_batch(self, stage: str, count: int) -> None:
+        if stage == 'embedded':
+            self.batch_no += 1
+        self.conn.execute(
+            "INSERT INTO batches (batch_no, stage, chunk_count, finished_at) VALUES (?, ?, ?, ?)",
+            (self.batch_no, stage, count, datetime.now().isoformat())
+        )
+
+    def close(self) -> None:
+        """Close the journal | إغلاق السجل"""
+        self.conn.close()
@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=============================================================================
+IntelliPath - Run Instrumentation
+المرشد الأكاديمي الذكي - قياس أداء التشغيل
+=============================================================================
+Shared per-stage instrumentation for the pipeline scripts. Context-manager
+spans record wall time, items, bytes, retries, errors and (optionally)
+tracemalloc peaks; a run is exported as a JSON report and a Prometheus
+textfile, and can be wrapped in cProfile or pyinstrument.
+قياس مشترك لكل مرحلة: الزمن والعناصر والبايتات وإعادات المحاولة وذروة
+الذاكرة، مع تصدير تقرير JSON وملف Prometheus وتشغيل المحلل عند الطلب.
+=============================================================================
+Version: 1.0.0 | الإصدار: 1.0.0
+Last Updated: 2026-10-19 | آخر تحديث: 2026-10-19
+=============================================================================
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import threading
+import tracemalloc
+from typing import Any, Dict, Iterator, List, Optional
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+METRIC_PREFIX = 'intellipath'
+
+
+# =============================================================================
+# SPANS | المقاطع
+# =============================================================================
+
+@dataclass
+class StageStats:
+    """
+    Aggregated measurements for one stage | قياسات مجمعة لمرحلة واحدة
+    """
+    stage: str  # Stage name, e.g. 'courses.write' | اسم المرحلة
+    calls: int = 0  # Completed spans | عدد المقاطع
+    seconds: float = 0.0  # Total wall time | الزمن الكلي
+    max_seconds: float = 0.0  # Slowest span | أبطأ مقطع
+    items: int = 0  # Items processed | العناصر المعالجة
+    bytes: int = 0  # Bytes read or sent | البايتات
+    retries: int = 0  # Retried attempts | إعادات المحاولة
+    errors: int = 0  # Spans that raised plus errors reported on spans | الأخطاء
+    peak_memory: int = 0  # Process-wide tracemalloc peak while open | ذروة ذاكرة العملية
+
+    @property
+    def items_per_second(self) -> float:
+        return self.items / self.seconds if self.seconds > 0 else 0.0
+
+
+class Span:
+    """
+    Live handle for one timed block | مقبض لكتلة مقاسة واحدة
+    """
+
+    __slots__ = ('stage', 'items', 'bytes', 'retries', 'errors', 'peak_memory')
+
+    def __init__(self, stage: str, items: int = 0, bytes: int = 0):
+        self.stage = stage
+        self.items = items
+        self.bytes = bytes
+        self.retries = 0
+        self.errors = 0
+        self.peak_memory = 0
+
+    def add(self, items: int = 0, bytes: int = 0) -> None:
+        """Count processed items and bytes | عد العناصر والبايتات"""
+        self.items += items
+        self.bytes += bytes
+
+    def retry(self, count: int = 1) -> None:
+        """Count a retried attempt | عد إعادة محاولة"""
+        self.retries += count
+
+    def error(self, count: int = 1) -> None:
+        """Count an error handled inside the span | عد خطأ عولج داخل المقطع"""
+        self.errors += count
+
+
+class Instrumentation:
+    """
+    Collects spans for one run and exports them
+    يجمع مقاطع تشغيل واحد ويصدرها
+    """
+
+    def __init__(self, run: str, trace_memory: bool = False):
+        """
+        Initialize instrumentation | تهيئة القياس
+
+        Args:
+            run: Run name used as a metric label | اسم التشغيل
+            trace_memory: Record tracemalloc peaks (slower) | تسجيل ذروة الذاكرة
+        """
+        self.run = run
+        self.trace_memory = trace_memory
+        self.started_at = datetime.now(timezone.utc)
+        self._started = time.perf_counter()
+        self.stages: Dict[str, StageStats] = {}
+        self.result: Dict[str, Any] = {}  # Script stats attached at the end | إحصائيات السكريبت
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def _stack(self) -> List[Span]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _fold_peak(self) -> None:
+        """
+        Credit the current tracemalloc peak to open spans | نسب الذروة للمقاطع المفتوحة
+
+        tracemalloc has one peak for the whole process. Spans open in worker
+        threads therefore share it: a span is credited with allocations made
+        by any thread while it was open, and one thread's reset hides the
+        peak from the others. Per-stage peaks are exact only for stages that
+        run alone; under concurrency, read the top-level peak.
+        ذروة tracemalloc واحدة للعملية كلها، فالمقاطع المتزامنة في الخيوط تتشاركها.
+        """
+        peak = tracemalloc.get_traced_memory()[1]
+        for open_span in self._stack():
+            open_span.peak_memory = max(open_span.peak_memory, peak)
+        tracemalloc.reset_peak()
+
+    @contextmanager
+    def span(self, stage: str, items: int = 0, bytes: int = 0) -> Iterator[Span]:
+        """
+        Time a block as part of a stage | قياس كتلة ضمن مرحلة
+
+        Args:
+            stage: Stage name; repeated spans aggregate | اسم المرحلة
+            items: Items known up front | العناصر المعروفة مسبقاً
+            bytes: Bytes known up front | البايتات المعروفة مسبقاً
+
+        Yields:
+            Span to add items, bytes, retries and errors to | مقطع لإضافة القياسات
+        """
+        current = Span(stage, items, bytes)
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            self._fold_peak()
+        self._stack().append(current)
+        failed = False
+        started = time.perf_counter()
+        try:
+            yield current
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            if tracing:
+                self._fold_peak()
+            self._stack().pop()
+            self._record(current, elapsed, failed)
+
+    def _record(self, current: Span, elapsed: float, failed: bool) -> None:
+        with self._lock:
+            stats = self.stages.get(current.stage)
+            if stats is None:
+                stats = self.stages[current.stage] = StageStats(current.stage)
+            stats.calls += 1
+            stats.seconds += elapsed
+            stats.max_seconds = max(stats.max_seconds, elapsed)
+            stats.items += current.items
+            stats.bytes += current.bytes
+            stats.retries += current.retries
+            stats.errors += current.errors + int(failed)
+            stats.peak_memory = max(stats.peak_memory, current.peak_memory)
+
+    # -------------------------------------------------------------------------
+    # Export | التصدير
+    # -------------------------------------------------------------------------
+
+    def report(self) -> Dict[str, Any]:
+        """
+        JSON-serializable run report | تقرير التشغيل
+
+        Returns:
+            Run metadata, per-stage stats and attached script stats
+            بيانات التشغيل وإحصائيات المراحل والسكريبت
+        """
+        with self._lock:
+            stages = [
+                {**asdict(s), 'seconds': round(s.seconds, 6), 'max_seconds': round(s.max_seconds, 6),
+                 'items_per_second': round(s.items_per_second, 2)}
+                for s in self.stages.values()
+            ]
+        return {
+            'run': self.run,
+            'started_at': self.started_at.isoformat(),
+            'seconds': round(time.perf_counter() - self._started, 6),
+            'trace_memory': self.trace_memory,
+            'stages': stages,
+            'result': self.result,
+        }
+
+    def write_json(self, path: str) -> None:
+        """Write the JSON run report | كتابة تقرير JSON"""
+        _write_atomic(path, json.dumps(self.report(), ensure_ascii=False, indent=2, default=str))
+        logger.info(f"Run report written to {path} | تم حفظ تقرير التشغيل")
+
+    def prometheus_text(self) -> str:
+        """
+        Prometheus text exposition of the run | صيغة Prometheus النصية
+        """
+        report = self.report()
+        run = _label(self.run)
+        metrics = (
+            ('stage_seconds_total', 'counter', 'Wall time spent in the stage', 'seconds'),
+            ('stage_calls_total', 'counter', 'Spans recorded for the stage', 'calls'),
+            ('stage_items_total', 'counter', 'Items processed by the stage', 'items'),
+            ('stage_bytes_total', 'counter', 'Bytes read or sent by the stage', 'bytes'),
+            ('stage_retries_total', 'counter', 'Retried attempts in the stage', 'retries'),
+            ('stage_errors_total', 'counter', 'Spans of the stage that raised plus errors recorded with span.error()', 'errors'),
+            ('stage_items_per_second', 'gauge', 'Stage throughput', 'items_per_second'),
+            ('stage_max_seconds', 'gauge', 'Slowest span of the stage', 'max_seconds'),
+            ('stage_peak_memory_bytes', 'gauge', 'tracemalloc peak during the stage', 'peak_memory'),
+        )
+        lines = []
+        for name, kind, help_text, key in metrics:
+            lines.append(f"# HELP {METRIC_PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {METRIC_PREFIX}_{name} {kind}")
+            for stage in report['stages']:
+                lines.append(
+                    f'{METRIC_PREFIX}_{name}{{run="{run}",stage="{_label(stage["stage"])}"}} {stage[key]}'
+                )
+        lines.append(f"# HELP {METRIC_PREFIX}_run_seconds Wall time of the whole run")
+        lines.append(f"# TYPE {METRIC_PREFIX}_run_seconds gauge")
+        lines.append(f'{METRIC_PREFIX}_run_seconds{{run="{run}"}} {report["seconds"]}')
+        lines.append(f"# HELP {METRIC_PREFIX}_run_timestamp_seconds Start of the run")
+        lines.append(f"# TYPE {METRIC_PREFIX}_run_timestamp_seconds gauge")
+        lines.append(f'{METRIC_PREFIX}_run_timestamp_seconds{{run="{run}"}} {self.started_at.timestamp():.3f}')
+        for key, value in report['result'].items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                lines.append(f'{METRIC_PREFIX}_run_result{{run="{run}",key="{_label(key)}"}} {value}')
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path: str) -> None:
+        """Write a node_exporter textfile | كتابة ملف نصي لـ node_exporter"""
+        _write_atomic(path, self.prometheus_text())
+        logger.info(f"Prometheus metrics written to {path} | تم حفظ مقاييس Prometheus")
+
+    def log_summary(self) -> None:
+        """Log the slowest stages | تسجيل أبطأ المراحل"""
+        stages = sorted(self.stages.values(), key=lambda s: -s.seconds)
+        for s in stages:
+            logger.info(
+                f"  {s.stage}: {s.seconds:.2f}s in {s.calls} spans, {s.items} items "
+                f"({s.items_per_second:.1f}/s), {s.bytes} bytes, {s.retries} retries"
+                + (f", peak {s.peak_memory / 1e6:.1f} MB" if s.peak_memory else '')
+            )
+
+
+def json_size(value: Any) -> int:
+    """Approximate wire size of a JSON payload in bytes | الحجم التقريبي لحمولة JSON"""
+    return len(json.dumps(value, ensure_ascii=False, default=str).encode('utf-8'))
+
+
+def _label(value: str) -> str:
+    """Escape a Prometheus label value | تهريب قيمة التسمية"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _write_atomic(path: str, text: str) -> None:
+    """Write via a temporary file so collectors never read half a file | كتابة ذرية"""
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(target.name + '.tmp')
+    tmp.write_text(text, encoding='utf-8')
+    os.replace(tmp, target)
+
+
+# =============================================================================
+# PROFILING | التحليل
+# =============================================================================
+
+@contextmanager
+def profiled(profiler: Optional[str], output: Optional[str] = None) -> Iterator[None]:
+    """
+    Wrap a block in cProfile or pyinstrument | تشغيل كتلة تحت المحلل
+
+    Args:
+        profiler: 'cprofile', 'pyinstrument' or None | المحلل
+        output: .prof / .html file; defaults to a summary on stderr | ملف الإخراج
+    """
+    if not profiler:
+        yield
+        return
+
+    if profiler == 'pyinstrument':
+        try:
+            from pyinstrument import Profiler
+        except ImportError as e:
+            raise ImportError("pyinstrument is not installed; pip install pyinstrument") from e
+        profile = Profiler()
+        profile.start()
+        try:
+            yield
+        finally:
+            profile.stop()
+            if output:
+                _write_atomic(output, profile.output_html())
+                logger.info(f"Profile written to {output} | تم حفظ ملف التحليل")
+            else:
+                sys.stderr.write(profile.output_text(unicode=True))
+        return
+
+    import cProfile
+    import pstats
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield
+    finally:
+        profile.disable()
+        if output:
+            profile.dump_stats(output)
+            logger.info(f"Profile written to {output} | تم حفظ ملف التحليل")
+        else:
+            pstats.Stats(profile, stream=sys.stderr).sort_stats('cumulative').print_stats(30)
+
+
+# =============================================================================
+# CLI HELPERS | أدوات سطر الأوامر
+# =============================================================================
+
+def add_instrumentation_arguments(parser: Any) -> None:
+    """
+    Add the shared metrics and profiling flags | إضافة خيارات القياس المشتركة
+
+    Args:
+        parser: argparse parser | محلل الوسائط
+    """
+    group = parser.add_argument_group('instrumentation | القياس')
+    group.add_argument('--metrics-json', help='Write a JSON run report here | ملف تقرير التشغيل')
+    group.add_argument(
+        '--metrics-prom',
+        help='Write a Prometheus textfile here (node_exporter textfile collector) | ملف مقاييس Prometheus'
+    )
+    group.add_argument(
+        '--trace-memory',
+        action='store_true',
+        help='Record tracemalloc peaks per stage (slower; process-wide, so concurrent '
+             'stages share one peak) | تسجيل ذروة الذاكرة لكل مرحلة'
+    )
+    group.add_argument(
+        '--profile',
+        choices=['cprofile', 'pyinstrument'],
+        help='Run under a profiler | التشغيل تحت المحلل'
+    )
+    group.add_argument('--profile-output', help='Profile output file (.prof or .html) | ملف التحليل')
+
+
+@contextmanager
+def instrumented_run(run: str, args: Any) -> Iterator[Instrumentation]:
+    """
+    Instrument and optionally profile a script run; reports are written
+    even when the run fails
+    قياس التشغيل وتحليله اختيارياً؛ تكتب التقارير حتى عند الفشل
+
+    Args:
+        run: Run name | اسم التشغيل
+        args: Parsed arguments with the shared flags | الوسائط المحللة
+
+    Yields:
+        Instrumentation to pass to the script's class | أداة القياس
+    """
+    metrics = Instrumentation(run, trace_memory=getattr(args, 'trace_memory', False))
+    try:
+        with profiled(getattr(args, 'profile', None), getattr(args, 'profile_output', None)):
+            yield metrics
+    finally:
+        metrics.log_summary()
+        if getattr(args, 'metrics_json', None):
+            metrics.write_json(args.metrics_json)
+        if getattr(args, 'metrics_prom', None):
+            metrics.write_prometheus(args.metrics_prom)
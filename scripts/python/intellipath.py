@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=============================================================================
+IntelliPath - Unified Command Line
+المرشد الأكاديمي الذكي - واجهة الأوامر الموحدة
+=============================================================================
+Single entry point for the data pipeline:
+
+    intellipath.py seed courses.xlsx --dry-run
+    intellipath.py graph-sync --rebuild
+    intellipath.py embed ./documents --upload-mode bulk
+    intellipath.py search "متطلبات مقرر قواعد المعطيات" --limit 5
+    intellipath.py embed-courses
+    intellipath.py search "databse design" --collection intellipath_courses --filter '{"year_level": 3}'
+    intellipath.py export --output public/data/knowledge_graph.json
+    intellipath.py eligibility --records records.csv --output eligible.csv
+    intellipath.py plan --records records.csv --max-credits 18 --output plans.csv
+    intellipath.py simulate --records records.csv --student 1000042 --retake CIFC.1.01
+    intellipath.py import-records registrar.xlsx --workers 4
+    intellipath.py risk --records supabase --train --write
+    intellipath.py peers --records supabase --state peers.npz --write
+    intellipath.py careers --catalog knowledge_graph.json --neo4j
+    intellipath.py related --catalog knowledge_graph.json --neo4j --dry-run
+    intellipath.py dimension-check --queries eval/queries.jsonl --dims 256 512
+
+Only the selected subcommand's module is imported, and third-party
+packages load on first use, so help and argument errors return at once.
+All subcommands share one settings loader (.env + environment) and one
+set of lazily created clients.
+نقطة دخول واحدة لخط البيانات؛ تستورد وحدة الأمر المختار فقط، وتشترك
+الأوامر في محمل إعدادات واحد وعملاء ينشؤون عند الحاجة.
+=============================================================================
+Version: 1.0.0 | الإصدار: 1.0.0
+Last Updated: 2026-10-19 | آخر تحديث: 2026-10-19
+=============================================================================
+"""
+
+import sys
+import logging
+import argparse
+import importlib
+from typing import Dict, List, NamedTuple, Optional
+
+from settings import Clients, SettingsError, load_settings, setup_logging
+
+logger = logging.getLogger('intellipath')
+
+
+class Command(NamedTuple):
+    """Subcommand definition | تعريف أمر فرعي"""
+    module: str  # Module implementing the command | الوحدة المنفذة
+    add_arguments: str  # Function adding its arguments | دالة إضافة الوسائط
+    run: str  # Function running it | دالة التشغيل
+    log_file: Optional[str]  # Default log file | ملف السجل الافتراضي
+    log_level: int  # Default log level | مستوى التسجيل الافتراضي
+    help: str  # One-line help | وصف مختصر
+
+
+COMMANDS: Dict[str, Command] = {
+    'seed': Command(
+        'seed_courses', 'add_arguments', 'run_command', 'course_seeder.log', logging.INFO,
+        'Seed courses from Excel/CSV into Supabase | تعبئة المقررات'
+    ),
+    'graph-sync': Command(
+        'graph_sync', 'add_arguments', 'run_command', 'graph_sync.log', logging.INFO,
+        'Sync Supabase data to Neo4j | مزامنة Neo4j'
+    ),
+    'embed': Command(
+        'vector_embedding_generator', 'add_arguments', 'run_command', 'embedding_generator.log', logging.INFO,
+        'Embed documents into the vector store | توليد التضمينات'
+    ),
+    'embed-courses': Command(
+        'vector_embedding_generator', 'add_course_arguments', 'run_courses', 'embedding_generator.log', logging.INFO,
+        'Index the courses table for semantic lookup | الفهرسة الدلالية للمقررات'
+    ),
+    'search': Command(
+        'vector_embedding_generator', 'add_search_arguments', 'run_search', None, logging.WARNING,
+        'Search the vector store | البحث في مخزن المتجهات'
+    ),
+    'export': Command(
+        'graph_export', 'add_arguments', 'run_command', None, logging.INFO,
+        'Export the Neo4j graph to JSON | تصدير الرسم المعرفي'
+    ),
+    'eligibility': Command(
+        'eligibility', 'add_arguments', 'run_command', None, logging.INFO,
+        'Check course eligibility from prerequisites | أهلية المقررات'
+    ),
+    'plan': Command(
+        'study_planner', 'add_arguments', 'run_command', None, logging.INFO,
+        'Generate semester study plans | توليد الخطط الدراسية'
+    ),
+    'simulate': Command(
+        'academic_simulator', 'add_arguments', 'run_command', None, logging.WARNING,
+        'What-if GPA scenarios for a student | محاكاة المعدل'
+    ),
+    'import-records': Command(
+        'import_records', 'add_arguments', 'run_command', 'records_importer.log', logging.INFO,
+        'Import student academic records | استيراد السجلات الأكاديمية'
+    ),
+    'risk': Command(
+        'risk_scoring', 'add_arguments', 'run_command', 'risk_scoring.log', logging.INFO,
+        'Batch at-risk scoring | تقييم الطلاب المعرضين للخطر'
+    ),
+    'peers': Command(
+        'peer_matching', 'add_arguments', 'run_command', 'peer_matching.log', logging.INFO,
+        'Top-k similar peers per student | مطابقة الزملاء'
+    ),
+    'careers': Command(
+        'career_relevance', 'add_arguments', 'run_command', 'career_relevance.log', logging.INFO,
+        'Precompute course/career relevance | صلة المقررات بالمسارات المهنية'
+    ),
+    'related': Command(
+        'course_similarity', 'add_arguments', 'run_command', 'course_similarity.log', logging.INFO,
+        'Regenerate RELATED_TO edges from course similarity | تشابه المقررات'
+    ),
+    'dimension-check': Command(
+        'dimension_check', 'add_arguments', 'run_command', None, logging.INFO,
+        'Neighbour recall of reduced embedding dimensions | فحص أبعاد التضمين'
+    ),
+}
+
+# Top-level options that take a value | الخيارات العامة التي تأخذ قيمة
+VALUE_OPTIONS = ('--env-file', '--log-file')
+
+
+def selected_command(argv: List[str]) -> Optional[str]:
+    """
+    First positional argument, if it names a command | الأمر المختار
+    """
+    skip = False
+    for arg in argv:
+        if skip:
+            skip = False
+        elif arg in VALUE_OPTIONS:
+            skip = True
+        elif not arg.startswith('-'):
+            return arg if arg in COMMANDS else None
+    return None
+
+
+def build_parser(command: Optional[str] = None) -> argparse.ArgumentParser:
+    """
+    Build the CLI parser, importing only the selected command's module
+    بناء محلل الأوامر مع استيراد وحدة الأمر المختار فقط
+
+    Args:
+        command: Subcommand whose arguments to load | الأمر المراد تحميل وسائطه
+    """
+    parser = argparse.ArgumentParser(
+        prog='intellipath',
+        description='IntelliPath data pipeline | خط بيانات IntelliPath'
+    )
+    parser.add_argument('--env-file', help='.env file to load (default: search upwards) | ملف البيئة')
+    parser.add_argument(
+        '--log-file',
+        help="Log file (default: per command, '' to disable) | ملف السجل"
+    )
+    parser.add_argument('-v', '--verbose', action='store_true', help='Verbose logging | تسجيل مفصل')
+
+    subparsers = parser.add_subparsers(dest='command', metavar='COMMAND')
+    for name, spec in COMMANDS.items():
+        sub = subparsers.add_parser(name, help=spec.help, description=spec.help)
+        if name == command:
+            module = importlib.import_module(spec.module)
+            getattr(module, spec.add_arguments)(sub)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Main entry point | نقطة الدخول الرئيسية
+
+    Returns:
+        Process exit code | رمز الخروج
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    command = selected_command(argv)
+    parser = build_parser(command)
+    args = parser.parse_args(argv)
+    if not args.command:
+        parser.print_help()
+        return 2
+
+    spec = COMMANDS[args.command]
+    log_file = spec.log_file if args.log_file is None else (args.log_file or None)
+    setup_logging(log_file, logging.DEBUG if args.verbose else spec.log_level)
+
+    clients = None
+    try:
+        settings = load_settings(args.env_file)
+        clients = Clients(settings)
+        run = getattr(importlib.import_module(spec.module), spec.run)
+        return run(args, settings, clients)
+    except (SettingsError, ImportError) as e:
+        logger.error(str(e))
+        return 1
+    finally:
+        if clients:
+            clients.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
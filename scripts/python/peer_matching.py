@@ -0,0 +1,631 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=============================================================================
+IntelliPath - Peer Matching
+المرشد الأكاديمي الذكي - مطابقة الزملاء
+=============================================================================
+Backend for the peer-matching API: the top-k most similar classmates for
+every student, with the courses they share.
+
+- Each student is a sparse vector over courses taken (weighted by the
+  best grade) and the skills and topics those courses reach through the
+  knowledge graph's TEACHES_SKILL / COVERS_TOPIC edges, IDF-weighted so
+  that rare courses and skills count more than the common core.
+- Similarity is cosine, computed as blocked sparse products: students are
+  ordered by major, and each block is multiplied against only the
+  columns it touches and the students sharing at least one of them.
+- Results are kept in an .npz state file. A refresh re-vectorizes only
+  students whose records changed, searches for them, and merges their
+  new scores into everyone else's lists; only lists that could have lost
+  a peer are searched again. IDF weights are frozen between full builds.
+يمثل كل طالب بمتجه متناثر من المقررات والمهارات والموضوعات، ويحسب أقرب
+الزملاء بضرب مصفوفات على كتل مع تحديث تزايدي عند وصول سجلات جديدة.
+=============================================================================
+Version: 1.0.0 | الإصدار: 1.0.0
+Last Updated: 2026-10-19 | آخر تحديث: 2026-10-19
+=============================================================================
+"""
+
+import sys
+import json
+import hashlib
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from dataclasses import dataclass, fields
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+
+from academic_records import (
+    CORE_COLUMNS, PASS_MARK, load_records, mark_points, passed_mask, student_majors
+)
+from array_ops import concat_ranges
+from course_catalog import CourseCatalog, load_catalog
+from import_records import SUMMARY_CODE, UNKNOWN
+from instrumentation import Instrumentation, add_instrumentation_arguments, instrumented_run
+from settings import Clients, Settings, SettingsError, lazy_import, load_settings, setup_logging
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas', 'pandas openpyxl')
+
+logger = logging.getLogger(__name__)
+
+TABLE = 'student_peer_matches'
+COURSE_PREFIX = 'course:'  # Column key prefix for courses | بادئة أعمدة المقررات
+
+
+# =============================================================================
+# CONFIGURATION | الإعدادات
+# =============================================================================
+
+@dataclass
+class PeerConfig:
+    """
+    Peer matching configuration | إعدادات مطابقة الزملاء
+    """
+    top_k: int = 10  # Peers kept per student | عدد الزملاء لكل طالب
+    pass_mark: float = PASS_MARK  # Passing grade for reaching skills | درجة النجاح
+    course_weight: float = 0.7  # Share of similarity from courses | وزن المقررات
+    entity_weight: float = 0.3  # Share from skills and topics | وزن المهارات والموضوعات
+    entity_edges: Tuple[str, ...] = ('TEACHES_SKILL', 'COVERS_TOPIC')  # Graph edges followed | العلاقات المتبعة
+    block_size: int = 512  # Students per query block | الطلاب لكل كتلة
+    max_columns: int = 1024  # Columns densified per block before splitting | حد الأعمدة لكل كتلة
+    dense_cells: int = 1 << 26  # Largest students x columns kept dense (256 MB) | حد المصفوفة الكثيفة
+    batch_size: int = 500  # Rows per upsert request | الصفوف لكل طلب
+    workers: int = 4  # Parallel upsert requests | الطلبات المتوازية
+
+    def fingerprint(self, catalog: CourseCatalog) -> str:
+        """
+        Hash of everything that changes vectors or list length
+        بصمة الإعدادات والعلاقات التي تغير المتجهات
+        """
+        digest = hashlib.sha1(json.dumps([
+            self.top_k, self.pass_mark, self.course_weight, self.entity_weight, list(self.entity_edges),
+        ]).encode())
+        for edge_type in self.entity_edges:
+            for source, target in sorted(catalog.edges.get(edge_type, [])):
+                digest.update(f'{edge_type}\t{source}\t{target}\n'.encode())
+        return digest.hexdigest()
+
+
+# =============================================================================
+# STATE | الحالة
+# =============================================================================
+
+@dataclass
+class PeerIndex:
+    """
+    Student vectors and their top-k peers | متجهات الطلاب وأقرب الزملاء
+
+    Vectors are CSR over `columns` (row_ptr/cols/values, rows in
+    student order); neighbors holds row numbers, -1 where fewer than
+    top_k students share anything.
+    """
+    student_ids: 'np.ndarray'
+    majors: 'np.ndarray'
+    digests: 'np.ndarray'  # Per-student hash of their records | بصمة سجلات الطالب
+    columns: 'np.ndarray'
+    weights: 'np.ndarray'  # IDF per column | وزن كل عمود
+    row_ptr: 'np.ndarray'
+    cols: 'np.ndarray'
+    values: 'np.ndarray'
+    neighbors: 'np.ndarray'
+    scores: 'np.ndarray'
+    fingerprint: str = ''
+
+    def save(self, path: str) -> None:
+        """Write the state as compressed .npz | حفظ الحالة"""
+        arrays = {f.name: getattr(self, f.name) for f in fields(self) if f.name != 'fingerprint'}
+        np.savez_compressed(path, fingerprint=np.array(self.fingerprint), **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> 'PeerIndex':
+        """Read a saved state | تحميل الحالة"""
+        with np.load(path, allow_pickle=False) as data:
+            arrays = {name: data[name] for name in data.files}
+        arrays['fingerprint'] = str(arrays['fingerprint'])
+        return cls(**arrays)
+
+    def course_sets(self, rows: 'np.ndarray') -> Dict[int, frozenset]:
+        """Course codes taken by the given rows | المقررات لكل طالب"""
+        is_course = np.char.startswith(self.columns, COURSE_PREFIX)
+        codes = np.array([c[len(COURSE_PREFIX):] for c in self.columns.tolist()], dtype=object)
+        cells = np.flatnonzero(is_course[self.cols])
+        bounds = np.searchsorted(cells, self.row_ptr)
+        taken = codes[self.cols[cells]]
+        return {row: frozenset(taken[bounds[row]:bounds[row + 1]]) for row in np.unique(rows).tolist()}
+
+
+# =============================================================================
+# VECTORS | المتجهات
+# =============================================================================
+
+def record_digests(records: 'pd.DataFrame') -> 'pd.Series':
+    """
+    Order-independent hash of each student's records | بصمة سجلات كل طالب
+
+    Any added, removed or edited row changes it.
+    """
+    columns = [c for c in CORE_COLUMNS if c in records]
+    hashed = pd.util.hash_pandas_object(records[columns], index=False)
+    return hashed.groupby(records['student_id'].to_numpy(), sort=False).sum().astype('uint64')
+
+
+def _cells(records: 'pd.DataFrame', catalog: CourseCatalog, config: PeerConfig) -> 'pd.DataFrame':
+    """
+    Raw (student_id, key, value) cells before weighting | الخلايا الخام
+
+    Courses score 0.5-1.0 by the best grade (any attempt counts as taken);
+    each skill/topic scores log(1 + passed courses reaching it).
+    """
+    taken = records[~records['course_code'].isin((SUMMARY_CODE, UNKNOWN, '', 'nan', 'None'))]
+    points = taken['grade_points'].fillna(pd.Series(mark_points(taken['final_grade']), index=taken.index))
+    courses = (
+        taken.assign(_points=points.fillna(0).clip(0, 4), _passed=passed_mask(taken, config.pass_mark))
+        .groupby(['student_id', 'course_code'], sort=False)
+        .agg(_points=('_points', 'max'), _passed=('_passed', 'any'))
+        .reset_index()
+    )
+    # Keys are categorical so string work runs once per distinct key
+    # المفاتيح فئوية لتجنب العمليات النصية لكل خلية
+    codes, uniques = pd.factorize(courses['course_code'])
+    keys = [pd.Categorical.from_codes(codes, COURSE_PREFIX + uniques.astype(str))]
+    parts = [pd.DataFrame({'student_id': courses['student_id'], 'value': 0.5 + courses['_points'] / 8})]
+
+    links = pd.DataFrame(
+        [(source, f'{edge_type}:{target}') for edge_type in config.entity_edges
+         for source, target in catalog.edges.get(edge_type, [])],
+        columns=['course_code', 'key'],
+    ).drop_duplicates().astype({'key': 'category'})
+    if len(links):
+        reached = courses.loc[courses['_passed'], ['student_id', 'course_code']].merge(links, on='course_code')
+        counts = reached.groupby(['student_id', 'key'], sort=False, observed=True).size().reset_index(name='count')
+        keys.append(counts['key'].array)
+        parts.append(pd.DataFrame({'student_id': counts['student_id'], 'value': np.log1p(counts['count'])}))
+    cells = pd.concat(parts, ignore_index=True)
+    cells['key'] = pd.api.types.union_categoricals(keys)
+    return cells
+
+
+def _key_columns(keys: 'pd.Series', columns: 'pd.Index') -> 'np.ndarray':
+    """Column number of each categorical key | رقم العمود لكل مفتاح"""
+    return columns.get_indexer(keys.cat.categories)[keys.cat.codes.to_numpy()]
+
+
+def _idf(document_frequency: 'np.ndarray', students: int) -> 'np.ndarray':
+    """Smoothed inverse document frequency | وزن الندرة"""
+    return (np.log((1 + students) / (1 + document_frequency)) + 1).astype(np.float32)
+
+
+def _vectorize(cells: 'pd.DataFrame', rows: 'np.ndarray', col_of: 'pd.Index', weights: 'np.ndarray',
+               config: PeerConfig) -> Tuple['np.ndarray', 'np.ndarray', 'np.ndarray']:
+    """
+    Weighted, normalized COO (row, col, value) sorted by row | المتجهات المطبّعة
+
+    Courses and skills/topics are normalized separately and mixed by
+    course_weight / entity_weight, then the row is normalized to unit length.
+    """
+    cols = _key_columns(cells['key'], col_of)
+    values = cells['value'].to_numpy(np.float32) * weights[cols]
+    is_course = np.char.startswith(col_of.to_numpy().astype(str), COURSE_PREFIX)[cols]
+    n = int(rows.max()) + 1 if len(rows) else 0
+
+    for mask, share in ((is_course, config.course_weight), (~is_course, config.entity_weight)):
+        norm = np.sqrt(np.bincount(rows[mask], weights=values[mask] ** 2, minlength=n))
+        values[mask] *= np.float32(np.sqrt(share)) / np.maximum(norm[rows[mask]], 1e-12).astype(np.float32)
+    norm = np.sqrt(np.bincount(rows, weights=values ** 2, minlength=n))
+    values /= np.maximum(norm[rows], 1e-12).astype(np.float32)
+
+    order = np.lexsort((cols, rows))
+    return rows[order].astype(np.int32), cols[order].astype(np.int32), values[order]
+
+
+# =============================================================================
+# SEARCH | البحث
+# =============================================================================
+
+class _Searcher:
+    """
+    Blocked sparse top-k search over one PeerIndex | البحث على كتل
+
+    Holds the column postings (CSC) of all vectors, or the whole matrix
+    column-major when it fits dense_cells. A block of query rows is
+    densified over the columns it touches and multiplied against the
+    students that have any of those columns.
+    """
+
+    def __init__(self, index: PeerIndex, config: PeerConfig):
+        self.index = index
+        self.config = config
+        self.k = config.top_k
+        order = np.argsort(index.cols, kind='stable')
+        counts = np.bincount(index.cols, minlength=len(index.columns))
+        self.col_ptr = np.concatenate(([0], np.cumsum(counts)))
+        self.col_rows = np.repeat(np.arange(len(index.row_ptr) - 1, dtype=np.int32), np.diff(index.row_ptr))[order]
+        self.col_values = index.values[order]
+        self.dense = None
+        students = len(index.row_ptr) - 1
+        if students * len(index.columns) <= config.dense_cells:
+            self.dense = np.zeros((students, len(index.columns)), dtype=np.float32, order='F')
+            self.dense[self.col_rows, index.cols[order]] = self.col_values
+        self.searched = 0
+
+    def _scores(self, block: 'np.ndarray') -> Tuple['np.ndarray', 'np.ndarray']:
+        """Query block x candidates similarity | تشابه الكتلة مع المرشحين"""
+        index = self.index
+        positions = concat_ranges(index.row_ptr[block], index.row_ptr[block + 1])
+        query_rows = np.repeat(np.arange(len(block)), np.diff(index.row_ptr)[block])
+        used, query_cols = np.unique(index.cols[positions], return_inverse=True)
+        query = np.zeros((len(block), len(used)), dtype=np.float32)
+        query[query_rows, query_cols] = index.values[positions]
+
+        if self.dense is not None:
+            return np.arange(len(self.dense)), query @ self.dense[:, used].T
+
+        postings = concat_ranges(self.col_ptr[used], self.col_ptr[used + 1])
+        candidates, cand_rows = np.unique(self.col_rows[postings], return_inverse=True)
+        matrix = np.zeros((len(candidates), len(used)), dtype=np.float32)
+        matrix[cand_rows, np.repeat(np.arange(len(used)), np.diff(self.col_ptr)[used])] = self.col_values[postings]
+        return candidates, query @ matrix.T
+
+    def _top(self, candidates: 'np.ndarray', scores: 'np.ndarray',
+             floor: 'np.ndarray') -> Tuple['np.ndarray', 'np.ndarray']:
+        """
+        Best k positive columns per row, -1 padded | أفضل k لكل صف
+
+        `floor` must not exceed each row's true k-th best score; only
+        entries at or above it are sorted, instead of partitioning every row.
+        """
+        rows, cols = np.nonzero(scores >= np.maximum(floor, 1e-6)[:, None])
+        values = scores[rows, cols]
+        order = np.lexsort((-values, rows))
+        rows, cols, values = rows[order], cols[order], values[order]
+        rank = np.arange(len(rows)) - np.searchsorted(rows, rows)
+        keep = rank < self.k
+        neighbors = np.full((len(scores), self.k), -1, dtype=np.int32)
+        best = np.zeros((len(scores), self.k), dtype=np.float32)
+        neighbors[rows[keep], rank[keep]] = candidates[cols[keep]]
+        best[rows[keep], rank[keep]] = values[keep]
+        return neighbors, best
+
+    def search(self, queries: 'np.ndarray', merge_into: Optional['np.ndarray'] = None) -> None:
+        """
+        Recompute the lists of `queries` | إعادة حساب قوائم الاستعلام
+
+        Args:
+            queries: Rows to search for | الصفوف المطلوبة
+            merge_into: Boolean mask of rows whose current lists are still
+                        exact except for the queries; their scores against
+                        the queries are merged in | صفوف تُدمج فيها الدرجات
+        """
+        index = self.index
+        queries = queries[np.diff(index.row_ptr)[queries] > 0]
+        stack = [queries[i:i + self.config.block_size] for i in range(0, len(queries), self.config.block_size)]
+        while stack:
+            block = stack.pop()
+            columns = len(np.unique(index.cols[concat_ranges(index.row_ptr[block], index.row_ptr[block + 1])]))
+            if columns > self.config.max_columns and len(block) > 1:
+                stack.extend(np.array_split(block, 2))
+                continue
+            candidates, scores = self._scores(block)
+            self.searched += len(block)
+
+            if merge_into is not None:
+                targets = np.flatnonzero(merge_into[candidates])
+                if len(targets):
+                    merged_rows = candidates[targets]
+                    pool = np.concatenate((index.neighbors[merged_rows],
+                                           np.broadcast_to(block, (len(targets), len(block)))), axis=1)
+                    pool_scores = np.concatenate((index.scores[merged_rows], scores[:, targets].T), axis=1)
+                    # The old k-th score still bounds the merged list from below
+                    # الدرجة k القديمة حد أدنى للقائمة المدمجة
+                    picked, best = self._top(np.arange(pool.shape[1]), pool_scores, pool_scores[:, self.k - 1])
+                    merged = np.where(picked >= 0, np.take_along_axis(pool, np.maximum(picked, 0), axis=1), -1)
+                    index.neighbors[merged_rows], index.scores[merged_rows] = merged, best
+
+            self_pos = np.searchsorted(candidates, block)
+            scores[np.arange(len(block)), self_pos] = -np.inf
+            # Blockmates share a major, so their k-th best is a tight floor
+            # زملاء الكتلة من التخصص نفسه فدرجتهم k حد أدنى قريب
+            floor = np.zeros(len(block), dtype=np.float32)
+            if len(block) > self.k:
+                floor = np.partition(scores[:, self_pos], len(block) - self.k, axis=1)[:, len(block) - self.k]
+            index.neighbors[block], index.scores[block] = self._top(candidates, scores, floor)
+
+
+# =============================================================================
+# MATCHING | المطابقة
+# =============================================================================
+
+def _student_order(records: 'pd.DataFrame', student_ids: 'pd.Index') -> Tuple['np.ndarray', 'np.ndarray']:
+    """Students sorted by (major, id) so blocks share columns | ترتيب الطلاب حسب التخصص"""
+    majors = student_majors(records).reindex(student_ids).fillna('').to_numpy().astype(str)
+    order = np.lexsort((student_ids.to_numpy().astype(str), majors))
+    return student_ids.to_numpy().astype(str)[order], majors[order]
+
+
+def match_peers(records: 'pd.DataFrame', catalog: CourseCatalog, config: Optional[PeerConfig] = None,
+                previous: Optional[PeerIndex] = None,
+                metrics: Optional[Instrumentation] = None) -> Tuple[PeerIndex, 'np.ndarray', Dict[str, int]]:
+    """
+    Build or refresh every student's peer list | بناء أو تحديث قوائم الزملاء
+
+    Args:
+        records: Academic records | السجلات الأكاديمية
+        catalog: Catalog with skill/topic edges | الكتالوج
+        config: Matching configuration | الإعدادات
+        previous: Saved state to refresh; rebuilt when its fingerprint differs
+                  الحالة السابقة للتحديث
+        metrics: Instrumentation for stage timings | أداة القياس
+
+    Returns:
+        (index, rows whose lists changed, stats) | الفهرس والصفوف المتغيرة والإحصائيات
+    """
+    config = config or PeerConfig()
+    metrics = metrics or Instrumentation('peer_matching')
+    fingerprint = config.fingerprint(catalog)
+    digests = record_digests(records)
+    student_ids, majors = _student_order(records, digests.index)
+    digests = digests.reindex(student_ids).to_numpy()
+    n = len(student_ids)
+    full = previous is None or previous.fingerprint != fingerprint
+    affected = np.zeros(n, dtype=bool)
+
+    if full:
+        if previous is not None:
+            logger.info("Configuration or graph changed, rebuilding | تغيرت الإعدادات، إعادة البناء")
+        changed = np.ones(n, dtype=bool)
+        removed = 0 if previous is None else len(set(previous.student_ids) - set(student_ids))
+    else:
+        old_ids = pd.Index(previous.student_ids)
+        old_row = old_ids.get_indexer(student_ids)
+        changed = (old_row < 0) | (previous.digests[np.maximum(old_row, 0)] != digests)
+        new_row = pd.Index(student_ids).get_indexer(old_ids)
+        # Old rows whose vector is gone or different | الصفوف القديمة المتغيرة أو المحذوفة
+        stale = new_row < 0
+        stale[~stale] = changed[new_row[~stale]]
+        removed = int((new_row < 0).sum())
+
+    with metrics.span('vectors') as span:
+        if full:
+            cells = _cells(records, catalog, config)
+            columns = pd.Index(np.sort(np.asarray(cells['key'].unique())))
+            frequency = np.bincount(_key_columns(cells['key'], columns), minlength=len(columns))
+            weights = _idf(frequency, n)
+            unchanged_coo = (np.empty(0, np.int32), np.empty(0, np.int32), np.empty(0, np.float32))
+        else:
+            cells = _cells(records[records['student_id'].isin(student_ids[changed])], catalog, config)
+            known = pd.Index(previous.columns)
+            added = np.sort(np.asarray(cells.loc[~cells['key'].isin(known), 'key'].unique()))
+            columns = known.append(pd.Index(added))
+            frequency = cells['key'].value_counts().reindex(added, fill_value=0).to_numpy()
+            weights = np.concatenate((previous.weights, _idf(frequency, n)))
+
+            keep = np.flatnonzero(~changed)
+            old_rows = old_row[keep]
+            positions = concat_ranges(previous.row_ptr[old_rows], previous.row_ptr[old_rows + 1])
+            unchanged_coo = (
+                np.repeat(keep, np.diff(previous.row_ptr)[old_rows]).astype(np.int32),
+                previous.cols[positions], previous.values[positions],
+            )
+
+        rows = pd.Index(student_ids).get_indexer(cells['student_id'])
+        new_coo = _vectorize(cells, rows, columns, weights, config)
+        all_rows, all_cols, all_values = (np.concatenate(parts) for parts in zip(unchanged_coo, new_coo))
+        order = np.argsort(all_rows, kind='stable')
+        row_ptr = np.concatenate(([0], np.cumsum(np.bincount(all_rows, minlength=n))))
+        span.add(items=int(changed.sum()))
+
+    neighbors = np.full((n, config.top_k), -1, dtype=np.int32)
+    scores = np.zeros((n, config.top_k), dtype=np.float32)
+    if not full:
+        # Carry unchanged lists over, renumbered; lists that held a changed
+        # or removed student must be searched again
+        # نقل القوائم غير المتغيرة وإعادة البحث لمن فقد زميلاً
+        keep = np.flatnonzero(~changed)
+        old_neighbors = previous.neighbors[old_row[keep]]
+        valid = old_neighbors >= 0
+        affected[keep] = (valid & stale[np.maximum(old_neighbors, 0)]).any(axis=1)
+        neighbors[keep] = np.where(valid, new_row[np.maximum(old_neighbors, 0)], -1)
+        scores[keep] = previous.scores[old_row[keep]]
+
+    index = PeerIndex(
+        student_ids=student_ids, majors=majors, digests=digests,
+        columns=columns.to_numpy().astype(str), weights=weights,
+        row_ptr=row_ptr, cols=all_cols[order], values=all_values[order],
+        neighbors=neighbors, scores=scores, fingerprint=fingerprint,
+    )
+
+    with metrics.span('search') as span:
+        searcher = _Searcher(index, config)
+        before = neighbors.copy()
+        merge_into = None if full else ~changed & ~affected
+        searcher.search(np.flatnonzero(changed), merge_into)
+        searcher.search(np.flatnonzero(affected))
+        span.add(items=searcher.searched)
+    dirty = changed | affected | (index.neighbors != before).any(axis=1)
+
+    stats = {
+        'students': n,
+        'changed': int(changed.sum()),
+        'removed': removed,
+        'affected': int(affected.sum()),
+        'searched': searcher.searched,
+        'updated': int(dirty.sum()),
+    }
+    return index, dirty, stats
+
+
+def peer_rows(index: PeerIndex, rows: 'np.ndarray') -> List[Dict[str, Any]]:
+    """
+    Peer lists shaped like the API's PeerMatch | قوائم الزملاء بصيغة الواجهة
+
+    Returns:
+        One dict per student with its ranked peers | قاموس لكل طالب
+    """
+    neighbors = index.neighbors[rows]
+    courses = index.course_sets(np.concatenate((rows, neighbors[neighbors >= 0])))
+    ids, majors = index.student_ids.tolist(), [major or None for major in index.majors.tolist()]
+    result = []
+    for row, peer_list, score_list in zip(rows.tolist(), neighbors.tolist(), index.scores[rows].tolist()):
+        peers = [{
+            'student_id': ids[peer],
+            'major': majors[peer],
+            'shared_courses': sorted(courses[row] & courses[peer]),
+            'compatibility_score': round(score, 4),
+        } for peer, score in zip(peer_list, score_list) if peer >= 0]
+        result.append({'student_id': ids[row], 'major': majors[row], 'peers': peers})
+    return result
+
+
+def write_matches(client: Any, rows: List[Dict[str, Any]], removed: Sequence[str],
+                  config: Optional[PeerConfig] = None,
+                  metrics: Optional[Instrumentation] = None) -> int:
+    """
+    Upsert peer lists on student_id and drop removed students
+    إدراج قوائم الزملاء وحذف الطلاب المحذوفين
+
+    Returns:
+        Rows that failed to write | الصفوف التي فشل إدراجها
+    """
+    config = config or PeerConfig()
+    metrics = metrics or Instrumentation('peer_matching')
+    computed_at = datetime.now(timezone.utc).isoformat()
+    payload = [dict(row, computed_at=computed_at) for row in rows]
+    batches = [payload[i:i + config.batch_size] for i in range(0, len(payload), config.batch_size)]
+
+    def send(batch: List[Dict[str, Any]]) -> int:
+        try:
+            with metrics.span('peers.upsert', items=len(batch)):
+                client.table(TABLE).upsert(batch, on_conflict='student_id', returning='minimal').execute()
+            return 0
+        except Exception as e:
+            logger.error(f"Peer batch failed: {e} | فشل إدراج الدفعة")
+            return len(batch)
+
+    failed = 0
+    for start in range(0, len(removed), config.batch_size):
+        try:
+            client.table(TABLE).delete().in_('student_id', list(removed[start:start + config.batch_size])).execute()
+        except Exception as e:
+            logger.error(f"Peer delete failed: {e} | فشل الحذف")
+            failed += len(removed[start:start + config.batch_size])
+    with ThreadPoolExecutor(max_workers=max(config.workers, 1)) as pool:
+        return failed + sum(pool.map(send, batches))
+
+
+# =============================================================================
+# MAIN ENTRY POINT | نقطة الدخول الرئيسية
+# =============================================================================
+
+def add_arguments(parser: Any) -> None:
+    """
+    Add peer matching arguments to a parser | إضافة وسائط مطابقة الزملاء
+    """
+    parser.add_argument(
+        '--records', required=True,
+        help="student_academic_records CSV/Excel or 'supabase' | مصدر السجلات الأكاديمية"
+    )
+    parser.add_argument(
+        '--catalog',
+        help="Knowledge graph export or 'supabase' for skill/topic edges (default: bundled export) | مصدر الكتالوج"
+    )
+    parser.add_argument('--student', help="Print one student's peers | زملاء طالب واحد")
+    parser.add_argument('--top-k', type=int, default=10, help='Peers per student (default: 10) | عدد الزملاء')
+    parser.add_argument('--state', help='Saved .npz state to refresh and update | ملف الحالة للتحديث التزايدي')
+    parser.add_argument('--full', action='store_true', help='Ignore the saved state and rebuild | إعادة البناء الكامل')
+    parser.add_argument('--pass-mark', type=float, default=PASS_MARK, help='Passing grade (default: 60) | درجة النجاح')
+    parser.add_argument('--output', help='Peer pairs CSV | ملف أزواج الزملاء')
+    parser.add_argument('--write', action='store_true', help=f'Upsert changed lists into {TABLE} | كتابة القوائم')
+    parser.add_argument('--batch-size', type=int, default=500, help='Rows per upsert request (default: 500) | الصفوف لكل طلب')
+    parser.add_argument('--workers', type=int, default=4, help='Parallel upsert requests (default: 4) | الطلبات المتوازية')
+    add_instrumentation_arguments(parser)
+
+
+def run_command(args: Any, settings: Settings, clients: Optional[Clients] = None) -> int:
+    """
+    Match peers from parsed arguments | مطابقة الزملاء من الوسائط
+
+    Returns:
+        Process exit code | رمز الخروج
+    """
+    uses_supabase = args.write or 'supabase' in (args.catalog, args.records)
+    if uses_supabase:
+        settings.require('supabase_url', 'supabase_key')
+    clients = clients or Clients(settings)
+    client = clients.supabase if uses_supabase else None
+    config = PeerConfig(top_k=args.top_k, pass_mark=args.pass_mark,
+                        batch_size=args.batch_size, workers=args.workers)
+
+    previous = None
+    if args.state and not args.full:
+        try:
+            previous = PeerIndex.load(args.state)
+        except FileNotFoundError:
+            logger.info(f"No state at {args.state}, building from scratch | لا توجد حالة سابقة")
+
+    with instrumented_run('peer_matching', args) as metrics:
+        with metrics.span('load') as span:
+            records = load_records(args.records, client=client)
+            catalog = load_catalog(args.catalog, client=client)
+            span.add(items=len(records))
+        index, dirty, stats = match_peers(records, catalog, config, previous, metrics)
+        if args.state:
+            index.save(args.state)
+
+        if args.student:
+            row = np.flatnonzero(index.student_ids == args.student)
+            if not len(row):
+                logger.error(f"No records for student {args.student} | لا توجد سجلات للطالب")
+                return 1
+            print(json.dumps(peer_rows(index, row)[0], ensure_ascii=False, indent=2))
+            return 0
+
+        rows = np.flatnonzero(dirty)
+        matches = peer_rows(index, rows) if (args.output or args.write) else []
+        if args.output:
+            pd.DataFrame([
+                {'student_id': match['student_id'], 'rank': rank, 'peer_id': peer['student_id'],
+                 'peer_major': peer['major'], 'compatibility_score': peer['compatibility_score'],
+                 'shared_courses': ';'.join(peer['shared_courses'])}
+                for match in matches for rank, peer in enumerate(match['peers'], 1)
+            ], columns=['student_id', 'rank', 'peer_id', 'peer_major', 'compatibility_score',
+                        'shared_courses']).to_csv(args.output, index=False, encoding='utf-8')
+        failed = 0
+        if args.write:
+            removed = [] if previous is None else sorted(set(previous.student_ids) - set(index.student_ids))
+            with metrics.span('write', items=len(matches)):
+                failed = write_matches(client, matches, removed, config, metrics)
+
+        found = index.scores[:, 0][index.neighbors[:, 0] >= 0]
+        stats.update({
+            'mean_top_score': round(float(found.mean()), 4) if len(found) else 0.0,
+            'written': len(matches) - failed if args.write else 0,
+        })
+        metrics.result.update(stats)
+    print(json.dumps(stats, ensure_ascii=False, indent=2))
+    return 1 if failed else 0
+
+
+def main():
+    """
+    Main entry point | نقطة الدخول الرئيسية
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='IntelliPath peer matching | مطابقة الزملاء'
+    )
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    setup_logging('peer_matching.log')
+    try:
+        sys.exit(run_command(args, load_settings()))
+    except (SettingsError, ImportError, ValueError) as e:
+        logger.error(str(e))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
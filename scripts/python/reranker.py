@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=============================================================================
+IntelliPath - Cross-Encoder Reranker
+المرشد الأكاديمي الذكي - معيد الترتيب بالمشفر المتقاطع
+=============================================================================
+Optional second retrieval stage: over-fetched vector search candidates are
+scored against the query by a small multilingual cross-encoder on CPU
+(ONNX Runtime or PyTorch), in batches, with scores cached per
+(query hash, point id, content hash) so repeated questions skip the model.
+مرحلة استرجاع ثانية اختيارية: تقييم المرشحين بمشفر متقاطع متعدد اللغات
+على المعالج مع تخزين الدرجات لكل (hash الاستعلام، معرف النقطة، hash المحتوى).
+=============================================================================
+Version: 1.0.0 | الإصدار: 1.0.0
+Last Updated: 2026-10-19 | آخر تحديث: 2026-10-19
+=============================================================================
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from dataclasses import dataclass
+from pathlib import Path
+
+from settings import lazy_import
+
+# Loaded with the model | تحمل مع النموذج
+np = lazy_import('numpy')
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# CONFIGURATION | الإعدادات
+# =============================================================================
+
+@dataclass
+class RerankerConfig:
+    """
+    Configuration for the reranker | إعدادات معيد الترتيب
+    """
+    model_name: str = "cross-encoder/mmarco-mMiniLMv2-L12-H384-v1"  # Multilingual (incl. Arabic) | متعدد اللغات
+    backend: str = "onnx"  # 'onnx' (onnxruntime) or 'torch' | محرك التشغيل
+    threads: int = 4  # Intra-op CPU threads | خيوط المعالج
+    batch_size: int = 16  # Pairs scored per forward pass | الأزواج لكل تمريرة
+    max_length: int = 512  # Tokens per (query, passage) pair | الرموز لكل زوج
+    cache_path: Optional[str] = ".cache/rerank_scores.sqlite"  # Score cache | ذاكرة الدرجات
+    onnx_cache_dir: Optional[str] = ".cache/onnx"  # Exported ONNX models | نماذج ONNX المصدرة
+
+
+def query_hash(query: str) -> str:
+    """Stable hash of a normalized query | hash ثابت للاستعلام المطبع"""
+    return hashlib.sha256(' '.join(query.split()).casefold().encode('utf-8')).hexdigest()
+
+
+def content_hash(text: str) -> str:
+    """Hash of the passage text that was scored | hash نص المقطع المقيم"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+# =============================================================================
+# SCORE CACHE | ذاكرة الدرجات
+# =============================================================================
+
+class ScoreCache:
+    """
+    SQLite cache of cross-encoder scores | ذاكرة SQLite لدرجات المشفر المتقاطع
+    Rows are keyed on the scored text's hash as well as the point id: course
+    points keep the same id across description edits, so the id alone would
+    serve stale scores.
+    الصفوف مفهرسة بـ hash النص مع معرف النقطة لأن نقاط المقررات تحتفظ بمعرفها بعد التعديل.
+    One connection is shared by concurrent searches behind a lock.
+    اتصال واحد مشترك بين عمليات البحث المتزامنة مع قفل.
+    """
+
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS rerank_scores ("
+            " model TEXT NOT NULL, query_hash TEXT NOT NULL, point_id TEXT NOT NULL,"
+            " content_hash TEXT NOT NULL, score REAL NOT NULL,"
+            " PRIMARY KEY (model, query_hash, point_id, content_hash))"
+        )
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, model: str, qhash: str,
+                 keys: List[Tuple[str, str]]) -> Dict[Tuple[str, str], float]:
+        """Cached scores for (point id, content hash) keys | الدرجات المخزنة للمفاتيح"""
+        if not keys:
+            return {}
+        placeholders = ','.join('(?, ?)' for _ in keys)
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT point_id, content_hash, score FROM rerank_scores"
+                f" WHERE model = ? AND query_hash = ?"
+                f" AND (point_id, content_hash) IN (VALUES {placeholders})",
+                [model, qhash, *(part for key in keys for part in key)]
+            ).fetchall()
+            found = {(point_id, digest): score for point_id, digest, score in rows}
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, model: str, qhash: str, scores: Dict[Tuple[str, str], float]) -> None:
+        """Store scores | تخزين الدرجات"""
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO rerank_scores"
+                " (model, query_hash, point_id, content_hash, score) VALUES (?, ?, ?, ?, ?)",
+                [(model, qhash, point_id, digest, score)
+                 for (point_id, digest), score in scores.items()]
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
+
+
+# =============================================================================
+# RERANKER | معيد الترتيب
+# =============================================================================
+
+class CrossEncoderReranker:
+    """
+    Batched CPU cross-encoder with a score cache
+    مشفر متقاطع على المعالج بدفعات مع ذاكرة للدرجات
+    """
+
+    def __init__(self, config: RerankerConfig):
+        """
+        Initialize the reranker; the model loads on first use
+        تهيئة معيد الترتيب؛ يحمل النموذج عند أول استخدام
+
+        Args:
+            config: Reranker configuration | إعدادات معيد الترتيب
+        """
+        if config.backend not in ('onnx', 'torch'):
+            raise ValueError(f"Unknown reranker backend: {config.backend}")
+        self.config = config
+        self.cache = ScoreCache(config.cache_path) if config.cache_path else None
+        self._tokenizer = None
+        self._model = None
+        self._load_lock = threading.Lock()
+
+    def _load_model(self) -> None:
+        """Load tokenizer and model for the configured backend | تحميل النموذج"""
+        with self._load_lock:
+            if self._model is None:
+                self._load_model_locked()
+
+    def _load_model_locked(self) -> None:
+        """Load the model; caller holds _load_lock | تحميل النموذج مع القفل"""
+
+        try:
+            from transformers import AutoTokenizer
+            if self.config.backend == 'onnx':
+                import onnxruntime
+                from optimum.onnxruntime import ORTModelForSequenceClassification
+            else:
+                import torch
+                from transformers import AutoModelForSequenceClassification
+        except ImportError as e:
+            raise ImportError(
+                f"Reranker backend '{self.config.backend}' unavailable ({e}); install "
+                + ("optimum[onnxruntime]" if self.config.backend == 'onnx' else "torch transformers")
+            ) from e
+
+        logger.info(f"Loading reranker {self.config.model_name} ({self.config.backend})")
+        self._tokenizer = AutoTokenizer.from_pretrained(self.config.model_name)
+
+        if self.config.backend == 'onnx':
+            options = onnxruntime.SessionOptions()
+            options.intra_op_num_threads = self.config.threads
+            options.inter_op_num_threads = 1
+            self._model = self._load_onnx(ORTModelForSequenceClassification, options)
+        else:
+            torch.set_num_threads(self.config.threads)
+            self._model = AutoModelForSequenceClassification.from_pretrained(self.config.model_name)
+            self._model.eval()
+
+    def _load_onnx(self, model_class: Any, options: Any) -> Any:
+        """
+        Load the ONNX model, exporting it once into the on-disk cache
+        تحميل نموذج ONNX مع تصديره مرة واحدة إلى ذاكرة القرص
+        """
+        load = {'provider': 'CPUExecutionProvider', 'session_options': options}
+        if not self.config.onnx_cache_dir:
+            return model_class.from_pretrained(self.config.model_name, export=True, **load)
+
+        export_dir = Path(self.config.onnx_cache_dir) / self.config.model_name.replace('/', '--')
+        if (export_dir / 'model.onnx').exists():
+            return model_class.from_pretrained(export_dir, **load)
+
+        logger.info(f"Exporting {self.config.model_name} to ONNX at {export_dir}")
+        model = model_class.from_pretrained(self.config.model_name, export=True, **load)
+        model.save_pretrained(export_dir)
+        return model
+
+    def _forward(self, query: str, passages: List[str]) -> 'np.ndarray':
+        """Score one batch of (query, passage) pairs | تقييم دفعة أزواج"""
+        inputs = self._tokenizer(
+            [query] * len(passages),
+            passages,
+            padding=True,
+            truncation='only_second',
+            max_length=self.config.max_length,
+            return_tensors='pt'
+        )
+        if self.config.backend == 'onnx':
+            logits = self._model(**inputs).logits
+        else:
+            import torch
+            with torch.inference_mode():
+                logits = self._model(**inputs).logits
+        logits = logits.detach().cpu().numpy() if hasattr(logits, 'detach') else np.asarray(logits)
+
+        # Single-logit relevance heads score directly; two-class heads use P(relevant)
+        # رؤوس المخرج الواحد تعطي الدرجة مباشرة؛ رؤوس الفئتين تستخدم احتمال الصلة
+        if logits.shape[1] == 1:
+            return logits[:, 0]
+        shifted = np.exp(logits - logits.max(axis=1, keepdims=True))
+        return shifted[:, 1] / shifted.sum(axis=1)
+
+    def score(self, query: str, candidates: List[Dict[str, Any]]) -> List[float]:
+        """
+        Cross-encoder scores for candidates | درجات المرشحين
+
+        Args:
+            query: Search query | استعلام البحث
+            candidates: Dicts with 'id' and 'content' | مرشحون مع المعرف والمحتوى
+
+        Returns:
+            One score per candidate | درجة لكل مرشح
+        """
+        qhash = query_hash(query)
+        keys = [(str(c['id']), content_hash(c['content'])) for c in candidates]
+        scores = self.cache.get_many(self.config.model_name, qhash, keys) if self.cache else {}
+
+        missing = {}
+        for key, candidate in zip(keys, candidates):
+            if key not in scores:
+                missing[key] = candidate['content']
+
+        if missing:
+            self._load_model()
+            todo = list(missing.items())
+            fresh: Dict[Tuple[str, str], float] = {}
+            for i in range(0, len(todo), self.config.batch_size):
+                batch = todo[i:i + self.config.batch_size]
+                values = self._forward(query, [content for _, content in batch])
+                fresh.update((key, float(v)) for (key, _), v in zip(batch, values))
+            if self.cache:
+                self.cache.put_many(self.config.model_name, qhash, fresh)
+            scores.update(fresh)
+
+        return [scores[key] for key in keys]
+
+    def rerank(self, query: str, candidates: List[Dict[str, Any]], top_k: int) -> List[Dict[str, Any]]:
+        """
+        Reorder candidates by cross-encoder score | إعادة ترتيب المرشحين
+
+        Args:
+            query: Search query | استعلام البحث
+            candidates: Vector search results | نتائج البحث المتجهي
+            top_k: Results to keep | عدد النتائج المطلوبة
+
+        Returns:
+            Top-k candidates with 'rerank_score' | أفضل k مرشحين مع درجة إعادة الترتيب
+        """
+        if not candidates:
+            return []
+        scores = self.score(query, candidates)
+        ranked = sorted(zip(scores, range(len(candidates))), key=lambda pair: -pair[0])
+        return [
+            {**candidates[i], 'rerank_score': score}
+            for score, i in ranked[:top_k]
+        ]
+
+    def close(self) -> None:
+        """Close the score cache | إغلاق ذاكرة الدرجات"""
+        if self.cache:
+            self.cache.close()
@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=============================================================================
+IntelliPath - Retrieval Evaluation Harness
+المرشد الأكاديمي الذكي - أداة تقييم الاسترجاع
+=============================================================================
+Runs a labelled set of Arabic and English queries through
+VectorEmbeddingGenerator.search concurrently and reports recall@k, MRR,
+nDCG@k and latency percentiles as JSON, optionally failing on regressions
+against a baseline report. With --offline it indexes a documents directory
+into a throwaway local store using a deterministic stub embedder, so it
+needs no network or API keys.
+يشغل مجموعة استعلامات عربية وإنجليزية موسومة عبر البحث بالتوازي ويحسب
+مقاييس الاسترجاع وزمن الاستجابة، مع مقارنة بتقرير مرجعي.
+=============================================================================
+Query set format (JSON list or JSONL), one object per query:
+    {"query": "...", "lang": "ar" | "en",
+     "expected_chunks": ["AI-BW-3.pdf_4_229575d03e1e"],
+     "expected_course_codes": ["CS101"],
+     "expected_sources": ["AI-BW-3.pdf"],
+     "filters": {"major": "..."}}
+At least one expected_* list is required; each listed item is a target.
+=============================================================================
+Version: 1.0.0 | الإصدار: 1.0.0
+Last Updated: 2026-10-19 | آخر تحديث: 2026-10-19
+=============================================================================
+"""
+
+import re
+import sys
+import json
+import math
+import time
+import uuid
+import hashlib
+import logging
+import tempfile
+from typing import Any, Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+
+import numpy as np
+
+from settings import load_settings, setup_logging
+from text_chunker import normalize_text
+from vector_embedding_generator import EmbeddingConfig, VectorEmbeddingGenerator
+
+logger = logging.getLogger(__name__)
+
+# Metrics compared against a baseline (higher is better) | المقاييس المقارنة
+QUALITY_METRICS = ('recall', 'mrr', 'ndcg')
+
+
+# =============================================================================
+# STUB EMBEDDER | المضمن البديل
+# =============================================================================
+
+class StubEmbeddings:
+    """
+    Deterministic hashed bag-of-features embedder with the shape of
+    openai.OpenAI().embeddings: words plus character trigrams, so Arabic
+    inflections of the same stem still overlap.
+    مضمن حتمي بتجزئة الكلمات والمقاطع الثلاثية بنفس واجهة OpenAI.
+    """
+
+    _WORD_RE = re.compile(r"\w+")
+
+    def __init__(self, dim: int = 1536, latency: float = 0.0):
+        self.dim = dim
+        self.latency = latency  # Simulated seconds per API call | زمن الاستدعاء المحاكى
+        self.calls = 0
+
+    def _slot(self, feature: str) -> Tuple[int, float]:
+        digest = hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest()
+        value = int.from_bytes(digest, 'little')
+        return value % self.dim, (1.0 if value >> 63 else -1.0)
+
+    def embed(self, text: str, dim: int) -> List[float]:
+        """Embed one text | تضمين نص واحد"""
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for word in self._WORD_RE.findall(normalize_text(text).casefold()):
+            slot, sign = self._slot(word)
+            vector[slot] += sign
+            padded = f"#{word}#"
+            for i in range(len(padded) - 2):
+                slot, sign = self._slot(padded[i:i + 3])
+                vector[slot] += 0.5 * sign
+        vector = vector[:dim]
+        norm = float(np.linalg.norm(vector))
+        return (vector / norm if norm else vector).tolist()
+
+    def create(self, model: str, input: List[str], dimensions: Optional[int] = None, **kwargs) -> Any:
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        dim = dimensions or self.dim
+        return SimpleNamespace(data=[SimpleNamespace(embedding=self.embed(t, dim)) for t in input])
+
+
+class StubOpenAIClient:
+    """Offline stand-in for openai.OpenAI | بديل OpenAI دون اتصال"""
+
+    def __init__(self, dim: int = 1536, latency: float = 0.0):
+        self.embeddings = StubEmbeddings(dim, latency)
+
+
+# =============================================================================
+# QUERY SET | مجموعة الاستعلامات
+# =============================================================================
+
+@dataclass
+class LabelledQuery:
+    """
+    One labelled evaluation query | استعلام تقييم موسوم
+    """
+    query: str  # Query text | نص الاستعلام
+    lang: str = "en"  # 'ar' or 'en' | اللغة
+    expected_chunks: List[str] = field(default_factory=list)  # Chunk IDs | معرفات القطع
+    expected_course_codes: List[str] = field(default_factory=list)  # Course codes | رموز المقررات
+    expected_sources: List[str] = field(default_factory=list)  # Source files | الملفات المصدر
+    filters: Optional[Dict[str, Any]] = None  # Structured filters | الفلاتر
+
+    def targets(self) -> List[Tuple[str, str]]:
+        """(kind, value) targets to find | الأهداف المطلوب إيجادها"""
+        return (
+            [('point', str(uuid.uuid5(uuid.NAMESPACE_DNS, c))) for c in self.expected_chunks]
+            + [('course', c) for c in self.expected_course_codes]
+            + [('source', s) for s in self.expected_sources]
+        )
+
+
+def load_queries(path: str) -> List[LabelledQuery]:
+    """
+    Load a JSON or JSONL query set | تحميل مجموعة الاستعلامات
+
+    Args:
+        path: Query set file | ملف الاستعلامات
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read().strip()
+    items = json.loads(text) if text.startswith('[') else [
+        json.loads(line) for line in text.splitlines() if line.strip()
+    ]
+    queries = [LabelledQuery(**item) for item in items]
+    for q in queries:
+        if not q.targets():
+            raise ValueError(f"Query has no expected_* labels: {q.query}")
+    return queries
+
+
+def _hit_targets(hit: Dict[str, Any]) -> set:
+    """Targets a search hit satisfies | الأهداف التي تحققها النتيجة"""
+    metadata = hit.get('metadata', {})
+    found = {('point', hit.get('id')), ('source', metadata.get('source_file'))}
+    codes = set(metadata.get('course_codes') or [])
+    if metadata.get('course_code'):
+        codes.add(metadata['course_code'])
+    found.update(('course', c) for c in codes)
+    return found
+
+
+# =============================================================================
+# METRICS | المقاييس
+# =============================================================================
+
+def score_ranking(hits: List[Dict[str, Any]], targets: List[Tuple[str, str]], k: int) -> Dict[str, float]:
+    """
+    Recall@k, reciprocal rank and nDCG@k for one query
+    حساب المقاييس لاستعلام واحد
+
+    A hit earns gain only for targets not already covered by a higher hit,
+    so many chunks from one expected source cannot inflate the score.
+    تحصل النتيجة على مكسب فقط عن الأهداف غير المغطاة سابقاً.
+    """
+    wanted = set(targets)
+    covered: set = set()
+    dcg = 0.0
+    first_rank = 0
+    for rank, hit in enumerate(hits[:k], start=1):
+        new = (_hit_targets(hit) & wanted) - covered
+        if new:
+            covered |= new
+            dcg += 1.0 / math.log2(rank + 1)
+            first_rank = first_rank or rank
+    ideal = sum(1.0 / math.log2(r + 1) for r in range(1, min(len(wanted), k) + 1))
+    return {
+        'recall': len(covered) / len(wanted),
+        'mrr': 1.0 / first_rank if first_rank else 0.0,
+        'ndcg': dcg / ideal if ideal else 0.0,
+    }
+
+
+def _percentiles(latencies_ms: List[float]) -> Dict[str, float]:
+    values = np.asarray(latencies_ms)
+    return {
+        'p50_ms': round(float(np.percentile(values, 50)), 3),
+        'p90_ms': round(float(np.percentile(values, 90)), 3),
+        'p99_ms': round(float(np.percentile(values, 99)), 3),
+        'mean_ms': round(float(values.mean()), 3),
+    }
+
+
+def _aggregate(rows: List[Dict[str, float]], k: int) -> Dict[str, float]:
+    return {
+        f'{name}@{k}' if name != 'mrr' else 'mrr': round(float(np.mean([r[name] for r in rows])), 4)
+        for name in QUALITY_METRICS
+    }
+
+
+# =============================================================================
+# EVALUATION | التقييم
+# =============================================================================
+
+def evaluate(generator: VectorEmbeddingGenerator, queries: List[LabelledQuery],
+             k: int = 10, concurrency: int = 4, rerank: Optional[bool] = None) -> Dict[str, Any]:
+    """
+    Run all queries and aggregate metrics | تشغيل الاستعلامات وتجميع المقاييس
+
+    Args:
+        generator: Configured generator to search with | المولد
+        queries: Labelled queries | الاستعلامات الموسومة
+        k: Metric cut-off | حد المقاييس
+        concurrency: Parallel search threads | خيوط البحث المتوازية
+        rerank: Override the generator's rerank setting | تجاوز إعادة الترتيب
+
+    Returns:
+        JSON-serializable report | تقرير قابل للتحويل إلى JSON
+    """
+    def run_one(q: LabelledQuery) -> Tuple[float, List[Dict[str, Any]]]:
+        started = time.perf_counter()
+        hits = generator.search(q.query, limit=k, filters=q.filters, rerank=rerank)
+        return (time.perf_counter() - started) * 1000, hits
+
+    # Create the shared reranker before the workers start | إنشاء معيد الترتيب قبل بدء الخيوط
+    if generator.config.rerank if rerank is None else rerank:
+        generator.get_reranker()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(run_one, queries))
+    wall = time.perf_counter() - started
+
+    per_query = []
+    for q, (latency, hits) in zip(queries, outcomes):
+        per_query.append({
+            'query': q.query,
+            'lang': q.lang,
+            'latency_ms': round(latency, 3),
+            **score_ranking(hits, q.targets(), k),
+        })
+
+    by_lang = {}
+    for lang in sorted({row['lang'] for row in per_query}):
+        rows = [row for row in per_query if row['lang'] == lang]
+        by_lang[lang] = {'queries': len(rows), **_aggregate(rows, k)}
+
+    config = generator.config
+    return {
+        'config': {
+            'embedding_model': config.embedding_model,
+            'dimensions': generator.vector_size,
+            'chunk_size': config.chunk_size,
+            'chunk_overlap': config.chunk_overlap,
+            'chunk_unit': config.chunk_unit,
+            'vector_backend': config.vector_backend,
+            'local_dtype': config.local_dtype,
+            'local_index_type': config.local_index_type,
+            'rerank': config.rerank if rerank is None else rerank,
+        },
+        'k': k,
+        'queries': len(per_query),
+        'concurrency': concurrency,
+        'metrics': _aggregate(per_query, k),
+        'latency': _percentiles([row['latency_ms'] for row in per_query]),
+        'throughput_qps': round(len(per_query) / wall, 2) if wall else 0.0,
+        'by_lang': by_lang,
+        'per_query': per_query,
+    }
+
+
+def compare_to_baseline(report: Dict[str, Any], baseline: Dict[str, Any],
+                        tolerance: float = 0.01, latency_tolerance: float = 1.25) -> List[str]:
+    """
+    List regressions against a baseline report | سرد التراجعات مقارنة بالمرجع
+
+    Args:
+        report: Current report | التقرير الحالي
+        baseline: Earlier report | التقرير المرجعي
+        tolerance: Allowed absolute drop per quality metric | الانخفاض المسموح
+        latency_tolerance: Allowed p99 ratio | نسبة زمن p99 المسموحة
+
+    Returns:
+        Human-readable regression messages (empty if none) | رسائل التراجع
+    """
+    regressions = []
+    for name, value in report['metrics'].items():
+        before = baseline.get('metrics', {}).get(name)
+        if before is not None and value < before - tolerance:
+            regressions.append(f"{name}: {before:.4f} -> {value:.4f}")
+    for lang, metrics in report['by_lang'].items():
+        for name, value in metrics.items():
+            before = baseline.get('by_lang', {}).get(lang, {}).get(name)
+            if name != 'queries' and before is not None and value < before - tolerance:
+                regressions.append(f"{lang} {name}: {before:.4f} -> {value:.4f}")
+    before_p99 = baseline.get('latency', {}).get('p99_ms')
+    p99 = report['latency']['p99_ms']
+    if before_p99 and p99 > before_p99 * latency_tolerance:
+        regressions.append(f"p99 latency: {before_p99:.1f}ms -> {p99:.1f}ms")
+    return regressions
+
+
+def build_offline_generator(documents: str, config: EmbeddingConfig) -> VectorEmbeddingGenerator:
+    """
+    Index documents into a throwaway local store with the stub embedder
+    فهرسة المستندات في مخزن محلي مؤقت بالمضمن البديل
+
+    Args:
+        documents: Documents directory | مجلد المستندات
+        config: Base configuration (backend/journal are overridden) | الإعدادات
+    """
+    config.openai_api_key = config.openai_api_key or 'offline'
+    config.journal_path = None
+    config.rerank = False
+    if config.vector_backend == 'local':
+        config.local_index_path = tempfile.mkdtemp(prefix='intellipath-eval-')
+    generator = VectorEmbeddingGenerator(config, openai_client=StubOpenAIClient(config.vector_size))
+    if config.vector_backend != 'local':
+        from qdrant_client import QdrantClient
+        generator.qdrant = QdrantClient(":memory:")
+    generator.process_directory(documents)
+    return generator
+
+
+# =============================================================================
+# MAIN ENTRY POINT | نقطة الدخول الرئيسية
+# =============================================================================
+
+def main():
+    """
+    Main entry point | نقطة الدخول الرئيسية
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='IntelliPath retrieval evaluation | تقييم الاسترجاع'
+    )
+    parser.add_argument('queries', help='Labelled query set (JSON/JSONL) | مجموعة الاستعلامات')
+    parser.add_argument('--k', type=int, default=10, help='Metric cut-off (default: 10) | حد المقاييس')
+    parser.add_argument('--concurrency', type=int, default=4, help='Parallel searches | البحث المتوازي')
+    parser.add_argument(
+        '--offline',
+        metavar='DOCUMENTS',
+        help='Index this directory with the stub embedder instead of using live services | التقييم دون اتصال'
+    )
+    parser.add_argument(
+        '--backend',
+        choices=['local', 'memory'],
+        default='local',
+        help='Offline store: local on-disk store or in-memory Qdrant | المخزن دون اتصال'
+    )
+    parser.add_argument('--collection', default='intellipath_documents', help='Collection name | اسم المجموعة')
+    parser.add_argument('--chunk-size', type=int, default=1000, help='Offline chunk size | حجم القطعة')
+    parser.add_argument('--chunk-overlap', type=int, default=200, help='Offline chunk overlap | التداخل')
+    parser.add_argument('--dimensions', type=int, default=None, help='Embedding dimensions | أبعاد التضمين')
+    parser.add_argument('--local-dtype', choices=['float32', 'int8'], default='float32', help='Local storage type')
+    parser.add_argument('--rerank', action='store_true', help='Rerank with the cross-encoder | إعادة الترتيب')
+    parser.add_argument('--baseline', help='Earlier report to compare against | التقرير المرجعي')
+    parser.add_argument('--tolerance', type=float, default=0.01, help='Allowed metric drop | الانخفاض المسموح')
+    parser.add_argument('--output', help='Write the JSON report here | ملف التقرير')
+
+    args = parser.parse_args()
+
+    setup_logging()
+    settings = load_settings()
+    queries = load_queries(args.queries)
+    config = EmbeddingConfig(
+        openai_api_key=settings.openai_api_key or '',
+        dimensions=args.dimensions,
+        vector_backend='local' if args.offline and args.backend == 'local' else settings.vector_backend,
+        local_dtype=args.local_dtype,
+        qdrant_url=settings.qdrant_url,
+        qdrant_api_key=settings.qdrant_api_key,
+        collection_name=args.collection,
+        chunk_size=args.chunk_size,
+        chunk_overlap=args.chunk_overlap,
+        rerank=args.rerank,
+    )
+
+    if args.offline:
+        if args.backend == 'memory':
+            config.vector_backend = 'qdrant'
+        generator = build_offline_generator(args.offline, config)
+    else:
+        if not config.openai_api_key:
+            logger.error("Missing OPENAI_API_KEY environment variable (or use --offline)")
+            sys.exit(1)
+        generator = VectorEmbeddingGenerator(config)
+
+    report = evaluate(generator, queries, k=args.k, concurrency=args.concurrency)
+
+    regressions: List[str] = []
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(report, baseline, tolerance=args.tolerance)
+        report['baseline'] = {'path': args.baseline, 'regressions': regressions}
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+        logger.info(f"Report written to {args.output} | تمت كتابة التقرير")
+    else:
+        # Logs share stdout; pass --output for a clean JSON file
+        # السجلات تشارك المخرج القياسي؛ استخدم --output لملف JSON نظيف
+        print(text)
+
+    for message in regressions:
+        logger.error(f"Regression: {message} | تراجع")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
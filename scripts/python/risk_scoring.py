@@ -0,0 +1,595 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=============================================================================
+IntelliPath - At-Risk Scoring
+المرشد الأكاديمي الذكي - تقييم الطلاب المعرضين للخطر
+=============================================================================
+Nightly batch backend for the predictions API: every student gets a risk
+score, level, predicted GPA and top risk factors in one pass.
+
+- Features are built for all students at once with grouped array
+  operations over student_academic_records: GPA and its trend over the
+  last terms, failures, warning history, credit velocity, and bottleneck
+  courses (many dependents in the prerequisite DAG) still pending past
+  their year.
+- The model is a logistic regression scored as one matrix product. It
+  ships with hand-set weights and can be refitted on history: features
+  as of each student's previous term against a warning (or GPA below
+  2.0) in their latest term.
+- Scores are upserted into student_risk_scores in parallel batches.
+يحسب لكل طالب درجة الخطر ومستواه والمعدل المتوقع وأهم العوامل دفعة
+واحدة، بسمات متجهة ونموذج انحدار لوجستي قابل لإعادة التدريب.
+=============================================================================
+Version: 1.0.0 | الإصدار: 1.0.0
+Last Updated: 2026-10-19 | آخر تحديث: 2026-10-19
+=============================================================================
+"""
+
+import sys
+import json
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from dataclasses import dataclass, field, asdict
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+
+from academic_records import (
+    CORE_COLUMNS, PASS_MARK, SEMESTER_ORDER, load_records, mark_points, passed_mask,
+    student_majors, term_index
+)
+from academic_simulator import DEFAULT_CREDITS
+from course_catalog import CourseCatalog, load_catalog
+from eligibility import PrerequisiteIndex
+from import_records import SUMMARY_CODE
+from instrumentation import Instrumentation, add_instrumentation_arguments, instrumented_run
+from settings import Clients, Settings, SettingsError, lazy_import, load_settings, setup_logging
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas', 'pandas openpyxl')
+
+logger = logging.getLogger(__name__)
+
+TABLE = 'student_risk_scores'
+
+# Record columns the features read | أعمدة السجلات المطلوبة
+RECORD_COLUMNS = CORE_COLUMNS + ('academic_warning', 'cumulative_gpa_points')
+
+# Model inputs and their factor descriptions | مدخلات النموذج ووصفها
+FEATURES = {
+    'cumulative_gpa': 'Cumulative GPA | المعدل التراكمي',
+    'gpa_trend': 'Term GPA trend | اتجاه المعدل الفصلي',
+    'unresolved_failures': 'Failed courses not yet passed | مقررات راسبة لم تُنجز',
+    'recent_failures': 'Failures in the latest term | رسوب في آخر فصل',
+    'warning_level': 'Current academic warning | الإنذار الأكاديمي الحالي',
+    'warning_terms': 'Terms under warning | عدد فصول الإنذار',
+    'credit_velocity': 'Credits passed per term vs plan | سرعة إنجاز الساعات',
+    'pending_bottlenecks': 'Share of due bottleneck courses not passed | نسبة المقررات المفصلية المتأخرة',
+}
+
+# Warning text -> severity; other non-empty text counts as 1 | شدة الإنذار
+WARNING_LEVELS = {
+    'إنذار أول': 1, 'انذار اول': 1,
+    'إنذار ثاني': 2, 'انذار ثاني': 2,
+    'إنذار ثالث': 3, 'انذار ثالث': 3, 'إنذار نهائي': 3, 'انذار نهائي': 3,
+    'فصل': 4, 'مفصول': 4,
+}
+
+# Levels from the lowest score each starts at | مستويات الخطر
+RISK_LEVELS = ((0.75, 'critical'), (0.5, 'high'), (0.25, 'medium'), (0.0, 'low'))
+
+
+# =============================================================================
+# CONFIGURATION | الإعدادات
+# =============================================================================
+
+@dataclass
+class RiskConfig:
+    """
+    Risk scoring configuration | إعدادات تقييم الخطر
+    """
+    pass_mark: float = PASS_MARK  # Passing grade | درجة النجاح
+    warning_gpa: float = 2.0  # GPA below this is at risk (training label) | حد الإنذار
+    trend_terms: int = 4  # Terms in the GPA trend | عدد الفصول في الاتجاه
+    term_credits: float = 17.0  # Planned credits per regular term (171 / 10) | الساعات المخططة للفصل
+    bottleneck_dependents: int = 3  # Dependents that make a course a bottleneck | حد المقرر المفصلي
+    student_block: int = 1024  # Students per block in the bottleneck pass | الطلاب لكل كتلة
+    batch_size: int = 1000  # Rows per upsert request | الصفوف لكل طلب
+    workers: int = 4  # Parallel upsert requests | الطلبات المتوازية
+
+
+# =============================================================================
+# FEATURES | السمات
+# =============================================================================
+
+def warning_levels(values: 'pd.Series') -> 'pd.Series':
+    """Warning text to severity, 0 when empty | تحويل نص الإنذار إلى شدة"""
+    text = values.astype('string').str.strip()
+    level = text.map(WARNING_LEVELS).astype(float)
+    level = level.where(level.notna(), (text.notna() & (text != '')).astype(float))
+    return level.fillna(0).astype(int)
+
+
+def _pending_bottlenecks(records: 'pd.DataFrame', student_ids: 'pd.Index', study_year: 'np.ndarray',
+                         catalog: CourseCatalog, index: PrerequisiteIndex,
+                         config: RiskConfig) -> 'np.ndarray':
+    """
+    Share of the bottleneck courses of each student's major below their
+    study year that are not passed yet | نسبة المقررات المفصلية المتأخرة
+
+    A share rather than a count, so the feature does not grow with the
+    size of the major's catalog.
+    """
+    bottleneck = index.descendant_counts() >= config.bottleneck_dependents
+    if not bottleneck.any():
+        return np.zeros(len(student_ids))
+    year_level = np.array([catalog.courses[code].year_level for code in index.codes])
+    offered, major_row = index.candidate_rows(student_majors(records).reindex(student_ids))
+    offered &= bottleneck
+
+    rows, cols = index.passed_cells(student_ids, records, config.pass_mark)
+    block = config.student_block
+    bounds = np.searchsorted(rows, np.arange(0, len(student_ids) + block, block))
+    share = np.zeros(len(student_ids))
+    for k, start in enumerate(range(0, len(student_ids), block)):
+        stop = min(start + block, len(student_ids))
+        done = np.zeros((stop - start, len(index.codes)), dtype=bool)
+        done[rows[bounds[k]:bounds[k + 1]] - start, cols[bounds[k]:bounds[k + 1]]] = True
+        due = offered[major_row[start:stop]] & (year_level < study_year[start:stop, None])
+        total = due.sum(axis=1)
+        share[start:stop] = np.where(total > 0, (due & ~done).sum(axis=1) / np.maximum(total, 1), 0.0)
+    return share
+
+
+def build_features(records: 'pd.DataFrame', config: Optional[RiskConfig] = None,
+                   catalog: Optional[CourseCatalog] = None,
+                   index: Optional[PrerequisiteIndex] = None) -> 'pd.DataFrame':
+    """
+    Per-student feature table from academic records | جدول السمات لكل طالب
+
+    Args:
+        records: student_academic_records rows (RECORD_COLUMNS) | السجلات
+        config: Scoring configuration | الإعدادات
+        catalog: Course catalog for bottleneck courses (optional) | الكتالوج
+        index: Prebuilt prerequisite index for the catalog | فهرس المتطلبات
+
+    Returns:
+        FEATURES plus last_term_gpa, graded_credits and study_year, indexed
+        by student_id; cumulative_gpa is NaN for students with no official
+        GPA and no graded credits | السمات مفهرسة بالرقم الجامعي
+    """
+    config = config or RiskConfig()
+    records = records.assign(_term=term_index(records))
+    courses = records[records['course_code'] != SUMMARY_CODE]
+
+    points = courses['grade_points'].to_numpy(dtype=float)
+    points = np.where(np.isnan(points), mark_points(courses['final_grade'].to_numpy(dtype=float)), points)
+    credits = courses['course_credits'].fillna(DEFAULT_CREDITS).to_numpy(dtype=float)
+    graded = ~np.isnan(points)
+    passed = passed_mask(courses, config.pass_mark).to_numpy()
+    failed = graded & ~passed
+
+    # One row per (student, term), students then terms in order
+    # صف لكل (طالب، فصل) مرتب حسب الطالب ثم الفصل
+    attempts = pd.DataFrame({
+        'student_id': courses['student_id'].to_numpy(),
+        'course_code': courses['course_code'].to_numpy(),
+        '_term': courses['_term'].to_numpy(),
+        'quality': np.where(graded, points * credits, 0.0),
+        'graded_credits': np.where(graded, credits, 0.0),
+        'passed_credits': np.where(passed, credits, 0.0),
+        'passed': passed,
+        'failed': failed,
+    })
+    terms = attempts.groupby(['student_id', '_term'], sort=True)[
+        ['quality', 'graded_credits', 'passed_credits', 'failed']
+    ].sum()
+    warnings = records.assign(_level=warning_levels(records['academic_warning'])).groupby(
+        ['student_id', '_term'], sort=True)['_level'].max()
+    terms = terms.join(warnings.rename('warning'), how='outer').fillna(0).sort_index()
+    by_student = terms.groupby(level=0, sort=False)
+    last = by_student.tail(1).droplevel(1)
+    student_ids = last.index
+
+    features = pd.DataFrame(index=student_ids)
+    totals = by_student[['quality', 'graded_credits', 'passed_credits']].sum()
+    computed = totals['quality'] / totals['graded_credits'].where(totals['graded_credits'] > 0)
+    # The registrar's cumulative GPA wins when present; students with neither
+    # (new, or every attempt withdrawn) keep NaN rather than a failing 0.0
+    # المعدل الرسمي أولاً؛ من لا معدل له يبقى NaN بدل صفر
+    official = records.dropna(subset=['cumulative_gpa_points']).sort_values('_term', kind='stable')
+    official = official.groupby('student_id', sort=False)['cumulative_gpa_points'].last()
+    features['cumulative_gpa'] = official.reindex(student_ids).fillna(computed)
+
+    # Least-squares slope of term GPA over the last trend_terms graded terms
+    # ميل المعدل الفصلي في آخر الفصول
+    scored = terms[terms['graded_credits'] > 0]
+    scored = scored[scored.groupby(level=0).cumcount(ascending=False) < config.trend_terms]
+    x = scored.groupby(level=0).cumcount().to_numpy(dtype=float)
+    y = (scored['quality'] / scored['graded_credits']).to_numpy()
+    sums = pd.DataFrame({'n': 1.0, 'x': x, 'y': y, 'xy': x * y, 'xx': x * x},
+                        index=scored.index.get_level_values(0)).groupby(level=0, sort=False).sum()
+    denominator = sums['n'] * sums['xx'] - sums['x'] ** 2
+    slope = (sums['n'] * sums['xy'] - sums['x'] * sums['y']) / denominator.where(denominator > 0)
+    features['gpa_trend'] = slope.reindex(student_ids).fillna(0.0)
+    last_gpa = (scored['quality'] / scored['graded_credits']).groupby(level=0, sort=False).last()
+
+    per_course = attempts.groupby(['student_id', 'course_code'], sort=False)[['passed', 'failed']].any()
+    unresolved = (per_course['failed'] & ~per_course['passed']).groupby(level=0, sort=False).sum()
+    features['unresolved_failures'] = unresolved.reindex(student_ids).fillna(0).astype(int)
+    features['recent_failures'] = last['failed'].astype(int)
+    features['warning_level'] = last['warning'].astype(int)
+    features['warning_terms'] = (terms['warning'] > 0).groupby(level=0, sort=False).sum().reindex(student_ids)
+
+    # Summer terms do not count toward the expected pace | الفصل الصيفي لا يُحتسب
+    summer = SEMESTER_ORDER['الفصل الصيفي']
+    term_numbers = terms.index.get_level_values(1).to_numpy()
+    regular = pd.Series(term_numbers % len(SEMESTER_ORDER) != summer, index=terms.index.get_level_values(0))
+    regular_terms = regular.groupby(level=0, sort=False).sum().reindex(student_ids).clip(lower=1)
+    features['credit_velocity'] = totals['passed_credits'] / (regular_terms * config.term_credits)
+
+    study_year = (regular_terms // 2 + 1).to_numpy()
+    if catalog is not None:
+        index = index or PrerequisiteIndex.from_catalog(catalog)
+        features['pending_bottlenecks'] = _pending_bottlenecks(
+            records, student_ids, study_year, catalog, index, config
+        )
+    else:
+        features['pending_bottlenecks'] = 0.0
+
+    features['last_term_gpa'] = last_gpa.reindex(student_ids)
+    features['graded_credits'] = totals['graded_credits']
+    features['study_year'] = study_year
+    return features
+
+
+def training_set(records: 'pd.DataFrame', config: Optional[RiskConfig] = None,
+                 catalog: Optional[CourseCatalog] = None,
+                 index: Optional[PrerequisiteIndex] = None) -> Tuple['pd.DataFrame', 'np.ndarray']:
+    """
+    Features as of each student's previous term, labelled by their latest
+    term | سمات الفصل السابق مع تسمية من آخر فصل
+
+    The label is a warning in the latest term, or a cumulative GPA below
+    warning_gpa. Students with a single term are left out.
+    """
+    config = config or RiskConfig()
+    term = term_index(records)
+    latest = term.groupby(records['student_id']).transform('max')
+    earlier = records[term < latest]
+    if earlier.empty:
+        return build_features(earlier, config, catalog, index), np.zeros(0, dtype=bool)
+    before = build_features(earlier, config, catalog, index)
+    before = before[before['cumulative_gpa'].notna()]
+    now = build_features(records[records['student_id'].isin(before.index)], config).reindex(before.index)
+    labels = (now['warning_level'] > 0) | (now['cumulative_gpa'] < config.warning_gpa)
+    return before, labels.to_numpy()
+
+
+# =============================================================================
+# MODEL | النموذج
+# =============================================================================
+
+def _sigmoid(z: 'np.ndarray') -> 'np.ndarray':
+    return 1.0 / (1.0 + np.exp(-np.clip(z, -35, 35)))
+
+
+@dataclass
+class RiskModel:
+    """
+    Logistic risk model over FEATURES in raw units | نموذج لوجستي للخطر
+    """
+    weights: Dict[str, float] = field(default_factory=lambda: {
+        'cumulative_gpa': -2.2,
+        'gpa_trend': -1.5,
+        'unresolved_failures': 0.35,
+        'recent_failures': 0.4,
+        'warning_level': 0.8,
+        'warning_terms': 0.15,
+        'credit_velocity': -1.2,
+        'pending_bottlenecks': 1.5,
+    })  # Coefficient per feature | معامل كل سمة
+    bias: float = 3.0  # Intercept | الثابت
+    reference: Dict[str, float] = field(default_factory=lambda: {
+        'cumulative_gpa': 2.5,
+        'credit_velocity': 1.0,
+    })  # On-track student factors are measured against (others 0) | الطالب المرجعي
+    version: str = 'default'  # Stored with every score | إصدار النموذج
+
+    def _matrix(self, features: 'pd.DataFrame') -> Tuple['np.ndarray', 'np.ndarray']:
+        names = list(FEATURES)
+        x = features[names].to_numpy(dtype=float)
+        w = np.array([self.weights.get(name, 0.0) for name in names])
+        return x, w
+
+    def probability(self, features: 'pd.DataFrame') -> 'np.ndarray':
+        """Risk probability per row, one matrix product | احتمال الخطر لكل صف"""
+        x, w = self._matrix(features)
+        return _sigmoid(x @ w + self.bias)
+
+    def contributions(self, features: 'pd.DataFrame') -> 'np.ndarray':
+        """
+        Each feature's pull on the log-odds away from the reference student
+        أثر كل سمة مقارنة بالطالب المرجعي
+        """
+        x, w = self._matrix(features)
+        reference = np.array([self.reference.get(name, 0.0) for name in FEATURES])
+        return (x - reference) * w
+
+    @classmethod
+    def fit(cls, features: 'pd.DataFrame', labels: Sequence[bool], l2: float = 1.0,
+            iterations: int = 25, version: Optional[str] = None) -> 'RiskModel':
+        """
+        Fit by Newton's method on standardized features | التدريب بطريقة نيوتن
+
+        L2 shrinks every weight but the intercept; weights are returned in
+        raw feature units.
+        """
+        names = list(FEATURES)
+        x = features[names].to_numpy(dtype=float)
+        y = np.asarray(labels, dtype=float)
+        if not len(y) or y.min() == y.max():
+            raise ValueError("Training needs both at-risk and on-track students | يلزم وجود الصنفين")
+        mean, scale = x.mean(axis=0), x.std(axis=0)
+        scale[scale == 0] = 1.0
+        z = np.column_stack([np.ones(len(x)), (x - mean) / scale])
+        penalty = np.full(z.shape[1], l2)
+        penalty[0] = 0.0
+
+        beta = np.zeros(z.shape[1])
+        for _ in range(iterations):
+            p = _sigmoid(z @ beta)
+            gradient = z.T @ (p - y) + penalty * beta
+            hessian = (z * (p * (1 - p))[:, None]).T @ z + np.diag(penalty)
+            step = np.linalg.solve(hessian, gradient)
+            beta -= step
+            if np.abs(step).max() < 1e-6:
+                break
+
+        weights = beta[1:] / scale
+        return cls(
+            weights={name: round(float(w), 6) for name, w in zip(names, weights)},
+            bias=round(float(beta[0] - weights @ mean), 6),
+            version=version or f"fitted-{datetime.now(timezone.utc):%Y%m%d}",
+        )
+
+    def save(self, path: str) -> None:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(asdict(self), f, ensure_ascii=False, indent=2)
+
+    @classmethod
+    def load(cls, path: str) -> 'RiskModel':
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(**json.load(f))
+
+
+def auc(scores: 'np.ndarray', labels: 'np.ndarray') -> float:
+    """Rank-based ROC AUC | مساحة منحنى ROC"""
+    labels = np.asarray(labels, dtype=bool)
+    positives, negatives = labels.sum(), (~labels).sum()
+    if not positives or not negatives:
+        return float('nan')
+    ranks = pd.Series(scores).rank().to_numpy()
+    return float((ranks[labels].sum() - positives * (positives + 1) / 2) / (positives * negatives))
+
+
+# =============================================================================
+# SCORING | التقييم
+# =============================================================================
+
+def score_students(features: 'pd.DataFrame', model: RiskModel, config: Optional[RiskConfig] = None,
+                   top_factors: int = 3) -> 'pd.DataFrame':
+    """
+    Risk rows shaped like StudentRiskPrediction | صفوف الخطر لكل طالب
+
+    Students without a GPA yet are not scored: there is no record to
+    judge, and a GPA of 0 would mark them critical.
+
+    Returns:
+        student_id, risk_score, risk_level, predicted_gpa, factors (list of
+        {name, weight, value, description}) and the feature values
+    """
+    config = config or RiskConfig()
+    features = features[features['cumulative_gpa'].notna()]
+    probability = model.probability(features)
+    thresholds = np.array([t for t, _ in RISK_LEVELS])
+    names = np.array([name for _, name in RISK_LEVELS], dtype=object)
+    level = names[np.argmax(probability[:, None] >= thresholds[None, :], axis=1)]
+
+    # Next term at the last term GPA plus the trend, blended into the cumulative
+    # الفصل القادم بمعدل آخر فصل مع الاتجاه، مدمجاً في التراكمي
+    credits = features['graded_credits'].to_numpy(dtype=float)
+    next_term = np.clip(
+        features['last_term_gpa'].fillna(features['cumulative_gpa']).to_numpy(dtype=float)
+        + features['gpa_trend'].to_numpy(dtype=float), 0.0, 4.0
+    )
+    predicted = (features['cumulative_gpa'].to_numpy(dtype=float) * credits + next_term * config.term_credits) \
+        / (credits + config.term_credits)
+
+    pulls = model.contributions(features)
+    top = np.argsort(-pulls, axis=1)[:, :top_factors]
+    names = list(FEATURES)
+    values = features[names].to_numpy(dtype=float)
+    factors = [
+        [
+            {'name': names[j], 'weight': round(float(pulls[i, j]), 3),
+             'value': round(float(values[i, j]), 3), 'description': FEATURES[names[j]]}
+            for j in row if pulls[i, j] > 0
+        ]
+        for i, row in enumerate(top)
+    ]
+
+    return pd.DataFrame({
+        'student_id': features.index.to_numpy(),
+        'risk_score': np.round(probability, 4),
+        'risk_level': level,
+        'predicted_gpa': np.round(predicted, 2),
+        'factors': factors,
+        'features': features[names].round(4).to_dict('records'),
+        'model_version': model.version,
+    })
+
+
+def write_scores(client: Any, scores: 'pd.DataFrame', config: Optional[RiskConfig] = None,
+                 metrics: Optional[Instrumentation] = None) -> int:
+    """
+    Upsert scores on student_id in parallel batches | إدراج الدرجات على دفعات
+
+    Returns:
+        Rows that failed to write | الصفوف التي فشل إدراجها
+    """
+    config = config or RiskConfig()
+    metrics = metrics or Instrumentation('risk_scoring')
+    scored_at = datetime.now(timezone.utc).isoformat()
+    payload = scores.assign(scored_at=scored_at).to_dict('records')
+    batches = [payload[i:i + config.batch_size] for i in range(0, len(payload), config.batch_size)]
+
+    def send(batch: List[Dict[str, Any]]) -> int:
+        try:
+            with metrics.span('risk.upsert', items=len(batch)):
+                client.table(TABLE).upsert(batch, on_conflict='student_id', returning='minimal').execute()
+            return 0
+        except Exception as e:
+            logger.error(f"Score batch failed: {e} | فشل إدراج الدفعة")
+            return len(batch)
+
+    with ThreadPoolExecutor(max_workers=max(config.workers, 1)) as pool:
+        return sum(pool.map(send, batches))
+
+
+# =============================================================================
+# MAIN ENTRY POINT | نقطة الدخول الرئيسية
+# =============================================================================
+
+def add_arguments(parser: Any) -> None:
+    """
+    Add risk scoring arguments to a parser | إضافة وسائط تقييم الخطر
+    """
+    parser.add_argument(
+        '--records', required=True,
+        help="student_academic_records CSV/Excel or 'supabase' | مصدر السجلات الأكاديمية"
+    )
+    parser.add_argument(
+        '--catalog',
+        help="Knowledge graph export or 'supabase' for bottleneck courses (default: bundled export) | مصدر الكتالوج"
+    )
+    parser.add_argument('--student', help='Print one student\'s prediction | تقييم طالب واحد')
+    parser.add_argument('--model', help='Model JSON to score with (default: built-in weights) | ملف النموذج')
+    parser.add_argument('--train', action='store_true', help='Refit the model on history first | إعادة تدريب النموذج')
+    parser.add_argument('--save-model', help='Write the fitted model JSON | حفظ النموذج')
+    parser.add_argument('--pass-mark', type=float, default=PASS_MARK, help='Passing grade (default: 60) | درجة النجاح')
+    parser.add_argument('--output', help='Per-student scores CSV | ملف الدرجات')
+    parser.add_argument('--write', action='store_true', help=f'Upsert scores into {TABLE} | كتابة الدرجات')
+    parser.add_argument('--batch-size', type=int, default=1000, help='Rows per upsert request (default: 1000) | الصفوف لكل طلب')
+    parser.add_argument('--workers', type=int, default=4, help='Parallel upsert requests (default: 4) | الطلبات المتوازية')
+    add_instrumentation_arguments(parser)
+
+
+def run_command(args: Any, settings: Settings, clients: Optional[Clients] = None) -> int:
+    """
+    Score students from parsed arguments | تقييم الطلاب من الوسائط
+
+    Returns:
+        Process exit code | رمز الخروج
+    """
+    uses_supabase = args.write or 'supabase' in (args.catalog, args.records)
+    if uses_supabase:
+        settings.require('supabase_url', 'supabase_key')
+    clients = clients or Clients(settings)
+    client = clients.supabase if uses_supabase else None
+    config = RiskConfig(pass_mark=args.pass_mark, batch_size=args.batch_size, workers=args.workers)
+
+    with instrumented_run('risk_scoring', args) as metrics:
+        with metrics.span('load') as span:
+            records = load_records(args.records, client=client, columns=RECORD_COLUMNS)
+            catalog = load_catalog(args.catalog, client=client)
+            index = PrerequisiteIndex.from_catalog(catalog)
+            span.add(items=len(records))
+        summary: Dict[str, Any] = {}
+        model = RiskModel.load(args.model) if args.model else RiskModel()
+        if args.train:
+            with metrics.span('train'):
+                features, labels = training_set(records, config, catalog, index)
+                model = RiskModel.fit(features, labels)
+            summary['training'] = {
+                'students': len(labels),
+                'at_risk': int(labels.sum()),
+                'auc': round(auc(model.probability(features), labels), 4),
+            }
+            if args.save_model:
+                model.save(args.save_model)
+
+        if args.student:
+            records = records[records['student_id'] == args.student]
+            if records.empty:
+                logger.error(f"No records for student {args.student} | لا توجد سجلات للطالب")
+                return 1
+
+        with metrics.span('features') as span:
+            features = build_features(records, config, catalog, index)
+            span.add(items=len(features))
+        with metrics.span('score', items=len(features)):
+            scores = score_students(features, model, config)
+        ungraded = len(features) - len(scores)
+        if ungraded:
+            logger.info(f"{ungraded} students without graded credits not scored | طلاب بلا معدل")
+
+        if args.student:
+            if scores.empty:
+                logger.warning(f"Student {args.student} has no graded credits yet; not scored | لا معدل بعد")
+                return 0
+            row = scores.iloc[0]
+            print(json.dumps({
+                'student_id': row['student_id'],
+                'risk_level': row['risk_level'],
+                'risk_score': float(row['risk_score']),
+                'factors': row['factors'],
+                'predicted_gpa': float(row['predicted_gpa']),
+            }, ensure_ascii=False, indent=2))
+            return 0
+
+        if args.output:
+            scores.assign(
+                factors=[json.dumps(f, ensure_ascii=False) for f in scores['factors']],
+                features=[json.dumps(f) for f in scores['features']],
+            ).to_csv(args.output, index=False, encoding='utf-8')
+        failed = 0
+        if args.write:
+            with metrics.span('write', items=len(scores)):
+                failed = write_scores(client, scores, config, metrics)
+
+        summary.update({
+            'students': len(scores),
+            'not_scored': ungraded,
+            'model_version': model.version,
+            'levels': {name: int((scores['risk_level'] == name).sum()) for _, name in reversed(RISK_LEVELS)},
+            'mean_score': round(float(scores['risk_score'].mean()), 4) if len(scores) else 0.0,
+            'written': len(scores) - failed if args.write else 0,
+        })
+        metrics.result.update(summary)
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+    return 1 if failed else 0
+
+
+def main():
+    """
+    Main entry point | نقطة الدخول الرئيسية
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='IntelliPath at-risk scoring | تقييم الطلاب المعرضين للخطر'
+    )
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    setup_logging('risk_scoring.log')
+    try:
+        sys.exit(run_command(args, load_settings()))
+    except (SettingsError, ImportError, ValueError) as e:
+        logger.error(str(e))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -21,32 +21,13 @@ from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, field
 from datetime import datetime
 
-# Third-party imports | المكتبات الخارجية
-try:
-    import pandas as pd
-    from supabase import create_client, Client
-    from dotenv import load_dotenv
-except ImportError as e:
-    print(f"Missing required package: {e}")
-    print("Install with: pip install pandas supabase python-dotenv openpyxl")
-    sys.exit(1)
+from instrumentation import Instrumentation, Span, add_instrumentation_arguments, instrumented_run
+from settings import Clients, Settings, SettingsError, lazy_import, load_settings, setup_logging
 
-# Load environment variables | تحميل متغيرات البيئة
-load_dotenv()
+# Third-party imports load on first use | المكتبات الخارجية تحمل عند أول استخدام
+pd = lazy_import('pandas', 'pandas openpyxl')
 
-# =============================================================================
-# LOGGING CONFIGURATION | إعداد التسجيل
-# =============================================================================
-
-# Setup logging with bilingual messages | إعداد التسجيل برسائل ثنائية اللغة
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler('course_seeder.log', encoding='utf-8')
-    ]
-)
+# Logging is configured by the entry point | يُعد التسجيل من نقطة الدخول
 logger = logging.getLogger(__name__)
 
 
@@ -102,15 +83,24 @@ class CourseSeeder:
     الفئة الرئيسية لتعبئة بيانات المقررات في قاعدة البيانات
     """
     
-    def __init__(self, config: SeederConfig):
+    def __init__(self, config: SeederConfig, metrics: Optional[Instrumentation] = None,
+                 supabase: Any = None):
         """
         Initialize the seeder | تهيئة أداة التعبئة
         
         Args:
             config: Seeder configuration | إعدادات أداة التعبئة
+            metrics: Run instrumentation | أداة قياس التشغيل
+            supabase: Shared Supabase client (created if omitted) | عميل Supabase مشترك
         """
         self.config = config
-        self.supabase: Client = create_client(config.supabase_url, config.supabase_key)
+        self.metrics = metrics or Instrumentation('seed_courses')
+        
+        # Dry runs never touch the database | وضع التجربة لا يتصل بقاعدة البيانات
+        if supabase is None and not config.dry_run:
+            from supabase import create_client
+            supabase = create_client(config.supabase_url, config.supabase_key)
+        self.supabase = supabase
         self.courses: List[Course] = []
         self.stats = {
             'total_read': 0,
@@ -121,7 +111,7 @@ class CourseSeeder:
         }
         logger.info("Course seeder initialized | تم تهيئة أداة تعبئة المقررات")
     
-    def read_excel(self, file_path: str) -> pd.DataFrame:
+    def read_excel(self, file_path: str) -> 'pd.DataFrame':
         """
         Read course data from Excel file | قراءة بيانات المقررات من ملف Excel
         
@@ -143,7 +133,7 @@ class CourseSeeder:
             logger.error(f"Error reading Excel: {e} | خطأ في قراءة Excel: {e}")
             raise
     
-    def read_csv(self, file_path: str) -> pd.DataFrame:
+    def read_csv(self, file_path: str) -> 'pd.DataFrame':
         """
         Read course data from CSV file | قراءة بيانات المقررات من ملف CSV
         
@@ -168,7 +158,7 @@ class CourseSeeder:
         
         raise ValueError("Could not read CSV with any supported encoding")
     
-    def parse_courses(self, df: pd.DataFrame) -> List[Course]:
+    def parse_courses(self, df: 'pd.DataFrame') -> List[Course]:
         """
         Parse DataFrame to Course objects | تحليل إطار البيانات إلى كائنات المقررات
         
@@ -194,10 +184,11 @@ class CourseSeeder:
             'hours_lab': ['hours_lab', 'lab', 'practical', 'عملي', 'ساعات عملي'],
             'description': ['description', 'desc', 'description_en'],
             'description_ar': ['description_ar', 'arabic_desc', 'الوصف'],
-            'prerequisites': ['prerequisites', 'prereqs', 'المتطلبات السابقة', 'متطلبات']
+            'prerequisites': ['prerequisites', 'prereqs', 'المتطلبات السابقة', 'متطلبات'],
+            'difficulty_rating': ['difficulty_rating', 'difficulty', 'الصعوبة']
         }
         
-        def get_column(df: pd.DataFrame, options: List[str]) -> Optional[str]:
+        def get_column(df: 'pd.DataFrame', options: List[str]) -> Optional[str]:
             """Find matching column name | إيجاد اسم العمود المطابق"""
             df_columns_lower = [c.lower().strip() for c in df.columns]
             for opt in options:
@@ -244,6 +235,7 @@ class CourseSeeder:
                 hours_lab = int(row[columns['hours_lab']]) if columns['hours_lab'] and pd.notna(row[columns['hours_lab']]) else 2
                 description = str(row[columns['description']]).strip() if columns['description'] and pd.notna(row[columns['description']]) else None
                 description_ar = str(row[columns['description_ar']]).strip() if columns['description_ar'] and pd.notna(row[columns['description_ar']]) else None
+                difficulty_rating = float(row[columns['difficulty_rating']]) if columns['difficulty_rating'] and pd.notna(row[columns['difficulty_rating']]) else 3.0
                 
                 # Parse prerequisites | تحليل المتطلبات السابقة
                 prerequisites = []
@@ -270,7 +262,8 @@ class CourseSeeder:
                     semester=semester,
                     hours_theory=hours_theory,
                     hours_lab=hours_lab,
-                    prerequisites=prerequisites
+                    prerequisites=prerequisites,
+                    difficulty_rating=difficulty_rating
                 )
                 courses.append(course)
                 
@@ -301,20 +294,23 @@ class CourseSeeder:
         # Process in batches | المعالجة على دفعات
         for i in range(0, len(courses), self.config.batch_size):
             batch = courses[i:i + self.config.batch_size]
-            self._insert_batch(batch)
+            with self.metrics.span('courses.upsert', items=len(batch)) as span:
+                self._insert_batch(batch, span)
             logger.info(f"Processed batch {i // self.config.batch_size + 1}")
         
         # Insert prerequisites after all courses exist
         # إدراج المتطلبات السابقة بعد وجود جميع المقررات
         logger.info("Inserting prerequisites | إدراج المتطلبات السابقة")
-        self._insert_prerequisites(courses)
+        with self.metrics.span('prerequisites.upsert', items=sum(len(c.prerequisites) for c in courses)):
+            self._insert_prerequisites(courses)
     
-    def _insert_batch(self, courses: List[Course]) -> None:
+    def _insert_batch(self, courses: List[Course], span: Optional[Span] = None) -> None:
         """
         Insert a batch of courses | إدراج دفعة من المقررات
         
         Args:
             courses: Batch of courses to insert | دفعة المقررات للإدراج
+            span: Metrics span that records failed rows | مقطع القياس للأخطاء
         """
         for course in courses:
             try:
@@ -351,6 +347,8 @@ class CourseSeeder:
             except Exception as e:
                 logger.error(f"Error inserting {course.code}: {e}")
                 self.stats['errors'] += 1
+                if span:
+                    span.error()
     
     def _insert_prerequisites(self, courses: List[Course]) -> None:
         """
@@ -407,15 +405,18 @@ class CourseSeeder:
         try:
             # Read input file | قراءة ملف الإدخال
             file_ext = os.path.splitext(self.config.input_file)[1].lower()
-            if file_ext in ['.xlsx', '.xls']:
-                df = self.read_excel(self.config.input_file)
-            elif file_ext == '.csv':
-                df = self.read_csv(self.config.input_file)
-            else:
-                raise ValueError(f"Unsupported file format: {file_ext}")
+            with self.metrics.span('read', bytes=os.path.getsize(self.config.input_file)) as span:
+                if file_ext in ['.xlsx', '.xls']:
+                    df = self.read_excel(self.config.input_file)
+                elif file_ext == '.csv':
+                    df = self.read_csv(self.config.input_file)
+                else:
+                    raise ValueError(f"Unsupported file format: {file_ext}")
+                span.add(items=len(df))
             
             # Parse courses | تحليل المقررات
-            courses = self.parse_courses(df)
+            with self.metrics.span('parse', items=len(df)):
+                courses = self.parse_courses(df)
             
             # Seed to database | التعبئة في قاعدة البيانات
             self.seed_courses(courses)
@@ -435,6 +436,7 @@ class CourseSeeder:
         logger.info(f"Errors: {self.stats['errors']} | الأخطاء: {self.stats['errors']}")
         logger.info("=" * 60)
         
+        self.metrics.result.update(self.stats)
         return self.stats
 
 
@@ -442,15 +444,10 @@ class CourseSeeder:
 # MAIN ENTRY POINT | نقطة الدخول الرئيسية
 # =============================================================================
 
-def main():
+def add_arguments(parser: Any) -> None:
     """
-    Main entry point | نقطة الدخول الرئيسية
+    Add seeder arguments to a parser | إضافة وسائط أداة التعبئة
     """
-    import argparse
-    
-    parser = argparse.ArgumentParser(
-        description='IntelliPath Course Seeder | أداة تعبئة مقررات IntelliPath'
-    )
     parser.add_argument(
         'input_file',
         help='Path to Excel or CSV file | مسار ملف Excel أو CSV'
@@ -466,33 +463,60 @@ def main():
         action='store_true',
         help='Run without inserting data | تشغيل بدون إدراج بيانات'
     )
+    add_instrumentation_arguments(parser)
+
+
+def run_command(args: Any, settings: Settings, clients: Optional[Clients] = None) -> int:
+    """
+    Run the seeder from parsed arguments | تشغيل أداة التعبئة من الوسائط
     
-    args = parser.parse_args()
-    
+    Returns:
+        Process exit code | رمز الخروج
+    """
     # Get Supabase credentials | الحصول على بيانات اعتماد Supabase
-    supabase_url = os.getenv('SUPABASE_URL') or os.getenv('VITE_SUPABASE_URL')
-    supabase_key = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
-    
-    if not supabase_url or not supabase_key:
-        logger.error("Missing SUPABASE_URL or SUPABASE_SERVICE_ROLE_KEY environment variables")
-        logger.error("مفقود: متغيرات بيئة SUPABASE_URL أو SUPABASE_SERVICE_ROLE_KEY")
-        sys.exit(1)
+    if not args.dry_run:
+        settings.require('supabase_url', 'supabase_key')
     
     # Create configuration | إنشاء الإعدادات
     config = SeederConfig(
-        supabase_url=supabase_url,
-        supabase_key=supabase_key,
+        supabase_url=settings.supabase_url,
+        supabase_key=settings.supabase_key,
         input_file=args.input_file,
         batch_size=args.batch_size,
         dry_run=args.dry_run
     )
     
     # Run seeder | تشغيل أداة التعبئة
-    seeder = CourseSeeder(config)
-    stats = seeder.run()
+    with instrumented_run('seed_courses', args) as metrics:
+        seeder = CourseSeeder(
+            config,
+            metrics=metrics,
+            supabase=clients.supabase if clients and not args.dry_run else None
+        )
+        stats = seeder.run()
     
     # Exit with error code if there were errors | الخروج برمز خطأ إذا كانت هناك أخطاء
-    sys.exit(1 if stats['errors'] > 0 else 0)
+    return 1 if stats['errors'] > 0 else 0
+
+
+def main():
+    """
+    Main entry point | نقطة الدخول الرئيسية
+    """
+    import argparse
+    
+    parser = argparse.ArgumentParser(
+        description='IntelliPath Course Seeder | أداة تعبئة مقررات IntelliPath'
+    )
+    add_arguments(parser)
+    args = parser.parse_args()
+    
+    setup_logging('course_seeder.log')
+    try:
+        sys.exit(run_command(args, load_settings()))
+    except (SettingsError, ImportError) as e:
+        logger.error(str(e))
+        sys.exit(1)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=============================================================================
+IntelliPath - Shared Settings and Runtime Helpers
+المرشد الأكاديمي الذكي - الإعدادات المشتركة وأدوات التشغيل
+=============================================================================
+One place for what every pipeline script used to do at import time:
+reading .env and the environment, configuring logging, and creating
+Supabase / Neo4j / OpenAI clients. Nothing here runs on import,
+and heavy third-party modules are imported on first use.
+مكان واحد لتحميل متغيرات البيئة وإعداد التسجيل وإنشاء العملاء، دون أي
+تنفيذ عند الاستيراد، مع تحميل المكتبات الثقيلة عند أول استخدام.
+=============================================================================
+Version: 1.0.0 | الإصدار: 1.0.0
+Last Updated: 2026-10-19 | آخر تحديث: 2026-10-19
+=============================================================================
+"""
+
+import os
+import sys
+import types
+import logging
+import importlib
+from typing import Any, Dict, Optional, Tuple
+from dataclasses import dataclass, fields
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# LAZY IMPORTS | الاستيراد المؤجل
+# =============================================================================
+
+class LazyModule(types.ModuleType):
+    """
+    Module proxy that imports on first attribute access
+    وكيل وحدة يستورد عند أول وصول لخاصية
+    """
+
+    def __init__(self, name: str, install: Optional[str] = None):
+        super().__init__(name)
+        self._install = install or name.split('.')[0]
+        self._module: Optional[types.ModuleType] = None
+
+    def _load(self) -> types.ModuleType:
+        if self._module is None:
+            try:
+                self._module = importlib.import_module(self.__name__)
+            except ImportError as e:
+                raise ImportError(
+                    f"Missing required package: {e.name or self.__name__}. "
+                    f"Install with: pip install {self._install}"
+                ) from e
+        return self._module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+
+def lazy_import(name: str, install: Optional[str] = None) -> Any:
+    """
+    Defer importing a module until it is used | تأجيل استيراد وحدة حتى استخدامها
+
+    Args:
+        name: Dotted module name | اسم الوحدة
+        install: pip requirement named in the error | اسم الحزمة للتثبيت
+    """
+    return LazyModule(name, install)
+
+
+# =============================================================================
+# LOGGING | التسجيل
+# =============================================================================
+
+def setup_logging(log_file: Optional[str] = None, level: int = logging.INFO) -> None:
+    """
+    Configure bilingual console (and optional file) logging
+    إعداد التسجيل على الشاشة وفي ملف اختياري
+
+    Args:
+        log_file: Log file path, or None for console only | ملف السجل
+        level: Logging level | مستوى التسجيل
+    """
+    handlers = [logging.StreamHandler(sys.stdout)]
+    if log_file:
+        handlers.append(logging.FileHandler(log_file, encoding='utf-8'))
+    logging.basicConfig(
+        level=level,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=handlers,
+        force=True
+    )
+
+
+# =============================================================================
+# SETTINGS | الإعدادات
+# =============================================================================
+
+# Environment variables per setting, first match wins | متغيرات البيئة لكل إعداد
+ENV_VARS: Dict[str, Tuple[str, ...]] = {
+    'supabase_url': ('SUPABASE_URL', 'VITE_SUPABASE_URL'),
+    'supabase_key': ('SUPABASE_SERVICE_ROLE_KEY',),
+    'database_url': ('DATABASE_URL', 'SUPABASE_DB_URL'),
+    'neo4j_uri': ('NEO4J_URI',),
+    'neo4j_user': ('NEO4J_USERNAME', 'NEO4J_USER'),
+    'neo4j_password': ('NEO4J_PASSWORD',),
+    'neo4j_database': ('NEO4J_DATABASE',),
+    'openai_api_key': ('OPENAI_API_KEY',),
+    'qdrant_url': ('QDRANT_URL',),
+    'qdrant_api_key': ('QDRANT_API_KEY',),
+    'vector_backend': ('VECTOR_BACKEND',),
+}
+
+
+# Neo4j driver tuning shared by Clients.neo4j and graph_sync.SyncConfig
+# ضبط برنامج تشغيل Neo4j المشترك بين العملاء والمزامنة
+NEO4J_DRIVER_OPTIONS: Dict[str, Any] = {
+    'max_connection_pool_size': 50,  # Connections per server | الاتصالات لكل خادم
+    'connection_acquisition_timeout': 60.0,  # Seconds to wait for a pooled connection | مهلة الحصول على اتصال
+    'fetch_size': 1000,  # Records per network fetch | السجلات لكل جلب
+    'keep_alive': True,  # TCP keep-alive on idle connections | إبقاء الاتصال نشطاً
+    'max_transaction_retry_time': 30.0,  # Retry budget for transient errors | مهلة إعادة المحاولة
+}
+
+
+class SettingsError(Exception):
+    """Required settings are missing | إعدادات مطلوبة مفقودة"""
+
+
+@dataclass
+class Settings:
+    """
+    Connection settings shared by all commands | إعدادات الاتصال المشتركة
+    """
+    supabase_url: Optional[str] = None  # Supabase project URL | رابط مشروع Supabase
+    supabase_key: Optional[str] = None  # Service role key | مفتاح الخدمة
+    database_url: Optional[str] = None  # Direct Postgres URL (COPY imports) | رابط Postgres المباشر
+    neo4j_uri: Optional[str] = None  # Neo4j URI | رابط Neo4j
+    neo4j_user: str = 'neo4j'  # Neo4j user | مستخدم Neo4j
+    neo4j_password: Optional[str] = None  # Neo4j password | كلمة مرور Neo4j
+    neo4j_database: Optional[str] = None  # Neo4j database (server default if None) | قاعدة بيانات Neo4j
+    openai_api_key: Optional[str] = None  # OpenAI API key | مفتاح OpenAI
+    qdrant_url: str = 'http://localhost:6333'  # Qdrant URL | رابط Qdrant
+    qdrant_api_key: Optional[str] = None  # Qdrant API key | مفتاح Qdrant
+    vector_backend: str = 'qdrant'  # 'qdrant' or 'local' | خلفية المتجهات
+
+    def require(self, *names: str) -> None:
+        """
+        Fail with the missing environment variables | التحقق من الإعدادات المطلوبة
+
+        Raises:
+            SettingsError: Listing the variables to set | قائمة المتغيرات المفقودة
+        """
+        missing = [ENV_VARS[name][0] for name in names if not getattr(self, name)]
+        if missing:
+            raise SettingsError(
+                f"Missing environment variables: {', '.join(missing)} | "
+                f"متغيرات البيئة المفقودة: {', '.join(missing)}"
+            )
+
+
+def load_settings(env_file: Optional[str] = None) -> Settings:
+    """
+    Read settings from .env and the environment | قراءة الإعدادات من البيئة
+
+    Args:
+        env_file: .env file; defaults to python-dotenv's lookup | ملف البيئة
+
+    Returns:
+        Settings with environment overrides applied | الإعدادات
+    """
+    try:
+        from dotenv import load_dotenv
+        load_dotenv(env_file) if env_file else load_dotenv()
+    except ImportError:
+        logger.debug("python-dotenv not installed; using the process environment only")
+
+    values = {}
+    for f in fields(Settings):
+        for var in ENV_VARS[f.name]:
+            if os.getenv(var):
+                values[f.name] = os.getenv(var)
+                break
+    return Settings(**values)
+
+
+# =============================================================================
+# CLIENTS | العملاء
+# =============================================================================
+
+class Clients:
+    """
+    Lazily created clients shared within one process
+    عملاء ينشؤون عند الحاجة ويشتركون ضمن العملية
+    """
+
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        self._supabase = None
+        self._neo4j = None
+        self._openai = None
+
+    @property
+    def supabase(self) -> Any:
+        """Supabase client | عميل Supabase"""
+        if self._supabase is None:
+            self.settings.require('supabase_url', 'supabase_key')
+            from supabase import create_client
+            self._supabase = create_client(self.settings.supabase_url, self.settings.supabase_key)
+        return self._supabase
+
+    @property
+    def neo4j(self) -> Any:
+        """Neo4j driver | برنامج تشغيل Neo4j"""
+        if self._neo4j is None:
+            self.settings.require('neo4j_uri', 'neo4j_password')
+            from neo4j import GraphDatabase
+            self._neo4j = GraphDatabase.driver(
+                self.settings.neo4j_uri,
+                auth=(self.settings.neo4j_user, self.settings.neo4j_password),
+                **NEO4J_DRIVER_OPTIONS
+            )
+        return self._neo4j
+
+    @property
+    def openai(self) -> Any:
+        """OpenAI client | عميل OpenAI"""
+        if self._openai is None:
+            self.settings.require('openai_api_key')
+            import openai
+            self._openai = openai.OpenAI(api_key=self.settings.openai_api_key)
+        return self._openai
+
+    def close(self) -> None:
+        """Close clients that hold connections | إغلاق الاتصالات"""
+        if self._neo4j is not None:
+            self._neo4j.close()
+            self._neo4j = None
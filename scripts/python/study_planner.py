@@ -0,0 +1,527 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=============================================================================
+IntelliPath - Study Plan Generator
+المرشد الأكاديمي الذكي - مولد الخطط الدراسية
+=============================================================================
+Builds semester-by-semester plans to graduation from the prerequisite DAG
+with list scheduling:
+
+- Each semester takes ready courses (all prerequisites passed in an
+  earlier semester, offered in that term) in critical-path order until
+  the credit cap is reached.
+- Critical-path priority is the longest chain of courses that still
+  depend on a course, so long chains start first and the plan needs as
+  few semesters as the DAG allows.
+- Plans are memoized per (major, completed set, starting term), so
+  students in the same position share one computation.
+
+Term offerings come from the course's plan semester (odd: first
+semester, even: second); courses without one are offered every term.
+A term in which nothing can be taken is skipped rather than planned
+empty, so each plan semester records its term and the elapsed terms.
+يبني خطة فصلية حتى التخرج بالجدولة القائمة على القوائم: كل فصل يأخذ
+المقررات الجاهزة حسب أولوية المسار الحرج حتى الحد الأعلى للساعات، مع
+حفظ الخطط لكل (تخصص، مقررات منجزة، فصل البداية).
+=============================================================================
+Version: 1.0.0 | الإصدار: 1.0.0
+Last Updated: 2026-10-19 | آخر تحديث: 2026-10-19
+=============================================================================
+"""
+
+import sys
+import json
+import heapq
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from dataclasses import dataclass, field, asdict
+
+from academic_records import (
+    PASS_MARK, SEMESTER_ORDER, load_records, passed_mask, student_majors, term_index
+)
+from course_catalog import TERM_NAMES, CourseCatalog, _paginate, load_catalog
+from eligibility import PrerequisiteIndex
+from settings import Clients, Settings, SettingsError, lazy_import, load_settings, setup_logging
+
+pd = lazy_import('pandas', 'pandas openpyxl')
+
+logger = logging.getLogger(__name__)
+
+# Regular terms a plan alternates between | الفصول العادية في الخطة
+TERMS = tuple(TERM_NAMES)
+
+
+# =============================================================================
+# CONFIGURATION | الإعدادات
+# =============================================================================
+
+@dataclass
+class PlannerConfig:
+    """
+    Planner configuration | إعدادات المخطط
+    """
+    max_credits: int = 18  # Credit cap per semester | الحد الأعلى للساعات في الفصل
+    total_credits: int = 171  # Graduation credits when the major has none | ساعات التخرج الافتراضية
+    respect_offerings: bool = True  # Only schedule courses in their term | الالتزام بفصل الطرح
+    max_semesters: int = 20  # Safety limit per plan | الحد الأقصى للفصول
+    memoize: bool = True  # Reuse plans per (major, completed, term) | إعادة استخدام الخطط
+
+
+@dataclass
+class StudyPlan:
+    """
+    Semester plan for one student | خطة دراسية لطالب واحد
+    """
+    student_id: Optional[str]  # Student number | الرقم الجامعي
+    major: Optional[str]  # Major | التخصص
+    start_term: str  # First planned term | فصل البداية
+    completed_credits: int  # Credits already passed | الساعات المنجزة
+    required_credits: int  # Graduation credits | ساعات التخرج
+    semesters: List[List[str]] = field(default_factory=list)  # Courses per semester | المقررات لكل فصل
+    credits: List[int] = field(default_factory=list)  # Credits per semester | الساعات لكل فصل
+    terms: List[str] = field(default_factory=list)  # Term of each semester | فصل كل خطوة
+    elapsed_terms: int = 0  # Terms to graduation, skipped ones included | الفصول المنقضية
+    lower_bound: int = 0  # No plan can be shorter | أقل عدد ممكن من الفصول
+    complete: bool = True  # Reaches the graduation credits | يبلغ ساعات التخرج
+
+    @property
+    def planned_credits(self) -> int:
+        return sum(self.credits)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data['planned_credits'] = self.planned_credits
+        return data
+
+
+# =============================================================================
+# PLANNER | المخطط
+# =============================================================================
+
+class StudyPlanner:
+    """
+    List scheduler over the prerequisite DAG | مجدول الخطط على شبكة المتطلبات
+    """
+
+    def __init__(self, catalog: CourseCatalog, config: Optional[PlannerConfig] = None,
+                 index: Optional[PrerequisiteIndex] = None,
+                 required_credits: Optional[Dict[str, int]] = None):
+        """
+        Prepare per-course data once | تجهيز بيانات المقررات مرة واحدة
+
+        Args:
+            catalog: Course catalog | كتالوج المقررات
+            config: Planner configuration | إعدادات المخطط
+            index: Prebuilt prerequisite index | فهرس متطلبات جاهز
+            required_credits: Major -> graduation credits (majors.total_credits)
+                              ساعات التخرج لكل تخصص
+        """
+        self.config = config or PlannerConfig()
+        self.index = index or PrerequisiteIndex.from_catalog(catalog)
+        self.required_credits = required_credits or {}
+        codes = self.index.codes
+        n = len(codes)
+
+        courses = [catalog.courses[code] for code in codes]
+        self.course_credits: List[int] = [c.credits for c in courses]
+        # Term offered in (0 first, 1 second, None both) | فصل الطرح
+        self.offered: List[Optional[int]] = [
+            (c.semester - 1) % len(TERMS) if c.semester else None for c in courses
+        ]
+
+        self.dependents: List[List[int]] = [[] for _ in range(n)]
+        for c, prereqs in enumerate(self.index.prerequisites):
+            for p in prereqs:
+                self.dependents[p].append(c)
+
+        # Priority: longest dependent chain first; ties go to earlier years and
+        # to shallower stored critical_path_depth (prerequisites below a
+        # course), which keeps chains in order when the catalog lacks edges
+        # الأولوية لأطول سلسلة تابعة، ثم السنة الأدنى والعمق الأقل
+        self.tail: List[int] = [0] * n
+        for i in reversed(self.index.order):
+            self.tail[i] = 1 + max((self.tail[d] for d in self.dependents[i]), default=0)
+        self.priority: List[Tuple[int, ...]] = [
+            (-self.tail[i], courses[i].year_level, courses[i].critical_path_depth,
+             courses[i].semester or 0, self.index.rank[i])
+            for i in range(n)
+        ]
+
+        self._major_bits: Dict[Optional[str], int] = {}
+        self._cache: Dict[Tuple[Optional[str], int, int], Tuple[Tuple[Tuple[int, ...], ...], int]] = {}
+        self.stats = {
+            'plans': 0,
+            'cache_hits': 0,
+            'incomplete': 0,
+        }
+
+    # -------------------------------------------------------------------------
+    # Helpers | أدوات مساعدة
+    # -------------------------------------------------------------------------
+
+    def _pool(self, major: Optional[str]) -> int:
+        """Major courses plus everything they require | مقررات التخصص ومتطلباتها"""
+        if major not in self._major_bits:
+            bits = 0
+            for i in self.index.candidates(major):
+                bits |= (1 << i) | self.index.ancestors[i]
+            self._major_bits[major] = bits
+        return self._major_bits[major]
+
+    def _credits_of(self, bits: int) -> int:
+        total = 0
+        while bits:
+            low = bits & -bits
+            total += self.course_credits[low.bit_length() - 1]
+            bits ^= low
+        return total
+
+    def required_for(self, major: Optional[str]) -> int:
+        """Graduation credits of a major | ساعات التخرج لتخصص"""
+        return self.required_credits.get(major) or self.config.total_credits
+
+    # -------------------------------------------------------------------------
+    # Scheduling | الجدولة
+    # -------------------------------------------------------------------------
+
+    def _schedule(self, major: Optional[str], done: int,
+                  start: int) -> Tuple[Tuple[int, Tuple[int, ...]], ...]:
+        """
+        List-schedule the remaining courses | جدولة المقررات المتبقية
+
+        Returns:
+            (terms after start, course indices) per planned semester; terms
+            with nothing schedulable are skipped
+            (الفصول بعد البداية، أرقام المقررات) لكل فصل مخطط
+        """
+        cfg = self.config
+        pool = self._pool(major) & ~done
+        target = self.required_for(major) - self._credits_of(done)
+        direct = self.index.direct
+
+        waiting: Dict[int, int] = {}
+        ready: List[Tuple[Tuple[int, ...], int]] = []
+        bits = pool
+        while bits:
+            low = bits & -bits
+            i = low.bit_length() - 1
+            bits ^= low
+            missing = bin(direct[i] & ~done).count('1')
+            if missing:
+                waiting[i] = missing
+            else:
+                ready.append((self.priority[i], i))
+        heapq.heapify(ready)
+
+        semesters: List[Tuple[int, Tuple[int, ...]]] = []
+        planned = 0
+        idle = 0
+        elapsed = 0
+        while ready and planned < target and len(semesters) < cfg.max_semesters:
+            term = (start + elapsed) % len(TERMS)
+            room = cfg.max_credits
+            taken: List[int] = []
+            deferred = []
+            while ready and room > 0 and planned < target:
+                entry = heapq.heappop(ready)
+                i = entry[1]
+                offered = self.offered[i]
+                if (cfg.respect_offerings and offered is not None and offered != term) \
+                        or self.course_credits[i] > room:
+                    deferred.append(entry)
+                    continue
+                taken.append(i)
+                room -= self.course_credits[i]
+                planned += self.course_credits[i]
+            for entry in deferred:
+                heapq.heappush(ready, entry)
+
+            elapsed += 1
+            if not taken:
+                # Only off-term courses are ready: wait a term | المقررات الجاهزة غير مطروحة
+                idle += 1
+                if idle >= len(TERMS):
+                    break
+                continue
+            idle = 0
+            semesters.append((elapsed - 1, tuple(taken)))
+            # Dependents open from the next semester | التوابع تتاح من الفصل التالي
+            for i in taken:
+                for d in self.dependents[i]:
+                    if d in waiting:
+                        waiting[d] -= 1
+                        if not waiting[d]:
+                            del waiting[d]
+                            heapq.heappush(ready, (self.priority[d], d))
+        return tuple(semesters)
+
+    def _lower_bound(self, major: Optional[str], done: int) -> int:
+        """
+        Semesters no schedule can beat: credit volume, and the longest
+        unfinished prerequisite chain when every course is needed
+        الحد الأدنى للفصول حسب الساعات وأطول سلسلة متبقية
+        """
+        pool = self._pool(major) & ~done
+        target = max(self.required_for(major) - self._credits_of(done), 0)
+        available = self._credits_of(pool)
+        bound = -(-min(target, available) // self.config.max_credits)
+        if available <= target:
+            depth: Dict[int, int] = {}
+            for i in self.index.order:
+                if pool >> i & 1:
+                    depth[i] = 1 + max((depth.get(p, 0) for p in self.index.prerequisites[i]), default=0)
+            bound = max(bound, max(depth.values(), default=0))
+        return bound
+
+    def plan(self, completed: Iterable[str], major: Optional[str] = None,
+             start_term: int = 0, student_id: Optional[str] = None) -> StudyPlan:
+        """
+        Plan one student to graduation | خطة طالب واحد حتى التخرج
+
+        Args:
+            completed: Passed course codes | المقررات المنجزة
+            major: Student major (None: whole catalog) | التخصص
+            start_term: 0 first semester, 1 second | فصل البداية
+            student_id: Student number for the report | الرقم الجامعي
+
+        Returns:
+            Study plan | الخطة الدراسية
+        """
+        done = self.index.mask(completed)
+        if major is not None and major not in self.index.majors:
+            major = None
+        key = (major, done, start_term)
+        cached = self._cache.get(key) if self.config.memoize else None
+        if cached is None:
+            cached = self._schedule(major, done, start_term), self._lower_bound(major, done)
+            if self.config.memoize:
+                self._cache[key] = cached
+        else:
+            self.stats['cache_hits'] += 1
+        schedule, lower_bound = cached
+        self.stats['plans'] += 1
+
+        completed_credits = self._credits_of(done)
+        required = self.required_for(major)
+        plan = StudyPlan(
+            student_id=student_id,
+            major=major,
+            start_term=TERMS[start_term],
+            completed_credits=completed_credits,
+            required_credits=required,
+            semesters=[[self.index.codes[i] for i in courses] for _, courses in schedule],
+            credits=[sum(self.course_credits[i] for i in courses) for _, courses in schedule],
+            terms=[TERMS[(start_term + offset) % len(TERMS)] for offset, _ in schedule],
+            elapsed_terms=schedule[-1][0] + 1 if schedule else 0,
+            lower_bound=lower_bound,
+        )
+        plan.complete = completed_credits + plan.planned_credits >= required
+        if not plan.complete:
+            self.stats['incomplete'] += 1
+        return plan
+
+    def plan_all(self, records: 'pd.DataFrame', pass_mark: float = PASS_MARK) -> 'pd.DataFrame':
+        """
+        Plan every student in the records | تخطيط جميع الطلاب
+
+        Each student starts in the regular term after their latest record.
+
+        Returns:
+            One row per student with the plan as JSON | صف لكل طالب
+        """
+        majors = student_majors(records)
+        start_terms = next_terms(records)
+        passed = records.loc[passed_mask(records, pass_mark), ['student_id', 'course_code']]
+        completed = passed.groupby('student_id', sort=False)['course_code'].agg(list)
+
+        rows = []
+        for student_id in pd.unique(records['student_id']):
+            plan = self.plan(
+                completed.get(student_id, []),
+                major=majors.get(student_id),
+                start_term=int(start_terms.get(student_id, 0)),
+                student_id=student_id,
+            )
+            rows.append({
+                'student_id': student_id,
+                'major': plan.major,
+                'start_term': plan.start_term,
+                'completed_credits': plan.completed_credits,
+                'planned_credits': plan.planned_credits,
+                'semesters': len(plan.semesters),
+                'elapsed_terms': plan.elapsed_terms,
+                'lower_bound': plan.lower_bound,
+                'complete': plan.complete,
+                'plan': json.dumps(plan.semesters, ensure_ascii=False),
+            })
+
+        logger.info(
+            f"Planned {self.stats['plans']} students ({self.stats['cache_hits']} from cache, "
+            f"{self.stats['incomplete']} incomplete) | تم تخطيط {self.stats['plans']} طالب"
+        )
+        return pd.DataFrame(rows, columns=[
+            'student_id', 'major', 'start_term', 'completed_credits', 'planned_credits',
+            'semesters', 'elapsed_terms', 'lower_bound', 'complete', 'plan',
+        ])
+
+
+def next_terms(records: 'pd.DataFrame') -> 'pd.Series':
+    """
+    Regular term after each student's latest record (0 first, 1 second)
+    الفصل العادي التالي لآخر سجل لكل طالب
+
+    After a second or summer term the plan starts in the first.
+    """
+    latest = records.assign(_term=term_index(records)).groupby('student_id', sort=False)['_term'].max()
+    return (latest % len(SEMESTER_ORDER) == SEMESTER_ORDER[TERMS[0]]).astype(int)
+
+
+def load_required_credits(client: Any) -> Dict[str, int]:
+    """
+    Graduation credits per major from the majors table | ساعات التخرج لكل تخصص
+    """
+    return {
+        row['name']: int(row['total_credits'])
+        for row in _paginate(client, 'majors', 'name, total_credits', 1000)
+        if row.get('total_credits')
+    }
+
+
+# =============================================================================
+# MAIN ENTRY POINT | نقطة الدخول الرئيسية
+# =============================================================================
+
+def add_arguments(parser: Any) -> None:
+    """
+    Add planner arguments to a parser | إضافة وسائط المخطط
+    """
+    parser.add_argument(
+        '--catalog',
+        help="Knowledge graph export or 'supabase' (default: bundled export) | مصدر الكتالوج"
+    )
+    parser.add_argument(
+        '--records',
+        help="student_academic_records CSV/Excel or 'supabase' | مصدر السجلات الأكاديمية"
+    )
+    parser.add_argument('--student', help='Plan one student | خطة طالب واحد')
+    parser.add_argument('--completed', nargs='*', help='Plan from an ad-hoc set of passed courses | مقررات منجزة')
+    parser.add_argument('--major', help='Major to plan for | التخصص')
+    parser.add_argument(
+        '--start-term', choices=['first', 'second'], default='first',
+        help='First planned term for ad-hoc plans (default: first) | فصل البداية'
+    )
+    parser.add_argument('--max-credits', type=int, default=18, help='Credit cap per semester (default: 18) | حد الساعات')
+    parser.add_argument(
+        '--total-credits', type=int,
+        help="Graduation credits (default: the major's total_credits, else 171) | ساعات التخرج"
+    )
+    parser.add_argument(
+        '--ignore-offerings', action='store_true',
+        help='Schedule courses in any term | تجاهل فصل الطرح'
+    )
+    parser.add_argument('--pass-mark', type=float, default=PASS_MARK, help='Passing grade (default: 60) | درجة النجاح')
+    parser.add_argument('--output', help='Bulk mode: per-student plans CSV | ملف الخطط')
+    parser.add_argument('--json', action='store_true', help='Print JSON | طباعة JSON')
+
+
+def _print_plan(plan: StudyPlan, as_json: bool) -> None:
+    if as_json:
+        print(json.dumps(plan.to_dict(), ensure_ascii=False, indent=2))
+        return
+    print(f"Student: {plan.student_id or '-'} | Major: {plan.major or '-'}")
+    print(
+        f"Credits: {plan.completed_credits} completed + {plan.planned_credits} planned "
+        f"/ {plan.required_credits} required"
+    )
+    print(
+        f"Semesters: {len(plan.semesters)} over {plan.elapsed_terms} terms "
+        f"(lower bound {plan.lower_bound})"
+    )
+    for n, (term, courses, credits) in enumerate(zip(plan.terms, plan.semesters, plan.credits), 1):
+        print(f"  {n:2d}. {term} [{credits}]: {' '.join(courses)}")
+    if not plan.complete:
+        print("Incomplete: not enough schedulable courses | الخطة غير مكتملة")
+
+
+def run_command(args: Any, settings: Settings, clients: Optional[Clients] = None) -> int:
+    """
+    Generate study plans from parsed arguments | توليد الخطط من الوسائط
+
+    Returns:
+        Process exit code | رمز الخروج
+    """
+    uses_supabase = 'supabase' in (args.catalog, args.records)
+    if uses_supabase:
+        settings.require('supabase_url', 'supabase_key')
+    clients = clients or Clients(settings)
+    client = clients.supabase if uses_supabase else None
+
+    config = PlannerConfig(
+        max_credits=args.max_credits,
+        respect_offerings=not args.ignore_offerings,
+    )
+    required = {}
+    if args.total_credits:
+        config.total_credits = args.total_credits
+    elif client is not None:
+        required = load_required_credits(client)
+    planner = StudyPlanner(load_catalog(args.catalog, client=client), config, required_credits=required)
+
+    if args.completed is not None:
+        start = 0 if args.start_term == 'first' else 1
+        _print_plan(planner.plan(args.completed, major=args.major, start_term=start), args.json)
+        return 0
+
+    if not args.records:
+        logger.error("Pass --records or --completed | حدد السجلات أو المقررات المنجزة")
+        return 2
+    records = load_records(args.records, client=client)
+
+    if args.student:
+        records = records[records['student_id'] == args.student]
+        if records.empty:
+            logger.error(f"No records for student {args.student} | لا توجد سجلات للطالب")
+            return 1
+        major = args.major or student_majors(records).get(args.student)
+        completed = records.loc[passed_mask(records, args.pass_mark), 'course_code']
+        start = int(next_terms(records).iloc[0])
+        _print_plan(planner.plan(completed, major=major, start_term=start, student_id=args.student), args.json)
+        return 0
+
+    plans = planner.plan_all(records, pass_mark=args.pass_mark)
+    if args.output:
+        plans.to_csv(args.output, index=False, encoding='utf-8')
+    summary = {
+        'students': len(plans),
+        'cache_hits': planner.stats['cache_hits'],
+        'incomplete': int((~plans['complete']).sum()) if len(plans) else 0,
+        'mean_semesters': round(float(plans['semesters'].mean()), 2) if len(plans) else 0.0,
+        'above_lower_bound': int((plans['semesters'] > plans['lower_bound']).sum()) if len(plans) else 0,
+    }
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+    return 0
+
+
+def main():
+    """
+    Main entry point | نقطة الدخول الرئيسية
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='IntelliPath study plan generator | مولد الخطط الدراسية'
+    )
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    setup_logging()
+    try:
+        sys.exit(run_command(args, load_settings()))
+    except (SettingsError, ImportError, ValueError) as e:
+        logger.error(str(e))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,584 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=============================================================================
+IntelliPath - Synthetic Dataset Generator
+المرشد الأكاديمي الذكي - مولد البيانات الاصطناعية
+=============================================================================
+Grows the bundled knowledge graph into reproducible load-testing datasets
+that respect schema_complete.sql: tens of thousands of courses with a
+layered prerequisite DAG, majors with study plans, students with
+semester-by-semester student_academic_records rows, and Arabic/English
+Markdown documents. courses.csv feeds CourseSeeder and documents/ feeds
+VectorEmbeddingGenerator as-is.
+يوسع الرسم المعرفي المرفق إلى بيانات اختبار حمل قابلة للتكرار تحترم
+قيود المخطط: مقررات ومتطلبات وتخصصات وسجلات أكاديمية ومستندات ثنائية اللغة.
+=============================================================================
+Version: 1.0.0 | الإصدار: 1.0.0
+Last Updated: 2026-10-19 | آخر تحديث: 2026-10-19
+=============================================================================
+"""
+
+import csv
+import sys
+import json
+import math
+import uuid
+import logging
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from dataclasses import dataclass, asdict, field
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from academic_records import GRADE_SCALE, PASS_MARK
+from course_catalog import CourseCatalog
+from settings import setup_logging
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# CONSTANTS | الثوابت
+# =============================================================================
+
+PLAN_SEMESTERS = 10  # Five-year plans, two terms a year | خطط خمس سنوات بفصلين
+MAX_PER_DEPARTMENT = 490  # Two-digit numbers per year level, e.g. CIFC.3.07 | رقمان لكل سنة
+SEMESTER_NAMES = ('الفصل الأول', 'الفصل الثاني')
+COLLEGE = 'كلية الهندسة المعلوماتية'
+
+# student_academic_records columns in schema order | أعمدة السجلات الأكاديمية
+RECORD_COLUMNS = (
+    'student_id', 'academic_year', 'semester', 'course_code', 'course_name',
+    'course_credits', 'final_grade', 'letter_grade', 'grade_points',
+    'cumulative_gpa_points', 'cumulative_gpa_percent', 'registered_hours_semester',
+    'completed_hours_semester', 'total_completed_hours', 'college', 'major',
+    'study_mode', 'permanent_status', 'semester_status', 'academic_warning',
+    'previous_academic_warning', 'baccalaureate_type', 'baccalaureate_country',
+    'certificate_score', 'certificate_average', 'has_ministry_scholarship',
+    'last_registration_semester',
+)
+
+# courses.csv columns understood by CourseSeeder.parse_courses | أعمدة ملف المقررات
+COURSE_COLUMNS = (
+    'code', 'name', 'name_ar', 'credits', 'department', 'year_level', 'semester',
+    'hours_theory', 'hours_lab', 'description', 'description_ar', 'prerequisites',
+    'difficulty_rating',
+)
+
+STUDENT_COLUMNS = (
+    'user_id', 'student_id', 'department', 'major', 'year_level', 'gpa',
+    'total_credits', 'study_mode', 'academic_warning', 'permanent_status',
+    'baccalaureate_type', 'baccalaureate_country', 'certificate_score',
+    'certificate_average', 'has_ministry_scholarship',
+)
+
+
+def grade_letter(mark: float) -> Tuple[str, float]:
+    """Letter grade and points for a 0-100 mark | الدرجة الحرفية والنقاط"""
+    for floor, letter, points in GRADE_SCALE:
+        if mark >= floor:
+            return letter, points
+    return 'F', 0.0
+
+
+def _prefix(index: int) -> str:
+    """Four-letter department code prefix | بادئة رمز القسم"""
+    letters = ''.join(chr(65 + (index // 26 ** k) % 26) for k in range(2, -1, -1))
+    return f"S{letters}"
+
+
+# =============================================================================
+# CONFIGURATION | الإعدادات
+# =============================================================================
+
+@dataclass
+class SyntheticConfig:
+    """
+    Configuration for the generator | إعدادات المولد
+    """
+    output_dir: str = "synthetic_data"  # Output directory | مجلد الإخراج
+    courses: int = 20000  # Total courses | عدد المقررات
+    courses_per_department: int = 400  # Courses per department (max 490) | مقررات لكل قسم
+    plan_courses_per_semester: int = 6  # Plan courses per term | مقررات الخطة لكل فصل
+    mean_prerequisites: float = 1.4  # Mean prerequisites per course | متوسط المتطلبات
+    max_prerequisites: int = 4  # Fan-in cap | الحد الأعلى للمتطلبات
+    students: int = 20000  # Students | عدد الطلاب
+    start_year: int = 2019  # First intake year | سنة أول دفعة
+    documents: bool = True  # Write Markdown documents | كتابة المستندات
+    courses_per_document: int = 50  # Courses per catalog document | مقررات لكل مستند
+    template_source: Optional[str] = None  # Knowledge graph export for names | مصدر القوالب
+    seed: int = 42  # Random seed | البذرة
+
+
+@dataclass
+class SyntheticCourse:
+    """
+    Generated course row | مقرر مولد
+    """
+    code: str
+    name: str
+    name_ar: str
+    credits: int
+    department: int  # Department index | رقم القسم
+    plan_semester: int  # 1-10 | الفصل في الخطة
+    hours_theory: int
+    hours_lab: int
+    difficulty_rating: float
+    description: str
+    description_ar: str
+    prerequisites: List[int] = field(default_factory=list)  # Course indexes | فهارس المتطلبات
+    depth: int = 0  # Longest prerequisite chain | أطول سلسلة متطلبات
+    dependents: int = 0  # Direct dependents | عدد المقررات التابعة
+
+    @property
+    def year_level(self) -> int:
+        return (self.plan_semester + 1) // 2
+
+
+# =============================================================================
+# GENERATOR | المولد
+# =============================================================================
+
+class SyntheticDatasetGenerator:
+    """
+    Reproducible scaled dataset generator | مولد بيانات موسعة قابلة للتكرار
+    """
+
+    def __init__(self, config: SyntheticConfig):
+        """
+        Initialize the generator | تهيئة المولد
+
+        Args:
+            config: Generator configuration | إعدادات المولد
+        """
+        if not 1 <= config.courses_per_department <= MAX_PER_DEPARTMENT:
+            raise ValueError(f"courses_per_department must be between 1 and {MAX_PER_DEPARTMENT}")
+        self.config = config
+        self.rng = np.random.default_rng(config.seed)
+        self.templates, self.major_names = self._load_templates(config.template_source)
+        self.departments: List[Tuple[str, str]] = []  # (name_ar, name_en)
+        self.courses: List[SyntheticCourse] = []
+        self.plans: List[List[int]] = []  # Per-department study plan | خطة كل قسم
+        self.stats: Dict[str, Any] = {
+            'courses': 0, 'prerequisites': 0, 'majors': 0, 'students': 0,
+            'academic_records': 0, 'documents': 0, 'max_depth': 0,
+        }
+
+    @staticmethod
+    def _load_templates(source: Optional[str]) -> Tuple[List[Tuple[str, str, str, str]], List[str]]:
+        """
+        (name, name_ar, description, description_ar) and major names from the real catalog
+        قوالب الأسماء والأوصاف وأسماء التخصصات من الكتالوج الحقيقي
+        """
+        catalog = CourseCatalog.from_knowledge_graph(source)
+        templates = [
+            (c.name, c.name_ar or c.name, c.description or '', c.description_ar or '')
+            for c in catalog.courses.values() if c.name and c.code != '-'
+        ]
+        if not templates:
+            raise ValueError("Template catalog has no courses")
+        majors = sorted({c.major for c in catalog.courses.values() if c.major})
+        return templates, majors or ['هندسة المعلوماتية']
+
+    # -------------------------------------------------------------------------
+    # Courses | المقررات
+    # -------------------------------------------------------------------------
+
+    def generate_courses(self) -> List[SyntheticCourse]:
+        """
+        Generate courses and a layered prerequisite DAG
+        توليد المقررات ورسم متطلبات طبقي لا دوري
+
+        Prerequisites come from the same department's previous one to three
+        terms (mostly the last one), which yields realistic chain depth; a
+        course's depth and dependent count follow GraphSync's definitions.
+        المتطلبات من الفصول الثلاثة السابقة في القسم نفسه.
+        """
+        cfg = self.config
+        rng = self.rng
+        n_departments = math.ceil(cfg.courses / cfg.courses_per_department)
+        per_term = math.ceil(cfg.courses_per_department / PLAN_SEMESTERS)
+
+        for d in range(n_departments):
+            # Real major names first, numbered copies beyond them | أسماء التخصصات الحقيقية أولاً
+            base, copy = self.major_names[d % len(self.major_names)], d // len(self.major_names)
+            self.departments.append((base if copy == 0 else f"{base} {copy + 1}", f"Engineering Department {d + 1}"))
+            prefix = _prefix(d)
+            by_term: Dict[int, List[int]] = {}
+            numbers: Dict[int, int] = {}
+            remaining = min(cfg.courses_per_department, cfg.courses - len(self.courses))
+            for i in range(remaining):
+                term = min(i // per_term + 1, PLAN_SEMESTERS)
+                year = (term + 1) // 2
+                numbers[year] = numbers.get(year, 0) + 1
+                name, name_ar, desc, desc_ar = self.templates[int(rng.integers(len(self.templates)))]
+                suffix = f" {d + 1}-{i + 1}"
+                course = SyntheticCourse(
+                    code=f"{prefix}.{year}.{numbers[year]:02d}",
+                    name=name + suffix,
+                    name_ar=name_ar + suffix,
+                    credits=int(rng.choice([2, 3, 3, 3, 4])),
+                    department=d,
+                    plan_semester=term,
+                    hours_theory=int(rng.integers(1, 4)),
+                    hours_lab=int(rng.integers(0, 3)),
+                    difficulty_rating=round(float(rng.uniform(1.5, 4.5)), 1),
+                    description=desc.replace(name, name + suffix) if desc else f"Course {name}{suffix}.",
+                    description_ar=desc_ar.replace(name_ar, name_ar + suffix) if desc_ar else f"مقرر {name_ar}{suffix}.",
+                )
+                index = len(self.courses)
+
+                # Pick prerequisites from recent earlier terms | المتطلبات من فصول سابقة قريبة
+                pool: List[int] = []
+                weights: List[float] = []
+                for back, weight in ((1, 0.6), (2, 0.3), (3, 0.1)):
+                    candidates = by_term.get(term - back, [])
+                    pool.extend(candidates)
+                    weights.extend([weight / max(len(candidates), 1)] * len(candidates))
+                k = min(int(rng.poisson(cfg.mean_prerequisites)), cfg.max_prerequisites, len(pool))
+                if k:
+                    p = np.asarray(weights) / sum(weights)
+                    chosen = rng.choice(len(pool), size=k, replace=False, p=p)
+                    course.prerequisites = sorted(pool[j] for j in chosen)
+                    course.depth = 1 + max(self.courses[j].depth for j in course.prerequisites)
+                    for j in course.prerequisites:
+                        self.courses[j].dependents += 1
+
+                self.courses.append(course)
+                by_term.setdefault(term, []).append(index)
+
+            self.plans.append(self._study_plan(by_term))
+
+        self.stats['courses'] = len(self.courses)
+        self.stats['prerequisites'] = sum(len(c.prerequisites) for c in self.courses)
+        self.stats['majors'] = len(self.departments)
+        self.stats['max_depth'] = max((c.depth for c in self.courses), default=0)
+        logger.info(f"Generated {len(self.courses)} courses in {n_departments} departments "
+                    f"({self.stats['prerequisites']} prerequisites, max depth {self.stats['max_depth']})")
+        return self.courses
+
+    def _study_plan(self, by_term: Dict[int, List[int]]) -> List[int]:
+        """
+        A major's plan: courses per term, closed under prerequisites
+        خطة التخصص: مقررات لكل فصل مغلقة بالمتطلبات
+        """
+        chosen: set = set()
+        for term in sorted(by_term):
+            size = min(self.config.plan_courses_per_semester, len(by_term[term]))
+            chosen.update(int(i) for i in self.rng.choice(by_term[term], size=size, replace=False))
+        stack = list(chosen)
+        while stack:
+            for j in self.courses[stack.pop()].prerequisites:
+                if j not in chosen:
+                    chosen.add(j)
+                    stack.append(j)
+        return sorted(chosen, key=lambda i: (self.courses[i].plan_semester, i))
+
+    # -------------------------------------------------------------------------
+    # Students and records | الطلاب والسجلات
+    # -------------------------------------------------------------------------
+
+    def iter_students(self) -> Iterator[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+        """
+        Simulate students term by term | محاكاة الطلاب فصلاً بفصل
+
+        Each term a student registers for the next eligible plan courses
+        (failed ones first); marks depend on ability and course difficulty.
+        يسجل الطالب في كل فصل المقررات المؤهلة التالية، والراسبة أولاً.
+
+        Yields:
+            (student row, academic record rows) | صف الطالب وسجلاته
+        """
+        cfg = self.config
+        rng = self.rng
+        per_term = cfg.plan_courses_per_semester
+        for s in range(cfg.students):
+            d = s % len(self.departments)
+            major = self.departments[d][0]
+            plan = self.plans[d]
+            intake = cfg.start_year + int(rng.integers(0, 5))
+            terms = min(int(rng.integers(2, PLAN_SEMESTERS + 1)),
+                        (cfg.start_year + 5 - intake) * 2 + 2)
+            ability = float(rng.normal(0, 1))
+            profile = {
+                'baccalaureate_type': rng.choice(['علمي', 'علمي', 'صناعي']),
+                'baccalaureate_country': rng.choice(['سوريا', 'سوريا', 'سوريا', 'لبنان']),
+                'certificate_score': int(np.clip(200 + 20 * ability + rng.normal(0, 10), 150, 240)),
+                'has_ministry_scholarship': bool(rng.random() < 0.1),
+            }
+            profile['certificate_average'] = round(profile['certificate_score'] / 2.4, 2)
+            student_id = f"{1000000 + s}"  # 7 digits, unique | سبعة أرقام فريدة
+
+            passed: set = set()
+            failed: List[int] = []
+            points_sum = credits_sum = marks_sum = 0.0
+            completed = 0
+            warning: Optional[str] = None
+            records: List[Dict[str, Any]] = []
+            for t in range(terms):
+                year = intake + t // 2
+                term_name = SEMESTER_NAMES[t % 2]
+                eligible = [
+                    i for i in failed + [i for i in plan if i not in passed and i not in failed]
+                    if self.courses[i].plan_semester <= t + 2
+                    and all(p in passed for p in self.courses[i].prerequisites)
+                ][:per_term]
+                if not eligible:
+                    break
+                term_rows = []
+                noise = rng.normal(0, 9, size=len(eligible))
+                for i, eps in zip(eligible, noise):
+                    course = self.courses[i]
+                    mark = round(float(np.clip(
+                        72 + 9 * ability - 3 * (course.difficulty_rating - 3) + eps, 0, 100
+                    )), 1)
+                    letter, points = grade_letter(mark)
+                    points_sum += points * course.credits
+                    credits_sum += course.credits
+                    marks_sum += mark * course.credits
+                    if mark >= PASS_MARK:
+                        passed.add(i)
+                        completed += course.credits
+                        if i in failed:
+                            failed.remove(i)
+                    elif i not in failed:
+                        failed.append(i)
+                    term_rows.append((course, mark, letter, points))
+
+                gpa = round(points_sum / credits_sum, 2)
+                previous_warning = warning
+                warning = None if gpa >= 2.0 else ('إنذار أول' if previous_warning is None else 'إنذار ثاني')
+                registered = sum(c.credits for c, *_ in term_rows)
+                completed_term = sum(c.credits for c, mark, *_ in term_rows if mark >= PASS_MARK)
+                for course, mark, letter, points in term_rows:
+                    records.append({
+                        'student_id': student_id,
+                        'academic_year': f"{year}/{year + 1}",
+                        'semester': term_name,
+                        'course_code': course.code,
+                        'course_name': course.name_ar,
+                        'course_credits': course.credits,
+                        'final_grade': mark,
+                        'letter_grade': letter,
+                        'grade_points': points,
+                        'cumulative_gpa_points': gpa,
+                        'cumulative_gpa_percent': round(marks_sum / credits_sum, 2),
+                        'registered_hours_semester': registered,
+                        'completed_hours_semester': completed_term,
+                        'total_completed_hours': completed,
+                        'college': COLLEGE,
+                        'major': major,
+                        'study_mode': 'نظام ساعات',
+                        'permanent_status': 'مستمر',
+                        'semester_status': 'منتظم',
+                        'academic_warning': warning,
+                        'previous_academic_warning': previous_warning,
+                        'last_registration_semester': f"{term_name} {year}/{year + 1}",
+                        **profile,
+                    })
+
+            gpa = round(points_sum / credits_sum, 2) if credits_sum else 0.0
+            student = {
+                'user_id': str(uuid.UUID(bytes=rng.bytes(16), version=4)),
+                'student_id': student_id,
+                'department': self.departments[d][0],
+                'major': major,
+                'year_level': min(max(terms // 2, 1), 6),
+                'gpa': gpa,
+                'total_credits': completed,
+                'study_mode': 'نظام ساعات',
+                'academic_warning': warning,
+                'permanent_status': 'مستمر',
+                **profile,
+            }
+            yield student, records
+
+    # -------------------------------------------------------------------------
+    # Output | الإخراج
+    # -------------------------------------------------------------------------
+
+    def course_rows(self) -> Iterator[Dict[str, Any]]:
+        """courses.csv rows in CourseSeeder's format | صفوف ملف المقررات"""
+        for course in self.courses:
+            yield {
+                'code': course.code,
+                'name': course.name,
+                'name_ar': course.name_ar,
+                'credits': course.credits,
+                'department': self.departments[course.department][0],
+                'year_level': course.year_level,
+                'semester': SEMESTER_NAMES[(course.plan_semester + 1) % 2],
+                'hours_theory': course.hours_theory,
+                'hours_lab': course.hours_lab,
+                'description': course.description,
+                'description_ar': course.description_ar,
+                'prerequisites': ', '.join(self.courses[j].code for j in course.prerequisites),
+                'difficulty_rating': course.difficulty_rating,
+            }
+
+    def write_documents(self, directory: Path) -> int:
+        """
+        Write bilingual Markdown catalogs and study plans
+        كتابة كتالوجات وخطط دراسية ثنائية اللغة بصيغة Markdown
+
+        Returns:
+            Number of files written | عدد الملفات
+        """
+        directory.mkdir(parents=True, exist_ok=True)
+        written = 0
+        per_doc = self.config.courses_per_document
+        for d, (name_ar, name_en) in enumerate(self.departments):
+            members = [i for i in range(len(self.courses)) if self.courses[i].department == d]
+            for part in range(0, len(members), per_doc):
+                lines = [f"# {name_en} | {name_ar}\n"]
+                for i in members[part:part + per_doc]:
+                    c = self.courses[i]
+                    prereqs = ', '.join(self.courses[j].code for j in c.prerequisites) or '-'
+                    lines.append(
+                        f"## {c.code} {c.name} | {c.name_ar}\n\n"
+                        f"{c.description}\n\n{c.description_ar}\n\n"
+                        f"Credits | الساعات المعتمدة: {c.credits}. "
+                        f"Prerequisites | المتطلبات السابقة: {prereqs}.\n"
+                    )
+                (directory / f"{_prefix(d)}_catalog_{part // per_doc + 1:03d}.md").write_text(
+                    '\n'.join(lines), encoding='utf-8'
+                )
+                written += 1
+
+            plan_lines = [f"# Study Plan: {name_en} | الخطة الدراسية: {name_ar}\n"]
+            for term in range(1, PLAN_SEMESTERS + 1):
+                plan_lines.append(f"## Semester {term} | الفصل {term}\n")
+                plan_lines.extend(
+                    f"{self.courses[i].code}\t{self.courses[i].name}\t{self.courses[i].name_ar}\t{self.courses[i].credits}"
+                    for i in self.plans[d] if self.courses[i].plan_semester == term
+                )
+                plan_lines.append('')
+            (directory / f"{_prefix(d)}_study_plan.md").write_text('\n'.join(plan_lines), encoding='utf-8')
+            written += 1
+        return written
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Generate and write the full dataset | توليد البيانات وكتابتها
+
+        Returns:
+            Generation statistics | إحصائيات التوليد
+        """
+        start_time = datetime.now()
+        out = Path(self.config.output_dir)
+        out.mkdir(parents=True, exist_ok=True)
+
+        self.generate_courses()
+        _write_csv(out / 'courses.csv', COURSE_COLUMNS, self.course_rows())
+        _write_csv(out / 'majors.csv', ('name', 'name_en', 'total_credits', 'duration_years'), (
+            {'name': ar, 'name_en': en, 'duration_years': 5,
+             'total_credits': sum(self.courses[i].credits for i in self.plans[d])}
+            for d, (ar, en) in enumerate(self.departments)
+        ))
+
+        logger.info(f"Simulating {self.config.students} students | محاكاة {self.config.students} طالب")
+        with open(out / 'students.csv', 'w', encoding='utf-8', newline='') as sf, \
+                open(out / 'student_academic_records.csv', 'w', encoding='utf-8', newline='') as rf:
+            students = csv.DictWriter(sf, STUDENT_COLUMNS)
+            records = csv.DictWriter(rf, RECORD_COLUMNS)
+            students.writeheader()
+            records.writeheader()
+            for student, rows in self.iter_students():
+                students.writerow(student)
+                records.writerows(rows)
+                self.stats['students'] += 1
+                self.stats['academic_records'] += len(rows)
+
+        if self.config.documents:
+            self.stats['documents'] = self.write_documents(out / 'documents')
+
+        self.stats['seconds'] = round((datetime.now() - start_time).total_seconds(), 2)
+        manifest = {'config': asdict(self.config), 'stats': self.stats}
+        (out / 'manifest.json').write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding='utf-8')
+
+        logger.info("=" * 60)
+        logger.info("GENERATION COMPLETE | اكتمل التوليد")
+        for key, value in self.stats.items():
+            logger.info(f"{key}: {value}")
+        logger.info("=" * 60)
+        return self.stats
+
+
+def _write_csv(path: Path, columns: Tuple[str, ...], rows: Iterator[Dict[str, Any]]) -> None:
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, columns)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def generate_catalog(n: int, seed: int = 42, **kwargs) -> SyntheticDatasetGenerator:
+    """
+    Generate courses only, for benchmarks | توليد المقررات فقط للقياس
+
+    Args:
+        n: Number of courses | عدد المقررات
+        seed: Random seed | البذرة
+        **kwargs: Other SyntheticConfig fields | حقول الإعدادات الأخرى
+    """
+    generator = SyntheticDatasetGenerator(SyntheticConfig(courses=n, students=0, seed=seed, **kwargs))
+    generator.generate_courses()
+    return generator
+
+
+# =============================================================================
+# MAIN ENTRY POINT | نقطة الدخول الرئيسية
+# =============================================================================
+
+def main():
+    """
+    Main entry point | نقطة الدخول الرئيسية
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='IntelliPath synthetic dataset generator | مولد البيانات الاصطناعية'
+    )
+    parser.add_argument('output_dir', help='Output directory | مجلد الإخراج')
+    parser.add_argument('--courses', type=int, default=20000, help='Number of courses (default: 20000) | عدد المقررات')
+    parser.add_argument(
+        '--courses-per-department',
+        type=int,
+        default=400,
+        help='Courses per department, max 490 (default: 400) | مقررات لكل قسم'
+    )
+    parser.add_argument('--students', type=int, default=20000, help='Number of students (default: 20000) | عدد الطلاب')
+    parser.add_argument(
+        '--mean-prerequisites',
+        type=float,
+        default=1.4,
+        help='Mean prerequisites per course (default: 1.4) | متوسط المتطلبات'
+    )
+    parser.add_argument('--no-documents', action='store_true', help='Skip Markdown documents | تخطي المستندات')
+    parser.add_argument('--templates', help='Knowledge graph export used for names | مصدر قوالب الأسماء')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed (default: 42) | البذرة')
+
+    args = parser.parse_args()
+    setup_logging()
+
+    config = SyntheticConfig(
+        output_dir=args.output_dir,
+        courses=args.courses,
+        courses_per_department=args.courses_per_department,
+        students=args.students,
+        mean_prerequisites=args.mean_prerequisites,
+        documents=not args.no_documents,
+        template_source=args.templates,
+        seed=args.seed
+    )
+
+    try:
+        SyntheticDatasetGenerator(config).run()
+    except ValueError as e:
+        logger.error(str(e))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
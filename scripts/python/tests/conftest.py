@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+"""
+Pytest setup: scripts import their siblings directly
+إعداد pytest: السكربتات تستورد الوحدات المجاورة مباشرة
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
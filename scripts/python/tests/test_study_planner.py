@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+Study planner on a Supabase-shaped catalog | المخطط على كتالوج بصيغة Supabase
+"""
+
+from types import SimpleNamespace
+
+from course_catalog import CourseCatalog
+from study_planner import PlannerConfig, StudyPlanner, TERMS
+
+
+class FakeTable:
+    """Enough of the PostgREST query builder for _paginate | بديل منشئ الاستعلامات"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.filters = []
+        self.key = None
+        self.count = None
+
+    def select(self, columns):
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def gt(self, column, value):
+        self.filters.append(lambda row: row[column] > value)
+        return self
+
+    def order(self, column):
+        self.key = column
+        return self
+
+    def limit(self, count):
+        self.count = count
+        return self
+
+    def execute(self):
+        rows = sorted((r for r in self.rows if all(f(r) for f in self.filters)), key=lambda r: r[self.key])
+        return SimpleNamespace(data=[dict(r) for r in rows[:self.count]])
+
+
+class FakeSupabase:
+    def __init__(self, tables):
+        self.tables = tables
+
+    def table(self, name):
+        return FakeTable(self.tables.get(name, []))
+
+
+def course(id, code, year, semester, credits=3):
+    return {'id': id, 'code': code, 'name': code, 'credits': credits, 'year_level': year,
+            'semester': semester, 'is_active': True}
+
+
+def supabase_catalog():
+    first, second = TERMS
+    return CourseCatalog.from_supabase(FakeSupabase({
+        'courses': [
+            course('1', 'A101', 1, first),
+            course('2', 'A102', 1, second),
+            course('3', 'A201', 2, first),
+            course('4', 'A202', 2, second),
+        ],
+        'course_prerequisites': [
+            {'id': 'p1', 'course_id': '2', 'prerequisite_id': '1'},
+            {'id': 'p2', 'course_id': '3', 'prerequisite_id': '2'},
+            {'id': 'p3', 'course_id': '4', 'prerequisite_id': '3'},
+        ],
+    }), page_size=2)
+
+
+def test_supabase_term_names_become_plan_semesters():
+    catalog = supabase_catalog()
+    assert [catalog.courses[c].semester for c in ('A101', 'A102', 'A201', 'A202')] == [1, 2, 3, 4]
+
+
+def test_plan_respects_supabase_offerings():
+    planner = StudyPlanner(supabase_catalog(), PlannerConfig(total_credits=12))
+    plan = planner.plan([], start_term=0)
+    assert plan.semesters == [['A101'], ['A102'], ['A201'], ['A202']]
+    assert plan.terms == list(TERMS) * 2
+    assert plan.elapsed_terms == 4
+
+
+def test_off_term_wait_is_skipped_not_planned_empty():
+    # Starting in the second term, A101 (first term only) waits one term
+    planner = StudyPlanner(supabase_catalog(), PlannerConfig(total_credits=12))
+    plan = planner.plan([], start_term=1)
+    assert all(plan.semesters)
+    assert plan.semesters[0] == ['A101']
+    assert plan.terms[0] == TERMS[0]
+    assert plan.elapsed_terms == 5
+
+
+def test_supabase_major_links_limit_the_plan():
+    first, _ = TERMS
+    catalog = CourseCatalog.from_supabase(FakeSupabase({
+        'courses': [
+            course('1', 'GEN101', 1, first),
+            course('2', 'CS101', 1, first),
+            course('3', 'IT101', 1, first),
+        ],
+        'majors': [{'id': 'm1', 'name': 'CS'}, {'id': 'm2', 'name': 'IT'}],
+        'course_majors': [
+            {'id': 'l1', 'course_id': '1', 'major_id': 'm1'},
+            {'id': 'l2', 'course_id': '1', 'major_id': 'm2'},
+            {'id': 'l3', 'course_id': '2', 'major_id': 'm1'},
+            {'id': 'l4', 'course_id': '3', 'major_id': 'm2'},
+        ],
+    }), page_size=2)
+    assert [catalog.courses[c].major for c in ('GEN101', 'CS101', 'IT101')] == [None, 'CS', 'IT']
+
+    plan = StudyPlanner(catalog, PlannerConfig(total_credits=6)).plan([], major='CS')
+    assert sorted(sum(plan.semesters, [])) == ['CS101', 'GEN101']
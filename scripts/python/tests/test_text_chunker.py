@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+"""
+Chunk budgets in the text chunker | حدود القطع في مقسم النصوص
+"""
+
+import random
+
+from text_chunker import ChunkerConfig, TextChunker
+
+
+def test_paragraph_separator_counts_toward_budget():
+    chunker = TextChunker(ChunkerConfig(chunk_size=20, chunk_overlap=5))
+    chunks = chunker.split_text("Short one.\n\nAnother bit.\n\nThird para here.")
+    assert chunks == ["Short one.", "Another bit.", "Third para here."]
+
+
+def test_chunks_never_exceed_char_budget():
+    rng = random.Random(7)
+    words = ['كلمة', 'word', 'نص.', 'end.', 'سؤال؟', 'مرحباً،', '\n\n', '\n', 'a | b | c']
+    for size in (20, 50, 200):
+        chunker = TextChunker(ChunkerConfig(chunk_size=size, chunk_overlap=size // 4))
+        for _ in range(100):
+            text = ' '.join(rng.choice(words) for _ in range(200))
+            assert all(len(chunk) <= size for chunk in chunker.split_text(text))
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=============================================================================
+IntelliPath - Arabic-aware Text Chunker
+المرشد الأكاديمي الذكي - مقسم النصوص المراعي للغة العربية
+=============================================================================
+Splits document text into retrieval chunks. Sentence, line, paragraph and
+table-row boundaries are found in a single regex pass, then packed greedily
+to a character or token budget with overlap.
+يقسم نص المستندات إلى قطع للاسترجاع بمسح واحد بالتعابير النمطية
+ثم يجمع الوحدات بشكل جشع ضمن حد الأحرف أو الرموز مع التداخل.
+=============================================================================
+Version: 1.0.0 | الإصدار: 1.0.0
+Last Updated: 2026-10-19 | آخر تحديث: 2026-10-19
+=============================================================================
+"""
+
+import re
+import unicodedata
+from typing import Callable, Iterator, List, Tuple
+from dataclasses import dataclass
+
+
+# =============================================================================
+# PATTERNS | الأنماط
+# =============================================================================
+
+# Sentence terminators (Latin + Arabic) | علامات نهاية الجملة
+_TERMINATORS = ".!?؟؛۔…"
+
+# Marks that may trail a terminator: tatweel, harakat, closing quotes/brackets
+# علامات قد تلي نهاية الجملة: التطويل والحركات وعلامات الإغلاق
+_TRAILING = r"[\u0640\u064B-\u065F\u0670\"'»”’)\]]*"
+
+# Bidi control characters left behind by PDF extraction of RTL text
+# محارف التحكم باتجاه النص الناتجة عن استخراج نصوص PDF العربية
+_BIDI_RE = re.compile(r"[\u200E\u200F\u202A-\u202E\u2066-\u2069\uFEFF]")
+
+# Cell separator inside extracted study-plan tables | فاصل الخلايا في جداول الخطط
+_CELL = r"(?:\t|\||[ \u00A0]{2,})"
+
+# One pass over the text: paragraph breaks, line breaks, table rows, sentences
+# مسح واحد للنص: فواصل الفقرات والأسطر وصفوف الجداول والجمل
+_UNIT_RE = re.compile(
+    rf"""
+      (?P<para>\n[ \t]*\n\s*)
+    | (?P<line>\n)
+    | (?P<space>[ \t\u00A0]+)
+    | (?P<row>(?<![^\n])(?=[^\n]*?\S{_CELL}[^\n]*?\S{_CELL}\S)[^\n]+)
+    | (?P<sentence>
+        (?:[^\n{_TERMINATORS}]|[{_TERMINATORS}](?!{_TRAILING}(?:\s|\Z)))+
+        (?:[{_TERMINATORS}]+{_TRAILING})?
+        | [{_TERMINATORS}]+{_TRAILING}
+      )
+    """,
+    re.VERBOSE,
+)
+
+# Secondary split points for oversized sentences (Arabic comma included)
+# نقاط تقسيم ثانوية للجمل الطويلة (بما فيها الفاصلة العربية)
+_CLAUSE_RE = re.compile(r"(?<=[،,;:])\s+")
+
+# Token estimate: words and standalone punctuation | تقدير الرموز: الكلمات وعلامات الترقيم
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+_SEPARATORS = {'para': '\n\n', 'line': '\n', 'space': ' '}
+
+
+def count_tokens(text: str) -> int:
+    """Approximate token count | عدد تقريبي للرموز"""
+    return sum(1 for _ in _TOKEN_RE.finditer(text))
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize extracted text | تطبيع النص المستخرج
+    Folds Arabic presentation forms (NFKC), drops bidi controls and
+    unifies line endings.
+    يحول أشكال العرض العربية ويزيل محارف الاتجاه ويوحد نهايات الأسطر.
+    """
+    text = unicodedata.normalize('NFKC', text)
+    text = _BIDI_RE.sub('', text)
+    return text.replace('\r\n', '\n').replace('\r', '\n')
+
+
+# =============================================================================
+# CHUNKER | المقسم
+# =============================================================================
+
+@dataclass
+class ChunkerConfig:
+    """
+    Configuration for the chunker | إعدادات المقسم
+    """
+    chunk_size: int = 1000  # Budget per chunk | الحد لكل قطعة
+    chunk_overlap: int = 200  # Overlap between chunks | التداخل بين القطع
+    length_unit: str = "chars"  # 'chars' or 'tokens' | وحدة القياس
+    normalize: bool = True  # Apply normalize_text first | تطبيع النص أولاً
+
+
+class TextChunker:
+    """
+    Greedy sentence/table-aware chunker
+    مقسم جشع يراعي الجمل والجداول
+    """
+
+    def __init__(self, config: ChunkerConfig):
+        """
+        Initialize the chunker | تهيئة المقسم
+
+        Args:
+            config: Chunker configuration | إعدادات المقسم
+        """
+        if config.chunk_overlap >= config.chunk_size:
+            raise ValueError("chunk_overlap must be smaller than chunk_size")
+        if config.length_unit not in ('chars', 'tokens'):
+            raise ValueError(f"Unknown length unit: {config.length_unit}")
+
+        self.config = config
+        self.length_function: Callable[[str], int] = (
+            len if config.length_unit == 'chars' else count_tokens
+        )
+        # Separator cost: its length in chars, tokens ignore whitespace
+        # تكلفة الفاصل: طوله بالأحرف، والرموز تتجاهل المسافات
+        self._sep_cost: Callable[[str], int] = (
+            len if config.length_unit == 'chars' else (lambda sep: 0)
+        )
+
+    def iter_units(self, text: str) -> Iterator[Tuple[str, str]]:
+        """
+        Yield (separator, unit) pairs in document order
+        إرجاع أزواج (الفاصل، الوحدة) بترتيب المستند
+
+        Args:
+            text: Document text | نص المستند
+        """
+        pending = ''
+        for match in _UNIT_RE.finditer(text):
+            kind = match.lastgroup
+            if kind in _SEPARATORS:
+                # Strongest break wins | الفاصل الأقوى هو المعتمد
+                sep = _SEPARATORS[kind]
+                if len(sep) > len(pending) or (sep == '\n' and pending == ' '):
+                    pending = sep
+                continue
+            unit = match.group().strip()
+            if unit:
+                if kind == 'row' and pending == ' ':
+                    pending = '\n'
+                yield pending, unit
+                pending = ''
+
+    def _split_oversized(self, unit: str) -> List[str]:
+        """
+        Break a unit longer than the budget at clauses, then words
+        تقسيم وحدة أطول من الحد عند الفواصل ثم الكلمات
+        """
+        size = self.config.chunk_size
+        pieces: List[str] = []
+        for clause in _CLAUSE_RE.split(unit):
+            if self.length_function(clause) <= size:
+                pieces.append(clause)
+                continue
+            current = ''
+            for word in clause.split():
+                candidate = f"{current} {word}" if current else word
+                if self.length_function(candidate) <= size:
+                    current = candidate
+                    continue
+                if current:
+                    pieces.append(current)
+                # Hard-slice words longer than the budget | قطع الكلمات الأطول من الحد
+                while self.length_function(word) > size:
+                    pieces.append(word[:size])
+                    word = word[size:]
+                current = word
+            if current:
+                pieces.append(current)
+        return pieces
+
+    def split_text(self, text: str) -> List[str]:
+        """
+        Split text into chunks | تقسيم النص إلى قطع
+
+        Args:
+            text: Document text | نص المستند
+
+        Returns:
+            List of chunk strings | قائمة نصوص القطع
+        """
+        if self.config.normalize:
+            text = normalize_text(text)
+
+        size = self.config.chunk_size
+        overlap = self.config.chunk_overlap
+        measure = self.length_function
+        sep_cost = self._sep_cost
+
+        chunks: List[str] = []
+        # Current window of (separator, unit, length) | النافذة الحالية
+        window: List[Tuple[str, str, int]] = []
+        window_len = 0
+
+        def emit() -> None:
+            parts = [window[0][1]]
+            parts.extend(sep + unit for sep, unit, _ in window[1:])
+            chunks.append(''.join(parts))
+
+        for sep, unit in self.iter_units(text):
+            unit_len = measure(unit)
+            units = [(sep, unit, unit_len)]
+            if unit_len > size:
+                units = [
+                    (sep if i == 0 else ' ', piece, measure(piece))
+                    for i, piece in enumerate(self._split_oversized(unit))
+                ]
+
+            for u_sep, u_text, u_len in units:
+                added = u_len + (sep_cost(u_sep) if window else 0)
+                if window and window_len + added > size:
+                    emit()
+                    # Carry trailing units as overlap | نقل الوحدات الأخيرة كتداخل
+                    carried: List[Tuple[str, str, int]] = []
+                    carried_len = 0
+                    for item in reversed(window):
+                        # Joined to the carried head by the head's separator | يتصل بفاصل رأس المنقول
+                        item_len = item[2] + (sep_cost(carried[0][0]) if carried else 0)
+                        if carried_len + item_len > overlap:
+                            break
+                        if carried_len + item_len + sep_cost(u_sep) + u_len > size:
+                            break
+                        carried.insert(0, item)
+                        carried_len += item_len
+                    window = carried
+                    window_len = carried_len
+                    added = u_len + (sep_cost(u_sep) if window else 0)
+                window.append((u_sep, u_text, u_len))
+                window_len += added
+
+        if window:
+            emit()
+        return chunks
@@ -6,8 +6,10 @@ IntelliPath - Vector Embedding Generator
 المرشد الأكاديمي الذكي - مولد التضمينات المتجهية
 =============================================================================
 This script processes documents (PDFs, etc.), generates embeddings, and 
-uploads them to Qdrant vector database for RAG retrieval.
-هذا السكريبت يعالج المستندات ويولد التضمينات ويرفعها إلى قاعدة Qdrant.
+uploads them to Qdrant vector database for RAG retrieval. The Supabase
+courses table is indexed into its own collection for semantic course lookup.
+هذا السكريبت يعالج المستندات ويولد التضمينات ويرفعها إلى قاعدة Qdrant،
+ويفهرس جدول المقررات في مجموعة مستقلة للبحث الدلالي عن المقررات.
 =============================================================================
 Version: 1.0.0 | الإصدار: 1.0.0
 Last Updated: 2026-01-02 | آخر تحديث: 2026-01-02
@@ -19,41 +21,30 @@ import sys
 import json
 import hashlib
 import logging
-from typing import List, Dict, Any, Optional, Iterator
+import sqlite3
+import time
+import threading
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import List, Dict, Any, Optional, Iterator, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 import uuid
 
-# Third-party imports | المكتبات الخارجية
-try:
-    from langchain.text_splitter import RecursiveCharacterTextSplitter
-    from langchain_community.document_loaders import PyPDFLoader, DirectoryLoader
-    from langchain.schema import Document
-    import openai
-    from qdrant_client import QdrantClient
-    from qdrant_client.http import models
-    from dotenv import load_dotenv
-except ImportError as e:
-    print(f"Missing required package: {e}")
-    print("Install with: pip install langchain langchain-community pypdf openai qdrant-client python-dotenv")
-    sys.exit(1)
-
-# Load environment variables | تحميل متغيرات البيئة
-load_dotenv()
+from text_chunker import TextChunker, ChunkerConfig
+from document_loaders import DocumentLoader, LoaderConfig, PageDocument
+from ingest_journal import IngestJournal
+from reranker import CrossEncoderReranker, RerankerConfig
+from instrumentation import Instrumentation, add_instrumentation_arguments, instrumented_run
+from settings import Clients, Settings, SettingsError, lazy_import, load_settings, setup_logging
+from course_catalog import CourseCatalog, COURSE_CODE_RE, DEFAULT_KNOWLEDGE_GRAPH, _paginate, load_catalog
 
-# =============================================================================
-# LOGGING CONFIGURATION | إعداد التسجيل
-# =============================================================================
+# Third-party imports load on first use | المكتبات الخارجية تحمل عند أول استخدام
+np = lazy_import('numpy')
+models = lazy_import('qdrant_client.http.models', 'qdrant-client')
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler('embedding_generator.log', encoding='utf-8')
-    ]
-)
+# Logging is configured by the entry point | يُعد التسجيل من نقطة الدخول
 logger = logging.getLogger(__name__)
 
 
@@ -69,19 +60,86 @@ class EmbeddingConfig:
     # OpenAI settings | إعدادات OpenAI
     openai_api_key: str  # OpenAI API key | مفتاح API OpenAI
     embedding_model: str = "text-embedding-3-small"  # Embedding model | نموذج التضمين
+    dimensions: Optional[int] = None  # Reduced output size (text-embedding-3-*) | البعد المخفض
+    
+    # Vector store settings | إعدادات مخزن المتجهات
+    vector_backend: str = "qdrant"  # 'qdrant' or 'local' | الخلفية
+    local_index_path: str = ".cache/vector_index"  # Local store directory | مجلد المخزن المحلي
+    local_dtype: str = "float32"  # 'float32' or 'int8' | نوع التخزين المحلي
+    local_index_type: str = "exact"  # 'exact' or 'ivf' | نوع الفهرس المحلي
     
     # Qdrant settings | إعدادات Qdrant
     qdrant_url: str = "http://localhost:6333"  # Qdrant URL | رابط Qdrant
     qdrant_api_key: Optional[str] = None  # Qdrant API key | مفتاح Qdrant
     collection_name: str = "intellipath_documents"  # Collection name | اسم المجموعة
+    prefer_grpc: bool = False  # Use gRPC (port 6334) for uploads | استخدام gRPC للرفع
+    qdrant_timeout: Optional[int] = None  # Request timeout in seconds | مهلة الطلب بالثواني
+    
+    # Upload settings | إعدادات الرفع
+    upload_mode: str = "upsert"  # 'upsert' (per batch) or 'bulk' (parallel) | نمط الرفع
+    upload_parallel: int = 4  # Parallel upload workers in bulk mode | عمال الرفع المتوازي
+    bulk_buffer_size: int = 10000  # Points buffered per bulk upload | النقاط لكل رفع مجمع
+    defer_indexing: bool = False  # Disable HNSW indexing during bulk load | تأجيل الفهرسة أثناء التحميل
+    consistency_timeout: int = 600  # Seconds to wait for a green collection | مهلة انتظار جاهزية المجموعة
     
     # Chunking settings | إعدادات التقطيع
     chunk_size: int = 1000  # Characters per chunk | الأحرف لكل قطعة
     chunk_overlap: int = 200  # Overlap between chunks | التداخل بين القطع
+    chunk_unit: str = "chars"  # 'chars' or 'tokens' | وحدة قياس القطعة
     
     # Processing settings | إعدادات المعالجة
     batch_size: int = 100  # Batch size for uploads | حجم الدفعة للرفع
     vector_size: int = 1536  # Embedding dimension | بُعد التضمين
+    
+    # Loading settings | إعدادات التحميل
+    page_cache_path: Optional[str] = ".cache/page_text.sqlite"  # Page text cache | ذاكرة نصوص الصفحات
+    enable_ocr: bool = False  # OCR plan images | التعرف الضوئي لصور الخطط
+    ocr_workers: int = 2  # OCR worker processes | عمليات التعرف الضوئي
+    
+    # Checkpoint settings | إعدادات نقاط الاستئناف
+    journal_path: Optional[str] = ".cache/ingest_journal.sqlite"  # Checkpoint journal | سجل الاستئناف
+    
+    # Reranking settings | إعدادات إعادة الترتيب
+    rerank: bool = False  # Cross-encoder rerank in search() | إعادة ترتيب نتائج البحث
+    rerank_candidates: int = 50  # Candidates fetched before reranking | المرشحون قبل إعادة الترتيب
+    rerank_model: str = "cross-encoder/mmarco-mMiniLMv2-L12-H384-v1"  # Cross-encoder | المشفر المتقاطع
+    rerank_backend: str = "onnx"  # 'onnx' or 'torch' | محرك التشغيل
+    rerank_threads: int = 4  # CPU threads for the cross-encoder | خيوط المعالج
+    
+    # Enrichment settings | إعدادات الإثراء
+    catalog_source: Optional[str] = str(DEFAULT_KNOWLEDGE_GRAPH)  # Export path or 'supabase' | مصدر الكتالوج
+
+
+# Payload indexes used by filtered search (PayloadSchemaType values)
+# فهارس الحمولة للبحث المفلتر
+PAYLOAD_INDEXES = {
+    'source_type': 'keyword',
+    'source_file': 'keyword',
+    'department': 'keyword',
+    'course_code': 'keyword',
+    'course_codes': 'keyword',
+    'major': 'keyword',
+    'majors': 'keyword',
+    # Integer indexes serve both exact and range conditions
+    # الفهارس الصحيحة تخدم المطابقة والنطاق
+    'year_levels': 'integer',
+    'year_level_min': 'integer',
+    'year_level_max': 'integer',
+}
+
+# Course catalog collection and its payload indexes | مجموعة كتالوج المقررات وفهارسها
+COURSE_COLLECTION = 'intellipath_courses'
+COURSE_PAYLOAD_INDEXES = {
+    'course_code': 'keyword',
+    'department': 'keyword',
+    'year_level': 'integer',
+}
+
+# Columns read from the courses table | الأعمدة المقروءة من جدول المقررات
+COURSE_COLUMNS = (
+    'code, name, name_ar, description, description_ar, objectives_en, objectives_ar, '
+    'department, year_level, credits, semester, updated_at'
+)
 
 
 @dataclass
@@ -95,6 +153,493 @@ class DocumentChunk:
     embedding: Optional[List[float]] = None  # Vector embedding | التضمين المتجهي
 
 
+# =============================================================================
+# LOCAL VECTOR STORE | مخزن المتجهات المحلي
+# =============================================================================
+
+class LocalCollection:
+    """
+    One on-disk collection: memory-mapped vector matrix, SQLite payloads and
+    an optional IVF (inverted file) approximate index
+    مجموعة محلية: مصفوفة متجهات مربوطة بالذاكرة وحمولات SQLite وفهرس IVF اختياري
+    """
+    
+    def __init__(self, path: Path, dim: Optional[int] = None, dtype: str = 'float32',
+                 index_type: str = 'exact', ivf_lists: int = 0, ivf_probes: int = 8):
+        """
+        Open or create a collection | فتح مجموعة أو إنشاؤها
+        
+        Args:
+            path: Collection directory | مجلد المجموعة
+            dim: Vector size (required when creating) | بُعد المتجه
+            dtype: 'float32' or 'int8' storage | نوع التخزين
+            index_type: 'exact' or 'ivf' | نوع الفهرس
+            ivf_lists: IVF centroids (0 = sqrt(n)) | عدد مراكز IVF
+            ivf_probes: Lists scanned per query | القوائم الممسوحة لكل استعلام
+        """
+        self.path = path
+        meta_file = path / 'meta.json'
+        if meta_file.exists():
+            self.meta = json.loads(meta_file.read_text())
+        else:
+            if dim is None:
+                raise ValueError(f"Collection not found: {path.name}")
+            path.mkdir(parents=True, exist_ok=True)
+            self.meta = {
+                'dim': dim, 'dtype': dtype, 'count': 0, 'capacity': 0,
+                'index_type': index_type, 'ivf_lists': ivf_lists, 'ivf_probes': ivf_probes,
+                'ivf_trained_at': 0, 'payload_schema': {},
+            }
+        self.dim = self.meta['dim']
+        self.dtype = np.int8 if self.meta['dtype'] == 'int8' else np.float32
+        
+        # Payloads and ids | الحمولات والمعرفات
+        self.db = sqlite3.connect(str(path / 'points.sqlite'))
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS points (row INTEGER PRIMARY KEY, id TEXT UNIQUE, payload TEXT)"
+        )
+        self.ids: List[Optional[str]] = [None] * self.meta['count']
+        self.payloads: List[Optional[Dict[str, Any]]] = [None] * self.meta['count']
+        for row, point_id, payload in self.db.execute("SELECT row, id, payload FROM points"):
+            self.ids[row] = point_id
+            self.payloads[row] = json.loads(payload)
+        self.rows = {point_id: row for row, point_id in enumerate(self.ids) if point_id is not None}
+        
+        self.vectors = self._open_matrix('vectors.npy')
+        self.assign = self._open_matrix('ivf_assign.npy')
+        centroids_file = path / 'ivf_centroids.npy'
+        self.centroids = np.load(centroids_file) if centroids_file.exists() else None
+        
+        self._live: Optional[np.ndarray] = None
+        
+        # Inverted indexes for indexed keyword/integer fields | فهارس معكوسة
+        self.inverted: Dict[str, Dict[Any, set]] = {}
+        for field_name in self.meta['payload_schema']:
+            self._build_inverted(field_name)
+    
+    def _open_matrix(self, name: str) -> Optional['np.ndarray']:
+        file = self.path / name
+        if not file.exists():
+            return None
+        return np.lib.format.open_memmap(str(file), mode='r+')
+    
+    def _grow(self, needed: int) -> None:
+        """Double the memory-mapped capacity | مضاعفة السعة"""
+        capacity = max(self.meta['capacity'], 1024)
+        while capacity < needed:
+            capacity *= 2
+        if capacity == self.meta['capacity'] and self.vectors is not None:
+            return
+        count = self.meta['count']
+        for name, attr, tail, dtype, fill in (
+            ('vectors.npy', 'vectors', (self.dim,), self.dtype, 0),
+            ('ivf_assign.npy', 'assign', (), np.int32, -1),
+        ):
+            tmp = self.path / f"{name}.tmp"
+            grown = np.lib.format.open_memmap(str(tmp), mode='w+', dtype=dtype, shape=(capacity, *tail))
+            grown[:] = fill
+            old = getattr(self, attr)
+            if old is not None and count:
+                grown[:count] = old[:count]
+            grown.flush()
+            del grown
+            setattr(self, attr, None)
+            del old
+            os.replace(tmp, self.path / name)
+            setattr(self, attr, np.lib.format.open_memmap(str(self.path / name), mode='r+'))
+        self.meta['capacity'] = capacity
+    
+    def _encode(self, vectors: 'np.ndarray') -> 'np.ndarray':
+        """Normalize (cosine) and quantize | التطبيع والتكميم"""
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.maximum(norms, 1e-12)
+        if self.dtype == np.int8:
+            return np.clip(np.rint(vectors * 127), -127, 127).astype(np.int8)
+        return vectors.astype(np.float32)
+    
+    def _scores(self, rows: Optional['np.ndarray'], query: 'np.ndarray') -> 'np.ndarray':
+        count = self.meta['count']
+        block = self.vectors[:count] if rows is None else self.vectors[rows]
+        if self.dtype == np.int8:
+            return (block.astype(np.float32) @ query) / 127.0
+        return block @ query
+    
+    # -------------------------------------------------------------------------
+    # Payload indexes and filters | فهارس الحمولة والفلاتر
+    # -------------------------------------------------------------------------
+    
+    @staticmethod
+    def _values(payload: Dict[str, Any], key: str) -> List[Any]:
+        value: Any = payload
+        for part in key.split('.'):
+            value = value.get(part) if isinstance(value, dict) else None
+        if value is None:
+            return []
+        return value if isinstance(value, list) else [value]
+    
+    def _build_inverted(self, field_name: str) -> None:
+        index: Dict[Any, set] = {}
+        for row, payload in enumerate(self.payloads):
+            if payload is not None:
+                for value in self._values(payload, field_name):
+                    index.setdefault(value, set()).add(row)
+        self.inverted[field_name] = index
+    
+    def _index_row(self, row: int, payload: Dict[str, Any], add: bool) -> None:
+        for field_name, index in self.inverted.items():
+            for value in self._values(payload, field_name):
+                if add:
+                    index.setdefault(value, set()).add(row)
+                else:
+                    index.get(value, set()).discard(row)
+    
+    def create_payload_index(self, field_name: str, schema: str) -> None:
+        self.meta['payload_schema'][field_name] = schema
+        self._build_inverted(field_name)
+        self._save_meta()
+    
+    def _condition(self, payload: Dict[str, Any], point_id: str, cond: Any) -> bool:
+        if isinstance(cond, models.Filter):
+            return self._evaluate(payload, point_id, cond)
+        if isinstance(cond, models.HasIdCondition):
+            return point_id in {str(i) for i in cond.has_id}
+        values = self._values(payload, cond.key)
+        if cond.match is not None:
+            match = cond.match
+            if isinstance(match, models.MatchValue):
+                return match.value in values
+            if isinstance(match, models.MatchAny):
+                return any(v in match.any for v in values)
+            if isinstance(match, models.MatchText):
+                return any(match.text in str(v) for v in values)
+            if isinstance(match, models.MatchExcept):
+                return not any(v in match.except_ for v in values)
+        if cond.range is not None:
+            r = cond.range
+            return any(
+                isinstance(v, (int, float))
+                and (r.gt is None or v > r.gt) and (r.gte is None or v >= r.gte)
+                and (r.lt is None or v < r.lt) and (r.lte is None or v <= r.lte)
+                for v in values
+            )
+        return False
+    
+    def _evaluate(self, payload: Dict[str, Any], point_id: str, flt: 'models.Filter') -> bool:
+        if flt.must and not all(self._condition(payload, point_id, c) for c in flt.must):
+            return False
+        if flt.should and not any(self._condition(payload, point_id, c) for c in flt.should):
+            return False
+        if flt.must_not and any(self._condition(payload, point_id, c) for c in flt.must_not):
+            return False
+        return True
+    
+    def filter_rows(self, flt: Optional['models.Filter']) -> 'np.ndarray':
+        """
+        Live rows matching a filter | الصفوف الحية المطابقة للفلتر
+        Indexed keyword matches in `must` narrow candidates through the
+        inverted index before the remaining conditions are checked.
+        تُضيّق المطابقات المفهرسة المرشحين قبل فحص بقية الشروط.
+        """
+        candidates: Optional[set] = None
+        # True while every condition has been answered by an index
+        # صحيح طالما أُجيبت جميع الشروط من الفهارس
+        fully_indexed = flt is not None and not flt.should and not flt.must_not
+        if flt is not None:
+            for cond in flt.must or []:
+                if not isinstance(cond, models.FieldCondition) or cond.key not in self.inverted:
+                    fully_indexed = False
+                    continue
+                index = self.inverted[cond.key]
+                if isinstance(cond.match, models.MatchValue):
+                    hits = index.get(cond.match.value, set())
+                elif isinstance(cond.match, models.MatchAny):
+                    hits = set().union(*(index.get(v, set()) for v in cond.match.any))
+                elif cond.range is not None:
+                    hits = set().union(*(
+                        rows for value, rows in index.items()
+                        if self._condition({cond.key: value}, '', cond)
+                    ))
+                else:
+                    fully_indexed = False
+                    continue
+                candidates = hits if candidates is None else candidates & hits
+        
+        if candidates is None:
+            if flt is None:
+                return self.live_rows()
+            rows = range(self.meta['count'])
+        else:
+            rows = sorted(candidates)
+            if fully_indexed:
+                return np.fromiter(rows, dtype=np.int64, count=len(rows))
+        return np.fromiter(
+            (
+                row for row in rows
+                if self.ids[row] is not None
+                and self._evaluate(self.payloads[row], self.ids[row], flt)
+            ),
+            dtype=np.int64
+        )
+    
+    def live_rows(self) -> 'np.ndarray':
+        """Rows not deleted (cached until the next write) | الصفوف غير المحذوفة"""
+        if self._live is None:
+            self._live = np.fromiter(
+                (row for row, point_id in enumerate(self.ids) if point_id is not None),
+                dtype=np.int64
+            )
+        return self._live
+    
+    # -------------------------------------------------------------------------
+    # Writes | الكتابة
+    # -------------------------------------------------------------------------
+    
+    def upsert(self, points: List['models.PointStruct']) -> None:
+        """Insert or replace points | إدراج النقاط أو استبدالها"""
+        if not points:
+            return
+        new_ids = [str(p.id) for p in points if str(p.id) not in self.rows]
+        self._grow(self.meta['count'] + len(new_ids))
+        
+        encoded = self._encode(np.asarray([p.vector for p in points], dtype=np.float32))
+        rows = []
+        for point, vector in zip(points, encoded):
+            point_id = str(point.id)
+            row = self.rows.get(point_id)
+            if row is None:
+                row = self.meta['count']
+                self.meta['count'] += 1
+                self.ids.append(point_id)
+                self.payloads.append(None)
+                self.rows[point_id] = row
+            elif self.payloads[row] is not None:
+                self._index_row(row, self.payloads[row], add=False)
+            payload = point.payload or {}
+            self.vectors[row] = vector
+            self.payloads[row] = payload
+            self.ids[row] = point_id
+            self._index_row(row, payload, add=True)
+            rows.append(row)
+        
+        self.db.executemany(
+            "INSERT OR REPLACE INTO points (row, id, payload) VALUES (?, ?, ?)",
+            [(row, self.ids[row], json.dumps(self.payloads[row], ensure_ascii=False, default=str))
+             for row in rows]
+        )
+        if self.centroids is not None:
+            self.assign[rows] = self._nearest_lists(self.vectors[rows], 1)[:, 0]
+        self._flush()
+    
+    def delete(self, flt: Optional['models.Filter'] = None, ids: Optional[List[str]] = None) -> int:
+        """
+        Delete by filter or id list (tombstones rows) | الحذف بالفلتر أو المعرفات
+        
+        Returns:
+            Number of points deleted | عدد النقاط المحذوفة
+        """
+        if ids is not None:
+            rows = [self.rows[str(i)] for i in ids if str(i) in self.rows]
+        else:
+            rows = self.filter_rows(flt).tolist()
+        for row in rows:
+            self._index_row(row, self.payloads[row], add=False)
+            del self.rows[self.ids[row]]
+            self.ids[row] = None
+            self.payloads[row] = None
+        self.db.executemany("DELETE FROM points WHERE row = ?", [(row,) for row in rows])
+        if self.assign is not None and rows:
+            self.assign[rows] = -1
+        self._flush()
+        return len(rows)
+    
+    def _flush(self) -> None:
+        self._live = None
+        if self.vectors is not None:
+            self.vectors.flush()
+            self.assign.flush()
+        self.db.commit()
+        self._save_meta()
+    
+    def _save_meta(self) -> None:
+        (self.path / 'meta.json').write_text(json.dumps(self.meta))
+    
+    # -------------------------------------------------------------------------
+    # IVF index | فهرس IVF
+    # -------------------------------------------------------------------------
+    
+    def _nearest_lists(self, vectors: 'np.ndarray', probes: int) -> 'np.ndarray':
+        block = vectors.astype(np.float32)
+        sims = block @ self.centroids.T
+        probes = min(probes, len(self.centroids))
+        return np.argpartition(-sims, probes - 1, axis=1)[:, :probes]
+    
+    def train_ivf(self, iterations: int = 10, sample: int = 50000, seed: int = 0) -> None:
+        """
+        Train IVF centroids with spherical k-means | تدريب مراكز IVF
+        """
+        live = self.live_rows()
+        if len(live) == 0:
+            return
+        rng = np.random.default_rng(seed)
+        nlist = self.meta['ivf_lists'] or max(1, int(np.sqrt(len(live))))
+        nlist = min(nlist, len(live))
+        train_rows = np.sort(rng.choice(live, size=min(sample, len(live)), replace=False))
+        data = self.vectors[train_rows].astype(np.float32)
+        if self.dtype == np.int8:
+            data /= 127.0
+        centroids = data[rng.choice(len(data), size=nlist, replace=False)]
+        for _ in range(iterations):
+            labels = np.argmax(data @ centroids.T, axis=1)
+            for k in range(nlist):
+                members = data[labels == k]
+                if len(members):
+                    c = members.sum(axis=0)
+                    centroids[k] = c / max(np.linalg.norm(c), 1e-12)
+        self.centroids = centroids
+        np.save(self.path / 'ivf_centroids.npy', centroids)
+        for start in range(0, len(live), 65536):
+            rows = live[start:start + 65536]
+            self.assign[rows] = self._nearest_lists(self.vectors[rows], 1)[:, 0]
+        self.meta['ivf_trained_at'] = len(live)
+        self._flush()
+        logger.info(f"Trained IVF index: {nlist} lists over {len(live)} vectors | تم تدريب فهرس IVF")
+    
+    # -------------------------------------------------------------------------
+    # Reads | القراءة
+    # -------------------------------------------------------------------------
+    
+    def live_count(self) -> int:
+        return len(self.rows)
+    
+    def search(self, query: List[float], limit: int, flt: Optional['models.Filter'] = None,
+               exact_threshold: int = 20000) -> List[Tuple[int, float]]:
+        """
+        Filtered top-k by cosine similarity | أفضل k نتائج مع الفلترة
+        
+        Uses the exact path when the (filtered) candidate set is small or no
+        IVF index is trained; otherwise scans the nearest IVF lists.
+        يستخدم المسار الدقيق للمجموعات الصغيرة وإلا يمسح أقرب قوائم IVF.
+        
+        Returns:
+            (row, score) pairs, best first | أزواج (الصف، الدرجة)
+        """
+        if self.meta['count'] == 0:
+            return []
+        q = np.asarray(query, dtype=np.float32)
+        q = q / max(float(np.linalg.norm(q)), 1e-12)
+        
+        rows: Optional[np.ndarray] = None
+        if flt is not None:
+            rows = self.filter_rows(flt)
+        elif len(self.rows) < self.meta['count']:
+            # Skip tombstoned rows | تخطي الصفوف المحذوفة
+            rows = self.live_rows()
+        
+        use_ivf = (
+            self.meta['index_type'] == 'ivf'
+            and (rows is None or len(rows) > exact_threshold)
+            and len(self.rows) > exact_threshold
+        )
+        if use_ivf:
+            # Retrain when the collection has grown 4x | إعادة التدريب عند النمو
+            if self.centroids is None or len(self.rows) > 4 * self.meta['ivf_trained_at']:
+                self.train_ivf()
+            lists = self._nearest_lists(q[None, :], self.meta['ivf_probes'])[0]
+            probed = np.flatnonzero(np.isin(self.assign[:self.meta['count']], lists))
+            rows = probed if rows is None else np.intersect1d(rows, probed, assume_unique=True)
+        
+        if rows is not None and len(rows) == 0:
+            return []
+        scores = self._scores(rows, q)
+        k = min(limit, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        result_rows = top if rows is None else rows[top]
+        return [(int(r), float(scores[t])) for r, t in zip(result_rows, top)]
+
+
+class LocalVectorStore:
+    """
+    In-process stand-in for the QdrantClient calls the generator makes
+    بديل داخل العملية لاستدعاءات QdrantClient التي يستخدمها المولد
+    """
+    
+    def __init__(self, path: str, dtype: str = 'float32', index_type: str = 'exact',
+                 ivf_lists: int = 0, ivf_probes: int = 8):
+        """
+        Open the store | فتح المخزن
+        
+        Args:
+            path: Root directory for collections | المجلد الجذر للمجموعات
+            dtype: 'float32' or 'int8' | نوع التخزين
+            index_type: 'exact' or 'ivf' | نوع الفهرس
+            ivf_lists: IVF centroids (0 = sqrt(n)) | عدد مراكز IVF
+            ivf_probes: Lists scanned per query | القوائم الممسوحة لكل استعلام
+        """
+        self.root = Path(path)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.options = dict(dtype=dtype, index_type=index_type, ivf_lists=ivf_lists, ivf_probes=ivf_probes)
+        self._collections: Dict[str, LocalCollection] = {}
+    
+    def _collection(self, name: str) -> LocalCollection:
+        if name not in self._collections:
+            self._collections[name] = LocalCollection(self.root / name)
+        return self._collections[name]
+    
+    def get_collections(self) -> 'models.CollectionsResponse':
+        return models.CollectionsResponse(collections=[
+            models.CollectionDescription(name=p.name)
+            for p in sorted(self.root.iterdir()) if (p / 'meta.json').exists()
+        ])
+    
+    def get_collection(self, collection_name: str) -> Any:
+        collection = self._collection(collection_name)
+        return SimpleNamespace(
+            status=models.CollectionStatus.GREEN,
+            config=SimpleNamespace(params=SimpleNamespace(
+                vectors=models.VectorParams(size=collection.dim, distance=models.Distance.COSINE)
+            )),
+            payload_schema=dict(collection.meta['payload_schema']),
+            points_count=collection.live_count(),
+            vectors_count=collection.live_count(),
+        )
+    
+    def create_collection(self, collection_name: str, vectors_config: 'models.VectorParams', **kwargs) -> bool:
+        self._collections[collection_name] = LocalCollection(
+            self.root / collection_name, dim=vectors_config.size, **self.options
+        )
+        return True
+    
+    def create_payload_index(self, collection_name: str, field_name: str, field_schema: Any = None, **kwargs) -> None:
+        self._collection(collection_name).create_payload_index(field_name, str(field_schema))
+    
+    def upsert(self, collection_name: str, points: List['models.PointStruct'], **kwargs) -> None:
+        self._collection(collection_name).upsert(points)
+    
+    def delete(self, collection_name: str, points_selector: Any, **kwargs) -> int:
+        collection = self._collection(collection_name)
+        if isinstance(points_selector, models.PointIdsList):
+            return collection.delete(ids=[str(i) for i in points_selector.points])
+        if isinstance(points_selector, models.FilterSelector):
+            return collection.delete(flt=points_selector.filter)
+        return collection.delete(flt=points_selector)
+    
+    def count(self, collection_name: str, count_filter: Optional['models.Filter'] = None, **kwargs) -> 'models.CountResult':
+        collection = self._collection(collection_name)
+        if count_filter is None:
+            return models.CountResult(count=collection.live_count())
+        return models.CountResult(count=len(collection.filter_rows(count_filter)))
+    
+    def search(self, collection_name: str, query_vector: List[float], limit: int = 10,
+               query_filter: Optional['models.Filter'] = None, **kwargs) -> List['models.ScoredPoint']:
+        collection = self._collection(collection_name)
+        return [
+            models.ScoredPoint(id=collection.ids[row], version=0, score=score,
+                               payload=collection.payloads[row])
+            for row, score in collection.search(query_vector, limit, query_filter)
+        ]
+
+
 # =============================================================================
 # EMBEDDING GENERATOR CLASS | فئة مولد التضمينات
 # =============================================================================
@@ -105,31 +650,79 @@ class VectorEmbeddingGenerator:
     الفئة الرئيسية لتوليد وتخزين التضمينات
     """
     
-    def __init__(self, config: EmbeddingConfig):
+    def __init__(self, config: EmbeddingConfig, metrics: Optional[Instrumentation] = None,
+                 openai_client: Any = None, supabase: Any = None):
         """
         Initialize the generator | تهيئة المولد
         
         Args:
             config: Generator configuration | إعدادات المولد
+            metrics: Run instrumentation | أداة قياس التشغيل
+            openai_client: Shared OpenAI client (created if omitted) | عميل OpenAI مشترك
+            supabase: Shared Supabase client for a 'supabase' catalog | عميل Supabase للكتالوج
         """
         self.config = config
+        self.metrics = metrics or Instrumentation('embedding_generator')
         
         # Initialize OpenAI client | تهيئة عميل OpenAI
-        self.openai_client = openai.OpenAI(api_key=config.openai_api_key)
+        if openai_client is None:
+            import openai
+            openai_client = openai.OpenAI(api_key=config.openai_api_key)
+        self.openai_client = openai_client
         
-        # Initialize Qdrant client | تهيئة عميل Qdrant
-        self.qdrant = QdrantClient(
-            url=config.qdrant_url,
-            api_key=config.qdrant_api_key
-        )
+        # Output dimension shared by embedding, collection and search | بعد المتجهات الموحد
+        if config.dimensions is not None and not config.embedding_model.startswith('text-embedding-3'):
+            raise ValueError(f"Model {config.embedding_model} does not support reduced dimensions")
+        self.vector_size = config.dimensions or config.vector_size
+        
+        # Initialize vector store: Qdrant or local fallback | تهيئة مخزن المتجهات
+        if config.vector_backend == 'local':
+            self.qdrant = LocalVectorStore(
+                config.local_index_path,
+                dtype=config.local_dtype,
+                index_type=config.local_index_type
+            )
+        else:
+            from qdrant_client import QdrantClient
+            self.qdrant = QdrantClient(
+                url=config.qdrant_url,
+                api_key=config.qdrant_api_key,
+                prefer_grpc=config.prefer_grpc,
+                timeout=config.qdrant_timeout
+            )
         
-        # Initialize text splitter | تهيئة مقسم النص
-        self.text_splitter = RecursiveCharacterTextSplitter(
+        # Bulk uploads buffer embedded chunks | الرفع المجمع يخزن القطع المضمنة مؤقتاً
+        self._bulk = config.upload_mode == 'bulk' and not isinstance(self.qdrant, LocalVectorStore)
+        self._upload_buffer: List[DocumentChunk] = []
+        # Bulk-sent chunk IDs awaiting the consistency barrier | معرفات تنتظر التأكيد
+        self._unconfirmed: List[str] = []
+        
+        # Cross-encoder reranker, created on first reranked search
+        # معيد الترتيب، ينشأ عند أول بحث يحتاجه
+        self.reranker: Optional[CrossEncoderReranker] = None
+        self._reranker_lock = threading.Lock()
+        
+        # Initialize text chunker | تهيئة مقسم النص
+        self.text_splitter = TextChunker(ChunkerConfig(
             chunk_size=config.chunk_size,
             chunk_overlap=config.chunk_overlap,
-            length_function=len,
-            separators=["\n\n", "\n", ".", "!", "?", "،", "؟", "!", " ", ""]
-        )
+            length_unit=config.chunk_unit
+        ))
+        
+        # Initialize document loader registry | تهيئة سجل محملات المستندات
+        self.loader = DocumentLoader(LoaderConfig(
+            page_cache_path=config.page_cache_path,
+            enable_ocr=config.enable_ocr,
+            ocr_workers=config.ocr_workers
+        ))
+        
+        # Load course catalog for chunk enrichment | تحميل الكتالوج لإثراء القطع
+        self.catalog: Optional[CourseCatalog] = None
+        if config.catalog_source:
+            try:
+                self.catalog = load_catalog(config.catalog_source, client=supabase)
+            except Exception as e:
+                logger.warning(f"Course catalog unavailable, skipping enrichment: {e}")
         
         # Statistics | الإحصائيات
         self.stats = {
@@ -137,16 +730,23 @@ class VectorEmbeddingGenerator:
             'chunks_created': 0,
             'embeddings_generated': 0,
             'vectors_uploaded': 0,
+            'files_skipped': 0,
+            'courses_embedded': 0,
+            'courses_unchanged': 0,
+            'courses_removed': 0,
             'errors': 0
         }
         
         logger.info("Vector embedding generator initialized | تم تهيئة مولد التضمينات")
     
-    def ensure_collection(self) -> None:
+    def ensure_collection(self, payload_indexes: Optional[Dict[str, str]] = None) -> None:
         """
         Ensure Qdrant collection exists | التأكد من وجود مجموعة Qdrant
         Creates the collection if it doesn't exist
         ينشئ المجموعة إذا لم تكن موجودة
+        
+        Args:
+            payload_indexes: Field -> schema (default: PAYLOAD_INDEXES) | فهارس الحمولة
         """
         try:
             # Check if collection exists | التحقق من وجود المجموعة
@@ -158,43 +758,46 @@ class VectorEmbeddingGenerator:
                 self.qdrant.create_collection(
                     collection_name=self.config.collection_name,
                     vectors_config=models.VectorParams(
-                        size=self.config.vector_size,
+                        size=self.vector_size,
                         distance=models.Distance.COSINE
                     )
                 )
                 
-                # Create payload indexes for filtering | إنشاء فهارس للفلترة
-                self.qdrant.create_payload_index(
-                    collection_name=self.config.collection_name,
-                    field_name="source_type",
-                    field_schema=models.PayloadSchemaType.KEYWORD
-                )
-                self.qdrant.create_payload_index(
-                    collection_name=self.config.collection_name,
-                    field_name="department",
-                    field_schema=models.PayloadSchemaType.KEYWORD
-                )
-                self.qdrant.create_payload_index(
-                    collection_name=self.config.collection_name,
-                    field_name="course_code",
-                    field_schema=models.PayloadSchemaType.KEYWORD
-                )
-                
                 logger.info(f"Collection created: {self.config.collection_name}")
             else:
                 logger.info(f"Collection exists: {self.config.collection_name}")
+                existing_size = self.qdrant.get_collection(
+                    self.config.collection_name
+                ).config.params.vectors.size
+                if existing_size != self.vector_size:
+                    raise ValueError(
+                        f"Collection {self.config.collection_name} stores {existing_size}-d vectors "
+                        f"but the generator produces {self.vector_size}-d vectors"
+                    )
+            
+            # Create missing payload indexes for filtering | إنشاء فهارس الفلترة المفقودة
+            info = self.qdrant.get_collection(self.config.collection_name)
+            existing = set((info.payload_schema or {}).keys())
+            for field_name, schema in (payload_indexes or PAYLOAD_INDEXES).items():
+                if field_name not in existing:
+                    self.qdrant.create_payload_index(
+                        collection_name=self.config.collection_name,
+                        field_name=field_name,
+                        field_schema=models.PayloadSchemaType(schema)
+                    )
                 
         except Exception as e:
             logger.error(f"Error ensuring collection: {e}")
             raise
     
-    def load_documents(self, directory: str, file_pattern: str = "**/*.pdf") -> List[Document]:
+    def load_documents(self, directory: str, file_pattern: Optional[str] = None) -> List[PageDocument]:
         """
         Load documents from directory | تحميل المستندات من المجلد
         
         Args:
             directory: Path to documents directory | مسار مجلد المستندات
-            file_pattern: Glob pattern for files | نمط البحث عن الملفات
+            file_pattern: Optional glob pattern; defaults to every registered type
+                          نمط البحث الاختياري؛ الافتراضي جميع الأنواع المسجلة
             
         Returns:
             List of loaded documents | قائمة المستندات المحملة
@@ -208,38 +811,60 @@ class VectorEmbeddingGenerator:
             logger.error(f"Directory not found: {directory} | المجلد غير موجود: {directory}")
             return []
         
-        # Find all PDF files | إيجاد جميع ملفات PDF
-        pdf_files = list(path.glob(file_pattern))
-        logger.info(f"Found {len(pdf_files)} PDF files | تم إيجاد {len(pdf_files)} ملف PDF")
+        # Find all supported files | إيجاد جميع الملفات المدعومة
+        files = list(self.loader.iter_files(path, file_pattern))
+        logger.info(f"Found {len(files)} files | تم إيجاد {len(files)} ملف")
         
-        for pdf_path in pdf_files:
+        for file_path in files:
             try:
-                loader = PyPDFLoader(str(pdf_path))
-                docs = loader.load()
-                
-                # Add source metadata | إضافة بيانات المصدر
-                for doc in docs:
-                    doc.metadata['source_file'] = pdf_path.name
-                    doc.metadata['source_path'] = str(pdf_path)
-                    
-                    # Extract course code from filename if present
-                    # استخراج رمز المقرر من اسم الملف إذا وجد
-                    filename = pdf_path.stem.upper()
-                    if any(c.isdigit() for c in filename):
-                        doc.metadata['course_code'] = filename
-                
-                documents.extend(docs)
-                self.stats['documents_processed'] += 1
-                logger.info(f"Loaded: {pdf_path.name} ({len(docs)} pages)")
-                
+                documents.extend(self._load_file(file_path))
             except Exception as e:
-                logger.error(f"Error loading {pdf_path.name}: {e}")
+                logger.error(f"Error loading {file_path.name}: {e}")
                 self.stats['errors'] += 1
         
+        # OCR queued images in the worker pool | التعرف الضوئي للصور المنتظرة
+        try:
+            with self.metrics.span('ocr') as span:
+                ocr_docs = self.loader.flush_ocr()
+                span.add(items=len(ocr_docs))
+            documents.extend(ocr_docs)
+            self.stats['documents_processed'] += len({d.metadata['source_path'] for d in ocr_docs})
+        except Exception as e:
+            logger.error(f"Error running OCR: {e}")
+            self.stats['errors'] += 1
+        
+        if self.loader.cache:
+            logger.info(f"Page cache: {self.loader.cache.hits} hits, {self.loader.cache.misses} misses")
         logger.info(f"Loaded {len(documents)} document pages total")
         return documents
     
-    def chunk_documents(self, documents: List[Document]) -> List[DocumentChunk]:
+    def _load_file(self, file_path: Path) -> List[PageDocument]:
+        """
+        Load one file through the loader registry | تحميل ملف واحد عبر سجل المحملات
+        
+        Args:
+            file_path: File to load | الملف المراد تحميله
+            
+        Returns:
+            Loaded pages (empty for images queued for OCR) | الصفحات المحملة
+        """
+        with self.metrics.span('load', bytes=file_path.stat().st_size) as span:
+            docs = self.loader.load(file_path)
+            span.add(items=len(docs))
+        
+        # Extract course code from filename if it is one
+        # استخراج رمز المقرر من اسم الملف إذا كان رمزاً
+        filename = file_path.stem.upper()
+        if COURSE_CODE_RE.fullmatch(filename):
+            for doc in docs:
+                doc.metadata['course_code'] = filename
+        
+        if docs:
+            self.stats['documents_processed'] += 1
+            logger.info(f"Loaded: {file_path.name} ({len(docs)} pages)")
+        return docs
+    
+    def chunk_documents(self, documents: List[PageDocument]) -> List[DocumentChunk]:
         """
         Split documents into chunks | تقسيم المستندات إلى قطع
         
@@ -253,42 +878,67 @@ class VectorEmbeddingGenerator:
         
         chunks = []
         
-        for doc in documents:
-            try:
-                # Split document text | تقسيم نص المستند
-                text_chunks = self.text_splitter.split_text(doc.page_content)
-                
-                for i, chunk_text in enumerate(text_chunks):
-                    # Skip empty chunks | تخطي القطع الفارغة
-                    if not chunk_text.strip():
-                        continue
+        with self.metrics.span('chunk', items=len(documents)):
+            for doc in documents:
+                try:
+                    # Split document text | تقسيم نص المستند
+                    text_chunks = self.text_splitter.split_text(doc.page_content)
                     
-                    # Generate unique ID based on content hash | توليد معرف فريد من hash المحتوى
-                    content_hash = hashlib.md5(chunk_text.encode()).hexdigest()[:12]
-                    chunk_id = f"{doc.metadata.get('source_file', 'unknown')}_{i}_{content_hash}"
-                    
-                    chunk = DocumentChunk(
-                        id=chunk_id,
-                        content=chunk_text,
-                        metadata={
-                            **doc.metadata,
-                            'chunk_index': i,
-                            'chunk_count': len(text_chunks),
-                            'content_length': len(chunk_text),
-                            'source_type': 'pdf',
-                            'processed_at': datetime.now().isoformat()
-                        }
-                    )
-                    chunks.append(chunk)
-                    
-            except Exception as e:
-                logger.error(f"Error chunking document: {e}")
-                self.stats['errors'] += 1
+                    for i, chunk_text in enumerate(text_chunks):
+                        # Skip empty chunks | تخطي القطع الفارغة
+                        if not chunk_text.strip():
+                            continue
+                        
+                        # Generate unique ID based on content hash | توليد معرف فريد من hash المحتوى
+                        content_hash = hashlib.md5(chunk_text.encode()).hexdigest()[:12]
+                        chunk_id = f"{doc.metadata.get('source_file', 'unknown')}_{i}_{content_hash}"
+                        
+                        chunk = DocumentChunk(
+                            id=chunk_id,
+                            content=chunk_text,
+                            metadata={
+                                'source_type': 'pdf',
+                                **doc.metadata,
+                                'chunk_index': i,
+                                'chunk_count': len(text_chunks),
+                                'content_length': len(chunk_text),
+                                'processed_at': datetime.now().isoformat()
+                            }
+                        )
+                        
+                        # Map chunk to majors/courses/years | ربط القطعة بالتخصصات والمقررات والسنوات
+                        if self.catalog:
+                            self.catalog.enrich(chunk.metadata, chunk_text)
+                        chunks.append(chunk)
+                        
+                except Exception as e:
+                    logger.error(f"Error chunking document: {e}")
+                    self.stats['errors'] += 1
         
-        self.stats['chunks_created'] = len(chunks)
+        self.stats['chunks_created'] += len(chunks)
         logger.info(f"Created {len(chunks)} chunks | تم إنشاء {len(chunks)} قطعة")
         return chunks
     
+    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed texts at the configured dimension | تضمين النصوص بالبعد المحدد
+        
+        Args:
+            texts: Texts to embed | النصوص
+            
+        Returns:
+            One vector per text | متجه لكل نص
+        """
+        kwargs: Dict[str, Any] = {}
+        if self.config.dimensions is not None:
+            kwargs['dimensions'] = self.config.dimensions
+        response = self.openai_client.embeddings.create(
+            model=self.config.embedding_model,
+            input=texts,
+            **kwargs
+        )
+        return [item.embedding for item in response.data]
+    
     def generate_embeddings(self, chunks: List[DocumentChunk]) -> List[DocumentChunk]:
         """
         Generate embeddings for chunks | توليد التضمينات للقطع
@@ -311,14 +961,13 @@ class VectorEmbeddingGenerator:
             
             try:
                 # Call OpenAI embedding API | استدعاء API تضمين OpenAI
-                response = self.openai_client.embeddings.create(
-                    model=self.config.embedding_model,
-                    input=texts
-                )
+                with self.metrics.span('embed', items=len(texts),
+                                       bytes=sum(len(t.encode('utf-8')) for t in texts)):
+                    embeddings = self.embed_texts(texts)
                 
                 # Assign embeddings to chunks | تعيين التضمينات للقطع
-                for j, embedding_data in enumerate(response.data):
-                    batch[j].embedding = embedding_data.embedding
+                for j, embedding in enumerate(embeddings):
+                    batch[j].embedding = embedding
                     self.stats['embeddings_generated'] += 1
                 
                 logger.info(f"Generated embeddings for batch {i // batch_size + 1}")
@@ -329,12 +978,15 @@ class VectorEmbeddingGenerator:
         
         return chunks
     
-    def upload_to_qdrant(self, chunks: List[DocumentChunk]) -> None:
+    def upload_to_qdrant(self, chunks: List[DocumentChunk]) -> List[str]:
         """
         Upload embeddings to Qdrant | رفع التضمينات إلى Qdrant
         
         Args:
             chunks: Chunks with embeddings | القطع مع التضمينات
+            
+        Returns:
+            IDs of chunks that were uploaded | معرفات القطع المرفوعة
         """
         logger.info(f"Uploading {len(chunks)} vectors to Qdrant")
         logger.info(f"رفع {len(chunks)} متجه إلى Qdrant")
@@ -344,7 +996,9 @@ class VectorEmbeddingGenerator:
         
         if not valid_chunks:
             logger.warning("No valid chunks to upload | لا توجد قطع صالحة للرفع")
-            return
+            return []
+        
+        uploaded: List[str] = []
         
         # Process in batches | المعالجة على دفعات
         for i in range(0, len(valid_chunks), self.config.batch_size):
@@ -365,24 +1019,249 @@ class VectorEmbeddingGenerator:
                 ]
                 
                 # Upsert points | إدراج/تحديث النقاط
-                self.qdrant.upsert(
-                    collection_name=self.config.collection_name,
-                    points=points
-                )
+                with self.metrics.span('upload', items=len(points), bytes=len(points) * self.vector_size * 4):
+                    self.qdrant.upsert(
+                        collection_name=self.config.collection_name,
+                        points=points
+                    )
                 
                 self.stats['vectors_uploaded'] += len(points)
+                uploaded.extend(chunk.id for chunk in batch)
                 logger.info(f"Uploaded batch {i // self.config.batch_size + 1}")
                 
             except Exception as e:
                 logger.error(f"Error uploading to Qdrant: {e}")
                 self.stats['errors'] += 1
+        
+        return uploaded
+    
+    def bulk_upload(self, chunks: List[DocumentChunk]) -> List[str]:
+        """
+        Upload embeddings with parallel workers | رفع التضمينات بعمال متوازيين
+        Points are sent without waiting for each batch to be applied;
+        wait_until_consistent() is the barrier at the end of the load.
+        ترسل النقاط دون انتظار تطبيق كل دفعة، والانتظار يتم في نهاية التحميل.
+        
+        Args:
+            chunks: Chunks with embeddings | القطع مع التضمينات
+            
+        Returns:
+            IDs of chunks that were uploaded | معرفات القطع المرفوعة
+        """
+        valid_chunks = [c for c in chunks if c.embedding is not None]
+        if not valid_chunks:
+            return []
+        
+        logger.info(f"Bulk uploading {len(valid_chunks)} vectors ({self.config.upload_parallel} workers)")
+        logger.info(f"رفع مجمع لـ {len(valid_chunks)} متجه")
+        
+        try:
+            with self.metrics.span('bulk_upload', items=len(valid_chunks),
+                                   bytes=len(valid_chunks) * self.vector_size * 4):
+                self.qdrant.upload_collection(
+                    collection_name=self.config.collection_name,
+                    vectors=[chunk.embedding for chunk in valid_chunks],
+                    payload=[{'content': chunk.content, **chunk.metadata} for chunk in valid_chunks],
+                    ids=[str(uuid.uuid5(uuid.NAMESPACE_DNS, chunk.id)) for chunk in valid_chunks],
+                    batch_size=self.config.batch_size,
+                    parallel=self.config.upload_parallel,
+                    wait=False
+                )
+        except Exception as e:
+            logger.error(f"Error bulk uploading to Qdrant: {e}")
+            self.stats['errors'] += 1
+            return []
+        
+        self.stats['vectors_uploaded'] += len(valid_chunks)
+        return [chunk.id for chunk in valid_chunks]
+    
+    def _flush_uploads(self) -> None:
+        """Bulk upload buffered chunks | رفع القطع المخزنة مؤقتاً"""
+        if not self._upload_buffer:
+            return
+        # Sent without waiting; journaled once bulk_load's barrier passes
+        # أرسلت دون انتظار؛ تسجل بعد نجاح الانتظار في bulk_load
+        self._unconfirmed.extend(self.bulk_upload(self._upload_buffer))
+        self._upload_buffer = []
+    
+    def wait_until_consistent(self) -> bool:
+        """
+        Wait until the collection has applied all updates and finished indexing
+        الانتظار حتى تطبق المجموعة جميع التحديثات وتنتهي الفهرسة
+        
+        Returns:
+            True if the collection turned green in time | True إذا أصبحت جاهزة
+        """
+        deadline = time.monotonic() + self.config.consistency_timeout
+        delay = 0.5
+        with self.metrics.span('wait_consistent') as span:
+            while True:
+                info = self.qdrant.get_collection(self.config.collection_name)
+                if info.status == models.CollectionStatus.GREEN:
+                    logger.info(f"Collection is consistent: {info.points_count} points | المجموعة جاهزة")
+                    return True
+                if info.status == models.CollectionStatus.RED:
+                    logger.error("Collection reported an optimizer error | خطأ في محسن المجموعة")
+                    return False
+                if time.monotonic() >= deadline:
+                    logger.warning(f"Collection still {info.status.value} after {self.config.consistency_timeout}s")
+                    return False
+                # Each poll counts as a retry | كل استطلاع يحسب كإعادة محاولة
+                span.retry()
+                time.sleep(delay)
+                delay = min(delay * 2, 10)
+    
+    @contextmanager
+    def bulk_load(self, journal: Optional[IngestJournal] = None) -> Iterator[None]:
+        """
+        Bulk load session | جلسة التحميل المجمع
+        Optionally disables HNSW indexing for the duration of the load, restores
+        the previous threshold afterwards and waits for the collection to be
+        consistent before returning. Bulk-sent chunks are marked uploaded in
+        the journal only once that barrier passes; a timeout or RED collection
+        counts as an error and leaves them pending for resume.
+        يعطل الفهرسة اختيارياً أثناء التحميل ثم يعيدها وينتظر جاهزية المجموعة،
+        ولا تسجل القطع كمرفوعة إلا بعد نجاح الانتظار.
+        
+        Args:
+            journal: Checkpoint journal or None | سجل الاستئناف
+        """
+        if not self._bulk:
+            yield
+            return
+        
+        previous_threshold = None
+        if self.config.defer_indexing:
+            info = self.qdrant.get_collection(self.config.collection_name)
+            previous_threshold = info.config.optimizer_config.indexing_threshold
+            # A threshold of 0 disables index building | القيمة 0 تعطل بناء الفهرس
+            self.qdrant.update_collection(
+                collection_name=self.config.collection_name,
+                optimizers_config=models.OptimizersConfigDiff(indexing_threshold=0)
+            )
+            logger.info(f"Indexing deferred (threshold was {previous_threshold}) | تأجيل الفهرسة")
+        try:
+            yield
+        finally:
+            if self.config.defer_indexing:
+                self.qdrant.update_collection(
+                    collection_name=self.config.collection_name,
+                    optimizers_config=models.OptimizersConfigDiff(
+                        indexing_threshold=previous_threshold if previous_threshold is not None else 20000
+                    )
+                )
+                logger.info("Indexing restored | استعادة الفهرسة")
+            if self.wait_until_consistent():
+                # Applied by the collection: safe to checkpoint | طبقتها المجموعة: يمكن تسجيلها
+                if journal:
+                    journal.mark_uploaded(self._unconfirmed)
+            else:
+                # Chunks stay pending and are re-sent on resume | تبقى القطع معلقة وتعاد عند الاستئناف
+                logger.error(f"{len(self._unconfirmed)} bulk-sent chunks not confirmed | قطع غير مؤكدة")
+                self.stats['errors'] += 1
+            self._unconfirmed = []
+    
+    def _run_key(self, directory: Path) -> str:
+        """
+        Identity of a run for resume matching | هوية التشغيل لمطابقة الاستئناف
+        Changing any setting that affects chunk IDs or vectors starts fresh.
+        """
+        settings = {
+            'directory': str(directory.resolve()),
+            'collection': self.config.collection_name,
+            'model': self.config.embedding_model,
+            'vector_size': self.vector_size,
+            'chunk_size': self.config.chunk_size,
+            'chunk_overlap': self.config.chunk_overlap,
+            'chunk_unit': self.config.chunk_unit,
+        }
+        return hashlib.sha256(json.dumps(settings, sort_keys=True).encode()).hexdigest()
+    
+    def _journal_files(self, directory: Path, journal: IngestJournal) -> None:
+        """
+        Parse and chunk files not yet checkpointed | تحليل وتقطيع الملفات غير المسجلة
+        
+        Args:
+            directory: Documents directory | مجلد المستندات
+            journal: Checkpoint journal | سجل الاستئناف
+        """
+        def file_hash(file_path: Path) -> str:
+            return hashlib.sha256(file_path.read_bytes()).hexdigest()
+        
+        for file_path in self.loader.iter_files(directory):
+            try:
+                digest = file_hash(file_path)
+                # Only files whose chunks are durable are skipped: 'uploaded' files
+                # are done and 'chunked' ones resume from their pending chunks.
+                # Anything else (e.g. 'parsed' from an interrupted run) is redone.
+                # تتخطى فقط الملفات المحفوظة قطعها؛ غيرها يعاد تحليله
+                if journal.file_state(str(file_path), digest) in ('chunked', 'uploaded'):
+                    self.stats['files_skipped'] += 1
+                    continue
+                
+                docs = self._load_file(file_path)
+                if not docs:
+                    continue
+                chunks = self.chunk_documents(docs)
+                # Chunks and the 'chunked' state commit in one transaction
+                # القطع وحالة الملف تحفظ في معاملة واحدة
+                with self.metrics.span('journal.write', items=len(chunks)):
+                    journal.record_chunks(str(file_path), digest, chunks)
+                
+            except Exception as e:
+                logger.error(f"Error loading {file_path.name}: {e}")
+                self.stats['errors'] += 1
+        
+        # OCR queued images, then checkpoint them per file | التعرف الضوئي ثم تسجيل كل صورة
+        try:
+            by_file: Dict[str, List[PageDocument]] = {}
+            for doc in self.loader.flush_ocr():
+                by_file.setdefault(doc.metadata['source_path'], []).append(doc)
+            for source_path, docs in by_file.items():
+                digest = file_hash(Path(source_path))
+                journal.record_chunks(source_path, digest, self.chunk_documents(docs))
+                self.stats['documents_processed'] += 1
+        except Exception as e:
+            logger.error(f"Error running OCR: {e}")
+            self.stats['errors'] += 1
+        
+        if self.stats['files_skipped']:
+            logger.info(f"Skipped {self.stats['files_skipped']} checkpointed files | تم تخطي ملفات مسجلة")
     
-    def process_directory(self, directory: str) -> Dict[str, int]:
+    def _process_batch(self, batch: List[DocumentChunk], journal: Optional[IngestJournal]) -> None:
+        """
+        Embed and upload one batch, checkpointing each step
+        تضمين ورفع دفعة واحدة مع تسجيل كل خطوة
+        
+        Args:
+            batch: Chunks (already-embedded ones skip the API) | القطع
+            journal: Checkpoint journal or None | سجل الاستئناف
+        """
+        to_embed = [c for c in batch if c.embedding is None]
+        if to_embed:
+            self.generate_embeddings(to_embed)
+            if journal:
+                journal.mark_embedded({c.id: c.embedding for c in to_embed if c.embedding is not None})
+        
+        if self._bulk:
+            # Embeddings are already durable in the journal; upload in large parallel calls
+            # التضمينات محفوظة في السجل؛ الرفع على دفعات كبيرة متوازية
+            self._upload_buffer.extend(batch)
+            if len(self._upload_buffer) >= self.config.bulk_buffer_size:
+                self._flush_uploads()
+            return
+        
+        uploaded = self.upload_to_qdrant(batch)
+        if journal:
+            journal.mark_uploaded(uploaded)
+    
+    def process_directory(self, directory: str, resume: bool = False) -> Dict[str, int]:
         """
         Process all documents in a directory | معالجة جميع المستندات في مجلد
         
         Args:
             directory: Path to documents directory | مسار مجلد المستندات
+            resume: Continue from the checkpoint journal | الاستئناف من سجل نقاط الاستئناف
             
         Returns:
             Processing statistics | إحصائيات المعالجة
@@ -392,29 +1271,49 @@ class VectorEmbeddingGenerator:
         logger.info("Starting embedding generation | بدء توليد التضمينات")
         logger.info("=" * 60)
         
+        journal = IngestJournal(self.config.journal_path) if self.config.journal_path else None
+        batch_size = self.config.batch_size
+        
         try:
             # Ensure collection exists | التأكد من وجود المجموعة
             self.ensure_collection()
             
-            # Load documents | تحميل المستندات
-            documents = self.load_documents(directory)
-            
-            if not documents:
-                logger.warning("No documents found | لم يتم العثور على مستندات")
+            path = Path(directory)
+            if not path.exists():
+                logger.error(f"Directory not found: {directory} | المجلد غير موجود: {directory}")
                 return self.stats
             
-            # Chunk documents | تقطيع المستندات
-            chunks = self.chunk_documents(documents)
+            if journal:
+                # Checkpointed pipeline | خط المعالجة مع نقاط الاستئناف
+                journal.begin(self._run_key(path), resume)
+                self._journal_files(path, journal)
+                batches = (
+                    [
+                        DocumentChunk(id=chunk_id, content=content, metadata=metadata, embedding=embedding)
+                        for chunk_id, content, metadata, embedding in rows
+                    ]
+                    for rows in journal.iter_pending(batch_size)
+                )
+            else:
+                # In-memory pipeline | خط المعالجة في الذاكرة
+                chunks = self.chunk_documents(self.load_documents(directory))
+                batches = (chunks[i:i + batch_size] for i in range(0, len(chunks), batch_size))
             
-            # Generate embeddings | توليد التضمينات
-            chunks = self.generate_embeddings(chunks)
+            # Embed and upload batch by batch | التضمين والرفع دفعة بدفعة
+            with self.bulk_load(journal):
+                for batch in batches:
+                    self._process_batch(batch, journal)
+                self._flush_uploads()
             
-            # Upload to Qdrant | الرفع إلى Qdrant
-            self.upload_to_qdrant(chunks)
+            if journal:
+                journal.finish_files()
             
         except Exception as e:
             logger.error(f"Processing failed: {e} | فشلت المعالجة: {e}")
             raise
+        finally:
+            if journal:
+                journal.close()
         
         # Print summary | طباعة الملخص
         elapsed = (datetime.now() - start_time).total_seconds()
@@ -425,117 +1324,566 @@ class VectorEmbeddingGenerator:
         logger.info(f"Chunks created: {self.stats['chunks_created']}")
         logger.info(f"Embeddings generated: {self.stats['embeddings_generated']}")
         logger.info(f"Vectors uploaded: {self.stats['vectors_uploaded']}")
+        logger.info(f"Files skipped (checkpointed): {self.stats['files_skipped']}")
         logger.info(f"Errors: {self.stats['errors']}")
         logger.info("=" * 60)
         
+        self.metrics.result.update(self.stats)
+        return self.stats
+    
+    @staticmethod
+    def course_chunk(row: Dict[str, Any]) -> DocumentChunk:
+        """
+        Build the indexed document of one course row | بناء مستند مقرر واحد
+        Names, descriptions and objectives in both languages share one vector,
+        so Arabic and English queries reach the same point.
+        الأسماء والأوصاف والأهداف باللغتين في متجه واحد.
+        
+        Args:
+            row: Row of the courses table | صف من جدول المقررات
+            
+        Returns:
+            Course document (one point per course) | مستند المقرر
+        """
+        code = row['code']
+        title = ' | '.join(v.strip() for v in (code, row.get('name'), row.get('name_ar')) if v and v.strip())
+        sections = [title] + [
+            row[column].strip()
+            for column in ('description', 'description_ar', 'objectives_en', 'objectives_ar')
+            if row.get(column) and row[column].strip()
+        ]
+        year_level = int(row.get('year_level') or 1)
+        return DocumentChunk(
+            id=f"course:{code}",
+            content='\n'.join(sections),
+            metadata={
+                'source_type': 'course',
+                'course_code': code,
+                'course_codes': [code],
+                'name': row.get('name'),
+                'name_ar': row.get('name_ar'),
+                'department': row.get('department'),
+                'year_level': year_level,
+                'year_levels': [year_level],
+                'credits': row.get('credits'),
+                'semester': row.get('semester'),
+                'updated_at': row.get('updated_at'),
+            }
+        )
+    
+    def _course_version(self, chunk: DocumentChunk) -> str:
+        """
+        Version of an indexed course: updated_at, text, payload and model
+        إصدار المقرر المفهرس: وقت التحديث والنص والحمولة والنموذج
+        """
+        key = [self.config.embedding_model, self.vector_size, chunk.content, chunk.metadata]
+        return hashlib.sha256(json.dumps(key, ensure_ascii=False, sort_keys=True, default=str).encode()).hexdigest()
+    
+    def _index_courses(self, rows: List[Dict[str, Any]], uploaded: Dict[str, str],
+                       journal: Optional[IngestJournal], source: str, full: bool) -> None:
+        """
+        Embed changed courses of one page and upload them | تضمين ورفع مقررات صفحة واحدة
+        
+        Args:
+            rows: Course rows | صفوف المقررات
+            uploaded: Course code -> uploaded version | الرمز -> الإصدار المرفوع
+            journal: Cache of uploaded embeddings or None | ذاكرة التضمينات المرفوعة
+            source: Journal source name | اسم المصدر في السجل
+            full: Re-upload unchanged courses too | إعادة رفع المقررات غير المتغيرة
+        """
+        chunks = [self.course_chunk(row) for row in rows]
+        versions = {c.id: self._course_version(c) for c in chunks}
+        unchanged = [c for c in chunks if uploaded.get(c.metadata['course_code']) == versions[c.id]]
+        changed = [c for c in chunks if uploaded.get(c.metadata['course_code']) != versions[c.id]]
+        self.stats['courses_unchanged'] += len(unchanged)
+        
+        batch = changed
+        if full and unchanged and journal:
+            # Unchanged courses keep their cached vectors | المقررات غير المتغيرة تحتفظ بمتجهاتها
+            cached = journal.source_embeddings(source, [c.metadata['course_code'] for c in unchanged])
+            for chunk in unchanged:
+                chunk.embedding = cached.get(chunk.metadata['course_code'])
+            batch = changed + unchanged
+        if not batch:
+            return
+        
+        if changed:
+            self.generate_embeddings(changed)
+            self.stats['courses_embedded'] += sum(c.embedding is not None for c in changed)
+        
+        done = set(self.upload_to_qdrant(batch))
+        if journal:
+            journal.record_source_items(source, {
+                c.metadata['course_code']: (versions[c.id], c.embedding)
+                for c in batch if c.id in done
+            })
+    
+    def process_courses(self, supabase: Any, full: bool = False) -> Dict[str, int]:
+        """
+        Index the courses table into the course collection | فهرسة جدول المقررات
+        
+        Pages through active courses and embeds each one's bilingual name,
+        description and objectives. With a journal, courses whose updated_at
+        and indexed text are unchanged since their last upload are skipped, and
+        courses that were deleted or deactivated are removed from the collection.
+        يتصفح المقررات الفعالة ويضمن الاسم والوصف والأهداف باللغتين، ويتخطى
+        المقررات غير المتغيرة ويحذف المقررات المحذوفة أو غير الفعالة.
+        
+        Args:
+            supabase: Supabase client | عميل Supabase
+            full: Re-upload unchanged courses from cached embeddings | إعادة الرفع من التضمينات المخزنة
+            
+        Returns:
+            Processing statistics | إحصائيات المعالجة
+        """
+        start_time = datetime.now()
+        logger.info(f"Indexing courses into {self.config.collection_name} | فهرسة المقررات")
+        
+        journal = IngestJournal(self.config.journal_path) if self.config.journal_path else None
+        source = f"courses:{self.config.vector_backend}:{self.config.collection_name}"
+        batch_size = self.config.batch_size
+        
+        try:
+            self.ensure_collection(COURSE_PAYLOAD_INDEXES)
+            uploaded = journal.source_versions(source) if journal else {}
+            
+            seen: set = set()
+            page: List[Dict[str, Any]] = []
+            with self.metrics.span('courses.fetch') as span:
+                for row in _paginate(supabase, 'courses', COURSE_COLUMNS, batch_size, active_only=True):
+                    seen.add(row['code'])
+                    page.append(row)
+                    if len(page) >= batch_size:
+                        self._index_courses(page, uploaded, journal, source, full)
+                        page = []
+                if page:
+                    self._index_courses(page, uploaded, journal, source, full)
+                span.add(items=len(seen))
+            
+            # Remove courses no longer active | حذف المقررات غير الفعالة
+            stale = sorted(set(uploaded) - seen)
+            if stale and not seen:
+                logger.warning("No active courses read; keeping the indexed ones | لم تقرأ أي مقررات")
+            elif stale:
+                self.qdrant.delete(
+                    collection_name=self.config.collection_name,
+                    points_selector=models.PointIdsList(
+                        points=[str(uuid.uuid5(uuid.NAMESPACE_DNS, f"course:{code}")) for code in stale]
+                    )
+                )
+                journal.drop_source_items(source, stale)
+                self.stats['courses_removed'] += len(stale)
+            
+        except Exception as e:
+            logger.error(f"Course indexing failed: {e} | فشلت فهرسة المقررات: {e}")
+            raise
+        finally:
+            if journal:
+                journal.close()
+        
+        elapsed = (datetime.now() - start_time).total_seconds()
+        logger.info(f"Courses read: {len(seen)} in {elapsed:.2f}s | المقررات المقروءة: {len(seen)}")
+        logger.info(f"Courses embedded: {self.stats['courses_embedded']}")
+        logger.info(f"Courses unchanged: {self.stats['courses_unchanged']}")
+        logger.info(f"Vectors uploaded: {self.stats['vectors_uploaded']}")
+        logger.info(f"Courses removed: {self.stats['courses_removed']}")
+        logger.info(f"Errors: {self.stats['errors']}")
+        
+        self.metrics.result.update(self.stats)
         return self.stats
     
-    def search(self, query: str, limit: int = 5, filters: Optional[Dict] = None) -> List[Dict]:
+    @staticmethod
+    def build_filter(filters: Optional[Dict[str, Any]]) -> Optional['models.Filter']:
+        """
+        Build a Qdrant filter from structured conditions | بناء فلتر Qdrant
+        
+        Each value may be a scalar (exact match), a list (match any) or a
+        dict with gt/gte/lt/lte (range), e.g.
+        {'majors': 'هندسة الاتصالات', 'course_codes': ['CICC.8.01'], 'year_levels': {'gte': 3}}
+        
+        Args:
+            filters: Field -> condition mapping | تعيين الحقل -> الشرط
+            
+        Returns:
+            Filter or None | الفلتر أو None
+        """
+        if not filters:
+            return None
+        
+        conditions = []
+        for key, value in filters.items():
+            if isinstance(value, dict):
+                condition = models.FieldCondition(key=key, range=models.Range(**value))
+            elif isinstance(value, (list, tuple, set)):
+                condition = models.FieldCondition(key=key, match=models.MatchAny(any=list(value)))
+            else:
+                condition = models.FieldCondition(key=key, match=models.MatchValue(value=value))
+            conditions.append(condition)
+        return models.Filter(must=conditions)
+    
+    def get_reranker(self) -> CrossEncoderReranker:
+        """
+        Shared cross-encoder reranker, created once | معيد الترتيب المشترك
+        Safe to call from concurrent searches; callers running a thread pool
+        should call it first so the pool never waits on creation.
+        آمن للبحث المتزامن؛ يفضل استدعاؤه قبل تشغيل مجموعة الخيوط.
+        """
+        with self._reranker_lock:
+            if self.reranker is None:
+                self.reranker = CrossEncoderReranker(RerankerConfig(
+                    model_name=self.config.rerank_model,
+                    backend=self.config.rerank_backend,
+                    threads=self.config.rerank_threads
+                ))
+            return self.reranker
+    
+    def search(self, query: str, limit: int = 5, filters: Optional[Dict] = None,
+               rerank: Optional[bool] = None) -> List[Dict]:
         """
         Search for similar documents | البحث عن مستندات مشابهة
         
         Args:
             query: Search query | استعلام البحث
             limit: Number of results | عدد النتائج
-            filters: Optional filters | الفلاتر الاختيارية
+            filters: Optional structured filters (see build_filter) | الفلاتر الاختيارية
+            rerank: Override config.rerank for this call | تجاوز إعداد إعادة الترتيب
             
         Returns:
             List of search results | قائمة نتائج البحث
         """
+        use_rerank = self.config.rerank if rerank is None else rerank
+        if use_rerank:
+            self.get_reranker()
+        
         # Generate query embedding | توليد تضمين الاستعلام
-        response = self.openai_client.embeddings.create(
-            model=self.config.embedding_model,
-            input=[query]
-        )
-        query_embedding = response.data[0].embedding
+        with self.metrics.span('search.embed', items=1):
+            query_embedding = self.embed_texts([query])[0]
         
         # Build filter | بناء الفلتر
-        qdrant_filter = None
-        if filters:
-            conditions = []
-            for key, value in filters.items():
-                conditions.append(models.FieldCondition(
-                    key=key,
-                    match=models.MatchValue(value=value)
-                ))
-            qdrant_filter = models.Filter(must=conditions)
+        qdrant_filter = self.build_filter(filters)
         
         # Search | البحث
-        results = self.qdrant.search(
-            collection_name=self.config.collection_name,
-            query_vector=query_embedding,
-            limit=limit,
-            query_filter=qdrant_filter
-        )
+        # Over-fetch when reranking | جلب مرشحين إضافيين عند إعادة الترتيب
+        with self.metrics.span('search.vector', items=1):
+            results = self.qdrant.search(
+                collection_name=self.config.collection_name,
+                query_vector=query_embedding,
+                limit=max(limit, self.config.rerank_candidates) if use_rerank else limit,
+                query_filter=qdrant_filter
+            )
         
-        return [
+        hits = [
             {
+                'id': str(hit.id),
                 'content': hit.payload.get('content', ''),
                 'score': hit.score,
                 'metadata': {k: v for k, v in hit.payload.items() if k != 'content'}
             }
             for hit in results
         ]
+        
+        if use_rerank:
+            with self.metrics.span('search.rerank', items=len(hits)):
+                return self.reranker.rerank(query, hits, limit)
+        return hits
 
 
 # =============================================================================
 # MAIN ENTRY POINT | نقطة الدخول الرئيسية
 # =============================================================================
 
-def main():
+def add_store_arguments(parser: Any) -> None:
     """
-    Main entry point | نقطة الدخول الرئيسية
+    Add vector store arguments shared by embed and search
+    إضافة وسائط مخزن المتجهات المشتركة
     """
-    import argparse
-    
-    parser = argparse.ArgumentParser(
-        description='IntelliPath Vector Embedding Generator | مولد تضمينات IntelliPath'
-    )
-    parser.add_argument(
-        'directory',
-        help='Path to documents directory | مسار مجلد المستندات'
-    )
     parser.add_argument(
         '--collection',
         default='intellipath_documents',
         help='Qdrant collection name | اسم مجموعة Qdrant'
     )
+    parser.add_argument(
+        '--dimensions',
+        type=int,
+        default=None,
+        help='Reduced embedding size, e.g. 256/512/768 (text-embedding-3-* only) | البعد المخفض للتضمين'
+    )
+    parser.add_argument(
+        '--backend',
+        choices=['qdrant', 'local'],
+        default=None,
+        help='Vector store backend (default: $VECTOR_BACKEND or qdrant) | خلفية مخزن المتجهات'
+    )
+    parser.add_argument(
+        '--local-index',
+        default='.cache/vector_index',
+        help='Local vector store directory | مجلد مخزن المتجهات المحلي'
+    )
+    parser.add_argument(
+        '--local-dtype',
+        choices=['float32', 'int8'],
+        default='float32',
+        help='Local vector storage type | نوع تخزين المتجهات المحلي'
+    )
+    parser.add_argument(
+        '--local-index-type',
+        choices=['exact', 'ivf'],
+        default='exact',
+        help='Local index: brute-force exact or IVF approximate | نوع الفهرس المحلي'
+    )
+    parser.add_argument(
+        '--qdrant-url',
+        default=None,
+        help='Qdrant server URL (default: $QDRANT_URL) | رابط خادم Qdrant'
+    )
+    parser.add_argument(
+        '--grpc',
+        action='store_true',
+        help='Talk to Qdrant over gRPC | الاتصال بـ Qdrant عبر gRPC'
+    )
+
+
+def add_arguments(parser: Any) -> None:
+    """
+    Add embedding arguments to a parser | إضافة وسائط توليد التضمينات
+    """
+    parser.add_argument(
+        'directory',
+        help='Path to documents directory | مسار مجلد المستندات'
+    )
+    add_store_arguments(parser)
     parser.add_argument(
         '--chunk-size',
         type=int,
         default=1000,
-        help='Chunk size in characters (default: 1000) | حجم القطعة بالأحرف'
+        help='Chunk size in characters or tokens (default: 1000) | حجم القطعة'
     )
     parser.add_argument(
-        '--qdrant-url',
-        default=os.getenv('QDRANT_URL', 'http://localhost:6333'),
-        help='Qdrant server URL | رابط خادم Qdrant'
+        '--chunk-overlap',
+        type=int,
+        default=200,
+        help='Overlap between chunks (default: 200) | التداخل بين القطع'
     )
+    parser.add_argument(
+        '--chunk-unit',
+        choices=['chars', 'tokens'],
+        default='chars',
+        help='Unit for chunk size and overlap (default: chars) | وحدة قياس القطعة'
+    )
+    parser.add_argument(
+        '--ocr',
+        action='store_true',
+        help='OCR plan images with local Tesseract | التعرف الضوئي لصور الخطط'
+    )
+    parser.add_argument(
+        '--page-cache',
+        default='.cache/page_text.sqlite',
+        help='Per-page text cache file (empty to disable) | ملف ذاكرة نصوص الصفحات'
+    )
+    parser.add_argument(
+        '--catalog',
+        default=str(DEFAULT_KNOWLEDGE_GRAPH),
+        help="Course catalog: knowledge graph JSON path or 'supabase' (empty to disable) | مصدر كتالوج المقررات"
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Resume from the checkpoint journal | الاستئناف من سجل نقاط الاستئناف'
+    )
+    parser.add_argument(
+        '--journal',
+        default='.cache/ingest_journal.sqlite',
+        help='Checkpoint journal file (empty to disable) | ملف سجل الاستئناف'
+    )
+    parser.add_argument(
+        '--upload-mode',
+        choices=['upsert', 'bulk'],
+        default='upsert',
+        help='Per-batch upsert or parallel bulk upload (default: upsert) | نمط الرفع'
+    )
+    parser.add_argument(
+        '--parallel',
+        type=int,
+        default=4,
+        help='Parallel upload workers in bulk mode (default: 4) | عمال الرفع المتوازي'
+    )
+    parser.add_argument(
+        '--defer-indexing',
+        action='store_true',
+        help='Disable HNSW indexing during bulk load | تأجيل الفهرسة أثناء التحميل المجمع'
+    )
+    add_instrumentation_arguments(parser)
+
+
+def add_search_arguments(parser: Any) -> None:
+    """
+    Add search arguments to a parser | إضافة وسائط البحث
+    """
+    parser.add_argument('query', help='Search query | استعلام البحث')
+    add_store_arguments(parser)
+    parser.add_argument('--limit', type=int, default=5, help='Number of results (default: 5) | عدد النتائج')
+    parser.add_argument(
+        '--filter',
+        type=json.loads,
+        default=None,
+        help='Structured filters as JSON, e.g. \'{"year_levels": {"gte": 3}}\' | الفلاتر بصيغة JSON'
+    )
+    parser.add_argument(
+        '--rerank',
+        action='store_true',
+        help='Rerank candidates with the cross-encoder | إعادة الترتيب بالمشفر المتقاطع'
+    )
+    parser.add_argument('--json', action='store_true', help='Print results as JSON | طباعة النتائج بصيغة JSON')
+
+
+def add_course_arguments(parser: Any) -> None:
+    """
+    Add course indexing arguments to a parser | إضافة وسائط فهرسة المقررات
+    """
+    add_store_arguments(parser)
+    parser.set_defaults(collection=COURSE_COLLECTION)
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=100,
+        help='Courses per page and upload batch (default: 100) | المقررات لكل دفعة'
+    )
+    parser.add_argument(
+        '--journal',
+        default='.cache/ingest_journal.sqlite',
+        help='Journal caching uploaded course embeddings (empty to disable) | ملف ذاكرة التضمينات'
+    )
+    parser.add_argument(
+        '--full',
+        action='store_true',
+        help='Re-upload unchanged courses from cached embeddings | إعادة رفع المقررات غير المتغيرة'
+    )
+    add_instrumentation_arguments(parser)
+
+
+def _config_from_args(args: Any, settings: Settings, **overrides) -> EmbeddingConfig:
+    """Build an EmbeddingConfig from parsed arguments | بناء الإعدادات من الوسائط"""
+    return EmbeddingConfig(
+        openai_api_key=settings.openai_api_key,
+        dimensions=args.dimensions,
+        vector_backend=args.backend or settings.vector_backend,
+        local_index_path=args.local_index,
+        local_dtype=args.local_dtype,
+        local_index_type=args.local_index_type,
+        qdrant_url=args.qdrant_url or settings.qdrant_url,
+        qdrant_api_key=settings.qdrant_api_key,
+        collection_name=args.collection,
+        prefer_grpc=args.grpc,
+        **overrides
+    )
+
+
+def run_command(args: Any, settings: Settings, clients: Optional[Clients] = None) -> int:
+    """
+    Embed a documents directory from parsed arguments | تضمين مجلد المستندات من الوسائط
     
-    args = parser.parse_args()
-    
-    # Get API keys | الحصول على مفاتيح API
-    openai_api_key = os.getenv('OPENAI_API_KEY')
-    qdrant_api_key = os.getenv('QDRANT_API_KEY')
-    
-    if not openai_api_key:
-        logger.error("Missing OPENAI_API_KEY environment variable")
-        sys.exit(1)
+    Returns:
+        Process exit code | رمز الخروج
+    """
+    settings.require('openai_api_key')
     
     # Create configuration | إنشاء الإعدادات
-    config = EmbeddingConfig(
-        openai_api_key=openai_api_key,
-        qdrant_url=args.qdrant_url,
-        qdrant_api_key=qdrant_api_key,
-        collection_name=args.collection,
-        chunk_size=args.chunk_size
+    config = _config_from_args(
+        args,
+        settings,
+        upload_mode=args.upload_mode,
+        upload_parallel=args.parallel,
+        defer_indexing=args.defer_indexing,
+        chunk_size=args.chunk_size,
+        chunk_overlap=args.chunk_overlap,
+        chunk_unit=args.chunk_unit,
+        page_cache_path=args.page_cache or None,
+        enable_ocr=args.ocr,
+        journal_path=args.journal or None,
+        catalog_source=args.catalog or None
     )
     
     # Run generator | تشغيل المولد
-    generator = VectorEmbeddingGenerator(config)
-    stats = generator.process_directory(args.directory)
+    with instrumented_run('embedding_generator', args) as metrics:
+        generator = VectorEmbeddingGenerator(
+            config,
+            metrics=metrics,
+            openai_client=clients.openai if clients else None,
+            supabase=clients.supabase if clients and config.catalog_source == 'supabase' else None
+        )
+        stats = generator.process_directory(args.directory, resume=args.resume)
+    
+    return 1 if stats['errors'] > 0 else 0
+
+
+def run_courses(args: Any, settings: Settings, clients: Optional[Clients] = None) -> int:
+    """
+    Index the courses table from parsed arguments | فهرسة جدول المقررات من الوسائط
+    
+    Returns:
+        Process exit code | رمز الخروج
+    """
+    settings.require('openai_api_key', 'supabase_url', 'supabase_key')
+    clients = clients or Clients(settings)
+    config = _config_from_args(
+        args,
+        settings,
+        batch_size=args.batch_size,
+        journal_path=args.journal or None,
+        catalog_source=None,
+        page_cache_path=None
+    )
+    
+    with instrumented_run('course_index', args) as metrics:
+        generator = VectorEmbeddingGenerator(config, metrics=metrics, openai_client=clients.openai)
+        stats = generator.process_courses(clients.supabase, full=args.full)
+    
+    return 1 if stats['errors'] > 0 else 0
+
+
+def run_search(args: Any, settings: Settings, clients: Optional[Clients] = None) -> int:
+    """
+    Search the collection from parsed arguments | البحث في المجموعة من الوسائط
     
-    sys.exit(1 if stats['errors'] > 0 else 0)
+    Returns:
+        Process exit code | رمز الخروج
+    """
+    settings.require('openai_api_key')
+    config = _config_from_args(args, settings, catalog_source=None, journal_path=None, page_cache_path=None)
+    
+    generator = VectorEmbeddingGenerator(config, openai_client=clients.openai if clients else None)
+    results = generator.search(args.query, limit=args.limit, filters=args.filter, rerank=args.rerank)
+    
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2, default=str))
+        return 0
+    for rank, hit in enumerate(results, 1):
+        meta = hit['metadata']
+        score = hit.get('rerank_score', hit['score'])
+        print(f"{rank}. [{score:.3f}] {meta.get('source_file', meta.get('name', '?'))} "
+              f"{', '.join(meta.get('course_codes', []))}".rstrip())
+        print(f"   {' '.join(hit['content'].split())[:200]}")
+    return 0
+
+
+def main():
+    """
+    Main entry point | نقطة الدخول الرئيسية
+    """
+    import argparse
+    
+    parser = argparse.ArgumentParser(
+        description='IntelliPath Vector Embedding Generator | مولد تضمينات IntelliPath'
+    )
+    add_arguments(parser)
+    args = parser.parse_args()
+    
+    setup_logging('embedding_generator.log')
+    try:
+        sys.exit(run_command(args, load_settings()))
+    except (SettingsError, ImportError) as e:
+        logger.error(str(e))
+        sys.exit(1)
 
 
 if __name__ == '__main__':
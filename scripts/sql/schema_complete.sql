@@ -220,6 +220,10 @@ CREATE INDEX IF NOT EXISTS idx_academic_records_academic_year ON public.student_
 CREATE INDEX IF NOT EXISTS idx_academic_records_semester ON public.student_academic_records(semester);
 CREATE INDEX IF NOT EXISTS idx_academic_records_course_code ON public.student_academic_records(course_code);
 CREATE INDEX IF NOT EXISTS idx_academic_records_lookup ON public.student_academic_records(student_id, academic_year, semester);
+-- One row per course attempt; the ON CONFLICT target for record imports
+-- صف واحد لكل محاولة مقرر، ويُستخدم هدفاً لـ ON CONFLICT عند الاستيراد
+CREATE UNIQUE INDEX IF NOT EXISTS idx_student_academic_records_unique_entry
+    ON public.student_academic_records(student_id, academic_year, semester, course_code);
 
 -- -----------------------------------------------------------------------------
 -- Table: enrollments | جدول التسجيلات
@@ -337,6 +341,39 @@ CREATE TABLE IF NOT EXISTS public.advisor_student_assignments (
 CREATE INDEX IF NOT EXISTS idx_advisor_assignments_advisor_id ON public.advisor_student_assignments(advisor_id);
 CREATE INDEX IF NOT EXISTS idx_advisor_assignments_student_id ON public.advisor_student_assignments(student_id);
 
+-- -----------------------------------------------------------------------------
+-- Table: student_risk_scores | جدول درجات خطر الطلاب
+-- Latest batch risk prediction per student (scripts/python/risk_scoring.py)
+-- آخر تقييم خطر لكل طالب من المعالجة الدفعية
+-- -----------------------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS public.student_risk_scores (
+    id UUID DEFAULT gen_random_uuid() PRIMARY KEY,
+    student_id TEXT NOT NULL UNIQUE, -- Links to students.student_id | رابط للرقم الجامعي
+    risk_score NUMERIC NOT NULL CHECK (risk_score >= 0 AND risk_score <= 1), -- Probability | احتمال الخطر
+    risk_level TEXT NOT NULL CHECK (risk_level IN ('low', 'medium', 'high', 'critical')), -- Level | مستوى الخطر
+    predicted_gpa NUMERIC, -- Projected cumulative GPA | المعدل المتوقع
+    factors JSONB NOT NULL DEFAULT '[]'::jsonb, -- Top risk factors | أهم عوامل الخطر
+    features JSONB, -- Model inputs | مدخلات النموذج
+    model_version TEXT, -- Model used | إصدار النموذج
+    scored_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Index for at-risk dashboards | فهرس للوحة الطلاب المعرضين للخطر
+CREATE INDEX IF NOT EXISTS idx_risk_scores_level ON public.student_risk_scores(risk_level, risk_score DESC);
+
+-- -----------------------------------------------------------------------------
+-- Table: student_peer_matches | جدول مطابقة الزملاء
+-- Top-k similar peers per student (scripts/python/peer_matching.py)
+-- أقرب الزملاء لكل طالب من المعالجة الدفعية
+-- -----------------------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS public.student_peer_matches (
+    id UUID DEFAULT gen_random_uuid() PRIMARY KEY,
+    student_id TEXT NOT NULL UNIQUE, -- Links to students.student_id | رابط للرقم الجامعي
+    major TEXT, -- Student's current major | التخصص الحالي
+    peers JSONB NOT NULL DEFAULT '[]'::jsonb, -- Ranked peers with shared courses and score | الزملاء مرتبين
+    computed_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
 -- *****************************************************************************
 -- PHASE 4: UTILITY FUNCTIONS | المرحلة الرابعة: الدوال المساعدة
 -- *****************************************************************************
@@ -413,6 +450,8 @@ ALTER TABLE public.chat_messages ENABLE ROW LEVEL SECURITY;
 ALTER TABLE public.chat_analytics ENABLE ROW LEVEL SECURITY;
 ALTER TABLE public.notifications ENABLE ROW LEVEL SECURITY;
 ALTER TABLE public.advisor_student_assignments ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.student_risk_scores ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.student_peer_matches ENABLE ROW LEVEL SECURITY;
 ALTER TABLE public.courses ENABLE ROW LEVEL SECURITY;
 ALTER TABLE public.course_prerequisites ENABLE ROW LEVEL SECURITY;
 ALTER TABLE public.majors ENABLE ROW LEVEL SECURITY;
@@ -589,6 +628,43 @@ CREATE POLICY "Advisors can view own assignments" ON public.advisor_student_assi
 CREATE POLICY "Admins can manage assignments" ON public.advisor_student_assignments
     FOR ALL USING (has_role(auth.uid(), 'admin'));
 
+-- -----------------------------------------------------------------------------
+-- RLS Policies: student_risk_scores | سياسات أمان: درجات الخطر
+-- Written by the service role; advisors and admins read
+-- تكتبها خدمة الخلفية ويقرؤها المشرفون والمدراء
+-- -----------------------------------------------------------------------------
+CREATE POLICY "Advisors can view risk scores" ON public.student_risk_scores
+    FOR SELECT USING (
+        has_role(auth.uid(), 'advisor') OR
+        has_role(auth.uid(), 'admin')
+    );
+
+CREATE POLICY "Admins can manage risk scores" ON public.student_risk_scores
+    FOR ALL USING (has_role(auth.uid(), 'admin'));
+
+-- -----------------------------------------------------------------------------
+-- RLS Policies: student_peer_matches | سياسات أمان: مطابقة الزملاء
+-- Written by the service role; students read their own list
+-- تكتبها خدمة الخلفية ويقرأ الطالب قائمته
+-- -----------------------------------------------------------------------------
+CREATE POLICY "Students can view own peer matches" ON public.student_peer_matches
+    FOR SELECT USING (
+        EXISTS (
+            SELECT 1 FROM students s
+            WHERE s.student_id = student_peer_matches.student_id
+              AND s.user_id = auth.uid()
+        )
+    );
+
+CREATE POLICY "Advisors can view peer matches" ON public.student_peer_matches
+    FOR SELECT USING (
+        has_role(auth.uid(), 'advisor') OR
+        has_role(auth.uid(), 'admin')
+    );
+
+CREATE POLICY "Admins can manage peer matches" ON public.student_peer_matches
+    FOR ALL USING (has_role(auth.uid(), 'admin'));
+
 -- -----------------------------------------------------------------------------
 -- RLS Policies: courses (public read) | سياسات أمان: المقررات (قراءة عامة)
 -- -----------------------------------------------------------------------------
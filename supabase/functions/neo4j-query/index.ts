@@ -19,6 +19,20 @@ interface Neo4jResponse {
   errors?: string[];
 }
 
+// graph_sync.py stamps synced nodes with a `generation` and a rebuild loads
+// the next generation beside the live one; (:GraphVersion {name: 'active'})
+// names the live generation. Every query filters on it (resolved once per
+// request) so a rebuild in progress is invisible until the pointer flips.
+// Unversioned nodes (Topic, Tool, graphs never synced) always match.
+const live = (v: string) => `(${v}.generation IS NULL OR $generation IS NULL OR ${v}.generation = $generation)`;
+
+async function activeGeneration(): Promise<number | null> {
+  const { results } = await executeNeo4jQuery(
+    `OPTIONAL MATCH (v:GraphVersion {name: 'active'}) RETURN v.generation AS generation`
+  );
+  return results[0]?.generation ?? null;
+}
+
 async function executeNeo4jQuery(cypher: string, params: Record<string, any> = {}): Promise<Neo4jResponse> {
   const neo4jUri = Deno.env.get('NEO4J_URI');
   const neo4jUsername = Deno.env.get('NEO4J_USERNAME');
@@ -77,68 +91,72 @@ serve(async (req) => {
     console.log('Neo4j operation:', request.operation);
 
     let result: any;
+    const generation = await activeGeneration();
 
     switch (request.operation) {
       case 'query':
         if (!request.cypher) {
           throw new Error('Cypher query required');
         }
-        result = await executeNeo4jQuery(request.cypher, request.params || {});
+        // $generation is available to ad-hoc queries | متاح للاستعلامات المخصصة
+        result = await executeNeo4jQuery(request.cypher, { generation, ...(request.params || {}) });
         break;
 
       case 'get_majors':
         result = await executeNeo4jQuery(`
-          MATCH (m:Major)
+          MATCH (m:Major) WHERE ${live('m')}
           RETURN m.id as id, m.name as name, m.name_en as name_en, 
                  m.description as description, m.total_credits as total_credits
           ORDER BY m.name
-        `);
+        `, { generation });
         break;
 
       case 'get_courses':
         result = await executeNeo4jQuery(`
-          MATCH (c:Course)
-          OPTIONAL MATCH (c)-[:BELONGS_TO]->(m:Major)
+          MATCH (c:Course) WHERE ${live('c')}
+          OPTIONAL MATCH (c)-[:BELONGS_TO]->(m:Major) WHERE ${live('m')}
           RETURN c.id as id, c.code as code, c.name as name, c.name_ar as name_ar,
                  c.credits as credits, c.department as department, c.year_level as year_level,
                  c.semester as semester, c.hours_theory as hours_theory, c.hours_lab as hours_lab,
                  c.description as description, c.objectives as objectives,
                  collect(DISTINCT m.name) as majors
           ORDER BY c.code
-        `);
+        `, { generation });
         break;
 
       case 'get_prerequisites':
         result = await executeNeo4jQuery(`
           MATCH (c1:Course)-[r:IS_PREREQUISITE_FOR]->(c2:Course)
+          WHERE ${live('c1')} AND ${live('c2')}
           RETURN c1.code as prerequisite_code, c1.name as prerequisite_name,
                  c2.code as course_code, c2.name as course_name,
                  r.type as relationship_type
           ORDER BY c2.code, c1.code
-        `);
+        `, { generation });
         break;
 
       case 'get_full_graph':
         // Get all nodes and relationships
         const courses = await executeNeo4jQuery(`
-          MATCH (c:Course)
-          OPTIONAL MATCH (c)-[:BELONGS_TO]->(m:Major)
+          MATCH (c:Course) WHERE ${live('c')}
+          OPTIONAL MATCH (c)-[:BELONGS_TO]->(m:Major) WHERE ${live('m')}
           RETURN c.id as id, c.code as code, c.name as name, c.name_ar as name_ar,
                  c.credits as credits, c.department as department, c.year_level as year_level,
                  c.semester as semester, c.hours_theory as hours_theory, c.hours_lab as hours_lab,
                  collect(DISTINCT m.id) as major_ids
           ORDER BY c.year_level, c.semester, c.code
-        `);
+        `, { generation });
 
         const prerequisites = await executeNeo4jQuery(`
           MATCH (c1:Course)-[:IS_PREREQUISITE_FOR]->(c2:Course)
+          WHERE ${live('c1')} AND ${live('c2')}
           RETURN c1.code as from_code, c2.code as to_code
-        `);
+        `, { generation });
 
         const majors = await executeNeo4jQuery(`
-          MATCH (m:Major)
+          MATCH (m:Major) WHERE ${live('m')}
           RETURN m.id as id, m.name as name, m.name_en as name_en
-        `);
+        `, { generation });
 
         result = {
           results: [{
@@ -158,25 +176,26 @@ serve(async (req) => {
 
         const majorCourses = await executeNeo4jQuery(`
           MATCH (c:Course)-[:BELONGS_TO]->(m:Major {id: $major_id})
+          WHERE ${live('c')} AND ${live('m')}
           RETURN c.id as id, c.code as code, c.name as name, c.name_ar as name_ar,
                  c.credits as credits, c.department as department, c.year_level as year_level,
                  c.semester as semester, c.hours_theory as hours_theory, c.hours_lab as hours_lab
           ORDER BY c.year_level, c.semester, c.code
-        `, { major_id: request.major_id });
+        `, { major_id: request.major_id, generation });
 
         const courseCodes = majorCourses.results.map((c: any) => c.code);
 
         const majorPrereqs = await executeNeo4jQuery(`
           MATCH (c1:Course)-[:IS_PREREQUISITE_FOR]->(c2:Course)
-          WHERE c1.code IN $codes OR c2.code IN $codes
+          WHERE (c1.code IN $codes OR c2.code IN $codes) AND ${live('c1')} AND ${live('c2')}
           RETURN c1.code as from_code, c2.code as to_code
-        `, { codes: courseCodes });
+        `, { codes: courseCodes, generation });
 
         const majorInfo = await executeNeo4jQuery(`
-          MATCH (m:Major {id: $major_id})
+          MATCH (m:Major {id: $major_id}) WHERE ${live('m')}
           RETURN m.id as id, m.name as name, m.name_en as name_en, 
                  m.description as description, m.total_credits as total_credits
-        `, { major_id: request.major_id });
+        `, { major_id: request.major_id, generation });
 
         result = {
           results: [{
@@ -192,12 +211,12 @@ serve(async (req) => {
       case 'import_all':
         // Get all data from Neo4j for syncing to Supabase
         const allCourses = await executeNeo4jQuery(`
-          MATCH (c:Course)
-          OPTIONAL MATCH (c)-[:BELONGS_TO]->(m:Major)
-          OPTIONAL MATCH (c)-[:TEACHES_SKILL]->(s:Skill)
-          OPTIONAL MATCH (c)-[:COVERS_TOPIC]->(t:Topic)
-          OPTIONAL MATCH (c)-[:TEACHES_TOOL]->(tool:Tool)
-          OPTIONAL MATCH (c)-[:LEADS_TO_CAREER]->(cp:CareerPath)
+          MATCH (c:Course) WHERE ${live('c')}
+          OPTIONAL MATCH (c)-[:BELONGS_TO]->(m:Major) WHERE ${live('m')}
+          OPTIONAL MATCH (c)-[:TEACHES_SKILL]->(s:Skill) WHERE ${live('s')}
+          OPTIONAL MATCH (c)-[:COVERS_TOPIC]->(t:Topic) WHERE ${live('t')}
+          OPTIONAL MATCH (c)-[:TEACHES_TOOL]->(tool:Tool) WHERE ${live('tool')}
+          OPTIONAL MATCH (c)-[:LEADS_TO_CAREER]->(cp:CareerPath) WHERE ${live('cp')}
           RETURN c.id as id, c.code as code, c.name as name, c.name_ar as name_ar,
                  c.credits as credits, c.department as department, c.year_level as year_level,
                  c.semester as semester, c.hours_theory as hours_theory, c.hours_lab as hours_lab,
@@ -209,38 +228,39 @@ serve(async (req) => {
                  collect(DISTINCT tool.name) as tools,
                  collect(DISTINCT cp.name) as career_paths
           ORDER BY c.code
-        `);
+        `, { generation });
 
         const allPrereqs = await executeNeo4jQuery(`
           MATCH (c1:Course)-[r:IS_PREREQUISITE_FOR]->(c2:Course)
+          WHERE ${live('c1')} AND ${live('c2')}
           RETURN c1.code as from_code, c2.code as to_code, r.type as type
-        `);
+        `, { generation });
 
         const allMajors = await executeNeo4jQuery(`
-          MATCH (m:Major)
+          MATCH (m:Major) WHERE ${live('m')}
           RETURN m.id as id, m.name as name, m.name_en as name_en,
                  m.description as description, m.total_credits as total_credits
-        `);
+        `, { generation });
 
         const allSkills = await executeNeo4jQuery(`
-          MATCH (s:Skill)
+          MATCH (s:Skill) WHERE ${live('s')}
           RETURN s.name as name, s.description as description, s.category as category
-        `);
+        `, { generation });
 
         const allTopics = await executeNeo4jQuery(`
-          MATCH (t:Topic)
+          MATCH (t:Topic) WHERE ${live('t')}
           RETURN t.name as name, t.description as description
-        `);
+        `, { generation });
 
         const allTools = await executeNeo4jQuery(`
-          MATCH (t:Tool)
+          MATCH (t:Tool) WHERE ${live('t')}
           RETURN t.name as name, t.description as description, t.category as category
-        `);
+        `, { generation });
 
         const allCareerPaths = await executeNeo4jQuery(`
-          MATCH (cp:CareerPath)
+          MATCH (cp:CareerPath) WHERE ${live('cp')}
           RETURN cp.name as name, cp.name_en as name_en, cp.description as description
-        `);
+        `, { generation });
 
         result = {
           results: [{
@@ -47,6 +47,19 @@ async function executeNeo4jQuery(driver: any, cypher: string, params: Record<str
   }
 }
 
+// graph_sync.py stamps synced nodes with a `generation`; the pointer node
+// (:GraphVersion {name: 'active'}) names the live one. Read only the live
+// generation so a rebuild in progress is never copied into Supabase.
+// Unversioned nodes (Topic, Tool, graphs never synced) always match.
+const live = (v: string) => `(${v}.generation IS NULL OR $generation IS NULL OR ${v}.generation = $generation)`;
+
+async function activeGeneration(driver: any): Promise<number | null> {
+  const rows = await executeNeo4jQuery(
+    driver, `OPTIONAL MATCH (v:GraphVersion {name: 'active'}) RETURN v.generation AS generation`
+  );
+  return rows[0]?.generation ?? null;
+}
+
 serve(async (req) => {
   if (req.method === 'OPTIONS') {
     return new Response(null, { headers: corsHeaders });
@@ -73,6 +86,7 @@ serve(async (req) => {
 
     driver = neo4j.driver(neo4jUri, neo4j.auth.basic(neo4jUsername, neo4jPassword));
     console.log('Connected to Neo4j');
+    const generation = await activeGeneration(driver);
 
     // Initialize Supabase
     const supabaseUrl = Deno.env.get('SUPABASE_URL')!;
@@ -82,11 +96,11 @@ serve(async (req) => {
     // 1. Sync Majors
     console.log('Syncing majors...');
     const majors = await executeNeo4jQuery(driver, `
-      MATCH (m:Major)
+      MATCH (m:Major) WHERE ${live('m')}
       RETURN m.name as name, m.name_en as name_en, m.description as description, 
              m.total_credits as total_credits
       ORDER BY m.name
-    `);
+    `, { generation });
     
     for (const major of majors) {
       const { error } = await supabase.from('majors').upsert({
@@ -107,10 +121,10 @@ serve(async (req) => {
     // 2. Sync Career Paths
     console.log('Syncing career paths...');
     const careerPaths = await executeNeo4jQuery(driver, `
-      MATCH (cp:CareerPath)
+      MATCH (cp:CareerPath) WHERE ${live('cp')}
       RETURN cp.name as name, cp.name_en as name_en, cp.description as description
       ORDER BY cp.name
-    `);
+    `, { generation });
     
     for (const cp of careerPaths) {
       const { error } = await supabase.from('career_paths').upsert({
@@ -130,10 +144,10 @@ serve(async (req) => {
     // 3. Sync Skills
     console.log('Syncing skills...');
     const skills = await executeNeo4jQuery(driver, `
-      MATCH (s:Skill)
+      MATCH (s:Skill) WHERE ${live('s')}
       RETURN s.name as name, s.description as description, s.category as category
       ORDER BY s.name
-    `);
+    `, { generation });
     
     for (const skill of skills) {
       const { error } = await supabase.from('skills').upsert({
@@ -153,10 +167,10 @@ serve(async (req) => {
     // 4. Sync Tools
     console.log('Syncing tools...');
     const tools = await executeNeo4jQuery(driver, `
-      MATCH (t:Tool)
+      MATCH (t:Tool) WHERE ${live('t')}
       RETURN t.name as name, t.description as description, t.category as category
       ORDER BY t.name
-    `);
+    `, { generation });
     
     for (const tool of tools) {
       const { error } = await supabase.from('tools').upsert({
@@ -176,10 +190,10 @@ serve(async (req) => {
     // 5. Sync Topics
     console.log('Syncing topics...');
     const topics = await executeNeo4jQuery(driver, `
-      MATCH (t:Topic)
+      MATCH (t:Topic) WHERE ${live('t')}
       RETURN t.name as name, t.description as description
       ORDER BY t.name
-    `);
+    `, { generation });
     
     for (const topic of topics) {
       const { error } = await supabase.from('topics').upsert({
@@ -198,7 +212,7 @@ serve(async (req) => {
     // 6. Sync Courses
     console.log('Syncing courses...');
     const courses = await executeNeo4jQuery(driver, `
-      MATCH (c:Course)
+      MATCH (c:Course) WHERE ${live('c')}
       RETURN c.code as code, c.name_en as name, c.name_ar as name_ar,
              c.credits as credits, c.category as department, 
              c.year as year_level, c.level as semester,
@@ -207,7 +221,7 @@ serve(async (req) => {
              c.objectives_ar as objectives_ar, c.objectives_en as objectives_en,
              c.is_bottleneck as is_bottleneck, c.critical_path_depth as critical_path_depth
       ORDER BY c.code
-    `);
+    `, { generation });
     
     for (const course of courses) {
       if (!course.code || course.code === '-') continue;
@@ -248,9 +262,10 @@ serve(async (req) => {
     console.log('Syncing course-major relationships...');
     const courseMajors = await executeNeo4jQuery(driver, `
       MATCH (c:Course)-[:BELONGS_TO]->(m:Major)
+      WHERE ${live('c')} AND ${live('m')}
       RETURN c.code as course_code, m.name as major_name
       ORDER BY c.code
-    `);
+    `, { generation });
     
     // Clear existing relationships first
     await supabase.from('course_majors').delete().neq('id', '00000000-0000-0000-0000-000000000000');
@@ -276,10 +291,11 @@ serve(async (req) => {
     console.log('Syncing prerequisites...');
     const prerequisites = await executeNeo4jQuery(driver, `
       MATCH (c1:Course)-[:IS_PREREQUISITE_FOR]->(c2:Course)
+      WHERE ${live('c1')} AND ${live('c2')}
       WHERE c1.code <> c2.code
       RETURN c1.code as prereq_code, c2.code as course_code
       ORDER BY c2.code
-    `);
+    `, { generation });
     
     // Clear existing prerequisites
     await supabase.from('course_prerequisites').delete().neq('id', '00000000-0000-0000-0000-000000000000');
@@ -305,9 +321,10 @@ serve(async (req) => {
     console.log('Syncing course-skill relationships...');
     const courseSkills = await executeNeo4jQuery(driver, `
       MATCH (c:Course)-[:TEACHES_SKILL]->(s:Skill)
+      WHERE ${live('c')} AND ${live('s')}
       RETURN c.code as course_code, s.name as skill_name
       ORDER BY c.code
-    `);
+    `, { generation });
     
     await supabase.from('course_skills').delete().neq('id', '00000000-0000-0000-0000-000000000000');
     
@@ -332,9 +349,10 @@ serve(async (req) => {
     console.log('Syncing course-topic relationships...');
     const courseTopics = await executeNeo4jQuery(driver, `
       MATCH (c:Course)-[:COVERS_TOPIC]->(t:Topic)
+      WHERE ${live('c')} AND ${live('t')}
       RETURN c.code as course_code, t.name as topic_name
       ORDER BY c.code
-    `);
+    `, { generation });
     
     await supabase.from('course_topics').delete().neq('id', '00000000-0000-0000-0000-000000000000');
     
@@ -359,9 +377,10 @@ serve(async (req) => {
     console.log('Syncing course-tool relationships...');
     const courseTools = await executeNeo4jQuery(driver, `
       MATCH (c:Course)-[:TEACHES_TOOL]->(t:Tool)
+      WHERE ${live('c')} AND ${live('t')}
       RETURN c.code as course_code, t.name as tool_name
       ORDER BY c.code
-    `);
+    `, { generation });
     
     await supabase.from('course_tools').delete().neq('id', '00000000-0000-0000-0000-000000000000');
     
@@ -386,9 +405,10 @@ serve(async (req) => {
     console.log('Syncing course-career path relationships...');
     const courseCareerPaths = await executeNeo4jQuery(driver, `
       MATCH (c:Course)-[:LEADS_TO_CAREER]->(cp:CareerPath)
+      WHERE ${live('c')} AND ${live('cp')}
       RETURN c.code as course_code, cp.name as career_path_name
       ORDER BY c.code
-    `);
+    `, { generation });
     
     await supabase.from('course_career_paths').delete().neq('id', '00000000-0000-0000-0000-000000000000');
     
@@ -0,0 +1,25 @@
+-- Batch risk predictions per student, written by scripts/python/risk_scoring.py
+CREATE TABLE IF NOT EXISTS public.student_risk_scores (
+    id UUID DEFAULT gen_random_uuid() PRIMARY KEY,
+    student_id TEXT NOT NULL UNIQUE,
+    risk_score NUMERIC NOT NULL CHECK (risk_score >= 0 AND risk_score <= 1),
+    risk_level TEXT NOT NULL CHECK (risk_level IN ('low', 'medium', 'high', 'critical')),
+    predicted_gpa NUMERIC,
+    factors JSONB NOT NULL DEFAULT '[]'::jsonb,
+    features JSONB,
+    model_version TEXT,
+    scored_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_risk_scores_level ON public.student_risk_scores (risk_level, risk_score DESC);
+
+ALTER TABLE public.student_risk_scores ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Advisors can view risk scores" ON public.student_risk_scores
+    FOR SELECT USING (
+        public.has_role(auth.uid(), 'advisor'::public.app_role) OR
+        public.has_role(auth.uid(), 'admin'::public.app_role)
+    );
+
+CREATE POLICY "Admins can manage risk scores" ON public.student_risk_scores
+    FOR ALL USING (public.has_role(auth.uid(), 'admin'::public.app_role));
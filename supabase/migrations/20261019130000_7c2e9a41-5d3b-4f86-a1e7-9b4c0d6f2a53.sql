@@ -0,0 +1,28 @@
+-- Top-k similar peers per student, written by scripts/python/peer_matching.py
+CREATE TABLE IF NOT EXISTS public.student_peer_matches (
+    id UUID DEFAULT gen_random_uuid() PRIMARY KEY,
+    student_id TEXT NOT NULL UNIQUE,
+    major TEXT,
+    peers JSONB NOT NULL DEFAULT '[]'::jsonb,
+    computed_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+ALTER TABLE public.student_peer_matches ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Students can view own peer matches" ON public.student_peer_matches
+    FOR SELECT USING (
+        EXISTS (
+            SELECT 1 FROM public.students s
+            WHERE s.student_id = student_peer_matches.student_id
+              AND s.user_id = auth.uid()
+        )
+    );
+
+CREATE POLICY "Advisors can view peer matches" ON public.student_peer_matches
+    FOR SELECT USING (
+        public.has_role(auth.uid(), 'advisor'::public.app_role) OR
+        public.has_role(auth.uid(), 'admin'::public.app_role)
+    );
+
+CREATE POLICY "Admins can manage peer matches" ON public.student_peer_matches
+    FOR ALL USING (public.has_role(auth.uid(), 'admin'::public.app_role));